@@ -0,0 +1,27 @@
+"""add users created_at index for keyset pagination
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17 01:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """ユーザー一覧のキーセットページネーション用インデックスを作成"""
+    op.create_index('idx_users_created_at_id', 'users', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    """インデックスを削除"""
+    op.drop_index('idx_users_created_at_id', table_name='users')
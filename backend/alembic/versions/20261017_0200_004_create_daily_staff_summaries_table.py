@@ -0,0 +1,62 @@
+"""create daily_staff_summaries table
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 02:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """daily_staff_summariesテーブルを作成し、既存の前日報告から初期データを投入"""
+    op.create_table(
+        'daily_staff_summaries',
+        sa.Column('work_date', sa.Date(), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('previous_day_report_id', UUID(as_uuid=True), nullable=True),
+        sa.Column('next_wake_up_time', sa.Time(), nullable=True),
+        sa.Column('next_departure_time', sa.Time(), nullable=True),
+        sa.Column('next_arrival_time', sa.Time(), nullable=True),
+        sa.Column('previous_day_reported_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+    )
+
+    # 既存の前日報告から作成（同じ報告日に複数ある場合は最新のもの）
+    op.execute("""
+        INSERT INTO daily_staff_summaries (
+            work_date, user_id, previous_day_report_id,
+            next_wake_up_time, next_departure_time, next_arrival_time,
+            previous_day_reported_at
+        )
+        SELECT DISTINCT ON (user_id, report_date)
+            report_date + 1, user_id, id,
+            next_wake_up_time, next_departure_time, next_arrival_time,
+            created_at
+        FROM previous_day_reports
+        ORDER BY user_id, report_date, created_at DESC;
+    """)
+
+    # updated_at自動更新トリガー
+    op.execute("""
+        CREATE TRIGGER update_daily_staff_summaries_updated_at
+        BEFORE UPDATE ON daily_staff_summaries
+        FOR EACH ROW
+        EXECUTE FUNCTION update_updated_at_column();
+    """)
+
+
+def downgrade() -> None:
+    """daily_staff_summariesテーブルを削除"""
+    op.execute("DROP TRIGGER IF EXISTS update_daily_staff_summaries_updated_at ON daily_staff_summaries;")
+    op.drop_table('daily_staff_summaries')
@@ -0,0 +1,40 @@
+"""add unique constraint on previous_day_reports (user_id, report_date)
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 03:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """1ユーザー1日1件の一意制約を追加（非一意インデックスを置き換え）"""
+    # 重複している前日報告は最新のもの（サマリーが参照しているもの）のみ残す
+    op.execute("""
+        DELETE FROM previous_day_reports AS older
+        USING previous_day_reports AS newer
+        WHERE older.user_id = newer.user_id
+          AND older.report_date = newer.report_date
+          AND (older.created_at, older.id) < (newer.created_at, newer.id);
+    """)
+
+    op.drop_index('idx_prev_reports_user_date', table_name='previous_day_reports')
+    op.create_unique_constraint(
+        'uq_prev_reports_user_date', 'previous_day_reports', ['user_id', 'report_date']
+    )
+
+
+def downgrade() -> None:
+    """一意制約を削除し、非一意インデックスに戻す"""
+    op.drop_constraint('uq_prev_reports_user_date', 'previous_day_reports', type_='unique')
+    op.create_index('idx_prev_reports_user_date', 'previous_day_reports', ['user_id', 'report_date'])
@@ -0,0 +1,43 @@
+"""add derived photo urls (WebP thumbnail / preview) to previous_day_reports
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17 04:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DERIVED_PHOTO_COLUMNS = (
+    'appearance_thumbnail_url',
+    'appearance_preview_url',
+    'route_thumbnail_url',
+    'route_preview_url',
+)
+
+
+def upgrade() -> None:
+    """
+    写真の派生画像URLの列を追加
+
+    NULL許容・デフォルトなしの列追加のため、テーブルの書き換えは発生しない。
+    既存の報告の派生画像は scripts/process_photos.py で作成する
+    """
+    for column in DERIVED_PHOTO_COLUMNS:
+        op.add_column(
+            'previous_day_reports', sa.Column(column, sa.String(length=500), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    """派生画像URLの列を削除"""
+    for column in reversed(DERIVED_PHOTO_COLUMNS):
+        op.drop_column('previous_day_reports', column)
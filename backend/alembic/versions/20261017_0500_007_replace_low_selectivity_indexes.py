@@ -0,0 +1,76 @@
+"""replace low-selectivity indexes with covering and partial indexes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17 05:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 派生画像が未作成の写真を持つ前日報告（処理待ちの行のみを索引する）
+PENDING_PHOTOS_WHERE = 'appearance_thumbnail_url IS NULL OR route_thumbnail_url IS NULL'
+
+
+def upgrade() -> None:
+    """選択性の低いインデックスを、カバリングインデックス・部分インデックスに置き換え"""
+    # 一意制約に id, updated_at を含め、最新・全体のバージョン確認をインデックスのみで行う
+    # （op.create_unique_constraint はキー以外の列を解決できないため、DDLを直接実行する）
+    op.drop_constraint('uq_prev_reports_user_date', 'previous_day_reports', type_='unique')
+    op.execute("""
+        ALTER TABLE previous_day_reports
+        ADD CONSTRAINT uq_prev_reports_user_date
+        UNIQUE (user_id, report_date) INCLUDE (id, updated_at);
+    """)
+
+    # 日付範囲のエクスポートの並び順（報告日・スタッフ順）をインデックスで返す
+    op.drop_index('idx_prev_reports_date', table_name='previous_day_reports')
+    op.create_index(
+        'idx_prev_reports_date_user', 'previous_day_reports', ['report_date', 'user_id']
+    )
+
+    # 派生画像の作成待ちの前日報告（ほとんどの行は作成済みのため部分インデックスにする）
+    op.create_index(
+        'idx_prev_reports_pending_photos',
+        'previous_day_reports',
+        ['id'],
+        postgresql_where=sa.text(PENDING_PHOTOS_WHERE),
+    )
+
+    # active・role 単独のインデックス（値が2〜3種類）を、一覧の並び順 (created_at, id) を含む
+    # 複合インデックスと、アクティブユーザーのみの部分インデックスに置き換え
+    op.drop_index('idx_users_role', table_name='users')
+    op.drop_index('idx_users_active', table_name='users')
+    op.create_index('idx_users_role_created_at_id', 'users', ['role', 'created_at', 'id'])
+    op.create_index(
+        'idx_users_active_role_created_at_id',
+        'users',
+        ['role', 'created_at', 'id'],
+        postgresql_where=sa.text('active'),
+    )
+
+
+def downgrade() -> None:
+    """置き換え前のインデックスに戻す"""
+    op.drop_index('idx_users_active_role_created_at_id', table_name='users')
+    op.drop_index('idx_users_role_created_at_id', table_name='users')
+    op.create_index('idx_users_active', 'users', ['active'])
+    op.create_index('idx_users_role', 'users', ['role'])
+
+    op.drop_index('idx_prev_reports_pending_photos', table_name='previous_day_reports')
+
+    op.drop_index('idx_prev_reports_date_user', table_name='previous_day_reports')
+    op.create_index('idx_prev_reports_date', 'previous_day_reports', ['report_date'])
+
+    op.drop_constraint('uq_prev_reports_user_date', 'previous_day_reports', type_='unique')
+    op.create_unique_constraint(
+        'uq_prev_reports_user_date', 'previous_day_reports', ['user_id', 'report_date']
+    )
@@ -0,0 +1,193 @@
+"""partition previous_day_reports by month (report_date)
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17 06:00:00
+
+既存の previous_day_reports をオンラインで月単位のレンジパーティションテーブルに移行する。
+
+1. 新しいパーティションテーブル（previous_day_reports_partitioned）と月ごとのパーティション
+   （保持期間の開始月〜3か月先、既存データの最古の月を含む）・DEFAULTパーティションを作成し、
+   既存テーブルへの書き込みをトリガーで新しいテーブルに反映する
+2. 既存の行を id 順のバッチで新しいテーブルにコピーする（バッチごとにコミットし、
+   既存テーブルの読み書きは止めない。コピー中のバッチの行の更新・削除のみ待たせる）
+3. 既存テーブルの書き込みをロックし、コピー中に削除された行等の差分を反映して件数を確認した後、
+   既存テーブルを削除して新しいテーブルの名前を previous_day_reports に変更する
+
+パーティションテーブルの主キー・一意制約にはパーティションキー（report_date）を含める必要が
+あるため、主キーは (id, report_date) とする。以降のパーティションの作成と、保持期間を過ぎた
+パーティションの切り離し・削除は scripts/manage_partitions.py で行う。
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 移行先のテーブル（移行完了時に previous_day_reports に名前を変更する）
+NEW_TABLE = 'previous_day_reports_partitioned'
+
+# 最初に作成するパーティションの範囲（保持期間の開始月〜今月から3か月先まで）
+RETENTION_MONTHS = 12
+PARTITIONS_AHEAD = 3
+
+# 既存の行をコピーする1バッチの行数
+COPY_BATCH_SIZE = 5000
+
+# 名前を変更する既存テーブルのインデックス（スキーマ内で一意のため、新しいテーブルで使う名前を空ける）
+INDEXES = (
+    'previous_day_reports_pkey',
+    'uq_prev_reports_user_date',
+    'idx_prev_reports_date_user',
+    'idx_prev_reports_pending_photos',
+)
+
+PENDING_PHOTOS_WHERE = 'appearance_thumbnail_url IS NULL OR route_thumbnail_url IS NULL'
+
+
+def _add_months(month: date, months: int) -> date:
+    """月初の日付に月数を加算"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes(table: str) -> None:
+    """前日報告テーブルの制約・インデックス・トリガーを作成"""
+    op.execute(f"""
+        ALTER TABLE {table}
+        ADD CONSTRAINT previous_day_reports_user_id_fkey
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+        ADD CONSTRAINT uq_prev_reports_user_date
+            UNIQUE (user_id, report_date) INCLUDE (id, updated_at);
+    """)
+    op.create_index('idx_prev_reports_date_user', table, ['report_date', 'user_id'])
+    op.create_index(
+        'idx_prev_reports_pending_photos',
+        table,
+        ['id'],
+        postgresql_where=sa.text(PENDING_PHOTOS_WHERE),
+    )
+    op.execute(f"""
+        CREATE TRIGGER update_previous_day_reports_updated_at
+        BEFORE UPDATE ON {table}
+        FOR EACH ROW
+        EXECUTE FUNCTION update_updated_at_column();
+    """)
+
+
+def upgrade() -> None:
+    """previous_day_reports を月単位のレンジパーティションテーブルにオンラインで移行"""
+    conn = op.get_bind()
+
+    # 1. パーティションテーブルの作成と、既存テーブルへの書き込みの反映
+    for index in INDEXES:
+        op.execute(f'ALTER INDEX {index} RENAME TO {index}_unpartitioned')
+    op.execute(f"""
+        CREATE TABLE {NEW_TABLE} (
+            LIKE previous_day_reports INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            CONSTRAINT previous_day_reports_pkey PRIMARY KEY (id, report_date)
+        ) PARTITION BY RANGE (report_date);
+    """)
+    _create_indexes(NEW_TABLE)
+
+    this_month = date.today().replace(day=1)
+    first = _add_months(this_month, -RETENTION_MONTHS)
+    oldest = conn.execute(sa.text('SELECT min(report_date) FROM previous_day_reports')).scalar()
+    if oldest is not None:
+        first = min(first, oldest.replace(day=1))
+    month = first
+    while month <= _add_months(this_month, PARTITIONS_AHEAD):
+        op.execute(f"""
+            CREATE TABLE previous_day_reports_p{month:%Y_%m} PARTITION OF {NEW_TABLE}
+            FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}');
+        """)
+        month = _add_months(month, 1)
+    # 作成済みのパーティションの範囲外の報告日（数か月先の日付等）
+    op.execute(f'CREATE TABLE previous_day_reports_default PARTITION OF {NEW_TABLE} DEFAULT')
+
+    op.execute(f"""
+        CREATE FUNCTION mirror_previous_day_reports() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {NEW_TABLE} WHERE id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {NEW_TABLE} SELECT NEW.* ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER mirror_previous_day_reports
+        AFTER INSERT OR UPDATE OR DELETE ON previous_day_reports
+        FOR EACH ROW
+        EXECUTE FUNCTION mirror_previous_day_reports();
+    """)
+
+    # 2. 既存の行のコピー（バッチごとにコミット）
+    # バッチの行は FOR SHARE でロックし、コピー中の行の更新・削除をコミットまで待たせる
+    # （トリガーがコピー前の行を消せず、古い内容が残ることを防ぐ）
+    with op.get_context().autocommit_block():
+        after = '00000000-0000-0000-0000-000000000000'
+        while after is not None:
+            after = conn.execute(
+                sa.text(f"""
+                    WITH batch AS (
+                        SELECT * FROM previous_day_reports
+                        WHERE id > CAST(:after AS uuid)
+                        ORDER BY id
+                        LIMIT :limit
+                        FOR SHARE
+                    ), copied AS (
+                        INSERT INTO {NEW_TABLE} SELECT * FROM batch ON CONFLICT DO NOTHING
+                    )
+                    SELECT id FROM batch ORDER BY id DESC LIMIT 1
+                """),
+                {'after': after, 'limit': COPY_BATCH_SIZE},
+            ).scalar()
+
+    # 3. 差分の反映と切り替え（書き込みのみロックし、読み出しは削除の直前まで止めない）
+    op.execute("SET LOCAL lock_timeout = '10s'")
+    op.execute('LOCK TABLE previous_day_reports IN EXCLUSIVE MODE')
+    op.execute(f"""
+        DELETE FROM {NEW_TABLE} AS copied
+        WHERE NOT EXISTS (SELECT 1 FROM previous_day_reports AS source WHERE source.id = copied.id);
+    """)
+    op.execute(f"""
+        INSERT INTO {NEW_TABLE}
+        SELECT * FROM previous_day_reports AS source
+        WHERE NOT EXISTS (SELECT 1 FROM {NEW_TABLE} AS copied WHERE copied.id = source.id);
+    """)
+    source_count, copied_count = conn.execute(
+        sa.text(f'SELECT (SELECT count(*) FROM previous_day_reports), (SELECT count(*) FROM {NEW_TABLE})')
+    ).one()
+    if source_count != copied_count:
+        raise RuntimeError(
+            f'前日報告のコピーの件数が一致しません: {source_count} != {copied_count}'
+        )
+
+    op.execute('DROP TABLE previous_day_reports')
+    op.execute('DROP FUNCTION mirror_previous_day_reports()')
+    op.execute(f'ALTER TABLE {NEW_TABLE} RENAME TO previous_day_reports')
+
+
+def downgrade() -> None:
+    """パーティションテーブルを通常のテーブルに戻す（書き込みを止めて一括でコピー）"""
+    op.execute('LOCK TABLE previous_day_reports IN EXCLUSIVE MODE')
+    op.execute("""
+        CREATE TABLE previous_day_reports_unpartitioned (
+            LIKE previous_day_reports INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        );
+    """)
+    op.execute('INSERT INTO previous_day_reports_unpartitioned SELECT * FROM previous_day_reports')
+    op.execute('DROP TABLE previous_day_reports')
+    op.execute('ALTER TABLE previous_day_reports_unpartitioned RENAME TO previous_day_reports')
+    op.create_primary_key('previous_day_reports_pkey', 'previous_day_reports', ['id'])
+    _create_indexes('previous_day_reports')
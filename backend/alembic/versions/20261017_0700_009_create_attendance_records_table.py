@@ -0,0 +1,78 @@
+"""create attendance_records table
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17 07:00:00
+
+勤怠記録（起床・出発・到着）のテーブルを作成する。
+
+- 1スタッフ1日1件（uq_attendance_staff_date）。段階の報告は INSERT ... ON CONFLICT の1文で行う
+- 朝の報告が集中する時間帯に1行が3回更新されるため、fillfactor を下げてページ内に空きを残し、
+  インデックス列を変更しない更新をHOT更新（インデックスの更新なし）にする
+- 行はその日の最初の報告で作成するため、status は partial / complete のみ（未報告は行がない）
+- status は選択性が低く、更新のたびにインデックスの更新が必要になる（HOT更新にならない）ため、
+  インデックスを作成しない
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """attendance_recordsテーブルを作成"""
+    op.create_table(
+        'attendance_records',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('staff_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('wake_up_time', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('wake_up_location', sa.String(255), nullable=True),
+        sa.Column('wake_up_notes', sa.Text(), nullable=True),
+        sa.Column('departure_time', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('departure_location', sa.String(255), nullable=True),
+        sa.Column('departure_notes', sa.Text(), nullable=True),
+        sa.Column('destination', sa.String(255), nullable=True),
+        sa.Column('arrival_time', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('arrival_location', sa.String(255), nullable=True),
+        sa.Column('arrival_gps_location', sa.String(255), nullable=True),
+        sa.Column('arrival_notes', sa.Text(), nullable=True),
+        sa.Column('route_photo_url', sa.String(500), nullable=True),
+        sa.Column('appearance_photo_url', sa.String(500), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.UniqueConstraint('staff_id', 'date', name='uq_attendance_staff_date'),
+        sa.CheckConstraint(
+            "status IN ('partial', 'complete')",
+            name='chk_attendance_status',
+        ),
+    )
+    # 同じページ内に更新後の行を置けるよう、30%の空きを残す（HOT更新）
+    op.execute("ALTER TABLE attendance_records SET (fillfactor = 70)")
+
+    # 日付ごとの全スタッフの勤怠記録（マネージャー向け）
+    op.create_index('idx_attendance_date_staff', 'attendance_records', ['date', 'staff_id'])
+
+    # updated_at自動更新トリガー
+    op.execute("""
+        CREATE TRIGGER update_attendance_records_updated_at
+        BEFORE UPDATE ON attendance_records
+        FOR EACH ROW
+        EXECUTE FUNCTION update_updated_at_column();
+    """)
+
+
+def downgrade() -> None:
+    """attendance_recordsテーブルを削除"""
+    op.execute("DROP TRIGGER IF EXISTS update_attendance_records_updated_at ON attendance_records;")
+    op.drop_index('idx_attendance_date_staff', table_name='attendance_records')
+    op.drop_table('attendance_records')
@@ -1,27 +1,332 @@
 """
 データベース設定
+
+エンジンはインポート時ではなく初回使用時に作成する（Lambdaのコールドスタート短縮のため、
+DBドライバのインポートとコネクションプールの作成を初期化フェーズから外す）
+
+エンジンにはクエリの計測用のイベントフックを登録し、リクエストごとのクエリ数・DB時間の集計と
+遅いクエリのログ出力を行う（app.utils.timing）
+
+DATABASE_REPLICA_URL を設定した場合は読み取り専用レプリカのエンジンを作成し、GETのエンドポイントの
+読み出しをレプリカで行う（app.dependencies.get_read_session）。書き込んだユーザーは
+DATABASE_REPLICA_PIN_SECONDS の間プライマリで読み出し、自分の書き込みが見えるようにする
+
+同期モード（DATABASE_ASYNC=False）では、同時に開くセッションの数をプールの接続数までに制限する
+（get_session）。サービスの呼び出しはそれぞれスレッドプールで実行され、セッションは呼び出しの間も
+接続を保持するため、制限しないとプールの接続数を超えるリクエストがスレッドを占有したまま接続を待ち、
+接続を保持するリクエストの次の呼び出しがスレッドを得られずに pool_timeout まで停止する
 """
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import logging
+import os
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.timing import current_timing, record_phase, record_query
 
-# データベースエンジンの作成
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_recycle=3600,
-    echo=settings.DEBUG,
-)
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
-# セッションローカルの作成
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# セッションローカルの作成（エンジンは get_engine() で初回使用時にバインド）
+# 非同期セッションと同様、コミット後のレスポンス作成で再読み込みが発生しないよう
+# expire_on_commit=False とする
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+
+# 非同期セッションの作成（get_async_engine() で初回使用時に作成・バインド）
+AsyncSessionLocal = None
+
+# 読み取り専用レプリカのセッション（get_replica_engine() / get_async_replica_engine() でバインド）
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+AsyncReplicaSessionLocal = None
 
 # ベースクラスの作成
 Base = declarative_base()
 
+_engine: Engine | None = None
+_async_engine: "AsyncEngine | None" = None
+_replica_engine: Engine | None = None
+_async_replica_engine: "AsyncEngine | None" = None
+
+logger = logging.getLogger(__name__)
+
+# 遅いクエリのログに出力するSQLの最大長
+SLOW_QUERY_LOG_MAX_LENGTH = 1000
+
+# 書き込み後にプライマリで読み出すユーザー（ユーザーID → True、DATABASE_REPLICA_PIN_SECONDS で失効）
+# 識別情報・前日報告のキャッシュと同様にプロセス内で保持する
+primary_pins = TTLCache(maxsize=100000, ttl=settings.DATABASE_REPLICA_PIN_SECONDS)
+
+# 同期モードのセッションの同時数の制限（イベントループ → エンジン名 → セマフォ）
+# asyncio のプリミティブは最初に待機したイベントループに結び付くため、ループごとに作成する
+_session_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def to_async_database_url(url: str) -> str:
+    """
+    DATABASE_URLを非同期ドライバ（psycopg3 async）用のURLに変換
+
+    Args:
+        url: データベースURL
+
+    Returns:
+        str: postgresql+psycopg スキームのURL
+    """
+    return make_url(url).set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+
+
+def resolve_pool_mode() -> str:
+    """
+    コネクションプールモードを決定
+
+    DATABASE_POOL_MODE=auto の場合、Lambda上（AWS_LAMBDA_FUNCTION_NAME が設定されている）では
+    single、それ以外では queue とする
+
+    Returns:
+        str: queue / single / null
+    """
+    mode = settings.DATABASE_POOL_MODE.lower()
+    if mode == "auto":
+        return "single" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else "queue"
+    if mode not in ("queue", "single", "null"):
+        raise ValueError(f"不正な DATABASE_POOL_MODE です: {settings.DATABASE_POOL_MODE}")
+    return mode
+
+
+def pool_capacity() -> int | None:
+    """
+    プールモードに応じた1エンジンあたりの最大接続数を取得
+
+    Returns:
+        int | None: queue は pool_size + max_overflow、single は 1、null は None（上限なし）
+    """
+    mode = resolve_pool_mode()
+    if mode == "null":
+        return None
+    if mode == "single":
+        return 1
+    return settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW
+
+
+def engine_options(read_only: bool = False) -> dict[str, Any]:
+    """
+    プールモードに応じたエンジン作成オプションを取得（同期・非同期エンジン共通）
+
+    - queue:  QueuePool（pool_size + max_overflow まで接続）
+    - single: 1接続のみ保持し、Lambdaの呼び出し間で再利用する
+    - null:   チェックアウトごとに接続し、返却時に切断する
+
+    pre_ping により、Lambdaのフリーズ中にサーバー側・NATで切断された接続は
+    チェックアウト時に検出して再接続される
+
+    Args:
+        read_only: True の場合、接続のトランザクションを読み取り専用とする（レプリカ用。
+            誤ってレプリカ側のセッションで書き込んだ場合にエラーにする）
+
+    Returns:
+        dict[str, Any]: create_engine / create_async_engine に渡すオプション
+    """
+    options: dict[str, Any] = {"echo": settings.DEBUG}
+
+    mode = resolve_pool_mode()
+    if mode == "null":
+        options["poolclass"] = NullPool
+    else:
+        single = mode == "single"
+        options.update(
+            pool_size=1 if single else settings.DATABASE_POOL_SIZE,
+            max_overflow=0 if single else settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+            pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        )
+
+    connect_args: dict[str, Any] = {}
+    if settings.DATABASE_RDS_PROXY:
+        # psycopg3 の自動プリペアドステートメントを無効化（Proxyの接続ピン留め回避）
+        connect_args["prepare_threshold"] = None
+    if read_only:
+        connect_args["options"] = "-c default_transaction_read_only=on"
+    if connect_args:
+        options["connect_args"] = connect_args
+
+    return options
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """
+    クエリパラメータの値を型名に置き換える（ログに個人情報・写真URL等を残さないため）
+
+    Args:
+        parameters: DBAPIに渡すパラメータ（辞書・シーケンス、executemany の場合はそのリスト）
+
+    Returns:
+        Any: 値を "<型名>" に置き換えたパラメータ（executemany の場合は先頭の行と行数）
+    """
+    if isinstance(parameters, dict):
+        return {name: f"<{type(value).__name__}>" for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {"rows": len(parameters), "first": redact_parameters(parameters[0])}
+        return [f"<{type(value).__name__}>" for value in parameters]
+    return f"<{type(parameters).__name__}>"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """クエリ数を加算し、実行開始時刻を記録（strict モードで上限を超える場合は実行しない）"""
+    record_query(statement)
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """クエリの実行時間をリクエストの db 段階に加算し、遅いクエリをログに出力"""
+    elapsed = time.perf_counter() - context._query_start
+    record_phase("db", elapsed)
+    threshold = settings.DATABASE_SLOW_QUERY_MS
+    if threshold and elapsed * 1000 >= threshold:
+        timing = current_timing()
+        logger.warning(
+            "遅いクエリ %.1fms%s: %s params=%s",
+            elapsed * 1000,
+            f" ({timing.request})" if timing is not None else "",
+            " ".join(statement.split())[:SLOW_QUERY_LOG_MAX_LENGTH],
+            redact_parameters(parameters),
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    クエリの計測用のイベントフックを登録
+
+    非同期エンジンの場合は sync_engine を渡す
+
+    Args:
+        engine: データベースエンジン
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def get_engine() -> Engine:
+    """
+    データベースエンジンを取得（初回呼び出し時に作成）
+
+    Returns:
+        Engine: データベースエンジン
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_engine(settings.DATABASE_URL, **engine_options())
+        instrument_engine(_engine)
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def get_async_engine() -> "AsyncEngine":
+    """
+    非同期データベースエンジンを取得（初回呼び出し時に作成）
+
+    Returns:
+        AsyncEngine: 非同期データベースエンジン
+    """
+    global _async_engine, AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        _async_engine = create_async_engine(
+            to_async_database_url(settings.DATABASE_URL), **engine_options()
+        )
+        instrument_engine(_async_engine.sync_engine)
+        # コミット後の属性アクセスで暗黙のI/Oが発生しないよう expire_on_commit=False とする
+        AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine, autocommit=False, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+def get_replica_engine() -> Engine | None:
+    """
+    読み取り専用レプリカのエンジンを取得（初回呼び出し時に作成）
+
+    Returns:
+        Engine | None: レプリカのエンジン（DATABASE_REPLICA_URL が未設定の場合は None）
+    """
+    global _replica_engine
+    if _replica_engine is None and settings.DATABASE_REPLICA_URL:
+        _replica_engine = create_engine(
+            settings.DATABASE_REPLICA_URL, **engine_options(read_only=True)
+        )
+        instrument_engine(_replica_engine)
+        ReplicaSessionLocal.configure(bind=_replica_engine)
+    return _replica_engine
+
+
+def get_async_replica_engine() -> "AsyncEngine | None":
+    """
+    読み取り専用レプリカの非同期エンジンを取得（初回呼び出し時に作成）
+
+    Returns:
+        AsyncEngine | None: レプリカの非同期エンジン（DATABASE_REPLICA_URL が未設定の場合は None）
+    """
+    global _async_replica_engine, AsyncReplicaSessionLocal
+    if _async_replica_engine is None and settings.DATABASE_REPLICA_URL:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        _async_replica_engine = create_async_engine(
+            to_async_database_url(settings.DATABASE_REPLICA_URL), **engine_options(read_only=True)
+        )
+        instrument_engine(_async_replica_engine.sync_engine)
+        AsyncReplicaSessionLocal = async_sessionmaker(
+            bind=_async_replica_engine, autocommit=False, autoflush=False, expire_on_commit=False
+        )
+    return _async_replica_engine
+
+
+def pin_primary(user_id: Any) -> None:
+    """
+    ユーザーの読み出しを DATABASE_REPLICA_PIN_SECONDS の間プライマリで行う
+
+    書き込みの前に呼び出し、コミット直後の読み出しがレプリカの遅延で古い値を返さないようにする
+
+    Args:
+        user_id: ユーザーID
+    """
+    if settings.DATABASE_REPLICA_URL:
+        primary_pins.set(user_id, True)
+
+
+def is_primary_pinned(user_id: Any) -> bool:
+    """
+    ユーザーの読み出しをプライマリで行う期間中か
+
+    Args:
+        user_id: ユーザーID
+
+    Returns:
+        bool: 書き込みから DATABASE_REPLICA_PIN_SECONDS 以内の場合 True
+    """
+    pinned, _ = primary_pins.get(user_id)
+    return pinned is not None
+
+
+def __getattr__(name: str):
+    """`engine` / `async_engine` の遅延作成（from app.database import engine 互換）"""
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_db():
     """
@@ -30,8 +335,125 @@ def get_db():
     Yields:
         Session: データベースセッション
     """
+    get_engine()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    非同期データベースセッションを取得する依存性注入関数
+
+    Yields:
+        AsyncSession: 非同期データベースセッション
+    """
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_session():
+    """
+    設定（DATABASE_ASYNC）に応じたデータベースセッションを取得する依存性注入関数
+
+    同期モードではセッションのクローズ（コネクション返却）をスレッドプールで実行し、
+    イベントループをブロックしない。同時に開くセッションはプールの最大接続数までとする
+
+    Yields:
+        AsyncSession | Session: データベースセッション
+    """
+    if settings.DATABASE_ASYNC:
+        get_async_engine()
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    get_engine()
+    async with _sync_session("primary", SessionLocal) as db:
+        yield db
+
+
+async def get_replica_session():
+    """
+    読み取り専用レプリカのセッションを取得する依存性注入関数
+
+    接続はセッションの最初のクエリで取得するため、使用しなかった場合は接続しない。
+    DATABASE_REPLICA_URL が未設定の場合は None を返す
+
+    Yields:
+        AsyncSession | Session | None: レプリカのセッション
+    """
+    if not settings.DATABASE_REPLICA_URL:
+        yield None
+        return
+
+    if settings.DATABASE_ASYNC:
+        get_async_replica_engine()
+        async with AsyncReplicaSessionLocal() as db:
+            yield db
+        return
+
+    get_replica_engine()
+    async with _sync_session("replica", ReplicaSessionLocal) as db:
+        yield db
+
+
+def _session_slot(name: str) -> asyncio.Semaphore | None:
+    """
+    実行中のイベントループでのエンジンのセッションの同時数を制限するセマフォを取得
+
+    Args:
+        name: エンジン名（primary / replica）
+
+    Returns:
+        asyncio.Semaphore | None: プールの最大接続数のセマフォ（null モードの場合は None）
+    """
+    capacity = pool_capacity()
+    if capacity is None:
+        return None
+    slots = _session_slots.setdefault(asyncio.get_running_loop(), {})
+    if name not in slots:
+        slots[name] = asyncio.Semaphore(capacity)
+    return slots[name]
+
+
+@asynccontextmanager
+async def _sync_session(name: str, factory: Callable[[], Session]) -> AsyncIterator[Session]:
+    """
+    同期セッションを開き、クローズ（コネクション返却）をスレッドプールで実行する
+
+    開いているセッションがプールの最大接続数に達している場合は、スレッドを使わずに
+    イベントループ上で空きを待つ。スレッドでの接続の取得は常に空きのある状態で行われるため、
+    接続を待つスレッドがスレッドプールを占有して、接続を保持するリクエストが停止することはない
+
+    Args:
+        name: エンジン名（primary / replica）
+        factory: セッションファクトリ
+
+    Yields:
+        Session: データベースセッション
+
+    Raises:
+        sqlalchemy.exc.TimeoutError: DATABASE_POOL_TIMEOUT 秒以内に空きができなかった場合
+    """
+    slot = _session_slot(name)
+    if slot is not None:
+        try:
+            await asyncio.wait_for(slot.acquire(), settings.DATABASE_POOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise PoolTimeoutError(
+                f"同時に開けるセッション数（{pool_capacity()}）に達し、"
+                f"{settings.DATABASE_POOL_TIMEOUT}秒以内に空きができませんでした"
+            ) from None
+    try:
+        db = factory()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+    finally:
+        if slot is not None:
+            slot.release()
@@ -2,93 +2,275 @@
 依存性注入
 """
 import uuid
-from typing import Annotated
+from typing import Annotated, Any, Awaitable, Callable
 
-from fastapi import Depends, Header, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
 from app.config import settings
+from app.database import get_db, get_replica_session, get_session, is_primary_pinned, pin_primary
+from app.services.attendance_service import AsyncAttendanceService, AttendanceService
+from app.services.dashboard_service import AsyncDashboardService, DashboardService
+from app.services.export_service import AsyncExportService, ExportService
+from app.services.previous_day_report_service import (
+    AsyncPreviousDayReportService,
+    PreviousDayReportService,
+)
+from app.services.upload_service import AsyncUploadService
+from app.services.user_service import AsyncUserService, UserService, identity_cache
 from app.utils.cognito import cognito_verifier
-from app.services.user_service import UserService
+from app.utils.timing import phase, query_allowance, set_query_budget
 
 # HTTPBearer認証スキーム
 security = HTTPBearer()
 
+# 書き込みを伴わないHTTPメソッド（これ以外のリクエストでは読み出しをプライマリに固定する）
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ThreadPoolService:
+    """
+    同期サービスを非同期インターフェースで呼び出すアダプター
+
+    同期モード（DATABASE_ASYNC=False）で、サービスのメソッド呼び出しを
+    スレッドプールで実行し、クエリ待ちでイベントループをブロックしない
+    """
+
+    def __init__(self, service: Any):
+        self._service = service
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._service, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await run_in_threadpool(attr, *args, **kwargs)
+
+        return call
+
+
+def get_previous_day_report_service(db=Depends(get_session)) -> AsyncPreviousDayReportService:
+    """
+    前日報告サービスを取得する依存性注入関数
+
+    Args:
+        db: データベースセッション（同期または非同期）
+
+    Returns:
+        AsyncPreviousDayReportService: 非同期インターフェースの前日報告サービス
+    """
+    if settings.DATABASE_ASYNC:
+        return AsyncPreviousDayReportService(db)
+    return ThreadPoolService(PreviousDayReportService(db))
+
+
+def get_user_service(db=Depends(get_session)) -> AsyncUserService:
+    """
+    ユーザーサービスを取得する依存性注入関数
+
+    Args:
+        db: データベースセッション（同期または非同期）
+
+    Returns:
+        AsyncUserService: 非同期インターフェースのユーザーサービス
+    """
+    if settings.DATABASE_ASYNC:
+        return AsyncUserService(db)
+    return ThreadPoolService(UserService(db))
+
+
+def get_attendance_service(db=Depends(get_session)) -> AsyncAttendanceService:
+    """
+    勤怠記録サービスを取得する依存性注入関数
+
+    Args:
+        db: データベースセッション（同期または非同期）
+
+    Returns:
+        AsyncAttendanceService: 非同期インターフェースの勤怠記録サービス
+    """
+    if settings.DATABASE_ASYNC:
+        return AsyncAttendanceService(db)
+    return ThreadPoolService(AttendanceService(db))
+
+
+def get_upload_service() -> AsyncUploadService:
+    """
+    写真アップロードサービスを取得する依存性注入関数
+
+    DBを使用しないため、モードによらず非同期サービスを返す（S3のI/Oはスレッドプールで実行）
+
+    Returns:
+        AsyncUploadService: 写真アップロードサービス
+    """
+    return AsyncUploadService()
+
+
+def query_budget(max_queries: int) -> Callable[[], Awaitable[None]]:
+    """
+    エンドポイントのクエリ数の上限を宣言する依存性を作成
+
+    上限は認証のユーザー検索（1回）を含むリクエスト全体のクエリ数。超過した場合の動作は
+    DATABASE_QUERY_BUDGET_MODE に従う（warn: ログに警告 / strict: 例外）
+
+    使用例:
+        @router.get("/...", dependencies=[Depends(query_budget(2))])
+
+    Args:
+        max_queries: クエリ数の上限
+
+    Returns:
+        Callable[[], Awaitable[None]]: 依存性注入関数
+    """
+
+    async def declare_query_budget() -> None:
+        set_query_budget(max_queries)
+
+    return declare_query_budget
+
+
+ReportServiceDep = Annotated[
+    AsyncPreviousDayReportService, Depends(get_previous_day_report_service)
+]
+UserServiceDep = Annotated[AsyncUserService, Depends(get_user_service)]
+AttendanceServiceDep = Annotated[AsyncAttendanceService, Depends(get_attendance_service)]
+UploadServiceDep = Annotated[AsyncUploadService, Depends(get_upload_service)]
+
 
 class CurrentUser:
     """現在のユーザー情報"""
 
-    def __init__(self, id: uuid.UUID, cognito_user_id: str, email: str, role: str = "staff"):
+    __slots__ = ("id", "cognito_user_id", "email", "role", "active")
+
+    def __init__(
+        self,
+        id: uuid.UUID,
+        cognito_user_id: str,
+        email: str,
+        role: str = "staff",
+        active: bool = True,
+    ):
         self.id = id
         self.cognito_user_id = cognito_user_id
         self.email = email
         self.role = role
+        self.active = active
 
 
 async def get_current_user(
+    request: Request,
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db: Annotated[Session, Depends(get_db)],
+    service: UserServiceDep,
 ) -> CurrentUser:
     """
     現在のユーザーを取得（Cognito JWT検証）
 
+    所要時間はリクエストの auth 段階として計測する（ユーザー検索のDBクエリを含む）。
+    書き込みのリクエスト（GET/HEAD/OPTIONS以外）では、書き込みの前にそのユーザーの読み出しを
+    一定期間プライマリで行うよう登録し、直後のGETがレプリカの遅延で古い値を返さないようにする
+
     Args:
+        request: リクエスト
         credentials: HTTPベアラートークン
-        db: データベースセッション
+        service: ユーザーサービス
 
     Returns:
         CurrentUser: 現在のユーザー情報
 
     Raises:
-        HTTPException: 認証情報が無効な場合
+        HTTPException: 認証情報が無効な場合、またはユーザーが無効化されている場合
     """
-    # Cognito設定が未設定の場合はスキップ（開発用）
-    if not settings.COGNITO_USER_POOL_ID or not settings.COGNITO_CLIENT_ID:
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Cognito認証が設定されていません。環境変数を確認してください。",
-        )
+    with phase("auth"):
+        # Cognito設定が未設定の場合はスキップ（開発用）
+        if not settings.COGNITO_USER_POOL_ID or not settings.COGNITO_CLIENT_ID:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Cognito認証が設定されていません。環境変数を確認してください。",
+            )
+
+        # JWTトークンを検証
+        token = credentials.credentials
+        payload = await cognito_verifier.verify_token(token)
 
-    # JWTトークンを検証
-    token = credentials.credentials
-    payload = cognito_verifier.verify_token(token)
-
-    # トークンからユーザー情報を取得
-    cognito_user_id = payload.get("sub")
-    email = payload.get("email")
-    name = payload.get("name", email)
-    cognito_groups = payload.get("cognito:groups", [])
-
-    # Cognitoグループからロールを判定
-    role = "staff"
-    if "manager" in cognito_groups:
-        role = "manager"
-    elif "staff" in cognito_groups:
+        # トークンからユーザー情報を取得
+        cognito_user_id = payload.get("sub")
+        email = payload.get("email")
+        name = payload.get("name", email)
+        cognito_groups = payload.get("cognito:groups", [])
+
+        # Cognitoグループからロールを判定
         role = "staff"
+        if "manager" in cognito_groups:
+            role = "manager"
+        elif "staff" in cognito_groups:
+            role = "staff"
 
-    if not cognito_user_id or not email:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="トークンに必要な情報が含まれていません",
-        )
+        if not cognito_user_id or not email:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="トークンに必要な情報が含まれていません",
+            )
 
-    # データベースからユーザーを取得または作成
-    service = UserService(db)
-    user = service.get_or_create_by_cognito_id(
-        cognito_user_id=cognito_user_id,
-        email=email,
-        name=name,
-        role=role,
-    )
+        # キャッシュ済みであればユーザー検索（DBアクセス）を省略
+        current_user, cache_token = identity_cache.get(cognito_user_id)
+        if current_user is None:
+            # データベースからユーザーを取得または作成
+            # （クエリ数の上限に含めるのは検索の1回。初回ログイン時の作成分は上限に加算する）
+            with query_allowance(1):
+                user = await service.get_or_create_by_cognito_id(
+                    cognito_user_id=cognito_user_id,
+                    email=email,
+                    name=name,
+                    role=role,
+                )
 
-    return CurrentUser(
-        id=user.id,
-        cognito_user_id=user.cognito_user_id,
-        email=user.email,
-        role=user.role,
-    )
+            current_user = CurrentUser(
+                id=user.id,
+                cognito_user_id=user.cognito_user_id,
+                email=user.email,
+                role=user.role,
+                active=user.active,
+            )
+            # 無効化されたユーザーもキャッシュし、拒否のたびのユーザー検索を省略する
+            # （無効化・有効化の更新時はキャッシュを削除する。検索中に削除された場合は保存しない）
+            identity_cache.set(cognito_user_id, current_user, cache_token)
+
+        if not current_user.active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="このユーザーは無効化されています",
+            )
+
+        if request.method not in SAFE_METHODS:
+            pin_primary(current_user.id)
+
+        return current_user
+
+
+async def get_current_manager(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+) -> CurrentUser:
+    """
+    現在のユーザーを取得（マネージャーのみ）
+
+    Args:
+        current_user: 現在のユーザー情報
+
+    Returns:
+        CurrentUser: 現在のユーザー情報
+
+    Raises:
+        HTTPException: マネージャーでない場合
+    """
+    if current_user.role != "manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="マネージャー権限が必要です",
+        )
+    return current_user
 
 
 # 開発用: ヘッダーから認証情報を取得（Cognito未設定時）
@@ -136,6 +318,115 @@ async def get_current_user_dev(
     )
 
 
+def get_read_session(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db=Depends(get_session),
+    replica=Depends(get_replica_session),
+):
+    """
+    読み出し専用のデータベースセッションを取得する依存性注入関数
+
+    レプリカが設定されている場合はレプリカのセッションを返す。ただし、書き込みから
+    DATABASE_REPLICA_PIN_SECONDS 以内のユーザーはプライマリのセッション（認証と共用）を返す
+
+    Args:
+        current_user: 現在のユーザー情報
+        db: プライマリのセッション
+        replica: レプリカのセッション（未設定の場合は None）
+
+    Returns:
+        AsyncSession | Session: データベースセッション
+    """
+    if replica is None or is_primary_pinned(current_user.id):
+        return db
+    return replica
+
+
+def get_previous_day_report_read_service(
+    db=Depends(get_read_session),
+) -> AsyncPreviousDayReportService:
+    """
+    読み出し用の前日報告サービスを取得する依存性注入関数（GETのエンドポイント用）
+
+    Args:
+        db: 読み出し専用のデータベースセッション
+
+    Returns:
+        AsyncPreviousDayReportService: 非同期インターフェースの前日報告サービス
+    """
+    if settings.DATABASE_ASYNC:
+        return AsyncPreviousDayReportService(db)
+    return ThreadPoolService(PreviousDayReportService(db))
+
+
+def get_user_read_service(db=Depends(get_read_session)) -> AsyncUserService:
+    """
+    読み出し用のユーザーサービスを取得する依存性注入関数（GETのエンドポイント用）
+
+    Args:
+        db: 読み出し専用のデータベースセッション
+
+    Returns:
+        AsyncUserService: 非同期インターフェースのユーザーサービス
+    """
+    if settings.DATABASE_ASYNC:
+        return AsyncUserService(db)
+    return ThreadPoolService(UserService(db))
+
+
+def get_attendance_read_service(db=Depends(get_read_session)) -> AsyncAttendanceService:
+    """
+    読み出し用の勤怠記録サービスを取得する依存性注入関数（GETのエンドポイント用）
+
+    Args:
+        db: 読み出し専用のデータベースセッション
+
+    Returns:
+        AsyncAttendanceService: 非同期インターフェースの勤怠記録サービス
+    """
+    if settings.DATABASE_ASYNC:
+        return AsyncAttendanceService(db)
+    return ThreadPoolService(AttendanceService(db))
+
+
+def get_dashboard_service(db=Depends(get_read_session)) -> AsyncDashboardService:
+    """
+    ダッシュボードサービスを取得する依存性注入関数
+
+    Args:
+        db: 読み出し専用のデータベースセッション
+
+    Returns:
+        AsyncDashboardService: 非同期インターフェースのダッシュボードサービス
+    """
+    if settings.DATABASE_ASYNC:
+        return AsyncDashboardService(db)
+    return ThreadPoolService(DashboardService(db))
+
+
+def get_export_service(db=Depends(get_read_session)) -> AsyncExportService:
+    """
+    エクスポートサービスを取得する依存性注入関数
+
+    Args:
+        db: 読み出し専用のデータベースセッション
+
+    Returns:
+        AsyncExportService: 非同期インターフェースのエクスポートサービス
+    """
+    if settings.DATABASE_ASYNC:
+        return AsyncExportService(db)
+    return ThreadPoolService(ExportService(db))
+
+
 # 依存性注入のエイリアス
 DBSession = Annotated[Session, Depends(get_db)]
 User = Annotated[CurrentUser, Depends(get_current_user)]
+Manager = Annotated[CurrentUser, Depends(get_current_manager)]
+ReportReadServiceDep = Annotated[
+    AsyncPreviousDayReportService, Depends(get_previous_day_report_read_service)
+]
+UserReadServiceDep = Annotated[AsyncUserService, Depends(get_user_read_service)]
+AttendanceReadServiceDep = Annotated[AsyncAttendanceService, Depends(get_attendance_read_service)]
+DashboardServiceDep = Annotated[AsyncDashboardService, Depends(get_dashboard_service)]
+ExportServiceDep = Annotated[AsyncExportService, Depends(get_export_service)]
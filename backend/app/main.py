@@ -1,11 +1,37 @@
 """
 FastAPIメインアプリケーション
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.routers import previous_day_reports, users
+from app.routers import (
+    attendance,
+    cache,
+    dashboard,
+    exports,
+    metrics,
+    previous_day_reports,
+    uploads,
+    users,
+)
+from app.services.photo_processing_service import shutdown_photo_processing
+from app.utils.serialization import JSONResponse
+from app.utils.timing import TimingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    アプリケーションの起動・終了処理
+
+    終了時は登録済みの写真の後処理の完了を待つ
+    """
+    yield
+    shutdown_photo_processing()
+
 
 # FastAPIアプリケーションの作成
 app = FastAPI(
@@ -14,6 +40,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=JSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS設定
@@ -23,11 +51,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
+# タイミング計測（最も外側で、CORSを含むリクエスト全体を計測）
+app.add_middleware(TimingMiddleware)
+
 # ルーターの登録
 app.include_router(users.router)
 app.include_router(previous_day_reports.router)
+app.include_router(attendance.router)
+app.include_router(dashboard.router)
+app.include_router(exports.router)
+app.include_router(uploads.router)
+app.include_router(cache.router)
+if metrics.metrics_enabled():
+    app.include_router(metrics.router)
 
 
 @app.get("/")
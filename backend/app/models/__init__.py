@@ -3,5 +3,7 @@
 """
 from app.models.user import User
 from app.models.previous_day_report import PreviousDayReport
+from app.models.daily_staff_summary import DailyStaffSummary
+from app.models.attendance import AttendanceRecord
 
-__all__ = ["User", "PreviousDayReport"]
+__all__ = ["User", "PreviousDayReport", "DailyStaffSummary", "AttendanceRecord"]
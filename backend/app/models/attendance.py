@@ -0,0 +1,83 @@
+"""
+勤怠記録モデル
+"""
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import CheckConstraint, Date, DateTime, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+# 勤怠ステータス（最初の段階の報告で partial、起床・出発・到着の3段階が揃うと complete）。
+# 行はその日の最初の報告で作成するため、未報告（pending）は行がないことで表す
+ATTENDANCE_STATUSES = ("partial", "complete")
+
+
+class AttendanceRecord(Base):
+    """
+    勤怠記録テーブル
+
+    1スタッフ1日1件。起床・出発・到着の各段階の報告は、行の作成と更新を
+    INSERT ... ON CONFLICT の1文で行い、ステータスもSQL内で決める
+    （app.repositories.attendance_repository）。
+    1行が朝に3回更新されるため、テーブルの fillfactor を下げてHOT更新にする（マイグレーション009）
+    """
+
+    __tablename__ = "attendance_records"
+    __table_args__ = (
+        # 1スタッフ1日1件（段階の報告の INSERT ... ON CONFLICT の競合判定にも使用）
+        UniqueConstraint("staff_id", "date", name="uq_attendance_staff_date"),
+        CheckConstraint(
+            f"status IN ({', '.join(repr(s) for s in ATTENDANCE_STATUSES)})",
+            name="chk_attendance_status",
+        ),
+    )
+
+    # 主キー
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # 外部キー
+    staff_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+
+    # 勤怠日付
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    # 起床
+    wake_up_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    wake_up_location: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    wake_up_notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # 出発
+    departure_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    departure_location: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    departure_notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    destination: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    # 到着
+    arrival_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    arrival_location: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    arrival_gps_location: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    arrival_notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # 写真URL
+    route_photo_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    appearance_photo_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    # ステータス・備考
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # タイムスタンプ
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=datetime.utcnow
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return f"<AttendanceRecord(id={self.id}, staff_id={self.staff_id}, date={self.date})>"
@@ -0,0 +1,48 @@
+"""
+日別スタッフ状況サマリーモデル
+"""
+import uuid
+from datetime import date, datetime, time
+
+from sqlalchemy import Date, DateTime, ForeignKey, Time
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class DailyStaffSummary(Base):
+    """
+    日別スタッフ状況サマリーテーブル
+
+    マネージャーダッシュボード用に、勤務日ごと・スタッフごとの報告状況を保持する。
+    前日報告の作成・更新・削除時に同じトランザクションで更新され、
+    ダッシュボードは報告履歴の件数によらずスタッフ数分の行だけを読む
+    """
+
+    __tablename__ = "daily_staff_summaries"
+
+    # 主キー（勤務日 + ユーザーID）
+    work_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    # 前日報告（勤務日の前日に報告されたもの）
+    previous_day_report_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    next_wake_up_time: Mapped[time | None] = mapped_column(Time, nullable=True)
+    next_departure_time: Mapped[time | None] = mapped_column(Time, nullable=True)
+    next_arrival_time: Mapped[time | None] = mapped_column(Time, nullable=True)
+    previous_day_reported_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    # タイムスタンプ
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return f"<DailyStaffSummary(work_date={self.work_date}, user_id={self.user_id})>"
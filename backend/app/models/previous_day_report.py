@@ -4,7 +4,17 @@
 import uuid
 from datetime import date, time, datetime
 
-from sqlalchemy import Column, String, Text, Date, Time, DateTime, ForeignKey
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    Date,
+    Time,
+    DateTime,
+    ForeignKey,
+    PrimaryKeyConstraint,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -12,14 +22,31 @@ from app.database import Base
 
 
 class PreviousDayReport(Base):
-    """前日報告テーブル"""
+    """
+    前日報告テーブル
+
+    報告日（report_date）の月単位でレンジパーティションに分割する。
+    パーティションテーブルの主キーにはパーティションキーを含める必要があるため、テーブルの
+    主キーは (id, report_date) とし、ORM上の識別子は id のみとする
+    （パーティションの作成・削除は scripts/manage_partitions.py で行う）
+    """
 
     __tablename__ = "previous_day_reports"
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "report_date", name="previous_day_reports_pkey"),
+        # 1ユーザー1日1件（INSERT ... ON CONFLICT の競合判定にも使用）。
+        # id, updated_at を含め、バージョンの確認をインデックスのみのスキャンで行う
+        UniqueConstraint(
+            "user_id",
+            "report_date",
+            name="uq_prev_reports_user_date",
+            postgresql_include=["id", "updated_at"],
+        ),
+        {"postgresql_partition_by": "RANGE (report_date)"},
+    )
 
     # 主キー
-    id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
-    )
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), default=uuid.uuid4)
 
     # 外部キー
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -38,6 +65,12 @@ class PreviousDayReport(Base):
     appearance_photo_url: Mapped[str] = mapped_column(String(500), nullable=False)
     route_photo_url: Mapped[str] = mapped_column(String(500), nullable=False)
 
+    # 写真の派生画像URL（WebP・EXIF除去済み。アップロード後の処理が完了するまではNULL）
+    appearance_thumbnail_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    appearance_preview_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    route_thumbnail_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    route_preview_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
     # 備考
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
@@ -58,7 +91,14 @@ class PreviousDayReport(Base):
 
     # リレーションシップ（必要に応じて後で追加）
     # user: Mapped["User"] = relationship(back_populates="previous_day_reports")
-    # actual_attendance_record: Mapped["AttendanceRecord"] = relationship(back_populates="previous_day_reports")
+    # actual_attendance_record: Mapped["AttendanceRecord"] = relationship(
+    #     back_populates="previous_day_reports"
+    # )
+
+    __mapper_args__ = {"primary_key": [id]}
 
     def __repr__(self) -> str:
-        return f"<PreviousDayReport(id={self.id}, user_id={self.user_id}, report_date={self.report_date})>"
+        return (
+            f"<PreviousDayReport(id={self.id}, user_id={self.user_id}, "
+            f"report_date={self.report_date})>"
+        )
@@ -1,6 +1,21 @@
 """
 リポジトリパッケージ
 """
-from app.repositories.previous_day_report_repository import PreviousDayReportRepository
+from app.repositories.attendance_repository import AsyncAttendanceRepository, AttendanceRepository
+from app.repositories.daily_staff_summary_repository import (
+    AsyncDailyStaffSummaryRepository,
+    DailyStaffSummaryRepository,
+)
+from app.repositories.previous_day_report_repository import (
+    AsyncPreviousDayReportRepository,
+    PreviousDayReportRepository,
+)
 
-__all__ = ["PreviousDayReportRepository"]
+__all__ = [
+    "PreviousDayReportRepository",
+    "AsyncPreviousDayReportRepository",
+    "DailyStaffSummaryRepository",
+    "AsyncDailyStaffSummaryRepository",
+    "AttendanceRepository",
+    "AsyncAttendanceRepository",
+]
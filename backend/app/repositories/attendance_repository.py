@@ -0,0 +1,263 @@
+"""
+勤怠記録リポジトリ
+"""
+import uuid
+from datetime import date
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Date, Insert, Select, and_, case, cast, desc, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.attendance import AttendanceRecord
+from app.schemas.attendance import AttendanceStage
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# 段階 → その段階の報告時刻の列（報告済みかの判定にも使う）
+STAGE_TIME_COLUMNS: dict[AttendanceStage, str] = {
+    "wake_up": "wake_up_time",
+    "departure": "departure_time",
+    "arrival": "arrival_time",
+}
+
+
+def _work_date():
+    """データベースの現在時刻から求めた勤怠日付（ATTENDANCE_TIMEZONE の日付）"""
+    return cast(func.timezone(settings.ATTENDANCE_TIMEZONE, func.now()), Date)
+
+
+def _record_stage(staff_id: uuid.UUID, stage: AttendanceStage, fields: dict[str, Any]) -> Insert:
+    """
+    当日の勤怠記録に段階の報告を書き込む1つのSQL文
+
+        INSERT INTO attendance_records (..., <段階>_time, status) VALUES (..., now(), 'partial')
+        ON CONFLICT (staff_id, date) DO UPDATE
+            SET <段階>_time = excluded.<段階>_time, ...,
+                status = CASE WHEN 全段階の時刻が揃う THEN 'complete' ELSE 'partial' END
+            WHERE attendance_records.<段階>_time IS NULL
+        RETURNING *
+
+    その日の最初の報告で行を作成し、以降の報告は同じ行を更新する（partial → complete）。
+    段階の順序は問わず、どの段階からでも報告できる（出発の前に到着を報告した場合も受け付け、
+    3段階の時刻が揃った時点で complete にする）。
+    ステータスは更新前の行と報告した段階からSQL内で決めるため、行を読み出してから書き込む必要がない。
+    同じ段階の報告が同時に届いた場合、後の文は先の文のコミットを待ってから WHERE を再評価し、
+    報告済みのため何も更新せず行を返さない（最初の報告の時刻・内容が残る）
+    """
+    table = AttendanceRecord.__table__
+    time_column = STAGE_TIME_COLUMNS[stage]
+    query = insert(AttendanceRecord).values(
+        id=uuid.uuid4(),
+        staff_id=staff_id,
+        date=_work_date(),
+        status="partial",
+        created_at=func.now(),
+        updated_at=func.now(),
+        **{time_column: func.now()},
+        **fields,
+    )
+    # 更新後の行で全段階の時刻が揃うか（報告した段階は excluded、それ以外は更新前の値）
+    complete = and_(
+        *(
+            func.coalesce(table.c[name], query.excluded[name]).is_not(None)
+            for name in STAGE_TIME_COLUMNS.values()
+        )
+    )
+    query = query.on_conflict_do_update(
+        index_elements=[AttendanceRecord.staff_id, AttendanceRecord.date],
+        set_={
+            time_column: query.excluded[time_column],
+            **{name: query.excluded[name] for name in fields},
+            "status": case((complete, literal("complete")), else_=literal("partial")),
+            "updated_at": func.now(),
+        },
+        where=table.c[time_column].is_(None),
+    )
+    return query.returning(AttendanceRecord)
+
+
+def _select_by_id(record_id: uuid.UUID) -> Select:
+    """IDで勤怠記録を取得するクエリ"""
+    return select(AttendanceRecord).where(AttendanceRecord.id == record_id)
+
+
+def _select_today_by_staff(staff_id: uuid.UUID) -> Select:
+    """スタッフの当日の勤怠記録を取得するクエリ（uq_attendance_staff_date を使用）"""
+    return select(AttendanceRecord).where(
+        AttendanceRecord.staff_id == staff_id, AttendanceRecord.date == _work_date()
+    )
+
+
+def _select_page_by_staff(
+    staff_id: uuid.UUID, limit: int, after: tuple[date, uuid.UUID] | None
+) -> Select:
+    """
+    スタッフの勤怠記録の1ページを勤怠日付の降順に取得するクエリ
+
+    after（前ページ最後の (date, id)）が指定された場合はキーセット方式で
+    それより後ろの行から取得する。スタッフ内で日付は一意のため、比較には日付のみを使う
+    （uq_attendance_staff_date の逆順スキャン）
+    """
+    query = (
+        select(AttendanceRecord)
+        .where(AttendanceRecord.staff_id == staff_id)
+        .order_by(desc(AttendanceRecord.date))
+        .limit(limit)
+    )
+    if after is not None:
+        work_date, _ = after
+        query = query.where(AttendanceRecord.date < literal(work_date, AttendanceRecord.date.type))
+    return query
+
+
+class AttendanceRepository:
+    """勤怠記録リポジトリ"""
+
+    def __init__(self, db: Session):
+        """
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+
+    def record_stage(
+        self, staff_id: uuid.UUID, stage: AttendanceStage, fields: dict[str, Any]
+    ) -> AttendanceRecord | None:
+        """
+        当日の勤怠記録に段階の報告を1つのSQL文で書き込む
+
+        Args:
+            staff_id: スタッフID
+            stage: 報告の段階
+            fields: その段階で書き込む列の値
+
+        Returns:
+            更新後の勤怠記録（その段階が報告済みの場合はNone）
+        """
+        return self.db.scalars(
+            _record_stage(staff_id, stage, fields),
+            execution_options={"populate_existing": True},
+        ).first()
+
+    def get_by_id(self, record_id: uuid.UUID) -> AttendanceRecord | None:
+        """
+        IDで勤怠記録を取得
+
+        Args:
+            record_id: 勤怠記録ID
+
+        Returns:
+            勤怠記録（存在しない場合はNone）
+        """
+        return self.db.scalars(_select_by_id(record_id)).first()
+
+    def get_today_by_staff(self, staff_id: uuid.UUID) -> AttendanceRecord | None:
+        """
+        スタッフの当日の勤怠記録を取得
+
+        Args:
+            staff_id: スタッフID
+
+        Returns:
+            勤怠記録（まだ報告がない場合はNone）
+        """
+        return self.db.scalars(_select_today_by_staff(staff_id)).first()
+
+    def get_by_staff(
+        self,
+        staff_id: uuid.UUID,
+        limit: int = 10,
+        after: tuple[date, uuid.UUID] | None = None,
+    ) -> list[AttendanceRecord]:
+        """
+        スタッフの勤怠記録一覧を取得
+
+        Args:
+            staff_id: スタッフID
+            limit: 取得件数
+            after: 前ページ最後の (date, id)（キーセットページネーション）
+
+        Returns:
+            勤怠記録リスト
+        """
+        return list(self.db.scalars(_select_page_by_staff(staff_id, limit, after)).all())
+
+
+class AsyncAttendanceRepository:
+    """勤怠記録リポジトリ（非同期）"""
+
+    def __init__(self, db: "AsyncSession"):
+        """
+        Args:
+            db: 非同期データベースセッション
+        """
+        self.db = db
+
+    async def record_stage(
+        self, staff_id: uuid.UUID, stage: AttendanceStage, fields: dict[str, Any]
+    ) -> AttendanceRecord | None:
+        """
+        当日の勤怠記録に段階の報告を1つのSQL文で書き込む
+
+        Args:
+            staff_id: スタッフID
+            stage: 報告の段階
+            fields: その段階で書き込む列の値
+
+        Returns:
+            更新後の勤怠記録（その段階が報告済みの場合はNone）
+        """
+        result = await self.db.scalars(
+            _record_stage(staff_id, stage, fields),
+            execution_options={"populate_existing": True},
+        )
+        return result.first()
+
+    async def get_by_id(self, record_id: uuid.UUID) -> AttendanceRecord | None:
+        """
+        IDで勤怠記録を取得
+
+        Args:
+            record_id: 勤怠記録ID
+
+        Returns:
+            勤怠記録（存在しない場合はNone）
+        """
+        result = await self.db.scalars(_select_by_id(record_id))
+        return result.first()
+
+    async def get_today_by_staff(self, staff_id: uuid.UUID) -> AttendanceRecord | None:
+        """
+        スタッフの当日の勤怠記録を取得
+
+        Args:
+            staff_id: スタッフID
+
+        Returns:
+            勤怠記録（まだ報告がない場合はNone）
+        """
+        result = await self.db.scalars(_select_today_by_staff(staff_id))
+        return result.first()
+
+    async def get_by_staff(
+        self,
+        staff_id: uuid.UUID,
+        limit: int = 10,
+        after: tuple[date, uuid.UUID] | None = None,
+    ) -> list[AttendanceRecord]:
+        """
+        スタッフの勤怠記録一覧を取得
+
+        Args:
+            staff_id: スタッフID
+            limit: 取得件数
+            after: 前ページ最後の (date, id)（キーセットページネーション）
+
+        Returns:
+            勤怠記録リスト
+        """
+        result = await self.db.scalars(_select_page_by_staff(staff_id, limit, after))
+        return list(result.all())
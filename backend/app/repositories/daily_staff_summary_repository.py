@@ -0,0 +1,253 @@
+"""
+日別スタッフ状況サマリーリポジトリ
+"""
+import uuid
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from sqlalchemy import FromClause, Select, Update, and_, func, select, update
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models.daily_staff_summary import DailyStaffSummary
+from app.models.previous_day_report import PreviousDayReport
+from app.models.user import User
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def work_date_for(report_date: date) -> date:
+    """前日報告の報告日から対象の勤務日（翌日）を求める"""
+    return report_date + timedelta(days=1)
+
+
+def report_date_for(work_date: date) -> date:
+    """勤務日から対象の前日報告の報告日（前日）を求める"""
+    return work_date - timedelta(days=1)
+
+
+# サマリーのうち前日報告から作成する列
+_PREVIOUS_DAY_REPORT_COLUMNS = (
+    "previous_day_report_id",
+    "next_wake_up_time",
+    "next_departure_time",
+    "next_arrival_time",
+    "previous_day_reported_at",
+)
+
+
+def _on_conflict_update_report_columns(query: Insert) -> Insert:
+    """既存のサマリー行がある場合は前日報告の列のみ上書きする"""
+    return query.on_conflict_do_update(
+        index_elements=[DailyStaffSummary.work_date, DailyStaffSummary.user_id],
+        set_={
+            **{name: query.excluded[name] for name in _PREVIOUS_DAY_REPORT_COLUMNS},
+            "updated_at": func.now(),
+        },
+    )
+
+
+def _upsert_previous_day_report(report: PreviousDayReport) -> Insert:
+    """前日報告の内容をサマリーに反映するクエリ（行がなければ作成）"""
+    query = insert(DailyStaffSummary).values(
+        work_date=work_date_for(report.report_date),
+        user_id=report.user_id,
+        previous_day_report_id=report.id,
+        next_wake_up_time=report.next_wake_up_time,
+        next_departure_time=report.next_departure_time,
+        next_arrival_time=report.next_arrival_time,
+        previous_day_reported_at=report.created_at,
+    )
+    return _on_conflict_update_report_columns(query)
+
+
+def upsert_previous_day_reports_from(reports: FromClause) -> Insert:
+    """
+    前日報告の行（テーブル・CTE等）の内容をサマリーに反映するクエリ
+
+    INSERT ... RETURNING のCTEと組み合わせ、前日報告の書き込みと
+    サマリーの更新を1つのSQL文で行うために使う
+
+    Args:
+        reports: previous_day_reports と同じ列を持つFROM句
+
+    Returns:
+        Insert: サマリーへの INSERT ... ON CONFLICT DO UPDATE
+    """
+    query = insert(DailyStaffSummary).from_select(
+        ["work_date", "user_id", *_PREVIOUS_DAY_REPORT_COLUMNS, "updated_at"],
+        select(
+            reports.c.report_date + 1,
+            reports.c.user_id,
+            reports.c.id,
+            reports.c.next_wake_up_time,
+            reports.c.next_departure_time,
+            reports.c.next_arrival_time,
+            reports.c.created_at,
+            func.now(),
+        ),
+    )
+    return _on_conflict_update_report_columns(query)
+
+
+def _clear_previous_day_report(
+    report_id: uuid.UUID, user_id: uuid.UUID, report_date: date
+) -> Update:
+    """
+    サマリーから前日報告の内容を取り除くクエリ
+
+    行は削除せず前日報告の列のみNULLにする（他の報告状況を保持するため）
+    """
+    return (
+        update(DailyStaffSummary)
+        .where(
+            and_(
+                DailyStaffSummary.work_date == work_date_for(report_date),
+                DailyStaffSummary.user_id == user_id,
+                DailyStaffSummary.previous_day_report_id == report_id,
+            )
+        )
+        .values(
+            previous_day_report_id=None,
+            next_wake_up_time=None,
+            next_departure_time=None,
+            next_arrival_time=None,
+            previous_day_reported_at=None,
+            updated_at=func.now(),
+        )
+    )
+
+
+def _select_dashboard(work_date: date) -> Select:
+    """
+    勤務日の全アクティブスタッフと報告状況を取得するクエリ（1クエリ・スタッフ数分の行）
+
+    写真のサムネイルURLのみ前日報告を主キーで結合して取得する
+    （派生画像は報告後に非同期で作成されるため、サマリーには持たない）。
+    前日報告は報告日でパーティションに分割しているため、勤務日の前日の報告日も条件に含め、
+    1つのパーティションのみを検索する
+    """
+    return (
+        select(
+            User.id.label("user_id"),
+            User.name,
+            User.email,
+            User.phone,
+            DailyStaffSummary.previous_day_report_id,
+            DailyStaffSummary.next_wake_up_time,
+            DailyStaffSummary.next_departure_time,
+            DailyStaffSummary.next_arrival_time,
+            DailyStaffSummary.previous_day_reported_at,
+            PreviousDayReport.appearance_thumbnail_url,
+            PreviousDayReport.route_thumbnail_url,
+        )
+        .outerjoin(
+            DailyStaffSummary,
+            and_(
+                DailyStaffSummary.user_id == User.id,
+                DailyStaffSummary.work_date == work_date,
+            ),
+        )
+        .outerjoin(
+            PreviousDayReport,
+            and_(
+                PreviousDayReport.id == DailyStaffSummary.previous_day_report_id,
+                PreviousDayReport.report_date == report_date_for(work_date),
+            ),
+        )
+        .where(User.role == "staff", User.active == True)  # noqa: E712
+        .order_by(User.name, User.id)
+    )
+
+
+class DailyStaffSummaryRepository:
+    """日別スタッフ状況サマリーリポジトリ"""
+
+    def __init__(self, db: Session):
+        """
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+
+    def record_previous_day_report(self, report: PreviousDayReport) -> None:
+        """
+        前日報告の内容をサマリーに反映
+
+        Args:
+            report: 作成・更新された前日報告（flush済み）
+        """
+        self.db.execute(_upsert_previous_day_report(report))
+
+    def clear_previous_day_report(
+        self, report_id: uuid.UUID, user_id: uuid.UUID, report_date: date
+    ) -> None:
+        """
+        サマリーから前日報告の内容を取り除く
+
+        Args:
+            report_id: 前日報告ID
+            user_id: ユーザーID
+            report_date: 報告日
+        """
+        self.db.execute(_clear_previous_day_report(report_id, user_id, report_date))
+
+    def get_dashboard(self, work_date: date) -> list[Row]:
+        """
+        勤務日の全アクティブスタッフと報告状況を取得
+
+        Args:
+            work_date: 勤務日
+
+        Returns:
+            スタッフごとの報告状況（報告がない場合、報告列はNone）
+        """
+        return list(self.db.execute(_select_dashboard(work_date)).all())
+
+
+class AsyncDailyStaffSummaryRepository:
+    """日別スタッフ状況サマリーリポジトリ（非同期）"""
+
+    def __init__(self, db: "AsyncSession"):
+        """
+        Args:
+            db: 非同期データベースセッション
+        """
+        self.db = db
+
+    async def record_previous_day_report(self, report: PreviousDayReport) -> None:
+        """
+        前日報告の内容をサマリーに反映
+
+        Args:
+            report: 作成・更新された前日報告（flush済み）
+        """
+        await self.db.execute(_upsert_previous_day_report(report))
+
+    async def clear_previous_day_report(
+        self, report_id: uuid.UUID, user_id: uuid.UUID, report_date: date
+    ) -> None:
+        """
+        サマリーから前日報告の内容を取り除く
+
+        Args:
+            report_id: 前日報告ID
+            user_id: ユーザーID
+            report_date: 報告日
+        """
+        await self.db.execute(_clear_previous_day_report(report_id, user_id, report_date))
+
+    async def get_dashboard(self, work_date: date) -> list[Row]:
+        """
+        勤務日の全アクティブスタッフと報告状況を取得
+
+        Args:
+            work_date: 勤務日
+
+        Returns:
+            スタッフごとの報告状況（報告がない場合、報告列はNone）
+        """
+        result = await self.db.execute(_select_dashboard(work_date))
+        return list(result.all())
@@ -2,13 +2,352 @@
 前日報告リポジトリ
 """
 import uuid
-from datetime import date
+from datetime import date, datetime
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, Sequence
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy import (
+    Delete,
+    Select,
+    Update,
+    and_,
+    case,
+    delete,
+    desc,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, aliased
 
 from app.models.previous_day_report import PreviousDayReport
-from app.schemas.previous_day_report import PreviousDayReportCreate, PreviousDayReportUpdate
+from app.models.user import User
+from app.repositories.daily_staff_summary_repository import upsert_previous_day_reports_from
+from app.schemas.previous_day_report import (
+    ConflictMode,
+    PreviousDayReportCreate,
+    PreviousDayReportUpdate,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# エクスポート時にサーバーサイドカーソルから1回に取得する行数
+EXPORT_BATCH_SIZE = 2000
+
+# 写真URLの列 → その写真の派生画像URLの列（写真が差し替えられた場合はNULLに戻す）
+DERIVED_PHOTO_COLUMNS: dict[str, tuple[str, ...]] = {
+    "appearance_photo_url": ("appearance_thumbnail_url", "appearance_preview_url"),
+    "route_photo_url": ("route_thumbnail_url", "route_preview_url"),
+}
+
+
+def _select_by_id(report_id: uuid.UUID) -> Select:
+    """IDで前日報告を取得するクエリ"""
+    return select(PreviousDayReport).where(PreviousDayReport.id == report_id)
+
+
+def _select_by_user_and_date(user_id: uuid.UUID, report_date: date) -> Select:
+    """ユーザーIDと報告日で前日報告を取得するクエリ"""
+    return select(PreviousDayReport).where(
+        and_(
+            PreviousDayReport.user_id == user_id,
+            PreviousDayReport.report_date == report_date,
+        )
+    )
+
+
+def _select_by_user(user_id: uuid.UUID) -> Select:
+    """
+    ユーザーIDで前日報告を報告日の降順に取得するクエリ
+
+    (user_id, report_date) は一意のため、報告日のみで順序が決まる
+    （uq_prev_reports_user_date の逆順スキャンで並べ替えが不要）
+    """
+    return (
+        select(PreviousDayReport)
+        .where(PreviousDayReport.user_id == user_id)
+        .order_by(desc(PreviousDayReport.report_date))
+    )
+
+
+def _select_version_by_id(report_id: uuid.UUID) -> Select:
+    """前日報告のバージョン（id, user_id, updated_at）のみを取得するクエリ"""
+    return select(
+        PreviousDayReport.id, PreviousDayReport.user_id, PreviousDayReport.updated_at
+    ).where(PreviousDayReport.id == report_id)
+
+
+def _select_latest_version_by_user(user_id: uuid.UUID) -> Select:
+    """
+    最新の前日報告のバージョン（id, updated_at）のみを取得するクエリ
+
+    id, updated_at は uq_prev_reports_user_date に含まれるため、テーブルを読まない
+    """
+    return (
+        select(PreviousDayReport.id, PreviousDayReport.updated_at)
+        .where(PreviousDayReport.user_id == user_id)
+        .order_by(desc(PreviousDayReport.report_date))
+        .limit(1)
+    )
+
+
+def _select_collection_version_by_user(user_id: uuid.UUID) -> Select:
+    """
+    ユーザーの前日報告全体のバージョン（件数, 最大の updated_at）を取得するクエリ
+
+    件数を含めるため、削除（最大の updated_at が変わらない）も検出できる
+    """
+    return select(
+        func.count().label("count"), func.max(PreviousDayReport.updated_at).label("updated_at")
+    ).where(PreviousDayReport.user_id == user_id)
+
+
+def _select_page_by_user(
+    user_id: uuid.UUID,
+    limit: int,
+    offset: int,
+    after: tuple[date, uuid.UUID] | None,
+) -> Select:
+    """
+    ユーザーIDで前日報告の1ページを取得するクエリ
+
+    after（前ページ最後の (report_date, id)）が指定された場合はキーセット方式で
+    それより後ろの行から取得し、offset は使用しない
+    （uq_prev_reports_user_date のインデックスを使うため、深いページでも行を読み飛ばさない）。
+    ユーザー内で報告日は一意のため、比較には報告日のみを使う
+    （id はカーソルの互換性のために受け取る）
+    """
+    query = _select_by_user(user_id).limit(limit)
+    if after is not None:
+        report_date, _ = after
+        return query.where(
+            PreviousDayReport.report_date < literal(report_date, PreviousDayReport.report_date.type)
+        )
+    return query.offset(offset)
+
+
+def _select_photos_by_id(report_id: uuid.UUID) -> Select:
+    """前日報告の写真URLと派生画像URLのみを取得するクエリ"""
+    table = PreviousDayReport.__table__
+    return select(
+        table.c.id,
+        table.c.user_id,
+        *(
+            table.c[name]
+            for photo, derived in DERIVED_PHOTO_COLUMNS.items()
+            for name in (photo, *derived)
+        ),
+    ).where(table.c.id == report_id)
+
+
+def _select_pending_photo_ids(
+    url_prefix: str, after: uuid.UUID | None, limit: int
+) -> Select:
+    """
+    派生画像が未作成の写真を持つ前日報告のIDをID順に取得するクエリ
+
+    写真用バケットのURL（url_prefix で始まるもの）のみを対象とし、
+    after（前バッチ最後のID）より後ろから limit 件を取得する
+    """
+    table = PreviousDayReport.__table__
+    query = (
+        select(table.c.id)
+        .where(
+            or_(
+                *(
+                    and_(
+                        table.c[photo].startswith(url_prefix, autoescape=True),
+                        table.c[derived[0]].is_(None),
+                    )
+                    for photo, derived in DERIVED_PHOTO_COLUMNS.items()
+                )
+            )
+        )
+        .order_by(table.c.id)
+        .limit(limit)
+    )
+    if after is not None:
+        query = query.where(table.c.id > literal(after, table.c.id.type))
+    return query
+
+
+def _update_derived_photo_urls(
+    report_id: uuid.UUID, photo_column: str, photo_url: str, values: dict[str, str]
+) -> Update:
+    """
+    写真の派生画像URLを記録するクエリ（写真が処理中に差し替えられていない場合のみ）
+
+    ETagや読み出しキャッシュのバージョンが変わるよう updated_at も更新し、user_id を返す
+    """
+    table = PreviousDayReport.__table__
+    return (
+        update(table)
+        .where(table.c.id == report_id, table.c[photo_column] == photo_url)
+        .values(**values, updated_at=func.now())
+        .returning(table.c.user_id)
+    )
+
+
+def _select_for_export(
+    date_from: date | None, date_to: date | None, user_id: uuid.UUID | None
+) -> Select:
+    """
+    エクスポート対象の前日報告をスタッフ情報付きで取得するクエリ
+
+    ORMオブジェクトを作らないよう列単位で取得し、報告日・スタッフ順に並べる
+    """
+    query = (
+        select(
+            PreviousDayReport.id,
+            PreviousDayReport.report_date,
+            PreviousDayReport.user_id,
+            User.name,
+            User.email,
+            PreviousDayReport.next_wake_up_time,
+            PreviousDayReport.next_departure_time,
+            PreviousDayReport.next_arrival_time,
+            PreviousDayReport.appearance_photo_url,
+            PreviousDayReport.route_photo_url,
+            PreviousDayReport.notes,
+            PreviousDayReport.created_at,
+            PreviousDayReport.updated_at,
+        )
+        .join(User, User.id == PreviousDayReport.user_id)
+        .order_by(PreviousDayReport.report_date, PreviousDayReport.user_id)
+    )
+    if date_from is not None:
+        query = query.where(PreviousDayReport.report_date >= date_from)
+    if date_to is not None:
+        query = query.where(PreviousDayReport.report_date <= date_to)
+    if user_id is not None:
+        query = query.where(PreviousDayReport.user_id == user_id)
+    return query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def _in_report_dates(lower: date, upper: date):
+    """報告日が [lower, upper) の範囲の条件（月の範囲を指定すると1パーティションのみを検索）"""
+    return and_(PreviousDayReport.report_date >= lower, PreviousDayReport.report_date < upper)
+
+
+def _select_oldest_report_date() -> Select:
+    """最も古い報告日を取得するクエリ"""
+    return select(func.min(PreviousDayReport.report_date))
+
+
+def _count_between(lower: date, upper: date) -> Select:
+    """報告日が [lower, upper) の前日報告の件数を取得するクエリ"""
+    return select(func.count()).select_from(PreviousDayReport).where(_in_report_dates(lower, upper))
+
+
+def _select_archive_batch(
+    lower: date, upper: date, after: uuid.UUID | None, limit: int
+) -> Select:
+    """
+    報告日が [lower, upper) の前日報告の全列をID順に limit 件取得するクエリ
+
+    after（前バッチ最後のID）より後ろから取得する（主キー (id, report_date) のインデックスを使う）
+    """
+    table = PreviousDayReport.__table__
+    query = select(table).where(_in_report_dates(lower, upper)).order_by(table.c.id).limit(limit)
+    if after is not None:
+        query = query.where(table.c.id > literal(after, table.c.id.type))
+    return query
+
+
+def _delete_archived(
+    lower: date, upper: date, keys: Sequence[tuple[uuid.UUID, datetime]]
+) -> Delete:
+    """
+    アーカイブした前日報告を削除するクエリ
+
+    (id, updated_at) が一致する行のみを削除し、アーカイブ後に更新された行は残す
+    """
+    return delete(PreviousDayReport).where(
+        _in_report_dates(lower, upper),
+        tuple_(PreviousDayReport.id, PreviousDayReport.updated_at).in_(keys),
+    )
+
+
+def _insert_report(
+    user_id: uuid.UUID, data: PreviousDayReportCreate, on_conflict: ConflictMode
+) -> Select:
+    """
+    前日報告を書き込み、日別スタッフ状況サマリーも更新する1つのSQL文
+
+        WITH written AS (
+            INSERT INTO previous_day_reports ... ON CONFLICT (user_id, report_date)
+            DO NOTHING | DO UPDATE ... RETURNING *
+        ), summary AS (
+            INSERT INTO daily_staff_summaries SELECT ... FROM written ON CONFLICT ...
+        )
+        SELECT *, id = :new_id AS inserted FROM written
+
+    競合判定は一意制約 uq_prev_reports_user_date で行うため、同時に送信されても重複しない。
+    reject で競合した場合は行を返さない。inserted は新規作成時にTrue（更新時はFalse）。
+    更新時は id を変更しないため、返された id が作成しようとした id と一致するかで判定する
+    （パーティションテーブルでは RETURNING でシステム列 xmax を参照できない）
+    """
+    fields = data.model_dump()
+    new_id = uuid.uuid4()
+    query = insert(PreviousDayReport).values(
+        id=new_id,
+        user_id=user_id,
+        created_at=func.now(),
+        updated_at=func.now(),
+        **fields,
+    )
+    conflict_target = [PreviousDayReport.user_id, PreviousDayReport.report_date]
+    if on_conflict == "upsert":
+        table = PreviousDayReport.__table__
+        query = query.on_conflict_do_update(
+            index_elements=conflict_target,
+            set_={
+                **{name: query.excluded[name] for name in fields},
+                # 写真が差し替えられた場合は派生画像を作り直す
+                **{
+                    name: case(
+                        (table.c[photo] == query.excluded[photo], table.c[name]), else_=null()
+                    )
+                    for photo, derived in DERIVED_PHOTO_COLUMNS.items()
+                    for name in derived
+                },
+                "updated_at": func.now(),
+            },
+        )
+    else:
+        query = query.on_conflict_do_nothing(index_elements=conflict_target)
+
+    written = query.returning(*PreviousDayReport.__table__.c).cte("written")
+    summary = upsert_previous_day_reports_from(written).cte("summary")
+
+    report = aliased(PreviousDayReport, written)
+    inserted = written.c.id == literal(new_id, PreviousDayReport.id.type)
+    return (
+        select(report, inserted.label("inserted"))
+        .add_cte(summary)
+        .execution_options(populate_existing=True)
+    )
+
+
+def _apply_update(report: PreviousDayReport, data: PreviousDayReportUpdate) -> None:
+    """
+    更新データ（設定された項目のみ）を前日報告に反映する
+
+    写真が差し替えられた場合は派生画像URLをNULLに戻す
+    """
+    update_data = data.model_dump(exclude_unset=True)
+    for photo, derived in DERIVED_PHOTO_COLUMNS.items():
+        if photo in update_data and update_data[photo] != getattr(report, photo):
+            for name in derived:
+                setattr(report, name, None)
+    for key, value in update_data.items():
+        setattr(report, key, value)
 
 
 class PreviousDayReportRepository:
@@ -21,32 +360,29 @@ class PreviousDayReportRepository:
         """
         self.db = db
 
-    def create(
-        self, user_id: uuid.UUID, data: PreviousDayReportCreate
-    ) -> PreviousDayReport:
+    def insert(
+        self,
+        user_id: uuid.UUID,
+        data: PreviousDayReportCreate,
+        on_conflict: ConflictMode = "reject",
+    ) -> tuple[PreviousDayReport | None, bool]:
         """
-        前日報告を作成
+        前日報告を1つのSQL文で作成（または上書き）
+
+        日別スタッフ状況サマリーも同じSQL文で更新する
 
         Args:
             user_id: ユーザーID
             data: 前日報告作成データ
+            on_conflict: 同じ報告日の前日報告が存在する場合の動作（reject / upsert）
 
         Returns:
-            作成された前日報告
+            (前日報告, 新規作成したか)。reject で競合した場合は (None, False)
         """
-        report = PreviousDayReport(
-            user_id=user_id,
-            report_date=data.report_date,
-            next_wake_up_time=data.next_wake_up_time,
-            next_departure_time=data.next_departure_time,
-            next_arrival_time=data.next_arrival_time,
-            appearance_photo_url=data.appearance_photo_url,
-            route_photo_url=data.route_photo_url,
-            notes=data.notes,
-        )
-        self.db.add(report)
-        self.db.flush()
-        return report
+        row = self.db.execute(_insert_report(user_id, data, on_conflict)).first()
+        if row is None:
+            return None, False
+        return row[0], row.inserted
 
     def get_by_id(self, report_id: uuid.UUID) -> PreviousDayReport | None:
         """
@@ -58,11 +394,7 @@ class PreviousDayReportRepository:
         Returns:
             前日報告（存在しない場合はNone）
         """
-        return (
-            self.db.query(PreviousDayReport)
-            .filter(PreviousDayReport.id == report_id)
-            .first()
-        )
+        return self.db.scalars(_select_by_id(report_id)).first()
 
     def get_by_user_and_date(
         self, user_id: uuid.UUID, report_date: date
@@ -77,19 +409,14 @@ class PreviousDayReportRepository:
         Returns:
             前日報告（存在しない場合はNone）
         """
-        return (
-            self.db.query(PreviousDayReport)
-            .filter(
-                and_(
-                    PreviousDayReport.user_id == user_id,
-                    PreviousDayReport.report_date == report_date,
-                )
-            )
-            .first()
-        )
+        return self.db.scalars(_select_by_user_and_date(user_id, report_date)).first()
 
     def get_by_user(
-        self, user_id: uuid.UUID, limit: int = 10, offset: int = 0
+        self,
+        user_id: uuid.UUID,
+        limit: int = 10,
+        offset: int = 0,
+        after: tuple[date, uuid.UUID] | None = None,
     ) -> list[PreviousDayReport]:
         """
         ユーザーIDで前日報告一覧を取得
@@ -97,19 +424,14 @@ class PreviousDayReportRepository:
         Args:
             user_id: ユーザーID
             limit: 取得件数
-            offset: オフセット
+            offset: オフセット（after指定時は無視）
+            after: 前ページ最後の (report_date, id)（キーセットページネーション）
 
         Returns:
             前日報告リスト
         """
-        return (
-            self.db.query(PreviousDayReport)
-            .filter(PreviousDayReport.user_id == user_id)
-            .order_by(desc(PreviousDayReport.report_date))
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
+        query = _select_page_by_user(user_id, limit, offset, after)
+        return list(self.db.scalars(query).all())
 
     def get_latest_by_user(self, user_id: uuid.UUID) -> PreviousDayReport | None:
         """
@@ -121,12 +443,167 @@ class PreviousDayReportRepository:
         Returns:
             最新の前日報告（存在しない場合はNone）
         """
-        return (
-            self.db.query(PreviousDayReport)
-            .filter(PreviousDayReport.user_id == user_id)
-            .order_by(desc(PreviousDayReport.report_date))
-            .first()
-        )
+        return self.db.scalars(_select_by_user(user_id).limit(1)).first()
+
+    def get_version_by_id(self, report_id: uuid.UUID) -> Row | None:
+        """
+        IDで前日報告のバージョンを取得（本文の列は読まない）
+
+        Args:
+            report_id: 前日報告ID
+
+        Returns:
+            (id, user_id, updated_at)（存在しない場合はNone）
+        """
+        return self.db.execute(_select_version_by_id(report_id)).first()
+
+    def get_latest_version_by_user(self, user_id: uuid.UUID) -> Row | None:
+        """
+        ユーザーIDで最新の前日報告のバージョンを取得
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            (id, updated_at)（存在しない場合はNone）
+        """
+        return self.db.execute(_select_latest_version_by_user(user_id)).first()
+
+    def get_collection_version_by_user(self, user_id: uuid.UUID) -> Row:
+        """
+        ユーザーの前日報告全体のバージョンを取得
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            (count, updated_at)
+        """
+        return self.db.execute(_select_collection_version_by_user(user_id)).one()
+
+    def stream_for_export(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        user_id: uuid.UUID | None = None,
+    ) -> Iterator[Sequence[Row]]:
+        """
+        エクスポート対象の前日報告をサーバーサイドカーソルで取得
+
+        クエリは呼び出し時に実行し、行は EXPORT_BATCH_SIZE 件ずつ取り出すため、
+        件数によらずメモリ使用量は一定となる
+
+        Args:
+            date_from: 報告日の開始日（含む）
+            date_to: 報告日の終了日（含む）
+            user_id: スタッフのユーザーID
+
+        Returns:
+            行のバッチのイテレーター
+        """
+        result = self.db.execute(_select_for_export(date_from, date_to, user_id))
+        return result.partitions()
+
+    def get_photos(self, report_id: uuid.UUID) -> Row | None:
+        """
+        前日報告の写真URLと派生画像URLを取得
+
+        Args:
+            report_id: 前日報告ID
+
+        Returns:
+            (id, user_id, 写真URL・派生画像URLの各列)（存在しない場合はNone）
+        """
+        return self.db.execute(_select_photos_by_id(report_id)).first()
+
+    def get_pending_photo_ids(
+        self, url_prefix: str, after: uuid.UUID | None = None, limit: int = 100
+    ) -> list[uuid.UUID]:
+        """
+        派生画像が未作成の写真を持つ前日報告のIDを取得
+
+        Args:
+            url_prefix: 写真用バケットのURLの接頭辞
+            after: 前バッチ最後のID（キーセットページネーション）
+            limit: 取得件数
+
+        Returns:
+            前日報告IDのリスト（ID順）
+        """
+        return list(self.db.scalars(_select_pending_photo_ids(url_prefix, after, limit)).all())
+
+    def set_derived_photo_urls(
+        self, report_id: uuid.UUID, photo_column: str, photo_url: str, values: dict[str, str]
+    ) -> uuid.UUID | None:
+        """
+        写真の派生画像URLを記録
+
+        Args:
+            report_id: 前日報告ID
+            photo_column: 写真URLの列名
+            photo_url: 派生画像の元にした写真URL（差し替えられていた場合は記録しない）
+            values: 派生画像URLの列名 → URL
+
+        Returns:
+            記録した前日報告のユーザーID（削除・差し替えられていた場合はNone）
+        """
+        query = _update_derived_photo_urls(report_id, photo_column, photo_url, values)
+        return self.db.execute(query).scalar()
+
+    def get_oldest_report_date(self) -> date | None:
+        """
+        最も古い報告日を取得
+
+        Returns:
+            最も古い報告日（前日報告がない場合はNone）
+        """
+        return self.db.scalar(_select_oldest_report_date())
+
+    def count_between(self, lower: date, upper: date) -> int:
+        """
+        報告日が [lower, upper) の前日報告の件数を取得
+
+        Args:
+            lower: 報告日の開始日（含む）
+            upper: 報告日の終了日（含まない）
+
+        Returns:
+            件数
+        """
+        return self.db.scalar(_count_between(lower, upper))
+
+    def get_archive_batch(
+        self, lower: date, upper: date, after: uuid.UUID | None = None, limit: int = 1000
+    ) -> list[Row]:
+        """
+        アーカイブ対象の前日報告（全列）をID順に取得
+
+        Args:
+            lower: 報告日の開始日（含む）
+            upper: 報告日の終了日（含まない）
+            after: 前バッチ最後のID（キーセットページネーション）
+            limit: 取得件数
+
+        Returns:
+            前日報告の行のリスト（ID順）
+        """
+        return list(self.db.execute(_select_archive_batch(lower, upper, after, limit)).all())
+
+    def delete_archived(
+        self, lower: date, upper: date, keys: Sequence[tuple[uuid.UUID, datetime]]
+    ) -> int:
+        """
+        アーカイブした前日報告を削除（アーカイブ後に更新された行は削除しない）
+
+        Args:
+            lower: 報告日の開始日（含む）
+            upper: 報告日の終了日（含まない）
+            keys: アーカイブした行の (id, updated_at)
+
+        Returns:
+            削除した件数
+        """
+        return self.db.execute(_delete_archived(lower, upper, keys)).rowcount
 
     def update(
         self, report: PreviousDayReport, data: PreviousDayReportUpdate
@@ -141,10 +618,7 @@ class PreviousDayReportRepository:
         Returns:
             更新された前日報告
         """
-        update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(report, key, value)
-
+        _apply_update(report, data)
         self.db.flush()
         return report
 
@@ -157,3 +631,298 @@ class PreviousDayReportRepository:
         """
         self.db.delete(report)
         self.db.flush()
+
+
+class AsyncPreviousDayReportRepository:
+    """前日報告リポジトリ（非同期）"""
+
+    def __init__(self, db: "AsyncSession"):
+        """
+        Args:
+            db: 非同期データベースセッション
+        """
+        self.db = db
+
+    async def insert(
+        self,
+        user_id: uuid.UUID,
+        data: PreviousDayReportCreate,
+        on_conflict: ConflictMode = "reject",
+    ) -> tuple[PreviousDayReport | None, bool]:
+        """
+        前日報告を1つのSQL文で作成（または上書き）
+
+        日別スタッフ状況サマリーも同じSQL文で更新する
+
+        Args:
+            user_id: ユーザーID
+            data: 前日報告作成データ
+            on_conflict: 同じ報告日の前日報告が存在する場合の動作（reject / upsert）
+
+        Returns:
+            (前日報告, 新規作成したか)。reject で競合した場合は (None, False)
+        """
+        result = await self.db.execute(_insert_report(user_id, data, on_conflict))
+        row = result.first()
+        if row is None:
+            return None, False
+        return row[0], row.inserted
+
+    async def get_by_id(self, report_id: uuid.UUID) -> PreviousDayReport | None:
+        """
+        IDで前日報告を取得
+
+        Args:
+            report_id: 前日報告ID
+
+        Returns:
+            前日報告（存在しない場合はNone）
+        """
+        result = await self.db.scalars(_select_by_id(report_id))
+        return result.first()
+
+    async def get_by_user_and_date(
+        self, user_id: uuid.UUID, report_date: date
+    ) -> PreviousDayReport | None:
+        """
+        ユーザーIDと報告日で前日報告を取得
+
+        Args:
+            user_id: ユーザーID
+            report_date: 報告日
+
+        Returns:
+            前日報告（存在しない場合はNone）
+        """
+        result = await self.db.scalars(_select_by_user_and_date(user_id, report_date))
+        return result.first()
+
+    async def get_by_user(
+        self,
+        user_id: uuid.UUID,
+        limit: int = 10,
+        offset: int = 0,
+        after: tuple[date, uuid.UUID] | None = None,
+    ) -> list[PreviousDayReport]:
+        """
+        ユーザーIDで前日報告一覧を取得
+
+        Args:
+            user_id: ユーザーID
+            limit: 取得件数
+            offset: オフセット（after指定時は無視）
+            after: 前ページ最後の (report_date, id)（キーセットページネーション）
+
+        Returns:
+            前日報告リスト
+        """
+        result = await self.db.scalars(_select_page_by_user(user_id, limit, offset, after))
+        return list(result.all())
+
+    async def get_latest_by_user(self, user_id: uuid.UUID) -> PreviousDayReport | None:
+        """
+        ユーザーIDで最新の前日報告を取得
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            最新の前日報告（存在しない場合はNone）
+        """
+        result = await self.db.scalars(_select_by_user(user_id).limit(1))
+        return result.first()
+
+    async def get_version_by_id(self, report_id: uuid.UUID) -> Row | None:
+        """
+        IDで前日報告のバージョンを取得（本文の列は読まない）
+
+        Args:
+            report_id: 前日報告ID
+
+        Returns:
+            (id, user_id, updated_at)（存在しない場合はNone）
+        """
+        result = await self.db.execute(_select_version_by_id(report_id))
+        return result.first()
+
+    async def get_latest_version_by_user(self, user_id: uuid.UUID) -> Row | None:
+        """
+        ユーザーIDで最新の前日報告のバージョンを取得
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            (id, updated_at)（存在しない場合はNone）
+        """
+        result = await self.db.execute(_select_latest_version_by_user(user_id))
+        return result.first()
+
+    async def get_collection_version_by_user(self, user_id: uuid.UUID) -> Row:
+        """
+        ユーザーの前日報告全体のバージョンを取得
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            (count, updated_at)
+        """
+        result = await self.db.execute(_select_collection_version_by_user(user_id))
+        return result.one()
+
+    async def stream_for_export(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        user_id: uuid.UUID | None = None,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        エクスポート対象の前日報告をサーバーサイドカーソルで取得
+
+        クエリは呼び出し時に実行し、行は EXPORT_BATCH_SIZE 件ずつ取り出すため、
+        件数によらずメモリ使用量は一定となる
+
+        Args:
+            date_from: 報告日の開始日（含む）
+            date_to: 報告日の終了日（含む）
+            user_id: スタッフのユーザーID
+
+        Returns:
+            行のバッチの非同期イテレーター
+        """
+        result = await self.db.stream(_select_for_export(date_from, date_to, user_id))
+        return result.partitions()
+
+    async def get_photos(self, report_id: uuid.UUID) -> Row | None:
+        """
+        前日報告の写真URLと派生画像URLを取得
+
+        Args:
+            report_id: 前日報告ID
+
+        Returns:
+            (id, user_id, 写真URL・派生画像URLの各列)（存在しない場合はNone）
+        """
+        result = await self.db.execute(_select_photos_by_id(report_id))
+        return result.first()
+
+    async def get_pending_photo_ids(
+        self, url_prefix: str, after: uuid.UUID | None = None, limit: int = 100
+    ) -> list[uuid.UUID]:
+        """
+        派生画像が未作成の写真を持つ前日報告のIDを取得
+
+        Args:
+            url_prefix: 写真用バケットのURLの接頭辞
+            after: 前バッチ最後のID（キーセットページネーション）
+            limit: 取得件数
+
+        Returns:
+            前日報告IDのリスト（ID順）
+        """
+        result = await self.db.scalars(_select_pending_photo_ids(url_prefix, after, limit))
+        return list(result.all())
+
+    async def set_derived_photo_urls(
+        self, report_id: uuid.UUID, photo_column: str, photo_url: str, values: dict[str, str]
+    ) -> uuid.UUID | None:
+        """
+        写真の派生画像URLを記録
+
+        Args:
+            report_id: 前日報告ID
+            photo_column: 写真URLの列名
+            photo_url: 派生画像の元にした写真URL（差し替えられていた場合は記録しない）
+            values: 派生画像URLの列名 → URL
+
+        Returns:
+            記録した前日報告のユーザーID（削除・差し替えられていた場合はNone）
+        """
+        query = _update_derived_photo_urls(report_id, photo_column, photo_url, values)
+        result = await self.db.execute(query)
+        return result.scalar()
+
+    async def get_oldest_report_date(self) -> date | None:
+        """
+        最も古い報告日を取得
+
+        Returns:
+            最も古い報告日（前日報告がない場合はNone）
+        """
+        return await self.db.scalar(_select_oldest_report_date())
+
+    async def count_between(self, lower: date, upper: date) -> int:
+        """
+        報告日が [lower, upper) の前日報告の件数を取得
+
+        Args:
+            lower: 報告日の開始日（含む）
+            upper: 報告日の終了日（含まない）
+
+        Returns:
+            件数
+        """
+        return await self.db.scalar(_count_between(lower, upper))
+
+    async def get_archive_batch(
+        self, lower: date, upper: date, after: uuid.UUID | None = None, limit: int = 1000
+    ) -> list[Row]:
+        """
+        アーカイブ対象の前日報告（全列）をID順に取得
+
+        Args:
+            lower: 報告日の開始日（含む）
+            upper: 報告日の終了日（含まない）
+            after: 前バッチ最後のID（キーセットページネーション）
+            limit: 取得件数
+
+        Returns:
+            前日報告の行のリスト（ID順）
+        """
+        result = await self.db.execute(_select_archive_batch(lower, upper, after, limit))
+        return list(result.all())
+
+    async def delete_archived(
+        self, lower: date, upper: date, keys: Sequence[tuple[uuid.UUID, datetime]]
+    ) -> int:
+        """
+        アーカイブした前日報告を削除（アーカイブ後に更新された行は削除しない）
+
+        Args:
+            lower: 報告日の開始日（含む）
+            upper: 報告日の終了日（含まない）
+            keys: アーカイブした行の (id, updated_at)
+
+        Returns:
+            削除した件数
+        """
+        result = await self.db.execute(_delete_archived(lower, upper, keys))
+        return result.rowcount
+
+    async def update(
+        self, report: PreviousDayReport, data: PreviousDayReportUpdate
+    ) -> PreviousDayReport:
+        """
+        前日報告を更新
+
+        Args:
+            report: 更新対象の前日報告
+            data: 更新データ
+
+        Returns:
+            更新された前日報告
+        """
+        _apply_update(report, data)
+        await self.db.flush()
+        return report
+
+    async def delete(self, report: PreviousDayReport) -> None:
+        """
+        前日報告を削除
+
+        Args:
+            report: 削除対象の前日報告
+        """
+        await self.db.delete(report)
+        await self.db.flush()
@@ -0,0 +1,224 @@
+"""
+前日報告のパーティション管理のデータアクセス層
+
+previous_day_reports は報告日（report_date）の月単位のレンジパーティションに分割している
+（previous_day_reports_pYYYY_MM、範囲外の報告日は previous_day_reports_default）。
+保持期間を過ぎた行は DELETE せず、月のパーティションを切り離して削除する
+（行数によらずカタログの変更のみで完了し、テーブル・インデックスが肥大化しない）。
+
+パーティションの作成・削除は親テーブルのロックを取得するため、lock_timeout を設定して
+長時間のクエリの後ろでリクエストを待たせないようにする（タイムアウトした場合は再実行する）
+"""
+import re
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from app.models.previous_day_report import PreviousDayReport
+
+TABLE = PreviousDayReport.__tablename__
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+# パーティションの作成・削除で親テーブルのロックを待つ最大時間
+LOCK_TIMEOUT = "5s"
+
+_BOUND_PATTERN = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+def month_start(day: date) -> date:
+    """日付の月初"""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """月初の日付に月数を加算（負の値で減算）"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """月のパーティション名（previous_day_reports_pYYYY_MM）"""
+    return f"{TABLE}_p{month:%Y_%m}"
+
+
+def retention_cutoff(today: date, retention_months: int) -> date:
+    """
+    保持期間の開始日（この日より前の報告日の行は削除対象）
+
+    月単位で削除するため、今月の月初から保持期間の月数を戻した日とする
+    （各行は少なくとも保持期間の間は残る）
+    """
+    return add_months(month_start(today), -retention_months)
+
+
+def _select_partitions() -> TextClause:
+    """前日報告のパーティションと範囲（DEFAULTパーティションは範囲なし）を取得するクエリ"""
+    return text(
+        """
+        SELECT child.relname AS name, pg_get_expr(child.relpartbound, child.oid) AS bound
+        FROM pg_inherits
+        JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = CAST(:table AS regclass)
+        ORDER BY child.relname
+        """
+    ).bindparams(table=TABLE)
+
+
+def _set_lock_timeout() -> TextClause:
+    """トランザクション内のロック待ちの上限を設定するクエリ"""
+    return text("SELECT set_config('lock_timeout', :timeout, true)").bindparams(
+        timeout=LOCK_TIMEOUT
+    )
+
+
+class ReportPartitionRepository:
+    """
+    前日報告のパーティション管理
+
+    定期実行のジョブ（scripts/manage_partitions.py）から使用する。
+    各メソッドはコミットしないため、呼び出し側でパーティションごとにコミットすること
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_partitions(self) -> list[tuple[str, date | None, date | None]]:
+        """
+        パーティションの一覧を取得
+
+        Returns:
+            list[tuple[str, date | None, date | None]]:
+                (パーティション名, 範囲の開始日, 範囲の終了日（この日を含まない)) の範囲順のリスト。
+                DEFAULTパーティションは範囲が (None, None) で末尾に置く
+        """
+        partitions = []
+        for row in self.db.execute(_select_partitions()):
+            match = _BOUND_PATTERN.search(row.bound)
+            if match is None:
+                partitions.append((row.name, None, None))
+            else:
+                lower, upper = (date.fromisoformat(value) for value in match.groups())
+                partitions.append((row.name, lower, upper))
+        return sorted(partitions, key=lambda p: (p[1] is None, p[1] or date.min))
+
+    def create_partition(self, month: date) -> int:
+        """
+        月のパーティションを作成
+
+        DEFAULTパーティションにその月の行がある場合（パーティションの作成前に登録された
+        先の日付の報告）は、作成したパーティションに移動する
+
+        Args:
+            month: 月初の日付
+
+        Returns:
+            int: DEFAULTパーティションから移動した行数
+        """
+        upper = add_months(month, 1)
+        params = {"lower": month, "upper": upper}
+        self.db.execute(_set_lock_timeout())
+        self.db.execute(text(f"CREATE TEMPORARY TABLE moved (LIKE {TABLE})"))
+        moved = self.db.execute(
+            text(
+                f"""
+                WITH moved_rows AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE report_date >= :lower AND report_date < :upper
+                    RETURNING *
+                )
+                INSERT INTO moved SELECT * FROM moved_rows
+                """
+            ),
+            params,
+        ).rowcount
+        self.db.execute(
+            text(
+                f"CREATE TABLE {partition_name(month)} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{month}') TO ('{upper}')"
+            )
+        )
+        self.db.execute(text(f"INSERT INTO {TABLE} SELECT * FROM moved"))
+        self.db.execute(text("DROP TABLE moved"))
+        return moved
+
+    def detach_partition(self, name: str) -> None:
+        """
+        パーティションを親テーブルから切り離す（行はそのまま残り、前日報告の検索対象から外れる）
+
+        Args:
+            name: パーティション名
+        """
+        self.db.execute(_set_lock_timeout())
+        self.db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+
+    def drop_table(self, name: str) -> None:
+        """
+        切り離したパーティションを削除
+
+        Args:
+            name: パーティション名
+        """
+        self.db.execute(text(f"DROP TABLE {name}"))
+
+    def get_table_stats(self, name: str) -> tuple[int, datetime | None]:
+        """
+        パーティションの行数と更新日時の最大値を取得（削除前のアーカイブの確認用）
+
+        Args:
+            name: パーティション名
+
+        Returns:
+            tuple[int, datetime | None]: (行数, 更新日時の最大値（行がない場合は None）)
+        """
+        row = self.db.execute(text(f"SELECT count(*), max(updated_at) FROM {name}")).one()
+        return row[0], row[1]
+
+    def get_default_months_before(self, cutoff: date) -> list[tuple[date, int, datetime]]:
+        """
+        DEFAULTパーティションの保持期間を過ぎた行を月ごとに集計
+
+        DEFAULTパーティションには月のパーティションがない報告日の行のみが入るため、
+        通常は空である
+
+        Args:
+            cutoff: 保持期間の開始日（この日より前の報告日の行を対象とする）
+
+        Returns:
+            list[tuple[date, int, datetime]]: (月初の日付, 行数, 更新日時の最大値) の月順のリスト
+        """
+        rows = self.db.execute(
+            text(
+                f"""
+                SELECT CAST(date_trunc('month', report_date) AS date) AS month,
+                       count(*), max(updated_at)
+                FROM {DEFAULT_PARTITION}
+                WHERE report_date < :cutoff
+                GROUP BY 1
+                ORDER BY 1
+                """
+            ),
+            {"cutoff": cutoff},
+        )
+        return [(row[0], row[1], row[2]) for row in rows]
+
+    def delete_default_between(self, lower: date, upper: date) -> int:
+        """
+        DEFAULTパーティションの報告日が [lower, upper) の行を削除
+
+        Args:
+            lower: 報告日の開始日（含む）
+            upper: 報告日の終了日（含まない）
+
+        Returns:
+            int: 削除した行数
+        """
+        result = self.db.execute(
+            text(
+                f"DELETE FROM {DEFAULT_PARTITION} "
+                "WHERE report_date >= :lower AND report_date < :upper"
+            ),
+            {"lower": lower, "upper": upper},
+        )
+        return result.rowcount
@@ -2,12 +2,105 @@
 ユーザーリポジトリ
 """
 import uuid
-from typing import Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Select, func, literal, select, tuple_
+from sqlalchemy.engine import Dialect, Row
 from sqlalchemy.orm import Session
 
 from app.models.user import User
+from app.schemas.user import CountMode
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _apply_filters(query: Select, role: Optional[str], active_only: bool) -> Select:
+    """ロール・アクティブ状態のフィルターをクエリに適用する"""
+    if role:
+        query = query.where(User.role == role)
+
+    if active_only:
+        query = query.where(User.active == True)  # noqa: E712
+
+    return query
+
+
+def _select_all(
+    skip: int,
+    limit: int,
+    role: Optional[str],
+    active_only: bool,
+    after: Optional[tuple[datetime, uuid.UUID]] = None,
+) -> Select:
+    """
+    ユーザー一覧を (created_at, id) 順に取得するクエリ
+
+    after（前ページ最後の (created_at, id)）が指定された場合はキーセット方式で
+    それより後ろの行から取得し、skip は使用しない
+    """
+    query = (
+        _apply_filters(select(User), role, active_only)
+        .order_by(User.created_at, User.id)
+        .limit(limit)
+    )
+    if after is not None:
+        created_at, user_id = after
+        return query.where(
+            tuple_(User.created_at, User.id)
+            > tuple_(literal(created_at, User.created_at.type), literal(user_id, User.id.type))
+        )
+    return query.offset(skip)
+
+
+def _select_count(role: Optional[str], active_only: bool) -> Select:
+    """ユーザー数を取得するクエリ"""
+    return _apply_filters(select(func.count()).select_from(User), role, active_only)
+
+
+def _select_all_with_total(
+    skip: int,
+    limit: int,
+    role: Optional[str],
+    active_only: bool,
+    after: Optional[tuple[datetime, uuid.UUID]] = None,
+) -> Select:
+    """
+    ユーザー一覧と総件数を1クエリで取得するクエリ
+
+    総件数は相関のないスカラーサブクエリ（InitPlanとして1回だけ評価される）で各行に付与する。
+    ウィンドウ関数 count(*) OVER () と異なり、キーセット条件の影響を受けずに
+    フィルター全体の件数を返す
+    """
+    total = _select_count(role, active_only).scalar_subquery()
+    return _select_all(skip, limit, role, active_only, after).add_columns(total.label("total"))
+
+
+def _explain_rows_sql(
+    role: Optional[str], active_only: bool, dialect: Dialect
+) -> tuple[str, dict]:
+    """
+    フィルター条件に一致する行数の推定値を得る EXPLAIN 文を作成
+
+    Returns:
+        tuple[str, dict]: (ドライバに渡すSQL, パラメータ)
+    """
+    query = _apply_filters(select(literal(1)).select_from(User), role, active_only)
+    compiled = query.compile(dialect=dialect)
+    return f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+
+
+def _plan_rows(plan) -> int:
+    """EXPLAIN (FORMAT JSON) の結果から推定行数を取り出す"""
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _split_page(rows) -> tuple[list[User], Optional[int]]:
+    """(User, total) 行のリストをユーザーリストと総件数に分ける"""
+    if not rows:
+        return [], None
+    return [row[0] for row in rows], rows[0][1]
 
 
 class UserRepository:
@@ -26,7 +119,21 @@ class UserRepository:
         Returns:
             User: ユーザー（存在しない場合はNone）
         """
-        return self.db.query(User).filter(User.id == user_id).first()
+        return self.db.scalars(select(User).where(User.id == user_id)).first()
+
+    def get_version(self, user_id: uuid.UUID) -> Optional[Row]:
+        """
+        IDでユーザーのバージョンを取得（id, updated_at のみ）
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            Row: (id, updated_at)（存在しない場合はNone）
+        """
+        return self.db.execute(
+            select(User.id, User.updated_at).where(User.id == user_id)
+        ).first()
 
     def get_by_cognito_id(self, cognito_user_id: str) -> Optional[User]:
         """
@@ -38,11 +145,9 @@ class UserRepository:
         Returns:
             User: ユーザー（存在しない場合はNone）
         """
-        return (
-            self.db.query(User)
-            .filter(User.cognito_user_id == cognito_user_id)
-            .first()
-        )
+        return self.db.scalars(
+            select(User).where(User.cognito_user_id == cognito_user_id)
+        ).first()
 
     def get_by_email(self, email: str) -> Optional[User]:
         """
@@ -54,7 +159,7 @@ class UserRepository:
         Returns:
             User: ユーザー（存在しない場合はNone）
         """
-        return self.db.query(User).filter(User.email == email).first()
+        return self.db.scalars(select(User).where(User.email == email)).first()
 
     def get_all(
         self,
@@ -62,28 +167,22 @@ class UserRepository:
         limit: int = 100,
         role: Optional[str] = None,
         active_only: bool = False,
+        after: Optional[tuple[datetime, uuid.UUID]] = None,
     ) -> list[User]:
         """
         ユーザー一覧を取得
 
         Args:
-            skip: スキップ件数
+            skip: スキップ件数（after指定時は無視）
             limit: 取得上限
             role: ロールフィルター
             active_only: アクティブユーザーのみ
+            after: 前ページ最後の (created_at, id)（キーセットページネーション）
 
         Returns:
             list[User]: ユーザーリスト
         """
-        query = self.db.query(User)
-
-        if role:
-            query = query.filter(User.role == role)
-
-        if active_only:
-            query = query.filter(User.active == True)
-
-        return query.offset(skip).limit(limit).all()
+        return list(self.db.scalars(_select_all(skip, limit, role, active_only, after)).all())
 
     def count(self, role: Optional[str] = None, active_only: bool = False) -> int:
         """
@@ -96,15 +195,60 @@ class UserRepository:
         Returns:
             int: ユーザー数
         """
-        query = self.db.query(User)
+        return self.db.scalar(_select_count(role, active_only))
 
-        if role:
-            query = query.filter(User.role == role)
+    def estimate_count(self, role: Optional[str] = None, active_only: bool = False) -> int:
+        """
+        ユーザー数の推定値をプランナー統計から取得（テーブルを走査しない）
+
+        Args:
+            role: ロールフィルター
+            active_only: アクティブユーザーのみ
+
+        Returns:
+            int: 推定ユーザー数
+        """
+        sql, params = _explain_rows_sql(role, active_only, self.db.get_bind().dialect)
+        plan = self.db.connection().exec_driver_sql(sql, params).scalar()
+        return _plan_rows(plan)
 
-        if active_only:
-            query = query.filter(User.active == True)
+    def get_all_with_total(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        role: Optional[str] = None,
+        active_only: bool = False,
+        after: Optional[tuple[datetime, uuid.UUID]] = None,
+        count: CountMode = "exact",
+    ) -> tuple[list[User], Optional[int]]:
+        """
+        ユーザー一覧と総件数を取得
 
-        return query.count()
+        Args:
+            skip: スキップ件数（after指定時は無視）
+            limit: 取得上限
+            role: ロールフィルター
+            active_only: アクティブユーザーのみ
+            after: 前ページ最後の (created_at, id)（キーセットページネーション）
+            count: 総件数の算出方法（exact / estimated / none）
+
+        Returns:
+            tuple[list[User], Optional[int]]: (ユーザーリスト, 総件数)
+        """
+        if count == "exact":
+            rows = self.db.execute(
+                _select_all_with_total(skip, limit, role, active_only, after)
+            ).all()
+            users, total = _split_page(rows)
+            if total is None:
+                # 空ページでは総件数が得られないため、範囲外のページのみ別途集計
+                total = self.count(role, active_only) if skip or after else 0
+            return users, total
+
+        users = self.get_all(skip, limit, role, active_only, after)
+        if count == "none":
+            return users, None
+        return users, self.estimate_count(role, active_only)
 
     def create(self, user: User) -> User:
         """
@@ -144,3 +288,196 @@ class UserRepository:
         """
         user.active = False
         self.db.flush()
+
+
+class AsyncUserRepository:
+    """ユーザーデータアクセス層（非同期）"""
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+
+    async def get_by_id(self, user_id: uuid.UUID) -> Optional[User]:
+        """
+        IDでユーザーを取得
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            User: ユーザー（存在しない場合はNone）
+        """
+        result = await self.db.scalars(select(User).where(User.id == user_id))
+        return result.first()
+
+    async def get_version(self, user_id: uuid.UUID) -> Optional[Row]:
+        """
+        IDでユーザーのバージョンを取得（id, updated_at のみ）
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            Row: (id, updated_at)（存在しない場合はNone）
+        """
+        result = await self.db.execute(
+            select(User.id, User.updated_at).where(User.id == user_id)
+        )
+        return result.first()
+
+    async def get_by_cognito_id(self, cognito_user_id: str) -> Optional[User]:
+        """
+        Cognito User IDでユーザーを取得
+
+        Args:
+            cognito_user_id: Cognito User ID (sub)
+
+        Returns:
+            User: ユーザー（存在しない場合はNone）
+        """
+        result = await self.db.scalars(
+            select(User).where(User.cognito_user_id == cognito_user_id)
+        )
+        return result.first()
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """
+        メールアドレスでユーザーを取得
+
+        Args:
+            email: メールアドレス
+
+        Returns:
+            User: ユーザー（存在しない場合はNone）
+        """
+        result = await self.db.scalars(select(User).where(User.email == email))
+        return result.first()
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        role: Optional[str] = None,
+        active_only: bool = False,
+        after: Optional[tuple[datetime, uuid.UUID]] = None,
+    ) -> list[User]:
+        """
+        ユーザー一覧を取得
+
+        Args:
+            skip: スキップ件数（after指定時は無視）
+            limit: 取得上限
+            role: ロールフィルター
+            active_only: アクティブユーザーのみ
+            after: 前ページ最後の (created_at, id)（キーセットページネーション）
+
+        Returns:
+            list[User]: ユーザーリスト
+        """
+        result = await self.db.scalars(_select_all(skip, limit, role, active_only, after))
+        return list(result.all())
+
+    async def count(self, role: Optional[str] = None, active_only: bool = False) -> int:
+        """
+        ユーザー数を取得
+
+        Args:
+            role: ロールフィルター
+            active_only: アクティブユーザーのみ
+
+        Returns:
+            int: ユーザー数
+        """
+        return await self.db.scalar(_select_count(role, active_only))
+
+    async def estimate_count(self, role: Optional[str] = None, active_only: bool = False) -> int:
+        """
+        ユーザー数の推定値をプランナー統計から取得（テーブルを走査しない）
+
+        Args:
+            role: ロールフィルター
+            active_only: アクティブユーザーのみ
+
+        Returns:
+            int: 推定ユーザー数
+        """
+        sql, params = _explain_rows_sql(role, active_only, self.db.get_bind().dialect)
+        connection = await self.db.connection()
+        result = await connection.exec_driver_sql(sql, params)
+        return _plan_rows(result.scalar())
+
+    async def get_all_with_total(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        role: Optional[str] = None,
+        active_only: bool = False,
+        after: Optional[tuple[datetime, uuid.UUID]] = None,
+        count: CountMode = "exact",
+    ) -> tuple[list[User], Optional[int]]:
+        """
+        ユーザー一覧と総件数を取得
+
+        Args:
+            skip: スキップ件数（after指定時は無視）
+            limit: 取得上限
+            role: ロールフィルター
+            active_only: アクティブユーザーのみ
+            after: 前ページ最後の (created_at, id)（キーセットページネーション）
+            count: 総件数の算出方法（exact / estimated / none）
+
+        Returns:
+            tuple[list[User], Optional[int]]: (ユーザーリスト, 総件数)
+        """
+        if count == "exact":
+            result = await self.db.execute(
+                _select_all_with_total(skip, limit, role, active_only, after)
+            )
+            users, total = _split_page(result.all())
+            if total is None:
+                # 空ページでは総件数が得られないため、範囲外のページのみ別途集計
+                total = await self.count(role, active_only) if skip or after else 0
+            return users, total
+
+        users = await self.get_all(skip, limit, role, active_only, after)
+        if count == "none":
+            return users, None
+        return users, await self.estimate_count(role, active_only)
+
+    async def create(self, user: User) -> User:
+        """
+        ユーザーを作成
+
+        Args:
+            user: ユーザーオブジェクト
+
+        Returns:
+            User: 作成されたユーザー
+        """
+        self.db.add(user)
+        await self.db.flush()
+        await self.db.refresh(user)
+        return user
+
+    async def update(self, user: User) -> User:
+        """
+        ユーザーを更新
+
+        Args:
+            user: ユーザーオブジェクト
+
+        Returns:
+            User: 更新されたユーザー
+        """
+        await self.db.flush()
+        await self.db.refresh(user)
+        return user
+
+    async def delete(self, user: User) -> None:
+        """
+        ユーザーを削除（論理削除）
+
+        Args:
+            user: ユーザーオブジェクト
+        """
+        user.active = False
+        await self.db.flush()
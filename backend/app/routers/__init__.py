@@ -1,6 +1,22 @@
 """
 ルーターパッケージ
 """
-from app.routers import previous_day_reports
+from app.routers import (
+    attendance,
+    cache,
+    dashboard,
+    exports,
+    metrics,
+    previous_day_reports,
+    uploads,
+)
 
-__all__ = ["previous_day_reports"]
+__all__ = [
+    "previous_day_reports",
+    "attendance",
+    "dashboard",
+    "exports",
+    "uploads",
+    "cache",
+    "metrics",
+]
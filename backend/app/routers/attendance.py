@@ -0,0 +1,180 @@
+"""
+勤怠記録ルーター
+"""
+import uuid
+
+from fastapi import APIRouter, Depends, Query, Response, status
+
+from app.dependencies import AttendanceReadServiceDep, AttendanceServiceDep, User, query_budget
+from app.schemas.attendance import (
+    ArrivalReport,
+    AttendanceRecordResponse,
+    DepartureReport,
+    WakeUpReport,
+)
+from app.utils.pagination import next_cursor
+from app.utils.serialization import json_response
+
+router = APIRouter(prefix="/api/attendance", tags=["attendance"])
+
+
+@router.post(
+    "/wakeup",
+    response_model=AttendanceRecordResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="起床報告",
+    description="当日の勤怠記録に起床を記録します（報告済みの場合は記録せず当日の勤怠記録を返す）",
+    dependencies=[Depends(query_budget(3))],
+)
+async def report_wake_up(
+    data: WakeUpReport,
+    response: Response,
+    service: AttendanceServiceDep,
+    current_user: User,
+):
+    """
+    起床報告
+
+    - **wake_up_location**: 起床場所（任意）
+    - **wake_up_notes**: 起床時の備考（任意）
+    - **appearance_photo_url**: 身だしなみ写真URL（任意）
+    """
+    record, recorded = await service.record_stage(
+        user_id=current_user.id, stage="wake_up", data=data
+    )
+    if not recorded:
+        response.status_code = status.HTTP_200_OK
+    return record
+
+
+@router.post(
+    "/departure",
+    response_model=AttendanceRecordResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="出発報告",
+    description="当日の勤怠記録に出発を記録します（報告済みの場合は記録せず当日の勤怠記録を返す）",
+    dependencies=[Depends(query_budget(3))],
+)
+async def report_departure(
+    data: DepartureReport,
+    response: Response,
+    service: AttendanceServiceDep,
+    current_user: User,
+):
+    """
+    出発報告
+
+    - **departure_location**: 出発場所（任意）
+    - **departure_notes**: 出発時の備考（任意）
+    - **destination**: 目的地（任意）
+    - **route_photo_url**: 経路スクリーンショットURL（任意）
+    """
+    record, recorded = await service.record_stage(
+        user_id=current_user.id, stage="departure", data=data
+    )
+    if not recorded:
+        response.status_code = status.HTTP_200_OK
+    return record
+
+
+@router.post(
+    "/arrival",
+    response_model=AttendanceRecordResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="到着報告",
+    description="当日の勤怠記録に到着を記録します（報告済みの場合は記録せず当日の勤怠記録を返す）",
+    dependencies=[Depends(query_budget(3))],
+)
+async def report_arrival(
+    data: ArrivalReport,
+    response: Response,
+    service: AttendanceServiceDep,
+    current_user: User,
+):
+    """
+    到着報告
+
+    - **arrival_location**: 到着場所（任意）
+    - **arrival_gps_location**: 到着GPS座標（任意）
+    - **arrival_notes**: 到着時の備考（任意）
+    """
+    record, recorded = await service.record_stage(
+        user_id=current_user.id, stage="arrival", data=data
+    )
+    if not recorded:
+        response.status_code = status.HTTP_200_OK
+    return record
+
+
+@router.get(
+    "/today",
+    response_model=AttendanceRecordResponse | None,
+    summary="当日の勤怠記録を取得",
+    description="ログインユーザーの当日の勤怠記録を取得します（まだ報告がない場合はnull）",
+    dependencies=[Depends(query_budget(2))],
+)
+async def get_today_attendance(
+    service: AttendanceReadServiceDep,
+    current_user: User,
+):
+    """当日の勤怠記録を取得"""
+    record = await service.get_today_record(user_id=current_user.id)
+    return json_response(AttendanceRecordResponse | None, record)
+
+
+@router.get(
+    "",
+    response_model=list[AttendanceRecordResponse],
+    summary="勤怠記録一覧を取得",
+    description="勤怠記録を日付の降順に取得します（次ページのカーソルは X-Next-Cursor ヘッダー）",
+    dependencies=[Depends(query_budget(2))],
+)
+async def list_attendance_records(
+    service: AttendanceReadServiceDep,
+    current_user: User,
+    staff_id: uuid.UUID | None = Query(None, description="スタッフID（既定はログインユーザー）"),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = None,
+):
+    """
+    勤怠記録一覧を取得
+
+    - **staff_id**: スタッフID（マネージャーのみ他のスタッフを指定可）
+    - **limit**: 取得件数（デフォルト: 10）
+    - **cursor**: 前ページの X-Next-Cursor ヘッダーの値
+    """
+    records = await service.get_staff_records(
+        staff_id=staff_id or current_user.id,
+        user_id=current_user.id,
+        role=current_user.role,
+        limit=limit,
+        cursor=cursor,
+    )
+    headers = {}
+    cursor = next_cursor(records, limit, key=lambda r: (r.date, r.id))
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    return json_response(list[AttendanceRecordResponse], records, headers=headers)
+
+
+@router.get(
+    "/{record_id}",
+    response_model=AttendanceRecordResponse,
+    summary="勤怠記録を取得",
+    description="指定したIDの勤怠記録を取得します（マネージャーは全スタッフの記録を取得可）",
+    dependencies=[Depends(query_budget(2))],
+)
+async def get_attendance_record(
+    record_id: uuid.UUID,
+    service: AttendanceReadServiceDep,
+    current_user: User,
+):
+    """
+    勤怠記録を取得
+
+    - **record_id**: 勤怠記録ID
+    """
+    record = await service.get_record_by_id(
+        record_id=record_id, user_id=current_user.id, role=current_user.role
+    )
+    return json_response(AttendanceRecordResponse, record)
@@ -0,0 +1,30 @@
+"""
+キャッシュ統計ルーター
+"""
+from fastapi import APIRouter, Depends
+
+from app.dependencies import Manager, query_budget
+from app.schemas.cache import CacheStatsResponse
+from app.services.previous_day_report_service import report_cache
+from app.services.user_service import identity_cache
+from app.utils.cognito import cognito_verifier
+
+router = APIRouter(prefix="/api/cache", tags=["cache"])
+
+
+@router.get(
+    "/stats",
+    response_model=CacheStatsResponse,
+    summary="キャッシュ統計を取得",
+    description="処理したプロセスのキャッシュのサイズ・ヒット率を取得します（マネージャーのみ）",
+    dependencies=[Depends(query_budget(1))],
+)
+async def get_cache_stats(current_user: Manager):
+    """
+    キャッシュ統計を取得
+    """
+    return CacheStatsResponse(
+        reports=report_cache.stats(),
+        identities=identity_cache.stats(),
+        tokens=cognito_verifier.token_cache.stats(),
+    )
@@ -0,0 +1,33 @@
+"""
+マネージャーダッシュボードルーター
+"""
+from datetime import date
+
+from fastapi import APIRouter, Depends
+
+from app.dependencies import DashboardServiceDep, Manager, query_budget
+from app.schemas.dashboard import DashboardResponse
+from app.utils.serialization import json_response
+
+router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
+
+
+@router.get(
+    "/{work_date}",
+    response_model=DashboardResponse,
+    summary="勤務日の全スタッフの状況を取得",
+    description="勤務日（報告日の翌日）の全スタッフの前日報告状況を取得します（マネージャーのみ）",
+    dependencies=[Depends(query_budget(2))],
+)
+async def get_daily_dashboard(
+    work_date: date,
+    service: DashboardServiceDep,
+    current_user: Manager,
+):
+    """
+    勤務日の全スタッフの状況を取得
+
+    - **work_date**: 勤務日（例: 2025-12-18 → 2025-12-17 に報告された前日報告を表示）
+    """
+    dashboard = await service.get_daily_dashboard(work_date)
+    return json_response(DashboardResponse, dashboard)
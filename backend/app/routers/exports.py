@@ -0,0 +1,53 @@
+"""
+エクスポートルーター
+"""
+import uuid
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+
+from app.dependencies import ExportServiceDep, Manager, query_budget
+from app.services.export_service import resolve_export_mode
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+CSV_HEADERS = {"Content-Disposition": 'attachment; filename="previous-day-reports.csv"'}
+
+router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+
+@router.get(
+    "/previous-day-reports.csv",
+    response_class=StreamingResponse,
+    summary="前日報告をCSVでエクスポート",
+    description=(
+        "前日報告を報告日・スタッフで絞り込み、CSV（UTF-8 BOM付き）でダウンロードします"
+        "（マネージャーのみ）。行はサーバーサイドカーソルから逐次送信します。"
+        "Lambda上では応答全体を作成してから送信し、上限（EXPORT_MAX_BYTES）を超える場合は400を返します"
+    ),
+    dependencies=[Depends(query_budget(2))],
+)
+async def export_previous_day_reports_csv(
+    service: ExportServiceDep,
+    current_user: Manager,
+    date_from: date | None = Query(None, description="報告日の開始日（含む）"),
+    date_to: date | None = Query(None, description="報告日の終了日（含む）"),
+    user_id: uuid.UUID | None = Query(None, description="スタッフのユーザーID"),
+):
+    """
+    前日報告をCSVでエクスポート
+
+    - **date_from**: 報告日の開始日（省略時は制限なし）
+    - **date_to**: 報告日の終了日（省略時は制限なし）
+    - **user_id**: スタッフのユーザーID（省略時は全スタッフ）
+    """
+    if resolve_export_mode() == "buffered":
+        body = await service.build_previous_day_reports_csv(
+            date_from=date_from, date_to=date_to, user_id=user_id
+        )
+        return Response(body, media_type=CSV_MEDIA_TYPE, headers=CSV_HEADERS)
+
+    chunks = await service.export_previous_day_reports_csv(
+        date_from=date_from, date_to=date_to, user_id=user_id
+    )
+    return StreamingResponse(chunks, media_type=CSV_MEDIA_TYPE, headers=CSV_HEADERS)
@@ -0,0 +1,58 @@
+"""
+メトリクスルーター
+"""
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+
+from app.config import settings
+from app.utils.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+def metrics_enabled() -> bool:
+    """
+    /metrics を公開するか
+
+    ルートのパスやレイテンシを外部に公開しないよう、development 以外の環境では
+    METRICS_TOKEN の設定を必須とする
+
+    Returns:
+        bool: METRICS_ENABLED
+
+    Raises:
+        ValueError: development 以外の環境で METRICS_TOKEN を設定せずに有効にした場合
+    """
+    if not settings.METRICS_ENABLED:
+        return False
+    if not settings.METRICS_TOKEN and settings.ENVIRONMENT != "development":
+        raise ValueError(
+            "METRICS_ENABLED=true の場合は METRICS_TOKEN を設定してください"
+            f"（ENVIRONMENT={settings.ENVIRONMENT}）"
+        )
+    return True
+
+
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    summary="メトリクスを取得（Prometheus形式）",
+)
+async def get_metrics(authorization: str | None = Header(None)):
+    """
+    ルートごとのレイテンシのヒストグラムを Prometheus のテキスト形式で取得
+
+    値はリクエストを処理したプロセスのもの。METRICS_TOKEN を設定した場合は
+    `Authorization: Bearer <METRICS_TOKEN>` を要求する
+    （スクレイパー向けのため、ユーザー認証は使用しない）
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest((authorization or "").encode(), expected.encode()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="メトリクスのトークンが不正です",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
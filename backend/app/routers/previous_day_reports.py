@@ -3,31 +3,48 @@
 """
 import uuid
 
-from fastapi import APIRouter, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 
-from app.dependencies import DBSession, User
+from app.dependencies import ReportReadServiceDep, ReportServiceDep, User, query_budget
 from app.schemas.previous_day_report import (
+    ConflictMode,
     PreviousDayReportCreate,
     PreviousDayReportResponse,
     PreviousDayReportUpdate,
 )
-from app.services.previous_day_report_service import PreviousDayReportService
+from app.utils.etag import etag_headers, etag_matches, not_modified, weak_etag
+from app.utils.pagination import next_cursor
+from app.utils.serialization import json_response
 
 router = APIRouter(prefix="/api/previous-day-reports", tags=["previous-day-reports"])
 
 
+def _latest_etag(user_id: uuid.UUID, latest) -> str:
+    """最新の前日報告（またはそのバージョン）のETag。報告がない場合もユーザーごとに一定"""
+    if latest is None:
+        return weak_etag(user_id, None)
+    return weak_etag(latest.id, latest.updated_at)
+
+
 @router.post(
     "",
     response_model=PreviousDayReportResponse,
     status_code=status.HTTP_201_CREATED,
     summary="前日報告を登録",
-    description="翌日の予定（起床・出発・到着時刻）と写真を登録します",
+    description=(
+        "翌日の予定（起床・出発・到着時刻）と写真を登録します。"
+        "on_conflict=upsert の場合、同じ報告日の前日報告を上書きします（上書き時は200）"
+    ),
+    dependencies=[Depends(query_budget(2))],
 )
 async def create_previous_day_report(
     data: PreviousDayReportCreate,
-    db: DBSession,
+    response: Response,
+    service: ReportServiceDep,
     current_user: User,
+    on_conflict: ConflictMode = Query(
+        "reject", description="同じ報告日の前日報告が存在する場合の動作 (reject/upsert)"
+    ),
 ):
     """
     前日報告を登録
@@ -39,9 +56,15 @@ async def create_previous_day_report(
     - **appearance_photo_url**: 身だしなみ写真URL
     - **route_photo_url**: 経路スクリーンショットURL
     - **notes**: 備考（任意）
+    - **on_conflict**: reject（既に存在する場合は400）/ upsert（上書き）
     """
-    service = PreviousDayReportService(db)
-    report = service.create_report(user_id=current_user.id, data=data)
+    if on_conflict == "upsert":
+        report, created = await service.upsert_report(user_id=current_user.id, data=data)
+        if not created:
+            response.status_code = status.HTTP_200_OK
+        return report
+
+    report = await service.create_report(user_id=current_user.id, data=data)
     return report
 
 
@@ -49,46 +72,81 @@ async def create_previous_day_report(
     "/{report_id}",
     response_model=PreviousDayReportResponse,
     summary="前日報告を取得",
-    description="指定したIDの前日報告を取得します",
+    description="指定したIDの前日報告を取得します（マネージャーは全スタッフの報告を取得可）",
+    dependencies=[Depends(query_budget(2))],
 )
 async def get_previous_day_report(
     report_id: uuid.UUID,
-    db: DBSession,
+    service: ReportReadServiceDep,
     current_user: User,
+    if_none_match: str | None = Header(None),
 ):
     """
     前日報告を取得
 
+    If-None-Match がETag（id, updated_at から作成）に一致する場合は 304 を返す
+
     - **report_id**: 前日報告ID
     """
-    service = PreviousDayReportService(db)
-    report = service.get_report_by_id(report_id=report_id, user_id=current_user.id)
-    return report
+    if if_none_match:
+        version = await service.get_report_version(
+            report_id=report_id, user_id=current_user.id, role=current_user.role
+        )
+        etag = weak_etag(version.id, version.updated_at)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    report = await service.get_report_by_id(
+        report_id=report_id, user_id=current_user.id, role=current_user.role
+    )
+    return json_response(
+        PreviousDayReportResponse,
+        report,
+        headers=etag_headers(weak_etag(report.id, report.updated_at)),
+    )
 
 
 @router.get(
     "",
     response_model=list[PreviousDayReportResponse],
     summary="前日報告一覧を取得",
-    description="ログインユーザーの前日報告一覧を取得します",
+    description=(
+        "ログインユーザーの前日報告一覧を取得します。"
+        "次ページのカーソルは X-Next-Cursor ヘッダーで返します"
+    ),
+    dependencies=[Depends(query_budget(3))],
 )
 async def list_previous_day_reports(
-    db: DBSession,
+    service: ReportReadServiceDep,
     current_user: User,
     limit: int = 10,
     offset: int = 0,
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
 ):
     """
     前日報告一覧を取得
 
+    ETagはユーザーの前日報告全体の件数と最大の updated_at から作成し、
+    If-None-Match が一致する場合は 304 を返す。1ページ目はこのバージョンをキーにキャッシュする
+
     - **limit**: 取得件数（デフォルト: 10）
-    - **offset**: オフセット（デフォルト: 0）
+    - **offset**: オフセット（デフォルト: 0、cursor指定時は無視）
+    - **cursor**: 前ページの X-Next-Cursor ヘッダーの値
     """
-    service = PreviousDayReportService(db)
-    reports = service.get_user_reports(
-        user_id=current_user.id, limit=limit, offset=offset
+    version = await service.get_user_reports_version(user_id=current_user.id)
+    etag = weak_etag(current_user.id, version.count, version.updated_at)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    reports = await service.get_user_reports(
+        user_id=current_user.id, limit=limit, offset=offset, cursor=cursor, version=version
     )
-    return reports
+    headers = etag_headers(etag)
+    cursor = next_cursor(reports, limit, key=lambda r: (r.report_date, r.id))
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    return json_response(list[PreviousDayReportResponse], reports, headers=headers)
 
 
 @router.get(
@@ -96,17 +154,30 @@ async def list_previous_day_reports(
     response_model=PreviousDayReportResponse | None,
     summary="最新の前日報告を取得",
     description="ログインユーザーの最新の前日報告を取得します",
+    dependencies=[Depends(query_budget(3))],
 )
 async def get_latest_previous_day_report(
-    db: DBSession,
+    service: ReportReadServiceDep,
     current_user: User,
+    if_none_match: str | None = Header(None),
 ):
     """
     最新の前日報告を取得
+
+    If-None-Match がETag（id, updated_at から作成）に一致する場合は 304 を返す。
+    最新の報告はこのバージョンをキーにキャッシュする
     """
-    service = PreviousDayReportService(db)
-    report = service.get_latest_report(user_id=current_user.id)
-    return report
+    version = await service.get_latest_report_version(user_id=current_user.id)
+    etag = _latest_etag(current_user.id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    report = await service.get_latest_report(user_id=current_user.id, version=version)
+    return json_response(
+        PreviousDayReportResponse | None,
+        report,
+        headers=etag_headers(_latest_etag(current_user.id, report)),
+    )
 
 
 @router.put(
@@ -114,11 +185,12 @@ async def get_latest_previous_day_report(
     response_model=PreviousDayReportResponse,
     summary="前日報告を更新",
     description="指定したIDの前日報告を更新します",
+    dependencies=[Depends(query_budget(6))],
 )
 async def update_previous_day_report(
     report_id: uuid.UUID,
     data: PreviousDayReportUpdate,
-    db: DBSession,
+    service: ReportServiceDep,
     current_user: User,
 ):
     """
@@ -126,8 +198,7 @@ async def update_previous_day_report(
 
     - **report_id**: 前日報告ID
     """
-    service = PreviousDayReportService(db)
-    report = service.update_report(
+    report = await service.update_report(
         report_id=report_id, user_id=current_user.id, data=data
     )
     return report
@@ -138,10 +209,11 @@ async def update_previous_day_report(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="前日報告を削除",
     description="指定したIDの前日報告を削除します",
+    dependencies=[Depends(query_budget(4))],
 )
 async def delete_previous_day_report(
     report_id: uuid.UUID,
-    db: DBSession,
+    service: ReportServiceDep,
     current_user: User,
 ):
     """
@@ -149,6 +221,5 @@ async def delete_previous_day_report(
 
     - **report_id**: 前日報告ID
     """
-    service = PreviousDayReportService(db)
-    service.delete_report(report_id=report_id, user_id=current_user.id)
+    await service.delete_report(report_id=report_id, user_id=current_user.id)
     return None
@@ -0,0 +1,36 @@
+"""
+写真アップロードルーター
+"""
+from fastapi import APIRouter, Depends
+
+from app.dependencies import UploadServiceDep, User, query_budget
+from app.schemas.upload import PhotoUploadPresignRequest, PhotoUploadPresignResponse
+
+router = APIRouter(prefix="/api/uploads", tags=["uploads"])
+
+
+@router.post(
+    "/presign",
+    response_model=PhotoUploadPresignResponse,
+    summary="写真の署名付きアップロードURLを発行",
+    description=(
+        "写真をS3に直接アップロードするための署名付きPOSTを、複数の写真についてまとめて発行します。"
+        "アップロード後、photo_url を前日報告の appearance_photo_url / route_photo_url に指定します"
+    ),
+    dependencies=[Depends(query_budget(1))],
+)
+async def presign_photo_uploads(
+    data: PhotoUploadPresignRequest,
+    service: UploadServiceDep,
+    current_user: User,
+):
+    """
+    写真の署名付きアップロードURLを発行
+
+    返された url に、fields の各値と file（画像）を multipart/form-data で POST する。
+    Content-Type と最大サイズ（20MB）はS3側で検証される
+
+    - **files**: アップロードする写真（purpose: appearance/route、
+      content_type: image/jpeg/image/png）
+    """
+    return await service.presign_photo_uploads(user_id=current_user.id, files=data.files)
@@ -4,50 +4,71 @@
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 
-from app.dependencies import DBSession, User as CurrentUser
+from app.dependencies import User as CurrentUser, UserReadServiceDep, UserServiceDep, query_budget
 from app.schemas.user import (
+    CountMode,
     CurrentUserResponse,
     UserCreate,
     UserListResponse,
     UserResponse,
     UserUpdate,
 )
-from app.services.user_service import UserService
+from app.utils.etag import etag_headers, etag_matches, not_modified, weak_etag
+from app.utils.pagination import next_cursor
+from app.utils.serialization import json_response
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
 
-@router.get("/me", response_model=CurrentUserResponse, summary="現在のユーザー情報取得")
+@router.get(
+    "/me",
+    response_model=CurrentUserResponse,
+    summary="現在のユーザー情報取得",
+    dependencies=[Depends(query_budget(3))],
+)
 async def get_current_user(
-    db: DBSession,
+    service: UserReadServiceDep,
     current_user: CurrentUser,
-) -> UserResponse:
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     """
     現在ログイン中のユーザー情報を取得
 
+    If-None-Match がETag（id, updated_at から作成）に一致する場合は 304 を返す
+
     Returns:
         CurrentUserResponse: 現在のユーザー情報
     """
-    service = UserService(db)
-    user = service.get_by_id(current_user.id)
-    return user
+    if if_none_match:
+        version = await service.get_version(current_user.id)
+        etag = weak_etag(version.id, version.updated_at)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    user = await service.get_by_id(current_user.id)
+    return json_response(
+        CurrentUserResponse, user, headers=etag_headers(weak_etag(user.id, user.updated_at))
+    )
 
 
 @router.get(
     "",
     response_model=UserListResponse,
     summary="ユーザー一覧取得",
+    dependencies=[Depends(query_budget(2))],
 )
 async def get_users(
-    db: DBSession,
+    service: UserReadServiceDep,
     current_user: CurrentUser,
     skip: int = Query(0, ge=0, description="スキップ件数"),
     limit: int = Query(100, ge=1, le=1000, description="取得上限"),
     role: Optional[str] = Query(None, description="ロールフィルター (staff/manager)"),
     active_only: bool = Query(False, description="アクティブユーザーのみ"),
-) -> UserListResponse:
+    cursor: Optional[str] = Query(None, description="前ページのカーソル"),
+    count: CountMode = Query("exact", description="総件数の算出方法 (exact/estimated/none)"),
+) -> Response:
     """
     ユーザー一覧を取得（マネージャーのみ）
 
@@ -56,26 +77,40 @@ async def get_users(
         limit: 取得上限
         role: ロールフィルター
         active_only: アクティブユーザーのみ
+        cursor: 前ページのカーソル
+        count: 総件数の算出方法
 
     Returns:
         UserListResponse: ユーザー一覧と総件数
     """
-    service = UserService(db)
-    users, total = service.get_all(
-        skip=skip, limit=limit, role=role, active_only=active_only
+    users, total = await service.get_all(
+        skip=skip,
+        limit=limit,
+        role=role,
+        active_only=active_only,
+        cursor=cursor,
+        count=count,
     )
 
-    return UserListResponse(total=total, users=users)
+    return json_response(
+        UserListResponse,
+        {
+            "total": total,
+            "users": users,
+            "next_cursor": next_cursor(users, limit, key=lambda u: (u.created_at, u.id)),
+        },
+    )
 
 
 @router.get(
     "/{user_id}",
     response_model=UserResponse,
     summary="ユーザー詳細取得",
+    dependencies=[Depends(query_budget(2))],
 )
 async def get_user(
     user_id: uuid.UUID,
-    db: DBSession,
+    service: UserReadServiceDep,
     current_user: CurrentUser,
 ) -> UserResponse:
     """
@@ -87,8 +122,7 @@ async def get_user(
     Returns:
         UserResponse: ユーザー詳細
     """
-    service = UserService(db)
-    user = service.get_by_id(user_id)
+    user = await service.get_by_id(user_id)
     return user
 
 
@@ -97,10 +131,11 @@ async def get_user(
     response_model=UserResponse,
     status_code=status.HTTP_201_CREATED,
     summary="ユーザー作成",
+    dependencies=[Depends(query_budget(5))],
 )
 async def create_user(
     user_data: UserCreate,
-    db: DBSession,
+    service: UserServiceDep,
     current_user: CurrentUser,
 ) -> UserResponse:
     """
@@ -112,8 +147,7 @@ async def create_user(
     Returns:
         UserResponse: 作成されたユーザー
     """
-    service = UserService(db)
-    user = service.create(user_data)
+    user = await service.create(user_data)
     return user
 
 
@@ -121,11 +155,12 @@ async def create_user(
     "/{user_id}",
     response_model=UserResponse,
     summary="ユーザー更新",
+    dependencies=[Depends(query_budget(4))],
 )
 async def update_user(
     user_id: uuid.UUID,
     user_data: UserUpdate,
-    db: DBSession,
+    service: UserServiceDep,
     current_user: CurrentUser,
 ) -> UserResponse:
     """
@@ -138,8 +173,7 @@ async def update_user(
     Returns:
         UserResponse: 更新されたユーザー
     """
-    service = UserService(db)
-    user = service.update(user_id, user_data)
+    user = await service.update(user_id, user_data)
     return user
 
 
@@ -147,10 +181,11 @@ async def update_user(
     "/{user_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     summary="ユーザー削除",
+    dependencies=[Depends(query_budget(3))],
 )
 async def delete_user(
     user_id: uuid.UUID,
-    db: DBSession,
+    service: UserServiceDep,
     current_user: CurrentUser,
 ) -> None:
     """
@@ -159,5 +194,4 @@ async def delete_user(
     Args:
         user_id: ユーザーID
     """
-    service = UserService(db)
-    service.delete(user_id)
+    await service.delete(user_id)
@@ -1,14 +1,38 @@
 """
 スキーマパッケージ
 """
+from app.schemas.attendance import (
+    ArrivalReport,
+    AttendanceRecordResponse,
+    DepartureReport,
+    WakeUpReport,
+)
+from app.schemas.cache import CacheStats, CacheStatsResponse
+from app.schemas.dashboard import DashboardResponse, DashboardStaffStatus
 from app.schemas.previous_day_report import (
     PreviousDayReportCreate,
     PreviousDayReportUpdate,
     PreviousDayReportResponse,
 )
+from app.schemas.upload import (
+    PhotoUploadPresignRequest,
+    PhotoUploadPresignResponse,
+    PresignedPhotoUpload,
+)
 
 __all__ = [
     "PreviousDayReportCreate",
     "PreviousDayReportUpdate",
     "PreviousDayReportResponse",
+    "DashboardResponse",
+    "DashboardStaffStatus",
+    "CacheStats",
+    "CacheStatsResponse",
+    "PhotoUploadPresignRequest",
+    "PhotoUploadPresignResponse",
+    "PresignedPhotoUpload",
+    "WakeUpReport",
+    "DepartureReport",
+    "ArrivalReport",
+    "AttendanceRecordResponse",
 ]
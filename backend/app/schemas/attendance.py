@@ -0,0 +1,123 @@
+"""
+勤怠記録スキーマ
+"""
+import uuid
+from datetime import date, datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# 勤怠の報告の段階（起床 → 出発 → 到着）
+AttendanceStage = Literal["wake_up", "departure", "arrival"]
+
+
+class WakeUpReport(BaseModel):
+    """起床報告スキーマ"""
+
+    wake_up_location: str | None = Field(None, max_length=255, description="起床場所")
+    wake_up_notes: str | None = Field(None, description="起床時の備考")
+    appearance_photo_url: str | None = Field(None, max_length=500, description="身だしなみ写真URL")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "wake_up_location": "自宅",
+                "appearance_photo_url": "https://s3.amazonaws.com/okiteru-photos/appearance/12345.jpg",
+            }
+        }
+    )
+
+
+class DepartureReport(BaseModel):
+    """出発報告スキーマ"""
+
+    departure_location: str | None = Field(None, max_length=255, description="出発場所")
+    departure_notes: str | None = Field(None, description="出発時の備考")
+    destination: str | None = Field(None, max_length=255, description="目的地")
+    route_photo_url: str | None = Field(
+        None,
+        max_length=500,
+        description="経路スクリーンショットURL",
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "departure_location": "自宅",
+                "destination": "渋谷現場",
+                "route_photo_url": "https://s3.amazonaws.com/okiteru-photos/route/12345.jpg",
+            }
+        }
+    )
+
+
+class ArrivalReport(BaseModel):
+    """到着報告スキーマ"""
+
+    arrival_location: str | None = Field(None, max_length=255, description="到着場所（手動入力）")
+    arrival_gps_location: str | None = Field(None, max_length=255, description="到着GPS座標")
+    arrival_notes: str | None = Field(None, description="到着時の備考")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "arrival_location": "渋谷現場",
+                "arrival_gps_location": "35.6580,139.7016",
+            }
+        }
+    )
+
+
+class AttendanceRecordResponse(BaseModel):
+    """勤怠記録レスポンススキーマ"""
+
+    id: uuid.UUID
+    staff_id: uuid.UUID
+    date: date
+    wake_up_time: datetime | None
+    wake_up_location: str | None
+    wake_up_notes: str | None
+    departure_time: datetime | None
+    departure_location: str | None
+    departure_notes: str | None
+    destination: str | None
+    arrival_time: datetime | None
+    arrival_location: str | None
+    arrival_gps_location: str | None
+    arrival_notes: str | None
+    route_photo_url: str | None
+    appearance_photo_url: str | None
+    status: str
+    notes: str | None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": {
+                "id": "123e4567-e89b-12d3-a456-426614174000",
+                "staff_id": "123e4567-e89b-12d3-a456-426614174001",
+                "date": "2025-12-18",
+                "wake_up_time": "2025-12-17T21:00:00Z",
+                "wake_up_location": "自宅",
+                "wake_up_notes": None,
+                "departure_time": "2025-12-17T22:30:00Z",
+                "departure_location": "自宅",
+                "departure_notes": None,
+                "destination": "渋谷現場",
+                "arrival_time": None,
+                "arrival_location": None,
+                "arrival_gps_location": None,
+                "arrival_notes": None,
+                "route_photo_url": "https://s3.amazonaws.com/okiteru-photos/route/12345.jpg",
+                "appearance_photo_url": (
+                    "https://s3.amazonaws.com/okiteru-photos/appearance/12345.jpg"
+                ),
+                "status": "partial",
+                "notes": None,
+                "created_at": "2025-12-17T21:00:00Z",
+                "updated_at": "2025-12-17T22:30:00Z",
+            }
+        },
+    )
@@ -0,0 +1,24 @@
+"""
+キャッシュ統計スキーマ
+"""
+from pydantic import BaseModel, Field
+
+
+class CacheStats(BaseModel):
+    """キャッシュごとの統計"""
+
+    size: int = Field(..., description="エントリ数（グループ単位のキャッシュはグループ数）")
+    maxsize: int = Field(..., description="最大エントリ数（0はキャッシュ無効）")
+    hits: int = Field(..., description="ヒット数")
+    misses: int = Field(..., description="ミス数")
+    hit_rate: float = Field(..., description="ヒット率")
+    entries: int | None = Field(None, description="グループ内のエントリの合計")
+    invalidations: int | None = Field(None, description="無効化の回数")
+
+
+class CacheStatsResponse(BaseModel):
+    """プロセス内キャッシュの統計（プロセスの起動以降の値）"""
+
+    reports: CacheStats = Field(..., description="前日報告の読み出しキャッシュ")
+    identities: CacheStats = Field(..., description="認証済みユーザー情報のキャッシュ")
+    tokens: CacheStats = Field(..., description="検証済みトークンのキャッシュ")
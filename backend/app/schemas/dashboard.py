@@ -0,0 +1,48 @@
+"""
+ダッシュボードスキーマ
+"""
+import uuid
+from datetime import date, datetime, time
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+# 前日報告の状況
+#   reported:     勤務日の前日までに前日報告済み
+#   not_reported: 未報告（ダッシュボードで強調表示する）
+PreviousDayReportStatus = Literal["reported", "not_reported"]
+
+
+class DashboardStaffStatus(BaseModel):
+    """スタッフごとの勤務日の状況"""
+
+    user_id: uuid.UUID = Field(..., description="ユーザーID")
+    name: str = Field(..., description="氏名")
+    email: str = Field(..., description="メールアドレス")
+    phone: str | None = Field(None, description="電話番号")
+    previous_day_report_status: PreviousDayReportStatus = Field(
+        ..., description="前日報告の状況 (reported/not_reported)"
+    )
+    previous_day_report_id: uuid.UUID | None = Field(None, description="前日報告ID")
+    next_wake_up_time: time | None = Field(None, description="予定起床時刻")
+    next_departure_time: time | None = Field(None, description="予定出発時刻")
+    next_arrival_time: time | None = Field(None, description="予定到着時刻")
+    previous_day_reported_at: datetime | None = Field(None, description="前日報告の登録日時")
+    appearance_thumbnail_url: str | None = Field(
+        None,
+        description="身だしなみ写真のサムネイルURL（作成前はNULL）",
+    )
+    route_thumbnail_url: str | None = Field(
+        None,
+        description="経路スクリーンショットのサムネイルURL（作成前はNULL）",
+    )
+
+
+class DashboardResponse(BaseModel):
+    """マネージャーダッシュボードレスポンススキーマ"""
+
+    work_date: date = Field(..., description="勤務日")
+    total: int = Field(..., description="アクティブスタッフ数")
+    reported: int = Field(..., description="前日報告済みのスタッフ数")
+    not_reported: int = Field(..., description="前日報告が未報告のスタッフ数")
+    staff: list[DashboardStaffStatus] = Field(..., description="スタッフごとの状況")
@@ -3,9 +3,15 @@
 """
 import uuid
 from datetime import date, time, datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field, ConfigDict
 
+# 同じ報告日の前日報告が既に存在する場合の動作
+#   reject: 登録せずエラーとする
+#   upsert: 既存の前日報告を送信内容で上書きする（モバイルの再送に対応）
+ConflictMode = Literal["reject", "upsert"]
+
 
 class PreviousDayReportCreate(BaseModel):
     """前日報告作成スキーマ"""
@@ -65,6 +71,11 @@ class PreviousDayReportResponse(BaseModel):
     next_arrival_time: time
     appearance_photo_url: str
     route_photo_url: str
+    # 派生画像（WebP・EXIF除去済み。アップロード後の処理が完了するまではnull）
+    appearance_thumbnail_url: str | None = None
+    appearance_preview_url: str | None = None
+    route_thumbnail_url: str | None = None
+    route_preview_url: str | None = None
     notes: str | None
     # actual_attendance_record_id: uuid.UUID | None  # 将来実装予定
     created_at: datetime
@@ -82,6 +93,14 @@ class PreviousDayReportResponse(BaseModel):
                 "next_arrival_time": "09:00:00",
                 "appearance_photo_url": "https://s3.amazonaws.com/okiteru-photos/appearance/12345.jpg",
                 "route_photo_url": "https://s3.amazonaws.com/okiteru-photos/route/12345.jpg",
+                "appearance_thumbnail_url": (
+                    "https://s3.amazonaws.com/okiteru-photos/appearance/12345.thumbnail.webp"
+                ),
+                "appearance_preview_url": (
+                    "https://s3.amazonaws.com/okiteru-photos/appearance/12345.preview.webp"
+                ),
+                "route_thumbnail_url": None,
+                "route_preview_url": None,
                 "notes": "特になし",
                 "created_at": "2025-12-17T20:00:00Z",
                 "updated_at": "2025-12-17T20:00:00Z",
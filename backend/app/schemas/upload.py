@@ -0,0 +1,66 @@
+"""
+写真アップロードスキーマ
+"""
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# 写真の用途（前日報告のフィールドに対応）
+#   appearance: 身だしなみ写真（appearance_photo_url）
+#   route:      経路スクリーンショット（route_photo_url）
+PhotoPurpose = Literal["appearance", "route"]
+
+# アップロードできる画像形式（COM-001: JPEG, PNG）
+PhotoContentType = Literal["image/jpeg", "image/png"]
+
+# 1回のリクエストで発行できる署名付きURLの上限
+MAX_PRESIGN_FILES = 10
+
+
+class PhotoUploadRequest(BaseModel):
+    """アップロードする写真"""
+
+    purpose: PhotoPurpose = Field(..., description="写真の用途 (appearance/route)")
+    content_type: PhotoContentType = Field(..., description="画像形式 (image/jpeg/image/png)")
+
+
+class PhotoUploadPresignRequest(BaseModel):
+    """署名付きアップロードURL発行リクエスト"""
+
+    files: list[PhotoUploadRequest] = Field(
+        ..., min_length=1, max_length=MAX_PRESIGN_FILES, description="アップロードする写真"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "files": [
+                    {"purpose": "appearance", "content_type": "image/jpeg"},
+                    {"purpose": "route", "content_type": "image/png"},
+                ]
+            }
+        }
+    )
+
+
+class PresignedPhotoUpload(BaseModel):
+    """署名付きアップロードURL"""
+
+    purpose: PhotoPurpose = Field(..., description="写真の用途")
+    key: str = Field(..., description="オブジェクトキー")
+    photo_url: str = Field(..., description="アップロード後に前日報告へ登録する写真URL")
+    method: Literal["POST"] = Field("POST", description="アップロードのHTTPメソッド")
+    url: str = Field(..., description="アップロード先URL")
+    fields: dict[str, str] = Field(
+        ...,
+        description="multipart/form-data に含めるフィールド（file より前に指定する）",
+    )
+
+
+class PhotoUploadPresignResponse(BaseModel):
+    """署名付きアップロードURL発行レスポンス"""
+
+    uploads: list[PresignedPhotoUpload] = Field(..., description="リクエストの順の署名付きURL")
+    expires_at: datetime = Field(..., description="署名付きURLの有効期限")
+    max_bytes: int = Field(..., description="写真の最大サイズ（バイト）")
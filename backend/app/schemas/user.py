@@ -3,11 +3,18 @@
 """
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
 
+# 一覧取得時の総件数の算出方法
+#   exact:     ページと同一クエリで正確な件数を取得
+#   estimated: プランナー統計（EXPLAIN）による推定件数（大きなテーブル向け）
+#   none:      総件数を取得しない
+CountMode = Literal["exact", "estimated", "none"]
+
+
 class UserBase(BaseModel):
     """ユーザーベーススキーマ"""
 
@@ -48,8 +55,11 @@ class UserResponse(UserBase):
 class UserListResponse(BaseModel):
     """ユーザー一覧レスポンススキーマ"""
 
-    total: int = Field(..., description="総件数")
+    total: Optional[int] = Field(
+        ..., description="総件数（count=estimated の場合は推定値、count=none の場合はnull）"
+    )
     users: list[UserResponse] = Field(..., description="ユーザーリスト")
+    next_cursor: Optional[str] = Field(None, description="次ページのカーソル（最終ページはnull）")
 
 
 class CurrentUserResponse(UserResponse):
@@ -1,6 +1,26 @@
 """
 サービスパッケージ
 """
-from app.services.previous_day_report_service import PreviousDayReportService
+from app.services.attendance_service import AsyncAttendanceService, AttendanceService
+from app.services.dashboard_service import AsyncDashboardService, DashboardService
+from app.services.export_service import AsyncExportService, ExportService
+from app.services.previous_day_report_service import (
+    AsyncPreviousDayReportService,
+    PreviousDayReportService,
+)
+from app.services.photo_processing_service import PhotoProcessingService
+from app.services.upload_service import AsyncUploadService, UploadService
 
-__all__ = ["PreviousDayReportService"]
+__all__ = [
+    "PreviousDayReportService",
+    "AsyncPreviousDayReportService",
+    "DashboardService",
+    "AsyncDashboardService",
+    "ExportService",
+    "AsyncExportService",
+    "UploadService",
+    "AsyncUploadService",
+    "PhotoProcessingService",
+    "AttendanceService",
+    "AsyncAttendanceService",
+]
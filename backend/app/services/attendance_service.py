@@ -0,0 +1,283 @@
+"""
+勤怠記録サービス
+"""
+import uuid
+from datetime import date
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.models.attendance import AttendanceRecord
+from app.repositories.attendance_repository import (
+    AsyncAttendanceRepository,
+    AttendanceRepository,
+)
+from app.schemas.attendance import AttendanceStage
+from app.services.upload_service import AsyncUploadService, UploadService
+from app.utils.pagination import decode_cursor
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _check_record_access(record: AttendanceRecord | None, user_id: uuid.UUID, role: str) -> None:
+    """
+    勤怠記録の閲覧権限をチェック
+
+    Raises:
+        HTTPException: 勤怠記録が存在しない、または権限がない場合
+    """
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="勤怠記録が見つかりません",
+        )
+
+    # 自分の記録かチェック（マネージャーは全て閲覧可）
+    if record.staff_id != user_id and role != "manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="この勤怠記録にアクセスする権限がありません",
+        )
+
+
+def _check_staff_access(staff_id: uuid.UUID, user_id: uuid.UUID, role: str) -> None:
+    """
+    スタッフの勤怠記録一覧の閲覧権限をチェック
+
+    Raises:
+        HTTPException: 他のスタッフの一覧をマネージャー以外が指定した場合
+    """
+    if staff_id != user_id and role != "manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="他のスタッフの勤怠記録を閲覧する権限がありません",
+        )
+
+
+def _not_recorded() -> HTTPException:
+    """報告済みの段階の当日の記録が見つからない（報告と再読み出しの間に日付が変わった等）"""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="勤怠記録を更新できませんでした。もう一度報告してください",
+    )
+
+
+class AttendanceService:
+    """勤怠記録サービス"""
+
+    def __init__(self, db: Session):
+        """
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+        self.repository = AttendanceRepository(db)
+        self.upload_service = UploadService()
+
+    def record_stage(
+        self, user_id: uuid.UUID, stage: AttendanceStage, data: BaseModel
+    ) -> tuple[AttendanceRecord, bool]:
+        """
+        当日の勤怠記録に起床・出発・到着の報告を記録
+
+        記録とステータスの遷移は1つのSQL文で行う。同じ段階の報告が重複して届いた場合
+        （二度押し・再送）は最初の報告を残し、当日の記録を読み出して返す
+
+        Args:
+            user_id: スタッフID
+            stage: 報告の段階
+            data: 報告データ（WakeUpReport / DepartureReport / ArrivalReport）
+
+        Returns:
+            (勤怠記録, この報告で記録したか)
+
+        Raises:
+            HTTPException: 写真がアップロードされていない場合
+        """
+        self.upload_service.verify_report_photos(user_id, data)
+
+        record = self.repository.record_stage(user_id, stage, data.model_dump())
+        recorded = record is not None
+        if not recorded:
+            record = self.repository.get_today_by_staff(user_id)
+            if record is None:
+                self.db.rollback()
+                raise _not_recorded()
+
+        # コミット
+        self.db.commit()
+
+        return record, recorded
+
+    def get_today_record(self, user_id: uuid.UUID) -> AttendanceRecord | None:
+        """
+        当日の勤怠記録を取得
+
+        Args:
+            user_id: スタッフID
+
+        Returns:
+            勤怠記録（まだ報告がない場合はNone）
+        """
+        return self.repository.get_today_by_staff(user_id)
+
+    def get_record_by_id(
+        self, record_id: uuid.UUID, user_id: uuid.UUID, role: str = "staff"
+    ) -> AttendanceRecord:
+        """
+        IDで勤怠記録を取得
+
+        Args:
+            record_id: 勤怠記録ID
+            user_id: ユーザーID（権限チェック用）
+            role: ユーザーロール（マネージャーは全スタッフの記録を閲覧可）
+
+        Returns:
+            勤怠記録
+
+        Raises:
+            HTTPException: 勤怠記録が存在しない、または権限がない場合
+        """
+        record = self.repository.get_by_id(record_id)
+        _check_record_access(record, user_id, role)
+        return record
+
+    def get_staff_records(
+        self,
+        staff_id: uuid.UUID,
+        user_id: uuid.UUID,
+        role: str = "staff",
+        limit: int = 10,
+        cursor: str | None = None,
+    ) -> list[AttendanceRecord]:
+        """
+        スタッフの勤怠記録一覧を取得
+
+        Args:
+            staff_id: 一覧を取得するスタッフID
+            user_id: ユーザーID（権限チェック用）
+            role: ユーザーロール（マネージャーは全スタッフの記録を閲覧可）
+            limit: 取得件数
+            cursor: 前ページのレスポンスで返されたカーソル
+
+        Returns:
+            勤怠記録リスト
+
+        Raises:
+            HTTPException: 権限がない、またはカーソルが不正な場合
+        """
+        _check_staff_access(staff_id, user_id, role)
+        after = decode_cursor(cursor, date.fromisoformat, uuid.UUID) if cursor else None
+        return self.repository.get_by_staff(staff_id=staff_id, limit=limit, after=after)
+
+
+class AsyncAttendanceService:
+    """勤怠記録サービス（非同期）"""
+
+    def __init__(self, db: "AsyncSession"):
+        """
+        Args:
+            db: 非同期データベースセッション
+        """
+        self.db = db
+        self.repository = AsyncAttendanceRepository(db)
+        self.upload_service = AsyncUploadService()
+
+    async def record_stage(
+        self, user_id: uuid.UUID, stage: AttendanceStage, data: BaseModel
+    ) -> tuple[AttendanceRecord, bool]:
+        """
+        当日の勤怠記録に起床・出発・到着の報告を記録
+
+        記録とステータスの遷移は1つのSQL文で行う。同じ段階の報告が重複して届いた場合
+        （二度押し・再送）は最初の報告を残し、当日の記録を読み出して返す
+
+        Args:
+            user_id: スタッフID
+            stage: 報告の段階
+            data: 報告データ（WakeUpReport / DepartureReport / ArrivalReport）
+
+        Returns:
+            (勤怠記録, この報告で記録したか)
+
+        Raises:
+            HTTPException: 写真がアップロードされていない場合
+        """
+        await self.upload_service.verify_report_photos(user_id, data)
+
+        record = await self.repository.record_stage(user_id, stage, data.model_dump())
+        recorded = record is not None
+        if not recorded:
+            record = await self.repository.get_today_by_staff(user_id)
+            if record is None:
+                await self.db.rollback()
+                raise _not_recorded()
+
+        # コミット
+        await self.db.commit()
+
+        return record, recorded
+
+    async def get_today_record(self, user_id: uuid.UUID) -> AttendanceRecord | None:
+        """
+        当日の勤怠記録を取得
+
+        Args:
+            user_id: スタッフID
+
+        Returns:
+            勤怠記録（まだ報告がない場合はNone）
+        """
+        return await self.repository.get_today_by_staff(user_id)
+
+    async def get_record_by_id(
+        self, record_id: uuid.UUID, user_id: uuid.UUID, role: str = "staff"
+    ) -> AttendanceRecord:
+        """
+        IDで勤怠記録を取得
+
+        Args:
+            record_id: 勤怠記録ID
+            user_id: ユーザーID（権限チェック用）
+            role: ユーザーロール（マネージャーは全スタッフの記録を閲覧可）
+
+        Returns:
+            勤怠記録
+
+        Raises:
+            HTTPException: 勤怠記録が存在しない、または権限がない場合
+        """
+        record = await self.repository.get_by_id(record_id)
+        _check_record_access(record, user_id, role)
+        return record
+
+    async def get_staff_records(
+        self,
+        staff_id: uuid.UUID,
+        user_id: uuid.UUID,
+        role: str = "staff",
+        limit: int = 10,
+        cursor: str | None = None,
+    ) -> list[AttendanceRecord]:
+        """
+        スタッフの勤怠記録一覧を取得
+
+        Args:
+            staff_id: 一覧を取得するスタッフID
+            user_id: ユーザーID（権限チェック用）
+            role: ユーザーロール（マネージャーは全スタッフの記録を閲覧可）
+            limit: 取得件数
+            cursor: 前ページのレスポンスで返されたカーソル
+
+        Returns:
+            勤怠記録リスト
+
+        Raises:
+            HTTPException: 権限がない、またはカーソルが不正な場合
+        """
+        _check_staff_access(staff_id, user_id, role)
+        after = decode_cursor(cursor, date.fromisoformat, uuid.UUID) if cursor else None
+        return await self.repository.get_by_staff(staff_id=staff_id, limit=limit, after=after)
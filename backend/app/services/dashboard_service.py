@@ -0,0 +1,86 @@
+"""
+ダッシュボードサービス
+"""
+from datetime import date
+from typing import TYPE_CHECKING
+
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.repositories.daily_staff_summary_repository import (
+    AsyncDailyStaffSummaryRepository,
+    DailyStaffSummaryRepository,
+)
+from app.schemas.dashboard import DashboardResponse, DashboardStaffStatus
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _build_dashboard(work_date: date, rows: list[Row]) -> DashboardResponse:
+    """サマリーの行からダッシュボードのレスポンスを組み立てる"""
+    staff = [
+        DashboardStaffStatus(
+            **row._mapping,
+            previous_day_report_status=(
+                "reported" if row.previous_day_report_id is not None else "not_reported"
+            ),
+        )
+        for row in rows
+    ]
+    reported = sum(1 for s in staff if s.previous_day_report_status == "reported")
+    return DashboardResponse(
+        work_date=work_date,
+        total=len(staff),
+        reported=reported,
+        not_reported=len(staff) - reported,
+        staff=staff,
+    )
+
+
+class DashboardService:
+    """ダッシュボードサービス"""
+
+    def __init__(self, db: Session):
+        """
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+        self.repository = DailyStaffSummaryRepository(db)
+
+    def get_daily_dashboard(self, work_date: date) -> DashboardResponse:
+        """
+        勤務日の全スタッフの状況を取得
+
+        Args:
+            work_date: 勤務日
+
+        Returns:
+            ダッシュボード
+        """
+        return _build_dashboard(work_date, self.repository.get_dashboard(work_date))
+
+
+class AsyncDashboardService:
+    """ダッシュボードサービス（非同期）"""
+
+    def __init__(self, db: "AsyncSession"):
+        """
+        Args:
+            db: 非同期データベースセッション
+        """
+        self.db = db
+        self.repository = AsyncDailyStaffSummaryRepository(db)
+
+    async def get_daily_dashboard(self, work_date: date) -> DashboardResponse:
+        """
+        勤務日の全スタッフの状況を取得
+
+        Args:
+            work_date: 勤務日
+
+        Returns:
+            ダッシュボード
+        """
+        return _build_dashboard(work_date, await self.repository.get_dashboard(work_date))
@@ -0,0 +1,257 @@
+"""
+エクスポートサービス
+"""
+import csv
+import io
+import os
+import uuid
+from datetime import date
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Iterator, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.repositories.previous_day_report_repository import (
+    AsyncPreviousDayReportRepository,
+    PreviousDayReportRepository,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# 前日報告CSVの列（見出し, 行の属性名）
+PREVIOUS_DAY_REPORT_CSV_COLUMNS = (
+    ("報告ID", "id"),
+    ("報告日", "report_date"),
+    ("ユーザーID", "user_id"),
+    ("氏名", "name"),
+    ("メールアドレス", "email"),
+    ("予定起床時刻", "next_wake_up_time"),
+    ("予定出発時刻", "next_departure_time"),
+    ("予定到着時刻", "next_arrival_time"),
+    ("身だしなみ写真URL", "appearance_photo_url"),
+    ("経路スクリーンショットURL", "route_photo_url"),
+    ("備考", "notes"),
+    ("登録日時", "created_at"),
+    ("更新日時", "updated_at"),
+)
+
+# Excelで文字化けしないようUTF-8のBOMを先頭に付ける
+CSV_BOM = "\ufeff"
+
+# 表計算ソフトが数式として解釈する先頭の文字（CSVインジェクション対策で ' を前置する）
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def resolve_export_mode() -> str:
+    """
+    CSVエクスポートの応答方式を決定
+
+    EXPORT_RESPONSE_MODE=auto の場合、Lambda上（AWS_LAMBDA_FUNCTION_NAME が設定されている）では
+    buffered、それ以外では stream とする（Lambdaでは応答が全てバッファされ、逐次送信できないため）
+
+    Returns:
+        str: stream / buffered
+    """
+    mode = settings.EXPORT_RESPONSE_MODE.lower()
+    if mode == "auto":
+        return "buffered" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else "stream"
+    if mode not in ("stream", "buffered"):
+        raise ValueError(f"不正な EXPORT_RESPONSE_MODE です: {settings.EXPORT_RESPONSE_MODE}")
+    return mode
+
+
+def _csv_value(value: Any) -> Any:
+    """CSVのセルの値（数式として解釈される文字列は ' を前置して文字列として扱わせる）"""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_header() -> bytes:
+    """CSVの見出し行（BOM付き）"""
+    buffer = io.StringIO()
+    buffer.write(CSV_BOM)
+    csv.writer(buffer).writerow(name for name, _ in PREVIOUS_DAY_REPORT_CSV_COLUMNS)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _csv_rows(rows: Iterable[Row]) -> bytes:
+    """行のバッチをCSVの1チャンクに変換"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [_csv_value(getattr(row, attr)) for _, attr in PREVIOUS_DAY_REPORT_CSV_COLUMNS]
+        for row in rows
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+def _validate_range(date_from: date | None, date_to: date | None) -> None:
+    """期間の指定が正しいか確認"""
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="開始日は終了日以前の日付を指定してください",
+        )
+
+
+def _too_large() -> HTTPException:
+    """CSVが EXPORT_MAX_BYTES を超える（buffered の場合）"""
+    limit = f"{settings.EXPORT_MAX_BYTES:,}バイト"
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"エクスポートするCSVが上限（{limit}）を超えます。期間またはスタッフを絞り込んでください",
+    )
+
+
+class ExportService:
+    """エクスポートサービス"""
+
+    def __init__(self, db: Session):
+        """
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+        self.report_repository = PreviousDayReportRepository(db)
+
+    def export_previous_day_reports_csv(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        user_id: uuid.UUID | None = None,
+    ) -> Iterator[bytes]:
+        """
+        前日報告をCSVでエクスポート
+
+        クエリ（サーバーサイドカーソルのオープン）はこの呼び出しで行い、
+        CSVは取得したバッチごとに1チャンクずつ生成する
+
+        Args:
+            date_from: 報告日の開始日（含む）
+            date_to: 報告日の終了日（含む）
+            user_id: スタッフのユーザーID
+
+        Returns:
+            CSVチャンクのイテレーター
+
+        Raises:
+            HTTPException: 期間の指定が不正な場合
+        """
+        _validate_range(date_from, date_to)
+        batches = self.report_repository.stream_for_export(date_from, date_to, user_id)
+        return self._generate_csv(batches)
+
+    def build_previous_day_reports_csv(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        user_id: uuid.UUID | None = None,
+    ) -> bytes:
+        """
+        前日報告のCSV全体を作成（EXPORT_RESPONSE_MODE=buffered 用）
+
+        Args:
+            date_from: 報告日の開始日（含む）
+            date_to: 報告日の終了日（含む）
+            user_id: スタッフのユーザーID
+
+        Returns:
+            bytes: CSV
+
+        Raises:
+            HTTPException: 期間の指定が不正な場合、またはCSVが EXPORT_MAX_BYTES を超える場合
+        """
+        chunks = self.export_previous_day_reports_csv(date_from, date_to, user_id)
+        body = bytearray()
+        for chunk in chunks:
+            body += chunk
+            if len(body) > settings.EXPORT_MAX_BYTES:
+                chunks.close()
+                raise _too_large()
+        return bytes(body)
+
+    @staticmethod
+    def _generate_csv(batches: Iterator[Sequence[Row]]) -> Iterator[bytes]:
+        """バッチごとにCSVチャンクを生成"""
+        yield _csv_header()
+        for rows in batches:
+            yield _csv_rows(rows)
+
+
+class AsyncExportService:
+    """エクスポートサービス（非同期）"""
+
+    def __init__(self, db: "AsyncSession"):
+        """
+        Args:
+            db: 非同期データベースセッション
+        """
+        self.db = db
+        self.report_repository = AsyncPreviousDayReportRepository(db)
+
+    async def export_previous_day_reports_csv(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        user_id: uuid.UUID | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        前日報告をCSVでエクスポート
+
+        クエリ（サーバーサイドカーソルのオープン）はこの呼び出しで行い、
+        CSVは取得したバッチごとに1チャンクずつ生成する
+
+        Args:
+            date_from: 報告日の開始日（含む）
+            date_to: 報告日の終了日（含む）
+            user_id: スタッフのユーザーID
+
+        Returns:
+            CSVチャンクの非同期イテレーター
+
+        Raises:
+            HTTPException: 期間の指定が不正な場合
+        """
+        _validate_range(date_from, date_to)
+        batches = await self.report_repository.stream_for_export(date_from, date_to, user_id)
+        return self._generate_csv(batches)
+
+    async def build_previous_day_reports_csv(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        user_id: uuid.UUID | None = None,
+    ) -> bytes:
+        """
+        前日報告のCSV全体を作成（EXPORT_RESPONSE_MODE=buffered 用）
+
+        Args:
+            date_from: 報告日の開始日（含む）
+            date_to: 報告日の終了日（含む）
+            user_id: スタッフのユーザーID
+
+        Returns:
+            bytes: CSV
+
+        Raises:
+            HTTPException: 期間の指定が不正な場合、またはCSVが EXPORT_MAX_BYTES を超える場合
+        """
+        chunks = await self.export_previous_day_reports_csv(date_from, date_to, user_id)
+        body = bytearray()
+        async for chunk in chunks:
+            body += chunk
+            if len(body) > settings.EXPORT_MAX_BYTES:
+                await chunks.aclose()
+                raise _too_large()
+        return bytes(body)
+
+    @staticmethod
+    async def _generate_csv(batches: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+        """バッチごとにCSVチャンクを生成"""
+        yield _csv_header()
+        async for rows in batches:
+            yield _csv_rows(rows)
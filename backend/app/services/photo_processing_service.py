@@ -0,0 +1,199 @@
+"""
+写真の後処理サービス
+
+前日報告の写真から、縮小・EXIF除去したWebPの派生画像（サムネイル・プレビュー）を作成し、
+派生画像URLを前日報告に記録する。画像のデコード・縮小・エンコードはリクエスト処理とは別の
+ワーカースレッドで実行する（Pillow は処理中にGILを解放するため、スレッドで並列に処理できる）
+"""
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal, get_engine
+from app.models.previous_day_report import PreviousDayReport
+from app.repositories.previous_day_report_repository import (
+    DERIVED_PHOTO_COLUMNS,
+    PreviousDayReportRepository,
+)
+from app.utils.images import WEBP_CONTENT_TYPE, render_webp
+from app.utils.s3 import get_object_bytes, key_from_photo_url, photo_url, put_object
+
+logger = logging.getLogger(__name__)
+
+# 派生画像の名前（DERIVED_PHOTO_COLUMNS の列の順）
+DERIVED_PHOTO_NAMES = ("thumbnail", "preview")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def derived_photo_key(key: str, name: str) -> str:
+    """
+    派生画像のオブジェクトキー
+
+    元の写真と同じ接頭辞に置くため、写真の削除・移動と同じ単位で扱える
+    （例: photos/{user_id}/appearance/abc.jpg → photos/{user_id}/appearance/abc.thumbnail.webp）
+    """
+    directory, _, filename = key.rpartition("/")
+    stem = filename.rsplit(".", 1)[0] if "." in filename else filename
+    return f"{directory}/{stem}.{name}.webp" if directory else f"{stem}.{name}.webp"
+
+
+def _pending_photos(report: PreviousDayReport | object) -> dict[str, str]:
+    """
+    派生画像が未作成の写真（写真用バケットのもの）
+
+    Returns:
+        dict[str, str]: 写真URLの列名 → 写真URL
+    """
+    pending = {}
+    for photo, derived in DERIVED_PHOTO_COLUMNS.items():
+        url = getattr(report, photo)
+        if url and getattr(report, derived[0]) is None and key_from_photo_url(url):
+            pending[photo] = url
+    return pending
+
+
+def process_photo(key: str) -> dict[str, str]:
+    """
+    写真の派生画像を作成してS3に保存（ブロッキングI/O・CPU処理）
+
+    Args:
+        key: 写真のオブジェクトキー
+
+    Returns:
+        dict[str, str]: 派生画像の名前 → URL
+
+    Raises:
+        botocore.exceptions.ClientError: 写真の取得・派生画像の保存に失敗した場合
+        PIL.UnidentifiedImageError: 画像として読み込めない場合
+    """
+    sizes = {"thumbnail": settings.PHOTO_THUMBNAIL_SIZE, "preview": settings.PHOTO_PREVIEW_SIZE}
+    rendered = render_webp(get_object_bytes(key), sizes, quality=settings.PHOTO_WEBP_QUALITY)
+    urls = {}
+    for name, body in rendered.items():
+        derived_key = derived_photo_key(key, name)
+        put_object(derived_key, body, WEBP_CONTENT_TYPE)
+        urls[name] = photo_url(derived_key)
+    return urls
+
+
+class PhotoProcessingService:
+    """写真の後処理サービス（ワーカースレッド・バッチ処理から同期セッションで使用する）"""
+
+    def __init__(self, db: Session):
+        """
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+        self.repository = PreviousDayReportRepository(db)
+
+    def process_report(self, report_id: uuid.UUID) -> uuid.UUID | None:
+        """
+        前日報告の写真の派生画像を作成し、派生画像URLを記録
+
+        画像処理の間はトランザクションを保持しない。処理中に写真が差し替えられた場合、
+        古い写真の派生画像URLは記録しない
+
+        Args:
+            report_id: 前日報告ID
+
+        Returns:
+            uuid.UUID | None: 派生画像URLを記録した前日報告のユーザーID（記録しなかった場合はNone）
+        """
+        report = self.repository.get_photos(report_id)
+        self.db.rollback()
+        if report is None:
+            return None
+
+        user_id = None
+        for photo, url in _pending_photos(report).items():
+            urls = process_photo(key_from_photo_url(url))
+            values = {
+                column: urls[name]
+                for name, column in zip(DERIVED_PHOTO_NAMES, DERIVED_PHOTO_COLUMNS[photo])
+            }
+            updated = self.repository.set_derived_photo_urls(report_id, photo, url, values)
+            self.db.commit()
+            user_id = updated or user_id
+        return user_id
+
+
+def resolve_photo_processing_mode() -> str:
+    """
+    写真の後処理モードを決定
+
+    PHOTO_PROCESSING_MODE=auto の場合、Lambda上（AWS_LAMBDA_FUNCTION_NAME が設定されている）では
+    off、それ以外では pool とする（Lambdaはレスポンス返却後に実行環境が凍結されるため、
+    バックグラウンドの処理は scripts/process_photos.py で行う）
+
+    Returns:
+        str: pool / off
+    """
+    mode = settings.PHOTO_PROCESSING_MODE.lower()
+    if mode == "auto":
+        return "off" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else "pool"
+    if mode not in ("pool", "off"):
+        raise ValueError(f"不正な PHOTO_PROCESSING_MODE です: {settings.PHOTO_PROCESSING_MODE}")
+    return mode
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """写真の後処理のワーカープールを取得（初回呼び出し時に作成）"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PHOTO_PROCESSING_WORKERS, thread_name_prefix="photo"
+                )
+    return _executor
+
+
+def _process_report_job(report_id: uuid.UUID) -> uuid.UUID | None:
+    """ワーカースレッドで前日報告の写真を処理（失敗はログに記録し、例外を送出しない）"""
+    get_engine()
+    with SessionLocal() as db:
+        try:
+            return PhotoProcessingService(db).process_report(report_id)
+        except Exception:
+            logger.exception("写真の後処理に失敗しました: report_id=%s", report_id)
+            return None
+
+
+def submit_report_photos(report: PreviousDayReport) -> Future | None:
+    """
+    前日報告の写真の後処理をワーカープールに登録
+
+    コミット後に呼び出す。後処理モードが off の場合、または派生画像が未作成の写真
+    （写真用バケットのもの）がない場合は登録しない
+
+    Args:
+        report: 前日報告
+
+    Returns:
+        Future | None: 結果（派生画像URLを記録した前日報告のユーザーID）のFuture
+    """
+    if resolve_photo_processing_mode() == "off" or not _pending_photos(report):
+        return None
+    return _get_executor().submit(_process_report_job, report.id)
+
+
+def shutdown_photo_processing(wait: bool = True) -> None:
+    """
+    写真の後処理のワーカープールを停止
+
+    Args:
+        wait: 実行中・登録済みの処理の完了を待つ場合True
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
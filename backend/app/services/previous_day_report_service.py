@@ -2,17 +2,117 @@
 前日報告サービス
 """
 import uuid
+from concurrent.futures import Future
 from datetime import date
+from typing import TYPE_CHECKING
 
 from fastapi import HTTPException, status
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.database import pin_primary
 from app.models.previous_day_report import PreviousDayReport
-from app.repositories.previous_day_report_repository import PreviousDayReportRepository
+from app.repositories.daily_staff_summary_repository import (
+    AsyncDailyStaffSummaryRepository,
+    DailyStaffSummaryRepository,
+)
+from app.repositories.previous_day_report_repository import (
+    AsyncPreviousDayReportRepository,
+    PreviousDayReportRepository,
+)
 from app.schemas.previous_day_report import (
     PreviousDayReportCreate,
+    PreviousDayReportResponse,
     PreviousDayReportUpdate,
 )
+from app.services.photo_processing_service import submit_report_photos
+from app.services.upload_service import AsyncUploadService, UploadService
+from app.utils.cache import MISSING, GroupedCache
+from app.utils.pagination import decode_cursor
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# ユーザーごとの前日報告の読み出しキャッシュ（user_id → 最新の報告・一覧の1ページ目）
+# 書き込み時はユーザー単位で無効化する。プロセス内キャッシュだが、最新の報告・一覧とも
+# 読み出しの前に確認したバージョンをキーに含めるため、他プロセスでの更新も即時に反映される
+report_cache = GroupedCache(
+    maxsize=settings.REPORT_CACHE_SIZE, ttl=settings.REPORT_CACHE_TTL_SECONDS
+)
+
+_RESPONSE_FIELDS = tuple(PreviousDayReportResponse.model_fields)
+
+
+def _snapshot(report: PreviousDayReport) -> PreviousDayReportResponse:
+    """
+    前日報告をキャッシュ可能なレスポンススキーマに変換
+
+    ORMオブジェクトはセッションに紐づくため、リクエストをまたいで共有できる値に
+    コピーする（DBから読み出した値のため検証は省略）
+    """
+    return PreviousDayReportResponse.model_construct(
+        **{name: getattr(report, name) for name in _RESPONSE_FIELDS}
+    )
+
+
+def _latest_cache_key(version: Row | None) -> tuple:
+    """最新の報告のキャッシュキー（確認したバージョン。報告がない場合は None）"""
+    if version is None:
+        return ("latest", None, None)
+    return ("latest", version.id, version.updated_at)
+
+
+def _page_cache_key(
+    limit: int, offset: int, cursor: str | None, version: Row | None
+) -> tuple | None:
+    """一覧のキャッシュキー（キャッシュするのはバージョン指定時の1ページ目のみ）"""
+    if version is None or offset != 0 or cursor is not None:
+        return None
+    return ("page", limit, version.count, version.updated_at)
+
+
+def _invalidate_processed(future: Future) -> None:
+    """
+    写真の後処理で派生画像URLを記録した場合、そのユーザーのキャッシュを無効化する
+
+    レプリカの遅延で派生画像URLのない報告を再びキャッシュしないよう、直後の読み出しはプライマリで行う
+    """
+    user_id = future.result()
+    if user_id is not None:
+        pin_primary(user_id)
+        report_cache.invalidate(user_id)
+
+
+def _submit_photo_processing(report: PreviousDayReport) -> None:
+    """コミット後、写真の後処理（派生画像の作成）をワーカープールに登録"""
+    future = submit_report_photos(report)
+    if future is not None:
+        future.add_done_callback(_invalidate_processed)
+
+
+def _check_report_access(
+    report: PreviousDayReport | Row | None, user_id: uuid.UUID, role: str
+) -> None:
+    """
+    前日報告の閲覧権限をチェック
+
+    Raises:
+        HTTPException: 前日報告が存在しない、または権限がない場合
+    """
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="前日報告が見つかりません",
+        )
+
+    # 自分の報告かチェック（マネージャーは閲覧のみ全て可）
+    if report.user_id != user_id and role != "manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="この前日報告にアクセスする権限がありません",
+        )
 
 
 class PreviousDayReportService:
@@ -25,6 +125,8 @@ class PreviousDayReportService:
         """
         self.db = db
         self.repository = PreviousDayReportRepository(db)
+        self.summary_repository = DailyStaffSummaryRepository(db)
+        self.upload_service = UploadService()
 
     def create_report(
         self, user_id: uuid.UUID, data: PreviousDayReportCreate
@@ -32,6 +134,9 @@ class PreviousDayReportService:
         """
         前日報告を作成
 
+        存在チェックと作成を INSERT ... ON CONFLICT DO NOTHING の1文で行うため、
+        同時に送信された場合も一意制約により1件だけ作成される
+
         Args:
             user_id: ユーザーID
             data: 前日報告作成データ
@@ -40,30 +145,60 @@ class PreviousDayReportService:
             作成された前日報告
 
         Raises:
-            HTTPException: 同じ日付の報告が既に存在する場合
+            HTTPException: 写真がアップロードされていない、または同じ日付の報告が既に存在する場合
         """
-        # 同じ日付の報告が既に存在するかチェック
-        existing_report = self.repository.get_by_user_and_date(
-            user_id=user_id, report_date=data.report_date
-        )
+        self.upload_service.verify_report_photos(user_id, data)
 
-        if existing_report:
+        report, _ = self.repository.insert(user_id=user_id, data=data, on_conflict="reject")
+
+        if report is None:
+            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"前日報告は既に登録されています: {data.report_date}",
             )
 
-        # 前日報告を作成
-        report = self.repository.create(user_id=user_id, data=data)
-
         # コミット
         self.db.commit()
-        self.db.refresh(report)
+        report_cache.invalidate(user_id)
+        _submit_photo_processing(report)
 
         return report
 
+    def upsert_report(
+        self, user_id: uuid.UUID, data: PreviousDayReportCreate
+    ) -> tuple[PreviousDayReport, bool]:
+        """
+        前日報告を作成（同じ日付の報告が既に存在する場合は上書き）
+
+        INSERT ... ON CONFLICT DO UPDATE の1文で行うため、モバイルからの再送が
+        同時に届いても重複せず、最後に届いた内容が残る
+
+        Args:
+            user_id: ユーザーID
+            data: 前日報告作成データ
+
+        Returns:
+            (前日報告, 新規作成したか)
+
+        Raises:
+            HTTPException: 写真がアップロードされていない場合
+        """
+        self.upload_service.verify_report_photos(user_id, data)
+
+        report, created = self.repository.insert(
+            user_id=user_id, data=data, on_conflict="upsert"
+        )
+
+        # コミット
+        self.db.commit()
+        report_cache.invalidate(user_id)
+        _submit_photo_processing(report)
+
+        return report, created
+
     def get_report_by_id(
-        self, report_id: uuid.UUID, user_id: uuid.UUID
+        self, report_id: uuid.UUID, user_id: uuid.UUID, role: str = "staff"
     ) -> PreviousDayReport:
         """
         IDで前日報告を取得
@@ -71,6 +206,7 @@ class PreviousDayReportService:
         Args:
             report_id: 前日報告ID
             user_id: ユーザーID（権限チェック用）
+            role: ユーザーロール（マネージャーは全スタッフの報告を閲覧可）
 
         Returns:
             前日報告
@@ -79,49 +215,124 @@ class PreviousDayReportService:
             HTTPException: 前日報告が存在しない、または権限がない場合
         """
         report = self.repository.get_by_id(report_id)
+        _check_report_access(report, user_id, role)
+        return report
 
-        if not report:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="前日報告が見つかりません",
-            )
+    def get_report_version(
+        self, report_id: uuid.UUID, user_id: uuid.UUID, role: str = "staff"
+    ) -> Row:
+        """
+        IDで前日報告のバージョンを取得（条件付きGETの確認用）
 
-        # 自分の報告かチェック（マネージャーの場合は別途権限チェックが必要）
-        if report.user_id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="この前日報告にアクセスする権限がありません",
-            )
+        Args:
+            report_id: 前日報告ID
+            user_id: ユーザーID（権限チェック用）
+            role: ユーザーロール（マネージャーは全スタッフの報告を閲覧可）
 
-        return report
+        Returns:
+            (id, user_id, updated_at)
+
+        Raises:
+            HTTPException: 前日報告が存在しない、または権限がない場合
+        """
+        version = self.repository.get_version_by_id(report_id)
+        _check_report_access(version, user_id, role)
+        return version
 
     def get_user_reports(
-        self, user_id: uuid.UUID, limit: int = 10, offset: int = 0
-    ) -> list[PreviousDayReport]:
+        self,
+        user_id: uuid.UUID,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: str | None = None,
+        version: Row | None = None,
+    ) -> list[PreviousDayReportResponse]:
         """
         ユーザーの前日報告一覧を取得
 
+        version を指定した場合、1ページ目（offset=0、カーソルなし）はバージョンを
+        キーに含めてキャッシュする
+
         Args:
             user_id: ユーザーID
             limit: 取得件数
-            offset: オフセット
+            offset: オフセット（cursor指定時は無視）
+            cursor: 前ページのレスポンスで返されたカーソル
+            version: get_user_reports_version で取得した一覧のバージョン
 
         Returns:
             前日報告リスト
+
+        Raises:
+            HTTPException: カーソルが不正な場合
         """
-        return self.repository.get_by_user(user_id=user_id, limit=limit, offset=offset)
+        key = _page_cache_key(limit, offset, cursor, version)
+        if key is not None:
+            cached, token = report_cache.get(user_id, key)
+            if cached is not MISSING:
+                return list(cached)
+
+        after = decode_cursor(cursor, date.fromisoformat, uuid.UUID) if cursor else None
+        reports = [
+            _snapshot(report)
+            for report in self.repository.get_by_user(
+                user_id=user_id, limit=limit, offset=offset, after=after
+            )
+        ]
 
-    def get_latest_report(self, user_id: uuid.UUID) -> PreviousDayReport | None:
+        if key is not None:
+            report_cache.set(user_id, key, tuple(reports), token)
+        return reports
+
+    def get_latest_report(
+        self, user_id: uuid.UUID, version: Row | None = None
+    ) -> PreviousDayReportResponse | None:
         """
-        ユーザーの最新の前日報告を取得
+        ユーザーの最新の前日報告を取得（キャッシュになければDBから取得して保存）
+
+        キャッシュのキーには get_latest_report_version で確認したバージョン（id, updated_at）を
+        含めるため、他プロセスで更新された場合はキャッシュを使わずにDBから取得する。
+        DBから取得した報告は、取得した報告自身のバージョンをキーに保存する
 
         Args:
             user_id: ユーザーID
+            version: get_latest_report_version で取得したバージョン（報告がない場合は None）
 
         Returns:
             最新の前日報告（存在しない場合はNone）
         """
-        return self.repository.get_latest_by_user(user_id)
+        cached, token = report_cache.get(user_id, _latest_cache_key(version))
+        if cached is not MISSING:
+            return cached
+
+        report = self.repository.get_latest_by_user(user_id)
+        latest = _snapshot(report) if report else None
+        report_cache.set(user_id, _latest_cache_key(latest), latest, token)
+        return latest
+
+    def get_latest_report_version(self, user_id: uuid.UUID) -> Row | None:
+        """
+        ユーザーの最新の前日報告のバージョンを取得（条件付きGETの確認用）
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            (id, updated_at)（存在しない場合はNone）
+        """
+        return self.repository.get_latest_version_by_user(user_id)
+
+    def get_user_reports_version(self, user_id: uuid.UUID) -> Row:
+        """
+        ユーザーの前日報告一覧のバージョンを取得（条件付きGETの確認用）
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            (count, updated_at)
+        """
+        return self.repository.get_collection_version_by_user(user_id)
 
     def update_report(
         self, report_id: uuid.UUID, user_id: uuid.UUID, data: PreviousDayReportUpdate
@@ -138,15 +349,34 @@ class PreviousDayReportService:
             更新された前日報告
 
         Raises:
-            HTTPException: 前日報告が存在しない、または権限がない場合
+            HTTPException: 前日報告が存在しない、権限がない、
+                または写真がアップロードされていない場合
         """
         report = self.get_report_by_id(report_id=report_id, user_id=user_id)
+        previous_report_date = report.report_date
+        self.upload_service.verify_report_photos(user_id, data)
+
+        # 更新（報告日の変更先に既に報告がある場合は一意制約違反となる）
+        try:
+            updated_report = self.repository.update(report=report, data=data)
+        except IntegrityError:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"前日報告は既に登録されています: {data.report_date}",
+            )
 
-        # 更新
-        updated_report = self.repository.update(report=report, data=data)
+        # サマリーを更新（報告日が変わった場合は元の勤務日から取り除く）
+        if updated_report.report_date != previous_report_date:
+            self.summary_repository.clear_previous_day_report(
+                report_id=report.id, user_id=report.user_id, report_date=previous_report_date
+            )
+        self.summary_repository.record_previous_day_report(updated_report)
 
         # コミット
         self.db.commit()
+        report_cache.invalidate(updated_report.user_id)
+        _submit_photo_processing(updated_report)
         self.db.refresh(updated_report)
 
         return updated_report
@@ -165,7 +395,301 @@ class PreviousDayReportService:
         report = self.get_report_by_id(report_id=report_id, user_id=user_id)
 
         # 削除
+        self.summary_repository.clear_previous_day_report(
+            report_id=report.id, user_id=report.user_id, report_date=report.report_date
+        )
         self.repository.delete(report)
 
         # コミット
         self.db.commit()
+        report_cache.invalidate(report.user_id)
+
+
+class AsyncPreviousDayReportService:
+    """前日報告サービス（非同期）"""
+
+    def __init__(self, db: "AsyncSession"):
+        """
+        Args:
+            db: 非同期データベースセッション
+        """
+        self.db = db
+        self.repository = AsyncPreviousDayReportRepository(db)
+        self.summary_repository = AsyncDailyStaffSummaryRepository(db)
+        self.upload_service = AsyncUploadService()
+
+    async def create_report(
+        self, user_id: uuid.UUID, data: PreviousDayReportCreate
+    ) -> PreviousDayReport:
+        """
+        前日報告を作成
+
+        存在チェックと作成を INSERT ... ON CONFLICT DO NOTHING の1文で行うため、
+        同時に送信された場合も一意制約により1件だけ作成される
+
+        Args:
+            user_id: ユーザーID
+            data: 前日報告作成データ
+
+        Returns:
+            作成された前日報告
+
+        Raises:
+            HTTPException: 写真がアップロードされていない、または同じ日付の報告が既に存在する場合
+        """
+        await self.upload_service.verify_report_photos(user_id, data)
+
+        report, _ = await self.repository.insert(user_id=user_id, data=data, on_conflict="reject")
+
+        if report is None:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"前日報告は既に登録されています: {data.report_date}",
+            )
+
+        # コミット
+        await self.db.commit()
+        report_cache.invalidate(user_id)
+        _submit_photo_processing(report)
+
+        return report
+
+    async def upsert_report(
+        self, user_id: uuid.UUID, data: PreviousDayReportCreate
+    ) -> tuple[PreviousDayReport, bool]:
+        """
+        前日報告を作成（同じ日付の報告が既に存在する場合は上書き）
+
+        INSERT ... ON CONFLICT DO UPDATE の1文で行うため、モバイルからの再送が
+        同時に届いても重複せず、最後に届いた内容が残る
+
+        Args:
+            user_id: ユーザーID
+            data: 前日報告作成データ
+
+        Returns:
+            (前日報告, 新規作成したか)
+
+        Raises:
+            HTTPException: 写真がアップロードされていない場合
+        """
+        await self.upload_service.verify_report_photos(user_id, data)
+
+        report, created = await self.repository.insert(
+            user_id=user_id, data=data, on_conflict="upsert"
+        )
+
+        # コミット
+        await self.db.commit()
+        report_cache.invalidate(user_id)
+        _submit_photo_processing(report)
+
+        return report, created
+
+    async def get_report_by_id(
+        self, report_id: uuid.UUID, user_id: uuid.UUID, role: str = "staff"
+    ) -> PreviousDayReport:
+        """
+        IDで前日報告を取得
+
+        Args:
+            report_id: 前日報告ID
+            user_id: ユーザーID（権限チェック用）
+            role: ユーザーロール（マネージャーは全スタッフの報告を閲覧可）
+
+        Returns:
+            前日報告
+
+        Raises:
+            HTTPException: 前日報告が存在しない、または権限がない場合
+        """
+        report = await self.repository.get_by_id(report_id)
+        _check_report_access(report, user_id, role)
+        return report
+
+    async def get_report_version(
+        self, report_id: uuid.UUID, user_id: uuid.UUID, role: str = "staff"
+    ) -> Row:
+        """
+        IDで前日報告のバージョンを取得（条件付きGETの確認用）
+
+        Args:
+            report_id: 前日報告ID
+            user_id: ユーザーID（権限チェック用）
+            role: ユーザーロール（マネージャーは全スタッフの報告を閲覧可）
+
+        Returns:
+            (id, user_id, updated_at)
+
+        Raises:
+            HTTPException: 前日報告が存在しない、または権限がない場合
+        """
+        version = await self.repository.get_version_by_id(report_id)
+        _check_report_access(version, user_id, role)
+        return version
+
+    async def get_user_reports(
+        self,
+        user_id: uuid.UUID,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: str | None = None,
+        version: Row | None = None,
+    ) -> list[PreviousDayReportResponse]:
+        """
+        ユーザーの前日報告一覧を取得
+
+        version を指定した場合、1ページ目（offset=0、カーソルなし）はバージョンを
+        キーに含めてキャッシュする
+
+        Args:
+            user_id: ユーザーID
+            limit: 取得件数
+            offset: オフセット（cursor指定時は無視）
+            cursor: 前ページのレスポンスで返されたカーソル
+            version: get_user_reports_version で取得した一覧のバージョン
+
+        Returns:
+            前日報告リスト
+
+        Raises:
+            HTTPException: カーソルが不正な場合
+        """
+        key = _page_cache_key(limit, offset, cursor, version)
+        if key is not None:
+            cached, token = report_cache.get(user_id, key)
+            if cached is not MISSING:
+                return list(cached)
+
+        after = decode_cursor(cursor, date.fromisoformat, uuid.UUID) if cursor else None
+        reports = [
+            _snapshot(report)
+            for report in await self.repository.get_by_user(
+                user_id=user_id, limit=limit, offset=offset, after=after
+            )
+        ]
+
+        if key is not None:
+            report_cache.set(user_id, key, tuple(reports), token)
+        return reports
+
+    async def get_latest_report(
+        self, user_id: uuid.UUID, version: Row | None = None
+    ) -> PreviousDayReportResponse | None:
+        """
+        ユーザーの最新の前日報告を取得（キャッシュになければDBから取得して保存）
+
+        キャッシュのキーには get_latest_report_version で確認したバージョン（id, updated_at）を
+        含めるため、他プロセスで更新された場合はキャッシュを使わずにDBから取得する。
+        DBから取得した報告は、取得した報告自身のバージョンをキーに保存する
+
+        Args:
+            user_id: ユーザーID
+            version: get_latest_report_version で取得したバージョン（報告がない場合は None）
+
+        Returns:
+            最新の前日報告（存在しない場合はNone）
+        """
+        cached, token = report_cache.get(user_id, _latest_cache_key(version))
+        if cached is not MISSING:
+            return cached
+
+        report = await self.repository.get_latest_by_user(user_id)
+        latest = _snapshot(report) if report else None
+        report_cache.set(user_id, _latest_cache_key(latest), latest, token)
+        return latest
+
+    async def get_latest_report_version(self, user_id: uuid.UUID) -> Row | None:
+        """
+        ユーザーの最新の前日報告のバージョンを取得（条件付きGETの確認用）
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            (id, updated_at)（存在しない場合はNone）
+        """
+        return await self.repository.get_latest_version_by_user(user_id)
+
+    async def get_user_reports_version(self, user_id: uuid.UUID) -> Row:
+        """
+        ユーザーの前日報告一覧のバージョンを取得（条件付きGETの確認用）
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            (count, updated_at)
+        """
+        return await self.repository.get_collection_version_by_user(user_id)
+
+    async def update_report(
+        self, report_id: uuid.UUID, user_id: uuid.UUID, data: PreviousDayReportUpdate
+    ) -> PreviousDayReport:
+        """
+        前日報告を更新
+
+        Args:
+            report_id: 前日報告ID
+            user_id: ユーザーID（権限チェック用）
+            data: 更新データ
+
+        Returns:
+            更新された前日報告
+
+        Raises:
+            HTTPException: 前日報告が存在しない、権限がない、
+                または写真がアップロードされていない場合
+        """
+        report = await self.get_report_by_id(report_id=report_id, user_id=user_id)
+        previous_report_date = report.report_date
+        await self.upload_service.verify_report_photos(user_id, data)
+
+        # 更新（報告日の変更先に既に報告がある場合は一意制約違反となる）
+        try:
+            updated_report = await self.repository.update(report=report, data=data)
+        except IntegrityError:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"前日報告は既に登録されています: {data.report_date}",
+            )
+
+        # サマリーを更新（報告日が変わった場合は元の勤務日から取り除く）
+        if updated_report.report_date != previous_report_date:
+            await self.summary_repository.clear_previous_day_report(
+                report_id=report.id, user_id=report.user_id, report_date=previous_report_date
+            )
+        await self.summary_repository.record_previous_day_report(updated_report)
+
+        # コミット
+        await self.db.commit()
+        report_cache.invalidate(updated_report.user_id)
+        _submit_photo_processing(updated_report)
+        await self.db.refresh(updated_report)
+
+        return updated_report
+
+    async def delete_report(self, report_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        """
+        前日報告を削除
+
+        Args:
+            report_id: 前日報告ID
+            user_id: ユーザーID（権限チェック用）
+
+        Raises:
+            HTTPException: 前日報告が存在しない、または権限がない場合
+        """
+        report = await self.get_report_by_id(report_id=report_id, user_id=user_id)
+
+        # 削除
+        await self.summary_repository.clear_previous_day_report(
+            report_id=report.id, user_id=report.user_id, report_date=report.report_date
+        )
+        await self.repository.delete(report)
+
+        # コミット
+        await self.db.commit()
+        report_cache.invalidate(report.user_id)
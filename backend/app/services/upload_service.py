@@ -0,0 +1,196 @@
+"""
+写真アップロードサービス
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.schemas.upload import (
+    PhotoPurpose,
+    PhotoUploadPresignResponse,
+    PhotoUploadRequest,
+    PresignedPhotoUpload,
+)
+from app.utils.s3 import (
+    PHOTO_KEY_PREFIX,
+    key_from_photo_url,
+    object_exists,
+    photo_url,
+    presign_post,
+)
+
+# Content-Type → 拡張子
+PHOTO_EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png"}
+
+# 前日報告の写真URLフィールド → 写真の用途
+REPORT_PHOTO_FIELDS: dict[str, PhotoPurpose] = {
+    "appearance_photo_url": "appearance",
+    "route_photo_url": "route",
+}
+
+
+def photo_key_prefix(user_id: uuid.UUID, purpose: PhotoPurpose) -> str:
+    """ユーザー・用途ごとのオブジェクトキーの接頭辞"""
+    return f"{PHOTO_KEY_PREFIX}/{user_id}/{purpose}/"
+
+
+def _presign_photo_uploads(
+    user_id: uuid.UUID, files: list[PhotoUploadRequest]
+) -> PhotoUploadPresignResponse:
+    """写真ごとにオブジェクトキーを発行し、署名付きPOSTを作成"""
+    expires_in = settings.S3_PRESIGN_EXPIRES_SECONDS
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    uploads = []
+    for file in files:
+        key = (
+            f"{photo_key_prefix(user_id, file.purpose)}"
+            f"{uuid.uuid4().hex}.{PHOTO_EXTENSIONS[file.content_type]}"
+        )
+        presigned = presign_post(key, file.content_type, settings.PHOTO_MAX_BYTES, expires_in)
+        uploads.append(
+            PresignedPhotoUpload(
+                purpose=file.purpose,
+                key=key,
+                photo_url=photo_url(key),
+                url=presigned["url"],
+                fields=presigned["fields"],
+            )
+        )
+    return PhotoUploadPresignResponse(
+        uploads=uploads, expires_at=expires_at, max_bytes=settings.PHOTO_MAX_BYTES
+    )
+
+
+def _report_photo_keys(user_id: uuid.UUID, data: Any) -> dict[str, str]:
+    """
+    前日報告の写真URLからオブジェクトキーを取得
+
+    Args:
+        user_id: 報告するユーザーID
+        data: 前日報告の作成・更新データ（値がNoneのフィールドは対象外）
+
+    Returns:
+        dict[str, str]: フィールド名 → オブジェクトキー
+
+    Raises:
+        HTTPException: 写真用バケットのURLでない、または他のユーザー・用途のキーの場合
+    """
+    keys = {}
+    for field, purpose in REPORT_PHOTO_FIELDS.items():
+        url = getattr(data, field, None)
+        if url is None:
+            continue
+        key = key_from_photo_url(url)
+        if key is None or not key.startswith(photo_key_prefix(user_id, purpose)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"写真URLが不正です（/api/uploads/presign で発行したURLを指定）: {field}",
+            )
+        keys[field] = key
+    return keys
+
+
+def _check_photo_exists(field: str, key: str) -> None:
+    """
+    写真がアップロード済みか確認（ブロッキングI/O）
+
+    Raises:
+        HTTPException: アップロードされていない場合、またはS3に接続できない場合
+    """
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    try:
+        exists = object_exists(key)
+    except (BotoCoreError, ClientError):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="写真の確認に失敗しました。しばらくしてから再度お試しください",
+        )
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"写真がアップロードされていません: {field}",
+        )
+
+
+class UploadService:
+    """写真アップロードサービス"""
+
+    def presign_photo_uploads(
+        self, user_id: uuid.UUID, files: list[PhotoUploadRequest]
+    ) -> PhotoUploadPresignResponse:
+        """
+        写真の署名付きアップロードURLを発行
+
+        Args:
+            user_id: ユーザーID
+            files: アップロードする写真
+
+        Returns:
+            PhotoUploadPresignResponse: 写真ごとの署名付きPOST（リクエストの順）
+        """
+        return _presign_photo_uploads(user_id, files)
+
+    def verify_report_photos(self, user_id: uuid.UUID, data: Any) -> None:
+        """
+        前日報告の写真がアップロード済みか確認（S3_VERIFY_UPLOADS が無効の場合は何もしない）
+
+        Args:
+            user_id: 報告するユーザーID
+            data: 前日報告の作成・更新データ
+
+        Raises:
+            HTTPException: 写真URLが不正、またはアップロードされていない場合
+        """
+        if not settings.S3_VERIFY_UPLOADS:
+            return
+        for field, key in _report_photo_keys(user_id, data).items():
+            _check_photo_exists(field, key)
+
+
+class AsyncUploadService:
+    """写真アップロードサービス（非同期）"""
+
+    async def presign_photo_uploads(
+        self, user_id: uuid.UUID, files: list[PhotoUploadRequest]
+    ) -> PhotoUploadPresignResponse:
+        """
+        写真の署名付きアップロードURLを発行
+
+        署名はローカルで計算するが、初回はS3クライアントの作成を伴うためスレッドプールで実行する
+
+        Args:
+            user_id: ユーザーID
+            files: アップロードする写真
+
+        Returns:
+            PhotoUploadPresignResponse: 写真ごとの署名付きPOST（リクエストの順）
+        """
+        return await run_in_threadpool(_presign_photo_uploads, user_id, files)
+
+    async def verify_report_photos(self, user_id: uuid.UUID, data: Any) -> None:
+        """
+        前日報告の写真がアップロード済みか確認（S3_VERIFY_UPLOADS が無効の場合は何もしない）
+
+        写真ごとのHEADリクエストはスレッドプールで並行して実行する
+
+        Args:
+            user_id: 報告するユーザーID
+            data: 前日報告の作成・更新データ
+
+        Raises:
+            HTTPException: 写真URLが不正、またはアップロードされていない場合
+        """
+        if not settings.S3_VERIFY_UPLOADS:
+            return
+        await asyncio.gather(
+            *(
+                run_in_threadpool(_check_photo_exists, field, key)
+                for field, key in _report_photo_keys(user_id, data).items()
+            )
+        )
@@ -2,14 +2,29 @@
 ユーザーサービス
 """
 import uuid
-from typing import Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.database import pin_primary
 from app.models.user import User
-from app.repositories.user_repository import UserRepository
-from app.schemas.user import UserCreate, UserUpdate
+from app.repositories.user_repository import AsyncUserRepository, UserRepository
+from app.schemas.user import CountMode, UserCreate, UserUpdate
+from app.utils.cache import TTLCache
+from app.utils.pagination import decode_cursor
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# 認証済みユーザー情報のキャッシュ（cognito_user_id → CurrentUser）
+# プロセス内キャッシュのため、他プロセスでの更新はTTL経過後に反映される
+identity_cache = TTLCache(
+    maxsize=settings.IDENTITY_CACHE_SIZE, ttl=settings.IDENTITY_CACHE_TTL_SECONDS
+)
 
 
 class UserService:
@@ -53,6 +68,8 @@ class UserService:
 
         user = self.repository.create(new_user)
         self.db.commit()
+        # GETのリクエスト中の作成のため、直後の読み出しをプライマリで行う
+        pin_primary(user.id)
 
         return user
 
@@ -79,6 +96,29 @@ class UserService:
 
         return user
 
+    def get_version(self, user_id: uuid.UUID) -> Row:
+        """
+        IDでユーザーのバージョンを取得（条件付きGETの確認用）
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            Row: (id, updated_at)
+
+        Raises:
+            HTTPException: ユーザーが見つからない場合
+        """
+        version = self.repository.get_version(user_id)
+
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="ユーザーが見つかりません",
+            )
+
+        return version
+
     def get_by_cognito_id(self, cognito_user_id: str) -> Optional[User]:
         """
         Cognito User IDでユーザーを取得
@@ -97,25 +137,35 @@ class UserService:
         limit: int = 100,
         role: Optional[str] = None,
         active_only: bool = False,
-    ) -> tuple[list[User], int]:
+        cursor: Optional[str] = None,
+        count: CountMode = "exact",
+    ) -> tuple[list[User], Optional[int]]:
         """
         ユーザー一覧を取得
 
         Args:
-            skip: スキップ件数
+            skip: スキップ件数（cursor指定時は無視）
             limit: 取得上限
             role: ロールフィルター
             active_only: アクティブユーザーのみ
+            cursor: 前ページのレスポンスで返されたカーソル
+            count: 総件数の算出方法（exact / estimated / none）
 
         Returns:
-            tuple[list[User], int]: (ユーザーリスト, 総件数)
+            tuple[list[User], Optional[int]]: (ユーザーリスト, 総件数)
+
+        Raises:
+            HTTPException: カーソルが不正な場合
         """
-        users = self.repository.get_all(
-            skip=skip, limit=limit, role=role, active_only=active_only
+        after = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID) if cursor else None
+        return self.repository.get_all_with_total(
+            skip=skip,
+            limit=limit,
+            role=role,
+            active_only=active_only,
+            after=after,
+            count=count,
         )
-        total = self.repository.count(role=role, active_only=active_only)
-
-        return users, total
 
     def create(self, user_data: UserCreate) -> User:
         """
@@ -192,6 +242,7 @@ class UserService:
 
         updated_user = self.repository.update(user)
         self.db.commit()
+        identity_cache.delete(updated_user.cognito_user_id)
 
         return updated_user
 
@@ -208,3 +259,239 @@ class UserService:
         user = self.get_by_id(user_id)
         self.repository.delete(user)
         self.db.commit()
+        identity_cache.delete(user.cognito_user_id)
+
+
+class AsyncUserService:
+    """ユーザービジネスロジック（非同期）"""
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+        self.repository = AsyncUserRepository(db)
+
+    async def get_or_create_by_cognito_id(
+        self, cognito_user_id: str, email: str, name: str, role: str = "staff"
+    ) -> User:
+        """
+        Cognito User IDでユーザーを取得または作成
+
+        初回ログイン時にCognitoから取得した情報でユーザーを自動作成
+
+        Args:
+            cognito_user_id: Cognito User ID (sub)
+            email: メールアドレス
+            name: 氏名
+            role: ロール
+
+        Returns:
+            User: ユーザー
+        """
+        # 既存ユーザーを検索
+        user = await self.repository.get_by_cognito_id(cognito_user_id)
+
+        if user:
+            return user
+
+        # 新規ユーザー作成
+        new_user = User(
+            cognito_user_id=cognito_user_id,
+            email=email,
+            name=name,
+            role=role,
+            active=True,
+        )
+
+        user = await self.repository.create(new_user)
+        await self.db.commit()
+        # GETのリクエスト中の作成のため、直後の読み出しをプライマリで行う
+        pin_primary(user.id)
+
+        return user
+
+    async def get_by_id(self, user_id: uuid.UUID) -> User:
+        """
+        IDでユーザーを取得
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            User: ユーザー
+
+        Raises:
+            HTTPException: ユーザーが見つからない場合
+        """
+        user = await self.repository.get_by_id(user_id)
+
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="ユーザーが見つかりません",
+            )
+
+        return user
+
+    async def get_version(self, user_id: uuid.UUID) -> Row:
+        """
+        IDでユーザーのバージョンを取得（条件付きGETの確認用）
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            Row: (id, updated_at)
+
+        Raises:
+            HTTPException: ユーザーが見つからない場合
+        """
+        version = await self.repository.get_version(user_id)
+
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="ユーザーが見つかりません",
+            )
+
+        return version
+
+    async def get_by_cognito_id(self, cognito_user_id: str) -> Optional[User]:
+        """
+        Cognito User IDでユーザーを取得
+
+        Args:
+            cognito_user_id: Cognito User ID
+
+        Returns:
+            User: ユーザー（存在しない場合はNone）
+        """
+        return await self.repository.get_by_cognito_id(cognito_user_id)
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        role: Optional[str] = None,
+        active_only: bool = False,
+        cursor: Optional[str] = None,
+        count: CountMode = "exact",
+    ) -> tuple[list[User], Optional[int]]:
+        """
+        ユーザー一覧を取得
+
+        Args:
+            skip: スキップ件数（cursor指定時は無視）
+            limit: 取得上限
+            role: ロールフィルター
+            active_only: アクティブユーザーのみ
+            cursor: 前ページのレスポンスで返されたカーソル
+            count: 総件数の算出方法（exact / estimated / none）
+
+        Returns:
+            tuple[list[User], Optional[int]]: (ユーザーリスト, 総件数)
+
+        Raises:
+            HTTPException: カーソルが不正な場合
+        """
+        after = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID) if cursor else None
+        return await self.repository.get_all_with_total(
+            skip=skip,
+            limit=limit,
+            role=role,
+            active_only=active_only,
+            after=after,
+            count=count,
+        )
+
+    async def create(self, user_data: UserCreate) -> User:
+        """
+        ユーザーを作成
+
+        Args:
+            user_data: ユーザー作成データ
+
+        Returns:
+            User: 作成されたユーザー
+
+        Raises:
+            HTTPException: Cognito IDまたはメールが既に存在する場合
+        """
+        # Cognito IDの重複チェック
+        existing_user = await self.repository.get_by_cognito_id(user_data.cognito_user_id)
+        if existing_user:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="このCognito User IDは既に登録されています",
+            )
+
+        # メールアドレスの重複チェック
+        existing_user = await self.repository.get_by_email(user_data.email)
+        if existing_user:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="このメールアドレスは既に登録されています",
+            )
+
+        # ユーザー作成
+        new_user = User(
+            cognito_user_id=user_data.cognito_user_id,
+            email=user_data.email,
+            name=user_data.name,
+            phone=user_data.phone,
+            role=user_data.role,
+            active=True,
+        )
+
+        user = await self.repository.create(new_user)
+        await self.db.commit()
+
+        return user
+
+    async def update(self, user_id: uuid.UUID, user_data: UserUpdate) -> User:
+        """
+        ユーザーを更新
+
+        Args:
+            user_id: ユーザーID
+            user_data: ユーザー更新データ
+
+        Returns:
+            User: 更新されたユーザー
+
+        Raises:
+            HTTPException: ユーザーが見つからない場合
+        """
+        user = await self.get_by_id(user_id)
+
+        # 更新
+        if user_data.name is not None:
+            user.name = user_data.name
+
+        if user_data.phone is not None:
+            user.phone = user_data.phone
+
+        if user_data.role is not None:
+            user.role = user_data.role
+
+        if user_data.active is not None:
+            user.active = user_data.active
+
+        updated_user = await self.repository.update(user)
+        await self.db.commit()
+        identity_cache.delete(updated_user.cognito_user_id)
+
+        return updated_user
+
+    async def delete(self, user_id: uuid.UUID) -> None:
+        """
+        ユーザーを削除（論理削除）
+
+        Args:
+            user_id: ユーザーID
+
+        Raises:
+            HTTPException: ユーザーが見つからない場合
+        """
+        user = await self.get_by_id(user_id)
+        await self.repository.delete(user)
+        await self.db.commit()
+        identity_cache.delete(user.cognito_user_id)
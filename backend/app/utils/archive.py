@@ -0,0 +1,291 @@
+"""
+アーカイブの保存先ユーティリティ
+
+保持期間を過ぎた行を、gzip圧縮したJSON Lines（1行1レコード）のファイルとして
+ローカルのディレクトリまたはS3互換のオブジェクトストレージに保存する。
+保存先は ARCHIVE_DESTINATION で指定する（"s3://バケット/接頭辞" の場合はS3、それ以外はディレクトリ）
+
+件数を確認したアーカイブは、月ごとのマニフェスト（previous_day_reports/YYYY-MM/manifest.json）に
+期間・件数・最終更新日時を記録する。パーティションの削除（scripts/manage_partitions.py）は
+マニフェストでアーカイブ済みであることを確認してから行う
+"""
+import gzip
+import os
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+from typing import IO, Any, Protocol
+
+import orjson
+
+from app.config import settings
+from app.utils.s3 import get_s3_client
+
+CONTENT_TYPE = "application/x-ndjson"
+CONTENT_ENCODING = "gzip"
+MANIFEST_CONTENT_TYPE = "application/json"
+
+
+def archive_key(month: date, run_id: str) -> str:
+    """月のアーカイブのファイル名（実行ごとに別のファイル）"""
+    return f"previous_day_reports/{month:%Y-%m}/{run_id}.jsonl.gz"
+
+
+def manifest_key(month: date) -> str:
+    """月のアーカイブのマニフェストのファイル名"""
+    return f"previous_day_reports/{month:%Y-%m}/manifest.json"
+
+
+def encode_record(record: dict[str, Any]) -> bytes:
+    """レコードをJSON Linesの1行に変換（UUID・日付・時刻はISO形式の文字列）"""
+    return orjson.dumps(record) + b"\n"
+
+
+def count_records(stream: IO[bytes]) -> int:
+    """
+    gzip圧縮したJSON Linesのレコード数を数える（1行ずつ読むため、サイズによらずメモリは一定）
+
+    Args:
+        stream: 圧縮されたファイルの読み出しストリーム
+
+    Returns:
+        int: レコード数
+    """
+    with gzip.GzipFile(fileobj=stream, mode="rb") as lines:
+        return sum(1 for _ in lines)
+
+
+class ArchiveSink(Protocol):
+    """アーカイブの保存先"""
+
+    def put(self, path: Path, key: str) -> None:
+        """ローカルのファイルを key に保存"""
+
+    def put_bytes(self, data: bytes, key: str) -> None:
+        """小さいデータ（マニフェスト等）を key に保存"""
+
+    def open(self, key: str) -> IO[bytes]:
+        """保存したファイルの読み出しストリームを取得"""
+
+    def get(self, key: str) -> bytes | None:
+        """保存したデータを取得（存在しない場合は None）"""
+
+    def url(self, key: str) -> str:
+        """保存したファイルの場所（表示用）"""
+
+
+class LocalArchiveSink:
+    """ローカルのディレクトリに保存"""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: 保存先のディレクトリ
+        """
+        self.directory = Path(directory)
+
+    def put(self, path: Path, key: str) -> None:
+        """ローカルのファイルを key に保存（一時ファイルに書き込んでから名前を変更する）"""
+        target = self.directory / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".partial")
+        shutil.copyfile(path, partial)
+        os.replace(partial, target)
+
+    def put_bytes(self, data: bytes, key: str) -> None:
+        """データを key に保存（一時ファイルに書き込んでから名前を変更する）"""
+        target = self.directory / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".partial")
+        partial.write_bytes(data)
+        os.replace(partial, target)
+
+    def open(self, key: str) -> IO[bytes]:
+        """保存したファイルの読み出しストリームを取得"""
+        return open(self.directory / key, "rb")
+
+    def get(self, key: str) -> bytes | None:
+        """保存したデータを取得（存在しない場合は None）"""
+        try:
+            return (self.directory / key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def url(self, key: str) -> str:
+        """保存したファイルのパス"""
+        return str(self.directory / key)
+
+
+class S3ArchiveSink:
+    """
+    S3互換のオブジェクトストレージに保存
+
+    アップロードは boto3 のマネージド転送で行い、大きいファイルはマルチパートで送信する
+    （S3_ENDPOINT_URL を設定した場合はそのエンドポイント）
+    """
+
+    def __init__(self, bucket: str, prefix: str = ""):
+        """
+        Args:
+            bucket: バケット名
+            prefix: オブジェクトキーの接頭辞
+        """
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put(self, path: Path, key: str) -> None:
+        """ローカルのファイルを key に保存"""
+        get_s3_client().upload_file(
+            str(path),
+            self.bucket,
+            self._key(key),
+            ExtraArgs={"ContentType": CONTENT_TYPE, "ContentEncoding": CONTENT_ENCODING},
+        )
+
+    def put_bytes(self, data: bytes, key: str) -> None:
+        """データを key に保存"""
+        get_s3_client().put_object(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Body=data,
+            ContentType=MANIFEST_CONTENT_TYPE,
+        )
+
+    def open(self, key: str) -> IO[bytes]:
+        """保存したオブジェクトの読み出しストリームを取得"""
+        response = get_s3_client().get_object(Bucket=self.bucket, Key=self._key(key))
+        return response["Body"]
+
+    def get(self, key: str) -> bytes | None:
+        """
+        保存したオブジェクトを取得（存在しない場合は None）
+
+        Raises:
+            botocore.exceptions.ClientError: 存在しない場合以外のエラー（権限不足等）
+        """
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.open(key).read()
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def url(self, key: str) -> str:
+        """保存したオブジェクトのURL（s3://バケット/キー）"""
+        return f"s3://{self.bucket}/{self._key(key)}"
+
+
+def get_archive_sink(destination: str | None = None) -> ArchiveSink:
+    """
+    アーカイブの保存先を取得
+
+    Args:
+        destination: 保存先（未指定の場合は ARCHIVE_DESTINATION）。
+            "s3://バケット/接頭辞" の場合はS3、それ以外はローカルのディレクトリ
+
+    Returns:
+        ArchiveSink: 保存先
+    """
+    destination = destination or settings.ARCHIVE_DESTINATION
+    if destination.startswith("s3://"):
+        bucket, _, prefix = destination.removeprefix("s3://").partition("/")
+        return S3ArchiveSink(bucket, prefix)
+    return LocalArchiveSink(destination)
+
+
+def read_manifest(sink: ArchiveSink, month: date) -> dict[str, Any] | None:
+    """
+    月のアーカイブのマニフェストを取得
+
+    Args:
+        sink: 保存先
+        month: 月初の日付
+
+    Returns:
+        dict[str, Any] | None: マニフェスト（アーカイブしていない場合は None）。
+            archives に実行ごとの記録（key, lower, upper, count, max_updated_at, run_id）を
+            実行順に持つ
+    """
+    data = sink.get(manifest_key(month))
+    return orjson.loads(data) if data is not None else None
+
+
+def write_manifest(
+    sink: ArchiveSink,
+    month: date,
+    key: str,
+    lower: date,
+    upper: date,
+    count: int,
+    max_updated_at: datetime,
+    run_id: str,
+) -> None:
+    """
+    件数を確認したアーカイブを月のマニフェストに追記する
+
+    Args:
+        sink: 保存先
+        month: 月初の日付
+        key: アーカイブのファイル名
+        lower: アーカイブした報告日の開始日（含む）
+        upper: アーカイブした報告日の終了日（含まない）
+        count: 確認した件数
+        max_updated_at: アーカイブした行の更新日時の最大値
+        run_id: 実行ID
+    """
+    manifest = read_manifest(sink, month) or {"month": f"{month:%Y-%m}", "archives": []}
+    manifest["archives"].append(
+        {
+            "key": key,
+            "lower": lower,
+            "upper": upper,
+            "count": count,
+            "max_updated_at": max_updated_at,
+            "run_id": run_id,
+        }
+    )
+    sink.put_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2), manifest_key(month))
+
+
+def unarchived_reason(
+    manifest: dict[str, Any] | None,
+    lower: date,
+    upper: date,
+    count: int,
+    max_updated_at: datetime | None,
+) -> str | None:
+    """
+    月の行が確認済みのアーカイブに含まれているかを確認
+
+    最後のアーカイブが月全体を対象とし、現在の行数がアーカイブの件数以下で、
+    アーカイブ後に更新・登録された行（更新日時がアーカイブの最大値より新しい行）がないことを確認する
+
+    Args:
+        manifest: 月のマニフェスト（read_manifest）
+        lower: 報告日の開始日（含む）
+        upper: 報告日の終了日（含まない）
+        count: 現在の行数
+        max_updated_at: 現在の行の更新日時の最大値
+
+    Returns:
+        str | None: アーカイブされていない理由（行がない、またはアーカイブ済みの場合は None）
+    """
+    if count == 0:
+        return None
+    if manifest is None or not manifest["archives"]:
+        return "アーカイブのマニフェストがありません"
+    latest = manifest["archives"][-1]
+    if date.fromisoformat(latest["lower"]) > lower or date.fromisoformat(latest["upper"]) < upper:
+        return f"アーカイブの期間（{latest['lower']}〜{latest['upper']}）が対象の期間を含みません"
+    if count > latest["count"]:
+        return f"行数 {count} がアーカイブの件数 {latest['count']} を超えます"
+    if max_updated_at is not None and max_updated_at > datetime.fromisoformat(
+        latest["max_updated_at"]
+    ):
+        return "アーカイブ後に更新・登録された行があります"
+    return None
@@ -0,0 +1,267 @@
+"""
+インプロセスキャッシュユーティリティ
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    有効期限付きLRUキャッシュ
+
+    - 上限件数を超えると最も使われていないエントリから削除（LRU）
+    - エントリごとに有効期限（UNIX時刻）を持ち、期限切れは取得時に削除
+    - ヒット・ミス数を記録
+    - maxsize=0 の場合はキャッシュ無効（常にミス）
+
+    get で返すトークンを set に渡すことで、読み出し中（get〜set の間）に
+    delete・clear されたキャッシュには古い値を保存しない（GroupedCache と同じ）。
+    削除の世代はキャッシュ全体で1つのため、他のキーの削除でも保存しない（次の読み出しで保存する）。
+
+    スレッドプールからも呼ばれるため、操作はロックで保護する
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: 最大エントリ数
+            ttl: デフォルトの有効期間（秒）。Noneの場合は set で expires_at の指定が必要
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        # delete・clear のたびに進める削除の世代（get で返すトークン）
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> tuple[Optional[Any], int]:
+        """
+        キャッシュから値を取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            (キャッシュされた値（存在しない、または期限切れの場合はNone）, set に渡すトークン)
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.time():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value, self._generation
+                del self._data[key]
+            self.misses += 1
+            return None, self._generation
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        token: Optional[int] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """
+        キャッシュに値を保存
+
+        token を指定した場合、get の後に delete・clear されていれば保存しない
+
+        Args:
+            key: キャッシュキー
+            value: 保存する値
+            token: get で返されたトークン（読み出した値を保存する場合）。Noneの場合は常に保存
+            expires_at: 有効期限（UNIX時刻）。省略時はデフォルトTTLを使用
+        """
+        if self.maxsize <= 0:
+            return
+        if expires_at is None:
+            if self.ttl is None:
+                raise ValueError("expires_at または ttl の指定が必要です")
+            expires_at = time.time() + self.ttl
+
+        with self._lock:
+            if token is not None and token != self._generation:
+                return
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        キャッシュからエントリを削除
+
+        Args:
+            key: キャッシュキー
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        """全エントリと統計を削除"""
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        キャッシュ統計を取得
+
+        Returns:
+            dict: size/maxsize/hits/misses/hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# GroupedCache.get でエントリが存在しなかったことを表す値（None もキャッシュできるようにする）
+MISSING: Any = object()
+
+
+class GroupedCache:
+    """
+    グループ単位で無効化できる有効期限付きLRUキャッシュ
+
+    - グループ（例: ユーザーID）ごとに複数のエントリ（例: 最新・一覧の1ページ目）を持つ
+    - 上限件数を超えると最も使われていないグループから削除（LRU）
+    - グループ内のエントリ数が上限を超えると古いエントリから削除
+    - 書き込み時は invalidate でグループごとまとめて削除する
+    - ヒット・ミス・無効化の回数を記録
+    - maxsize=0 の場合はキャッシュ無効（常にミス）
+
+    get で返すトークンを set に渡すことで、読み出し中（get〜set の間）に
+    無効化されたグループには古い値を保存しない
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60, max_entries_per_group: int = 8):
+        """
+        Args:
+            maxsize: 最大グループ数
+            ttl: エントリの有効期間（秒）
+            max_entries_per_group: グループあたりの最大エントリ数
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_entries_per_group = max_entries_per_group
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._groups: OrderedDict[Hashable, dict[Hashable, tuple[Any, float]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, group: Hashable, key: Hashable) -> tuple[Any, Optional[object]]:
+        """
+        キャッシュから値を取得
+
+        Args:
+            group: グループのキー
+            key: グループ内のエントリのキー
+
+        Returns:
+            (キャッシュされた値（存在しない、または期限切れの場合は MISSING）, set に渡すトークン)
+        """
+        with self._lock:
+            if self.maxsize <= 0:
+                self.misses += 1
+                return MISSING, None
+
+            entries = self._groups.get(group)
+            if entries is None:
+                entries = self._groups[group] = {}
+                while len(self._groups) > self.maxsize:
+                    self._groups.popitem(last=False)
+            else:
+                self._groups.move_to_end(group)
+                entry = entries.get(key)
+                if entry is not None:
+                    value, expires_at = entry
+                    if expires_at > time.time():
+                        self.hits += 1
+                        return value, entries
+                    del entries[key]
+            self.misses += 1
+            return MISSING, entries
+
+    def set(self, group: Hashable, key: Hashable, value: Any, token: Optional[object]) -> None:
+        """
+        キャッシュに値を保存
+
+        get の後にグループが無効化（または削除）されていた場合は保存しない
+
+        Args:
+            group: グループのキー
+            key: グループ内のエントリのキー
+            value: 保存する値
+            token: get で返されたトークン
+        """
+        if token is None:
+            return
+
+        with self._lock:
+            entries = self._groups.get(group)
+            if entries is not token:
+                return
+            entries.pop(key, None)
+            entries[key] = (value, time.time() + self.ttl)
+            while len(entries) > self.max_entries_per_group:
+                del entries[next(iter(entries))]
+
+    def invalidate(self, group: Hashable) -> None:
+        """
+        グループのエントリをまとめて削除
+
+        Args:
+            group: グループのキー
+        """
+        with self._lock:
+            self._groups.pop(group, None)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """全エントリと統計を削除"""
+        with self._lock:
+            self._groups.clear()
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        キャッシュ統計を取得
+
+        Returns:
+            dict: size/maxsize/hits/misses/hit_rate/entries/invalidations
+        """
+        with self._lock:
+            entries = sum(len(group) for group in self._groups.values())
+        total = self.hits + self.misses
+        return {
+            "size": len(self._groups),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+            "invalidations": self.invalidations,
+        }
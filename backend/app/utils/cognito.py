@@ -1,14 +1,30 @@
 """
 AWS Cognito JWT検証ユーティリティ
 """
+import asyncio
+import hashlib
 import json
-from typing import Dict, Optional
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, Optional
 from urllib.request import urlopen
 
-from jose import jwt, JWTError
 from fastapi import HTTPException, status
 
 from app.config import settings
+from app.utils.cache import TTLCache
+
+# jose（cryptography）はインポートが重いため、初回のトークン検証時に読み込む
+if TYPE_CHECKING:
+    from jose.backends.base import Key
+
+logger = logging.getLogger(__name__)
+
+# JWKS取得のタイムアウト（秒）
+JWKS_FETCH_TIMEOUT_SECONDS = 5
+
+# 未知のkidによる再取得の最小間隔（秒）。不正なkidで取得を連発させないための制限
+JWKS_MISS_REFRESH_INTERVAL_SECONDS = 30
 
 
 class CognitoJWTVerifier:
@@ -18,35 +34,128 @@ class CognitoJWTVerifier:
         self.user_pool_id = settings.COGNITO_USER_POOL_ID
         self.region = settings.COGNITO_REGION
         self.client_id = settings.COGNITO_CLIENT_ID
-        self.keys: Optional[Dict] = None
+        self.jwks_url = settings.COGNITO_JWKS_URL or (
+            f"https://cognito-idp.{self.region}.amazonaws.com/"
+            f"{self.user_pool_id}/.well-known/jwks.json"
+        )
+        self.jwks_ttl = settings.COGNITO_JWKS_TTL_SECONDS
+
+        # kid → 構築済み公開鍵オブジェクト
+        self.keys: Dict[str, "Key"] = {}
+        self._fetched_at: float = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
 
-    def get_jwks(self) -> Dict:
+        # トークンのダイジェスト → 検証済みペイロード（トークンのexpで失効）
+        self.token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE)
+
+    def _fetch_jwks(self) -> Dict:
         """
-        Cognitoの公開鍵（JWKS）を取得
+        Cognitoの公開鍵（JWKS）を取得（ブロッキングI/O、スレッドで実行する）
 
         Returns:
             Dict: JWKS（JSON Web Key Set）
         """
-        if self.keys:
-            return self.keys
+        with urlopen(self.jwks_url, timeout=JWKS_FETCH_TIMEOUT_SECONDS) as response:
+            return json.loads(response.read())
 
-        # Cognitoの公開鍵エンドポイント
-        jwks_url = (
-            f"https://cognito-idp.{self.region}.amazonaws.com/"
-            f"{self.user_pool_id}/.well-known/jwks.json"
-        )
+    @staticmethod
+    def _build_keys(jwks: Dict) -> Dict[str, "Key"]:
+        """
+        JWKSからkidをキーとする公開鍵オブジェクトの辞書を構築
 
-        try:
-            with urlopen(jwks_url) as response:
-                self.keys = json.loads(response.read())
-            return self.keys
-        except Exception as e:
+        Args:
+            jwks: JWKS（JSON Web Key Set）
+
+        Returns:
+            Dict[str, Key]: kid → 公開鍵オブジェクト
+        """
+        from jose import jwk
+
+        keys: Dict[str, "Key"] = {}
+        for key in jwks.get("keys", []):
+            kid = key.get("kid")
+            if kid:
+                keys[kid] = jwk.construct(key, key.get("alg", "RS256"))
+        return keys
+
+    async def _refresh(self) -> None:
+        """公開鍵をスレッドで取得し、キャッシュを差し替える"""
+        jwks = await asyncio.to_thread(self._fetch_jwks)
+        self.keys = self._build_keys(jwks)
+        self._fetched_at = time.monotonic()
+
+    def refresh_keys(self) -> asyncio.Task:
+        """
+        公開鍵の再取得を開始（シングルフライト）
+
+        実行中の再取得がある場合は同じタスクを返し、同時に複数の取得を行わない
+
+        Returns:
+            asyncio.Task: 再取得タスク
+        """
+        task = self._refresh_task
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
+            task = asyncio.create_task(self._refresh())
+            task.add_done_callback(self._on_refresh_done)
+            self._refresh_task = task
+        return task
+
+    @staticmethod
+    def _on_refresh_done(task: asyncio.Task) -> None:
+        """バックグラウンド再取得の失敗をログに残す（未回収例外の警告を防ぐ）"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("JWKSの再取得に失敗しました: %s", task.exception())
+
+    async def get_public_key(self, kid: str) -> "Key":
+        """
+        kidに一致する公開鍵を取得
+
+        - キャッシュが有効期限内: キャッシュから返す（ネットワークアクセスなし）
+        - 有効期限切れ: キャッシュの鍵を返しつつ、バックグラウンドで再取得
+        - 未知のkid（鍵ローテーション）またはキャッシュ未作成: 再取得を待つ
+
+        Args:
+            kid: Key ID
+
+        Returns:
+            Key: 公開鍵オブジェクト
+
+        Raises:
+            HTTPException: 公開鍵の取得に失敗した、または一致する鍵がない場合
+        """
+        now = time.monotonic()
+        key = self.keys.get(kid)
+
+        if key is not None:
+            if now - self._fetched_at >= self.jwks_ttl:
+                self.refresh_keys()
+            return key
+
+        # 未知のkid: 直近に取得済みなら再取得しない
+        if not self.keys or now - self._fetched_at >= JWKS_MISS_REFRESH_INTERVAL_SECONDS:
+            try:
+                await asyncio.shield(self.refresh_keys())
+            except Exception as e:
+                if not self.keys:
+                    raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail=f"公開鍵の取得に失敗しました: {str(e)}",
+                    )
+            key = self.keys.get(kid)
+
+        if key is None:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"公開鍵の取得に失敗しました: {str(e)}",
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="一致する公開鍵が見つかりません",
             )
 
-    def verify_token(self, token: str) -> Dict:
+        return key
+
+    async def verify_token(self, token: str) -> Dict:
         """
         Cognito IDトークンを検証
 
@@ -59,6 +168,32 @@ class CognitoJWTVerifier:
         Raises:
             HTTPException: トークンが無効な場合
         """
+        # 検証済みのトークンであれば署名・クレームの検証を省略
+        digest = hashlib.sha256(token.encode()).digest()
+        cached, _ = self.token_cache.get(digest)
+        if cached is not None:
+            return cached
+
+        payload = await self._verify_token(token)
+        if "exp" in payload:
+            self.token_cache.set(digest, payload, expires_at=payload["exp"])
+        return payload
+
+    async def _verify_token(self, token: str) -> Dict:
+        """
+        Cognito IDトークンの署名・クレームを検証
+
+        Args:
+            token: Cognito IDトークン
+
+        Returns:
+            Dict: デコードされたトークンペイロード
+
+        Raises:
+            HTTPException: トークンが無効な場合
+        """
+        from jose import JWTError, jwt
+
         try:
             # JWTヘッダーからkid（Key ID）を取得
             headers = jwt.get_unverified_header(token)
@@ -70,22 +205,8 @@ class CognitoJWTVerifier:
                     detail="トークンのヘッダーにkidがありません",
                 )
 
-            # JWKS（公開鍵セット）を取得
-            jwks = self.get_jwks()
-            keys = jwks.get("keys", [])
-
-            # kidに一致する公開鍵を検索
-            public_key = None
-            for key in keys:
-                if key.get("kid") == kid:
-                    public_key = key
-                    break
-
-            if not public_key:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="一致する公開鍵が見つかりません",
-                )
+            # kidに一致する公開鍵を取得
+            public_key = await self.get_public_key(kid)
 
             # JWTトークンを検証・デコード
             payload = jwt.decode(
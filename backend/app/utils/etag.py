@@ -0,0 +1,59 @@
+"""
+ETag（条件付きGET）ユーティリティ
+
+レスポンスボディではなく、リソースのバージョン（id と updated_at、コレクションの場合は
+件数と最大の updated_at）から弱いETagを作成する。If-None-Match が一致する場合は
+軽量なバージョン確認クエリのみで 304 Not Modified を返す。
+"""
+import hashlib
+from typing import Any
+
+from fastapi import Response, status
+
+# 認証付きレスポンスのため共有キャッシュには保存させず、毎回ETagで再検証させる
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    バージョンを表す値から弱いETagを作成
+
+    Args:
+        parts: ETagの元になる値（id、updated_at 等）
+
+    Returns:
+        str: 弱いETag（例: W/"3f2a..."）
+    """
+    raw = "|".join(part.isoformat() if hasattr(part, "isoformat") else str(part) for part in parts)
+    return f'W/"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    If-None-Match ヘッダーがETagに一致するか判定（弱い比較）
+
+    Args:
+        if_none_match: If-None-Match ヘッダーの値（カンマ区切りの複数指定、* に対応）
+        etag: 現在のETag
+
+    Returns:
+        bool: 一致する場合True
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(",")
+    )
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    """ETagを返すレスポンスのヘッダー"""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """304 Not Modified レスポンスを作成"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
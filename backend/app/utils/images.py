@@ -0,0 +1,49 @@
+"""
+画像処理ユーティリティ
+
+Pillow はインポートが重いため、初回の画像処理時に読み込む
+"""
+import io
+from typing import Mapping
+
+WEBP_CONTENT_TYPE = "image/webp"
+
+
+def render_webp(data: bytes, sizes: Mapping[str, int], quality: int = 80) -> dict[str, bytes]:
+    """
+    画像を縮小したWebPを作成（EXIF等のメタデータは含めない）
+
+    - EXIFの向き（Orientation）は画素に反映してから除去する（撮影位置等も残らない）
+    - JPEGは最大サイズに合わせて縮小デコードし、大きい順に前の結果から縮小する
+    - 長辺が指定サイズより小さい画像は拡大しない
+
+    Args:
+        data: 元画像（JPEG/PNG）
+        sizes: 派生画像の名前 → 長辺の最大サイズ（px）
+        quality: WebPの品質（0〜100）
+
+    Returns:
+        dict[str, bytes]: 派生画像の名前 → WebP
+
+    Raises:
+        PIL.UnidentifiedImageError: 画像として読み込めない場合
+        PIL.Image.DecompressionBombError: 画素数が大きすぎる場合
+    """
+    from PIL import Image, ImageOps
+
+    results: dict[str, bytes] = {}
+    with Image.open(io.BytesIO(data)) as source:
+        largest = max(sizes.values())
+        source.draft("RGB", (largest, largest))
+        icc_profile = source.info.get("icc_profile")
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        for name, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+            image.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            output = io.BytesIO()
+            image.save(output, "WEBP", quality=quality, method=4, icc_profile=icc_profile)
+            results[name] = output.getvalue()
+    return results
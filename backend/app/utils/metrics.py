@@ -0,0 +1,144 @@
+"""
+メトリクスユーティリティ
+
+リクエストのレイテンシをプロセス内のヒストグラムに集計し、Prometheus のテキスト形式
+（/metrics）で出力する。値はプロセスごとのため、複数プロセス・コンテナの集計は
+Prometheus 側で行う
+"""
+import bisect
+import threading
+from typing import Sequence
+
+# ヒストグラムのバケット（秒）。PERF-002（500ms）の達成率を確認できるよう 0.5 を含める
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label(value: str) -> str:
+    """ラベル値のエスケープ（バックスラッシュ・ダブルクォート・改行）"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """数値の出力（整数はそのまま、それ以外は repr）"""
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Histogram:
+    """
+    ラベルごとの累積ヒストグラム（Prometheus の histogram 型）
+
+    ラベルの組み合わせごとにバケットの件数・合計・件数を保持する。
+    ラベル値はルートのテンプレート等、種類が限られる値のみを使用すること
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Args:
+            name: メトリクス名
+            documentation: 説明（# HELP）
+            label_names: ラベル名
+            buckets: バケットの上限（昇順、+Inf は自動で追加）
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # ラベル値 → [バケットごとの件数（非累積、末尾は +Inf）, 合計, 件数]
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        """
+        値を記録
+
+        Args:
+            labels: ラベル値（label_names の順）
+            value: 値（秒）
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self) -> None:
+        """全ての値を削除"""
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        """
+        Prometheus のテキスト形式で出力
+
+        Returns:
+            list[str]: 出力行
+        """
+        with self._lock:
+            snapshot = [
+                (labels, list(series[0]), series[1], series[2])
+                for labels, series in sorted(self._series.items())
+            ]
+
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, counts, total, count in snapshot:
+            label_text = ",".join(
+                f'{name}="{_escape_label(value)}"' for name, value in zip(self.label_names, labels)
+            )
+            prefix = f"{label_text}," if label_text else ""
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {_format_value(total)}")
+            lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return lines
+
+
+# リクエストのレイテンシ（レスポンスの送信完了まで）
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response body is sent.",
+    ("method", "route", "status"),
+)
+
+# リクエストの処理段階ごとの所要時間（auth / db / serialize）
+REQUEST_PHASE_DURATION = Histogram(
+    "http_request_phase_duration_seconds",
+    "Time spent in each phase (auth, db, serialize) of an HTTP request.",
+    ("method", "route", "phase"),
+)
+
+# リクエストあたりのクエリ数（認証を含む）
+REQUEST_QUERIES = Histogram(
+    "http_request_queries",
+    "Number of SQL statements executed per HTTP request.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 4, 5, 8, 10, 20, 50),
+)
+
+REGISTRY: tuple[Histogram, ...] = (REQUEST_DURATION, REQUEST_PHASE_DURATION, REQUEST_QUERIES)
+
+
+def render_metrics() -> str:
+    """
+    全メトリクスを Prometheus のテキスト形式で出力
+
+    Returns:
+        str: /metrics のレスポンス本文
+    """
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
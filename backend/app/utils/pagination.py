@@ -0,0 +1,74 @@
+"""
+カーソル（キーセット）ページネーションユーティリティ
+
+カーソルはソートキーの値をJSON配列にしてbase64urlエンコードした不透明な文字列。
+クライアントは前ページのレスポンスで受け取った値をそのまま次のリクエストに渡す。
+"""
+import base64
+import json
+from typing import Any, Callable, Sequence
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    ソートキーの値からカーソルを作成
+
+    Args:
+        values: ソートキーの値（date/datetime/UUID等、str()で文字列化できるもの）
+
+    Returns:
+        str: カーソル文字列
+    """
+    raw = json.dumps(
+        [v.isoformat() if hasattr(v, "isoformat") else str(v) for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> tuple:
+    """
+    カーソルをソートキーの値に復元
+
+    Args:
+        cursor: カーソル文字列
+        parsers: 各値の変換関数（例: date.fromisoformat, uuid.UUID）
+
+    Returns:
+        tuple: ソートキーの値
+
+    Raises:
+        HTTPException: カーソルが不正な場合
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor length mismatch")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="カーソルが不正です",
+        )
+
+
+def next_cursor(items: Sequence[Any], limit: int, key: Callable[[Any], tuple]) -> str | None:
+    """
+    次ページのカーソルを作成
+
+    取得件数が上限に達していない場合は最終ページとみなしNoneを返す
+
+    Args:
+        items: 取得したページ
+        limit: 取得上限
+        key: 要素からソートキーの値を取り出す関数
+
+    Returns:
+        str | None: 次ページのカーソル
+    """
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(*key(items[-1]))
@@ -0,0 +1,186 @@
+"""
+S3操作ユーティリティ
+
+写真はクライアントから署名付きURLでS3に直接アップロードし、APIはオブジェクトキーの発行と
+存在確認のみを行う。S3クライアントはインポート時ではなく初回使用時に作成し、
+プロセス内で再利用する（boto3 のインポートとクライアント作成はコールドスタートで重いため）
+"""
+import threading
+from typing import TYPE_CHECKING, Any
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from botocore.client import BaseClient
+
+# 写真のオブジェクトキーの接頭辞（photos/{user_id}/{用途}/{ファイル名}）
+PHOTO_KEY_PREFIX = "photos"
+
+_client: "BaseClient | None" = None
+_client_lock = threading.Lock()
+
+
+def get_s3_client() -> "BaseClient":
+    """
+    S3クライアントを取得（初回呼び出し時に作成）
+
+    boto3 のクライアントはスレッドセーフのため、スレッドプールからも共有する。
+    S3_ENDPOINT_URL が設定されている場合はそのエンドポイント（ローカルのスタンドイン等）に
+    パス形式でアクセスする
+
+    Returns:
+        BaseClient: S3クライアント
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import boto3
+                from botocore.config import Config
+
+                _client = boto3.client(
+                    "s3",
+                    region_name=settings.S3_REGION,
+                    endpoint_url=settings.S3_ENDPOINT_URL or None,
+                    config=Config(
+                        signature_version="s3v4",
+                        s3={"addressing_style": "path" if settings.S3_ENDPOINT_URL else "auto"},
+                        connect_timeout=settings.S3_CONNECT_TIMEOUT_SECONDS,
+                        read_timeout=settings.S3_READ_TIMEOUT_SECONDS,
+                        retries={"max_attempts": 2, "mode": "standard"},
+                    ),
+                )
+    return _client
+
+
+def photo_base_url() -> str:
+    """
+    写真URLのベースURL（末尾のスラッシュなし）
+
+    S3_PUBLIC_BASE_URL が未設定の場合は、エンドポイント（またはバケットの仮想ホスト形式のURL）から
+    導出する
+
+    Returns:
+        str: ベースURL
+    """
+    if settings.S3_PUBLIC_BASE_URL:
+        return settings.S3_PUBLIC_BASE_URL.rstrip("/")
+    if settings.S3_ENDPOINT_URL:
+        return f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{settings.S3_BUCKET_NAME}"
+    return f"https://{settings.S3_BUCKET_NAME}.s3.{settings.S3_REGION}.amazonaws.com"
+
+
+def photo_url(key: str) -> str:
+    """
+    オブジェクトキーから写真URLを作成
+
+    Args:
+        key: オブジェクトキー
+
+    Returns:
+        str: 写真URL（前日報告に登録する値）
+    """
+    return f"{photo_base_url()}/{key}"
+
+
+def key_from_photo_url(url: str) -> str | None:
+    """
+    写真URLからオブジェクトキーを取得
+
+    Args:
+        url: 写真URL
+
+    Returns:
+        str | None: オブジェクトキー（写真用バケットのURLでない場合はNone）
+    """
+    base = photo_base_url() + "/"
+    if not url.startswith(base):
+        return None
+    key = url[len(base) :].split("?", 1)[0]
+    return key or None
+
+
+def presign_post(key: str, content_type: str, max_bytes: int, expires_in: int) -> dict[str, Any]:
+    """
+    署名付きPOST（ブラウザのフォームアップロード）のURLとフィールドを作成
+
+    Content-Type とサイズ上限をポリシーに含めるため、S3側で超過・不一致のアップロードを拒否する。
+    署名はローカルで計算するため、S3への通信は発生しない
+
+    Args:
+        key: オブジェクトキー
+        content_type: Content-Type
+        max_bytes: 最大サイズ（バイト）
+        expires_in: 有効期間（秒）
+
+    Returns:
+        dict[str, Any]: url と fields（フォームに含めるフィールド）
+    """
+    return get_s3_client().generate_presigned_post(
+        Bucket=settings.S3_BUCKET_NAME,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, max_bytes],
+        ],
+        ExpiresIn=expires_in,
+    )
+
+
+def object_exists(key: str) -> bool:
+    """
+    オブジェクトが存在するか確認（HEAD、ブロッキングI/O）
+
+    Args:
+        key: オブジェクトキー
+
+    Returns:
+        bool: 存在する場合True
+
+    Raises:
+        botocore.exceptions.ClientError: 存在しない場合以外のエラー（権限不足等）
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        get_s3_client().head_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
+    return True
+
+
+def get_object_bytes(key: str) -> bytes:
+    """
+    オブジェクトの本文を取得（ブロッキングI/O）
+
+    Args:
+        key: オブジェクトキー
+
+    Returns:
+        bytes: オブジェクトの本文
+    """
+    response = get_s3_client().get_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
+    return response["Body"].read()
+
+
+def put_object(key: str, body: bytes, content_type: str) -> None:
+    """
+    オブジェクトを保存（ブロッキングI/O）
+
+    派生画像等、同じキーの内容が変わらないオブジェクト向けに長期キャッシュを許可する
+
+    Args:
+        key: オブジェクトキー
+        body: 本文
+        content_type: Content-Type
+    """
+    get_s3_client().put_object(
+        Bucket=settings.S3_BUCKET_NAME,
+        Key=key,
+        Body=body,
+        ContentType=content_type,
+        CacheControl="public, max-age=31536000, immutable",
+    )
@@ -0,0 +1,140 @@
+"""
+レスポンスのJSONシリアライズユーティリティ
+
+response_model 経由のレスポンスは、ORMオブジェクトをレスポンススキーマで検証
+（from_attributes）し、辞書に変換してからJSONエンコードする。DBから読み出した値は
+検証済みのため、一覧系のエンドポイントではスキーマの定義から属性の取り出し方を
+一度だけ組み立てた「シリアライザー」で辞書を作り、orjson で直接エンコードする。
+
+シリアライザーはフィールドを属性名（辞書の場合はキー）で取り出すだけのため、
+エイリアスやシリアライザー・computed_field を持つスキーマには使用できない（組み立て時にエラー）。
+"""
+import types
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Union, get_args, get_origin
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+from app.utils.timing import phase
+
+# pydantic と同じく、UTCの日時は "Z" で出力する
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class JSONResponse(ORJSONResponse):
+    """orjson でエンコードするデフォルトのレスポンスクラス"""
+
+    def render(self, content: Any) -> bytes:
+        with phase("serialize"):
+            return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def _passthrough(value: Any) -> Any:
+    """値をそのまま返す（orjson がエンコードできる型）"""
+    return value
+
+
+def _compile_model(model: type[BaseModel]) -> Callable[[Any], dict]:
+    """スキーマのフィールド定義から、オブジェクト（または辞書）を辞書に変換する関数を組み立てる"""
+    decorators = model.__pydantic_decorators__
+    if decorators.field_serializers or decorators.model_serializers or decorators.computed_fields:
+        raise TypeError(f"{model.__name__} はシリアライザーを持つため使用できません")
+
+    fields: list[tuple[str, Callable[[Any], Any], Any]] = []
+    for name, field in model.model_fields.items():
+        if field.alias or field.serialization_alias:
+            raise TypeError(f"{model.__name__}.{name} はエイリアスを持つため使用できません")
+        default = PydanticUndefined if field.is_required() else field.get_default()
+        fields.append((name, compile_serializer(field.annotation), default))
+
+    def serialize(obj: Any) -> dict:
+        if isinstance(obj, Mapping):
+            return {
+                name: convert(obj[name] if name in obj or default is PydanticUndefined else default)
+                for name, convert, default in fields
+            }
+        return {name: convert(getattr(obj, name)) for name, convert, _ in fields}
+
+    return serialize
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(annotation: Any) -> Callable[[Any], Any]:
+    """
+    型注釈に対応するシリアライザーを取得（型ごとに一度だけ組み立ててキャッシュ）
+
+    Args:
+        annotation: レスポンスの型（スキーマ、list[スキーマ]、スキーマ | None 等）
+
+    Returns:
+        Callable[[Any], Any]: 値を orjson でエンコードできる値に変換する関数
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _compile_model(annotation)
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+
+    if origin in (list, tuple, set, frozenset) and args:
+        convert = compile_serializer(args[0])
+        if convert is _passthrough:
+            return list
+        return lambda values: [convert(value) for value in values]
+
+    if origin in (Union, types.UnionType):
+        non_none = [arg for arg in args if arg is not type(None)]
+        if len(non_none) == 1:
+            convert = compile_serializer(non_none[0])
+            if convert is _passthrough:
+                return _passthrough
+            return lambda value: None if value is None else convert(value)
+
+    return _passthrough
+
+
+def to_json(annotation: Any, value: Any) -> bytes:
+    """
+    値をレスポンススキーマの形でJSONにエンコード
+
+    Args:
+        annotation: レスポンスの型（スキーマ、list[スキーマ] 等）
+        value: ORMオブジェクト・辞書・スキーマのインスタンス、またはそのリスト
+
+    Returns:
+        bytes: JSON
+    """
+    with phase("serialize"):
+        return orjson.dumps(compile_serializer(annotation)(value), option=ORJSON_OPTIONS)
+
+
+def json_response(
+    annotation: Any,
+    value: Any,
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """
+    値をレスポンススキーマの形でエンコードしたレスポンスを作成
+
+    response_model による検証・変換を経由しないため、エンドポイントの
+    response_model は OpenAPI のドキュメント用となる
+
+    Args:
+        annotation: レスポンスの型（スキーマ、list[スキーマ] 等）
+        value: ORMオブジェクト・辞書・スキーマのインスタンス、またはそのリスト
+        status_code: ステータスコード
+        headers: レスポンスヘッダー
+
+    Returns:
+        Response: JSONレスポンス
+    """
+    return Response(
+        content=to_json(annotation, value),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
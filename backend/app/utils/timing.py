@@ -0,0 +1,311 @@
+"""
+リクエストのタイミング計測
+
+TimingMiddleware がリクエストごとの計測を開始し、認証・DBクエリ・JSONシリアライズの
+各段階の所要時間とクエリ数を集計する。集計結果は以下に出力する。
+
+- Server-Timing ヘッダー（ブラウザの開発者ツールで確認できる）
+- ルートごとのヒストグラム（/metrics、Prometheus のテキスト形式）
+- Lambda上では、リクエストごとの構造化ログ（CloudWatch Embedded Metric Format）
+
+クエリ数はエンドポイントごとの上限（query_budget）と照合し、超過や同じSQLの繰り返し
+（N+1の疑い）をログに警告する。DATABASE_QUERY_BUDGET_MODE=strict の場合は上限を超えた
+クエリの実行前に QueryBudgetExceeded を送出する（テスト・開発向け）
+
+計測中のリクエストはコンテキスト変数で保持する。スレッドプール（run_in_threadpool）や
+非同期エンジンのグリーンレットにもコンテキストが引き継がれるため、同期・非同期モードの
+どちらでもDBクエリの時間が計測される
+"""
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.metrics import REQUEST_DURATION, REQUEST_PHASE_DURATION, REQUEST_QUERIES
+
+logger = logging.getLogger(__name__)
+
+# ルートに一致しなかったリクエスト（404・CORSのプリフライト等）のラベル
+UNMATCHED_ROUTE = "unmatched"
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """エンドポイントのクエリ数の上限を超えた（DATABASE_QUERY_BUDGET_MODE=strict）"""
+
+
+class RequestTiming:
+    """リクエストの計測状態"""
+
+    __slots__ = ("start", "request", "phases", "queries", "query_budget", "statements")
+
+    def __init__(self, request: str = ""):
+        self.start = time.perf_counter()
+        # ログ用のリクエストの表記（"GET /api/..."）
+        self.request = request
+        # 段階名 → 所要時間（秒）の合計
+        self.phases: dict[str, float] = {}
+        self.queries = 0
+        # エンドポイントのクエリ数の上限（query_budget で宣言、未宣言の場合はNone）
+        self.query_budget: int | None = None
+        # SQL → 実行回数（N+1の検出用）
+        self.statements: dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """段階の所要時間を加算"""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        """リクエスト開始からの経過時間（秒）"""
+        return time.perf_counter() - self.start
+
+
+_current: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+def current_timing() -> RequestTiming | None:
+    """計測中のリクエスト（リクエスト外ではNone）"""
+    return _current.get()
+
+
+def record_query(statement: str) -> None:
+    """
+    計測中のリクエストのクエリ数を加算（リクエスト外では何もしない）
+
+    Args:
+        statement: 実行するSQL
+
+    Raises:
+        QueryBudgetExceeded: strict モードでクエリ数の上限を超える場合
+    """
+    timing = _current.get()
+    if timing is None:
+        return
+    timing.queries += 1
+    timing.statements[statement] = timing.statements.get(statement, 0) + 1
+    if (
+        timing.query_budget is not None
+        and timing.queries > timing.query_budget
+        and settings.DATABASE_QUERY_BUDGET_MODE == "strict"
+    ):
+        raise QueryBudgetExceeded(
+            f"{timing.request}: クエリ数の上限（{timing.query_budget}）を超えました: "
+            f"{' '.join(statement.split())[:200]}"
+        )
+
+
+def set_query_budget(max_queries: int) -> None:
+    """
+    計測中のリクエストのクエリ数の上限を設定
+
+    Args:
+        max_queries: 認証を含むリクエスト全体のクエリ数の上限
+    """
+    timing = _current.get()
+    if timing is not None:
+        timing.query_budget = max_queries
+
+
+@contextmanager
+def query_allowance(expected: int) -> Iterator[None]:
+    """
+    ブロック内のクエリのうち、expected を超えた分をクエリ数の上限に加算
+
+    初回ログイン時のユーザー作成など、まれにしか発生しないクエリで上限を超えないようにする。
+    ブロック内では上限を確認しない
+
+    Args:
+        expected: 上限に含まれているブロック内のクエリ数
+    """
+    timing = _current.get()
+    if timing is None or timing.query_budget is None:
+        yield
+        return
+    budget, start = timing.query_budget, timing.queries
+    timing.query_budget = None
+    try:
+        yield
+    finally:
+        timing.query_budget = budget + max(0, timing.queries - start - expected)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """
+    計測中のリクエストに段階の所要時間を加算（リクエスト外では何もしない）
+
+    Args:
+        name: 段階名（auth / db / serialize）
+        seconds: 所要時間（秒）
+    """
+    timing = _current.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    ブロックの所要時間を段階として計測
+
+    Args:
+        name: 段階名
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - start)
+
+
+def resolve_request_log_mode() -> bool:
+    """
+    リクエストごとの構造化ログを出力するか決定
+
+    REQUEST_LOG_MODE=auto の場合、Lambda上（AWS_LAMBDA_FUNCTION_NAME が設定されている）でのみ
+    出力する（Lambdaではプロセス内のヒストグラムを収集できないため）
+
+    Returns:
+        bool: 出力する場合True
+    """
+    mode = settings.REQUEST_LOG_MODE.lower()
+    if mode == "auto":
+        return bool(os.environ.get("AWS_LAMBDA_FUNCTION_NAME"))
+    if mode not in ("on", "off"):
+        raise ValueError(f"不正な REQUEST_LOG_MODE です: {settings.REQUEST_LOG_MODE}")
+    return mode == "on"
+
+
+def server_timing_header(timing: RequestTiming) -> str:
+    """
+    Server-Timing ヘッダーの値を作成
+
+    Args:
+        timing: リクエストの計測状態
+
+    Returns:
+        str: 例 "auth;dur=1.2, db;dur=3.4, serialize;dur=0.3, total;dur=8.9"（ミリ秒）
+    """
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timing.phases.items()]
+    if timing.queries:
+        entries.append(f'queries;desc="{timing.queries}"')
+    entries.append(f"total;dur={timing.elapsed() * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def _route_label(scope: Scope) -> str:
+    """ルートのテンプレート（/api/previous-day-reports/{report_id} 等）"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def _check_queries(timing: RequestTiming) -> None:
+    """クエリ数の上限の超過と、同じSQLの繰り返し（N+1の疑い）をログに警告"""
+    budget = timing.query_budget
+    mode = settings.DATABASE_QUERY_BUDGET_MODE
+    if mode != "off" and budget is not None and timing.queries > budget:
+        logger.warning(
+            "クエリ数の上限を超えました: %s queries=%d budget=%d",
+            timing.request,
+            timing.queries,
+            timing.query_budget,
+        )
+    threshold = settings.DATABASE_N_PLUS_ONE_THRESHOLD
+    if threshold:
+        for statement, count in timing.statements.items():
+            if count >= threshold:
+                logger.warning(
+                    "同じSQLが%d回実行されました（N+1の疑い）: %s: %s",
+                    count,
+                    timing.request,
+                    " ".join(statement.split())[:500],
+                )
+
+
+def _emit_log(scope: Scope, route: str, status: int, duration: float, timing: RequestTiming):
+    """
+    リクエストの構造化ログを標準出力に出力（CloudWatch Embedded Metric Format）
+
+    CloudWatch Logs がログからルートごとのメトリクス（ミリ秒）を作成する
+    """
+    values = {"duration": duration * 1000}
+    values.update({name: seconds * 1000 for name, seconds in timing.phases.items()})
+    metrics = [{"Name": name, "Unit": "Milliseconds"} for name in values]
+    metrics.append({"Name": "queries", "Unit": "Count"})
+    record: dict[str, Any] = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": settings.METRICS_NAMESPACE,
+                    "Dimensions": [["route"]],
+                    "Metrics": metrics,
+                }
+            ],
+        },
+        "type": "request",
+        "route": f"{scope['method']} {route}",
+        "path": scope["path"],
+        "status": status,
+        **{name: round(value, 2) for name, value in values.items()},
+        "queries": timing.queries,
+    }
+    context = scope.get("aws.context")
+    if context is not None:
+        record["request_id"] = getattr(context, "aws_request_id", None)
+    sys.stdout.write(orjson.dumps(record).decode() + "\n")
+    sys.stdout.flush()
+
+
+class TimingMiddleware:
+    """
+    リクエストのタイミング計測ミドルウェア（ASGI）
+
+    レスポンスヘッダーの送信時に Server-Timing を付与し、レスポンスの送信完了時
+    （ストリーミングの場合は最後のチャンクの送信後）にヒストグラム・ログに記録する
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.server_timing = settings.SERVER_TIMING_ENABLED
+        self.log = resolve_request_log_mode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming(f"{scope['method']} {scope['path']}")
+        token = _current.set(timing)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", server_timing_header(timing)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            duration = timing.elapsed()
+            method = scope["method"]
+            route = _route_label(scope)
+            REQUEST_DURATION.observe((method, route, str(status)), duration)
+            for name, seconds in timing.phases.items():
+                REQUEST_PHASE_DURATION.observe((method, route, name), seconds)
+            REQUEST_QUERIES.observe((method, route), timing.queries)
+            _check_queries(timing)
+            if self.log:
+                _emit_log(scope, route, status, duration, timing)
@@ -0,0 +1,140 @@
+"""
+非同期DBパスのベンチマーク
+
+遅いクエリ（pg_sleep）と速いクエリ（SELECT 1）を同時に発行し、
+速いリクエストのレイテンシが遅いクエリにどれだけ引きずられるかを比較する。
+
+- blocking:   同期Sessionをイベントループ上で直接実行（従来の挙動）
+- threadpool: 同期Sessionをスレッドプールで実行（DATABASE_ASYNC=False）
+- async:      psycopg3 async ドライバの AsyncSession（DATABASE_ASYNC=True）
+
+実行方法（backendディレクトリで実行、PostgreSQLが必要）:
+    python -m benchmarks.bench_async_db --slow 10 --fast 200 --sleep 0.5
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import to_async_database_url
+from benchmarks.common import print_header, print_row, summarize_ms
+
+SLOW_QUERY = text("SELECT pg_sleep(:seconds)")
+FAST_QUERY = text("SELECT 1")
+
+
+async def run_workload(handler, slow: int, fast: int, sleep: float) -> tuple[list[float], float]:
+    """
+    遅いリクエストと速いリクエストを混在させて実行
+
+    Args:
+        handler: リクエストハンドラー（slow: bool を受け取るコルーチン関数）
+        slow: 遅いリクエスト数
+        fast: 速いリクエスト数
+        sleep: 遅いクエリの待機秒数
+
+    Returns:
+        tuple[list[float], float]: (速いリクエストのレイテンシ一覧, 全体の経過秒数)
+    """
+    fast_latencies: list[float] = []
+
+    async def timed_fast():
+        start = time.perf_counter()
+        await handler(False)
+        fast_latencies.append(time.perf_counter() - start)
+
+    async def fast_stream():
+        # 速いリクエストは遅いクエリ実行中に少しずつ到着させる
+        interval = sleep / max(fast, 1)
+        tasks = []
+        for _ in range(fast):
+            tasks.append(asyncio.create_task(timed_fast()))
+            await asyncio.sleep(interval)
+        await asyncio.gather(*tasks)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(True) for _ in range(slow)), fast_stream())
+    return fast_latencies, time.perf_counter() - start
+
+
+def make_sync_handlers(sleep: float):
+    """同期Sessionを使うハンドラー（blocking / threadpool）を作成"""
+    engine = create_engine(settings.DATABASE_URL, pool_size=5, max_overflow=10)
+    session_factory = sessionmaker(bind=engine)
+
+    def query(slow: bool):
+        with session_factory() as db:
+            if slow:
+                db.execute(SLOW_QUERY, {"seconds": sleep})
+            else:
+                db.execute(FAST_QUERY)
+
+    async def blocking(slow: bool):
+        query(slow)
+
+    async def threadpool(slow: bool):
+        await run_in_threadpool(query, slow)
+
+    return engine, blocking, threadpool
+
+
+def make_async_handler(sleep: float):
+    """AsyncSessionを使うハンドラーを作成"""
+    engine = create_async_engine(
+        to_async_database_url(settings.DATABASE_URL), pool_size=5, max_overflow=10
+    )
+    session_factory = async_sessionmaker(bind=engine)
+
+    async def handler(slow: bool):
+        async with session_factory() as db:
+            if slow:
+                await db.execute(SLOW_QUERY, {"seconds": sleep})
+            else:
+                await db.execute(FAST_QUERY)
+
+    return engine, handler
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    sync_engine, blocking, threadpool = make_sync_handlers(args.sleep)
+    async_engine, async_handler = make_async_handler(args.sleep)
+
+    try:
+        for label, handler in (
+            ("blocking", blocking),
+            ("threadpool", threadpool),
+            ("async", async_handler),
+        ):
+            # ウォームアップ（コネクションプールを満たす）
+            await run_workload(handler, slow=0, fast=10, sleep=args.sleep)
+
+            latencies, elapsed = await run_workload(
+                handler, slow=args.slow, fast=args.fast, sleep=args.sleep
+            )
+            print_row(label, summarize_ms(latencies), f" total={elapsed:6.2f}s")
+    finally:
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="非同期DBパスのベンチマーク")
+    parser.add_argument("--slow", type=int, default=10, help="遅いリクエスト数")
+    parser.add_argument("--fast", type=int, default=200, help="速いリクエスト数")
+    parser.add_argument("--sleep", type=float, default=0.5, help="遅いクエリの秒数")
+    args = parser.parse_args()
+
+    print_header("非同期DBパス ベンチマーク（速いリクエストのレイテンシ）")
+    print(f"slow={args.slow} fast={args.fast} sleep={args.sleep}s")
+    print()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
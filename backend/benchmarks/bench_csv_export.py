@@ -0,0 +1,258 @@
+"""
+前日報告CSVエクスポートのベンチマーク
+
+大量の前日報告（デフォルト100万行）を投入し、エクスポートのピークRSSと
+最初のバイトまでの時間（TTFB）を比較する。モードごとに別プロセスで計測する。
+
+- materialize:  .all() で全行を取得してからCSVを作成（従来の読み出し方）
+- stream-sync:  GET /api/exports/previous-day-reports.csv（同期Session + スレッドプール）
+- stream-async: 同上（DATABASE_ASYNC=True）
+
+エンドポイントはASGIアプリを直接呼び出して計測する（レスポンスボディは読み捨てる）。
+
+実行方法（backendディレクトリで実行、PostgreSQLが必要）:
+    python -m benchmarks.bench_csv_export --rows 1000000
+    python -m benchmarks.bench_csv_export --cleanup   # 投入したデータを削除
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import uuid
+
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from benchmarks.common import print_header
+
+EXPORT_PATH = "/api/exports/previous-day-reports.csv"
+
+# ベンチマーク用ユーザーの識別子（cognito_user_id の接頭辞）
+BENCH_USER_PREFIX = "bench-export-"
+BENCH_USERS = 1000
+
+MODES = ("materialize", "stream-sync", "stream-async")
+
+
+def peak_rss_mb() -> float:
+    """このプロセスのピークRSS（MB）"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed(rows: int) -> None:
+    """
+    ベンチマーク用ユーザーと前日報告を投入（既に同じ件数がある場合は何もしない）
+
+    ユーザーごとに報告日を変えて一意制約 (user_id, report_date) を満たす
+    """
+    engine = create_engine(settings.DATABASE_URL)
+    days = -(-rows // BENCH_USERS)
+    with engine.begin() as conn:
+        existing = conn.execute(
+            text(
+                "SELECT count(*) FROM previous_day_reports r JOIN users u ON u.id = r.user_id "
+                "WHERE u.cognito_user_id LIKE :prefix"
+            ),
+            {"prefix": BENCH_USER_PREFIX + "%"},
+        ).scalar()
+        if existing == rows:
+            print(f"投入済みのデータを使用します: {rows:,} 行")
+            return
+
+        cleanup(conn)
+        start = time.perf_counter()
+        conn.execute(
+            text(
+                "INSERT INTO users (cognito_user_id, email, role, name) "
+                "SELECT :prefix || i, :prefix || i || '@example.com', 'staff', 'ベンチ' || i "
+                "FROM generate_series(1, :users) AS i"
+            ),
+            {"prefix": BENCH_USER_PREFIX, "users": BENCH_USERS},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO previous_day_reports ("
+                "  user_id, report_date, next_wake_up_time, next_departure_time,"
+                "  next_arrival_time, appearance_photo_url, route_photo_url, notes) "
+                "SELECT u.id, DATE '2000-01-01' + d, TIME '06:00', TIME '07:30', TIME '09:00',"
+                "  'https://example.com/appearance/' || u.id || '/' || d || '.jpg',"
+                "  'https://example.com/route/' || u.id || '/' || d || '.jpg',"
+                "  '特になし' "
+                "FROM users u CROSS JOIN generate_series(0, :days - 1) AS d "
+                "WHERE u.cognito_user_id LIKE :pattern "
+                "LIMIT :rows"
+            ),
+            {"pattern": BENCH_USER_PREFIX + "%", "days": days, "rows": rows},
+        )
+        print(f"{rows:,} 行を投入しました（{time.perf_counter() - start:.1f}s）")
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE previous_day_reports"))
+    engine.dispose()
+
+
+def cleanup(conn) -> None:
+    """ベンチマーク用ユーザーを削除（前日報告・サマリーはCASCADEで削除される）"""
+    conn.execute(
+        text("DELETE FROM users WHERE cognito_user_id LIKE :pattern"),
+        {"pattern": BENCH_USER_PREFIX + "%"},
+    )
+
+
+def run_materialize() -> dict:
+    """従来の読み出し方（全行を取得してからCSVを作成）"""
+    from app.database import SessionLocal, get_engine
+    from app.repositories.previous_day_report_repository import _select_for_export
+    from app.services.export_service import _csv_header, _csv_rows
+
+    get_engine()
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    with SessionLocal() as db:
+        query = _select_for_export(None, None, None).execution_options(yield_per=None)
+        rows = db.execute(query).all()
+        body = _csv_header() + _csv_rows(rows)
+    elapsed = time.perf_counter() - start
+    # 全行をメモリに載せてからでないと送信を開始できないため TTFB = 全体時間
+    return {
+        "ttfb": elapsed,
+        "total": elapsed,
+        "bytes": len(body),
+        "rows": len(rows),
+        "baseline_mb": baseline,
+        "peak_mb": peak_rss_mb(),
+    }
+
+
+async def run_stream() -> dict:
+    """エクスポートAPIをASGIで呼び出し、ボディを読み捨てながら計測"""
+    from app.dependencies import CurrentUser, get_current_manager
+    from app.main import app
+
+    app.dependency_overrides[get_current_manager] = lambda: CurrentUser(
+        id=uuid.uuid4(), cognito_user_id="bench", email="bench@example.com", role="manager"
+    )
+
+    disconnected = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    stats = {"ttfb": None, "bytes": 0, "lines": 0, "status": None}
+    start = 0.0
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            stats["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            if body and stats["ttfb"] is None:
+                stats["ttfb"] = time.perf_counter() - start
+            stats["bytes"] += len(body)
+            stats["lines"] += body.count(b"\n")
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": EXPORT_PATH,
+        "raw_path": EXPORT_PATH.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    total = time.perf_counter() - start
+    disconnected.set()
+
+    if stats["status"] != 200:
+        raise RuntimeError(f"エクスポートが失敗しました: status={stats['status']}")
+    return {
+        "ttfb": stats["ttfb"],
+        "total": total,
+        "bytes": stats["bytes"],
+        "rows": stats["lines"] - 1,
+        "baseline_mb": baseline,
+        "peak_mb": peak_rss_mb(),
+    }
+
+
+def run_worker(mode: str) -> None:
+    """計測用サブプロセスの処理（結果をJSONで標準出力に書く）"""
+    if mode == "materialize":
+        result = run_materialize()
+    else:
+        result = asyncio.run(run_stream())
+    print(json.dumps(result))
+
+
+def measure(mode: str) -> dict:
+    """モードごとに別プロセスで計測（ピークRSSを独立させるため）"""
+    env = dict(os.environ, DATABASE_ASYNC="true" if mode == "stream-async" else "false")
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_csv_export", "--worker", mode],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="前日報告CSVエクスポートのベンチマーク")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="投入する前日報告の行数")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=MODES,
+        default=list(MODES),
+        help="計測するモード",
+    )
+    parser.add_argument("--cleanup", action="store_true", help="投入したデータを削除して終了")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker)
+        return
+
+    if args.cleanup:
+        engine = create_engine(settings.DATABASE_URL)
+        with engine.begin() as conn:
+            cleanup(conn)
+        engine.dispose()
+        print("ベンチマーク用データを削除しました")
+        return
+
+    print_header("前日報告CSVエクスポート ベンチマーク（ピークRSS / TTFB）")
+    seed(args.rows)
+    print()
+    for mode in args.modes:
+        r = measure(mode)
+        print(
+            f"{mode:<14} rows={r['rows']:>9,} size={r['bytes'] / 1024 / 1024:7.1f}MB "
+            f"ttfb={r['ttfb'] * 1000:9.1f}ms total={r['total']:6.2f}s "
+            f"peak_rss={r['peak_mb']:7.1f}MB (+{r['peak_mb'] - r['baseline_mb']:.1f}MB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Lambdaコールドスタートのインポート時間ベンチマーク
+
+新しいPythonプロセスで `python -X importtime -c "import lambda_handler"` を繰り返し実行し、
+初期化フェーズのインポート時間（中央値）を計測する。
+以下の場合は終了コード1で失敗する（CIでの回帰検知用）。
+
+- インポート時間の中央値が予算（--budget-ms、既定は基準値 BASELINE_MS + BUDGET_MARGIN）を超えた場合
+- 初回使用まで遅延させるべきモジュール（DBドライバ、jose、boto3等）が読み込まれた場合
+
+あわせて、どのリクエストの処理にも必要なため遅延できないフレームワーク（FRAMEWORK_IMPORTS）
+のみのインポート時間を計測し、アプリ自身のモジュール（ルーター・依存関係・モデル・スキーマ）
+の分と分けて表示する。
+
+実行方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_import_time --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.common import print_header
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 予算の基準値: lambda_handler のインポート時間の中央値（1 vCPU の開発環境で --runs 10 を
+# 11回実行した中央値の中央値 1036ms。各回の中央値は 962〜1127ms）
+BASELINE_MS = 1040.0
+# 基準値に対する余裕（計測のばらつき（最大 +9%）を上回り、15%を超える回帰を検知する）
+BUDGET_MARGIN = 0.15
+# 既定の予算（1040ms × 1.15 = 1196ms）
+DEFAULT_BUDGET_MS = round(BASELINE_MS * (1 + BUDGET_MARGIN))
+
+# 初期化フェーズで読み込んではいけないモジュール（初回使用時に遅延インポートする）
+DEFERRED_MODULES = (
+    "psycopg",
+    "jose",
+    "cryptography",
+    "boto3",
+    "botocore",
+    "sqlalchemy.ext.asyncio",
+    "PIL",
+)
+
+# どのリクエストの処理にも必要なため、初期化フェーズで読み込むフレームワーク
+# （ルーティング・依存関係の解決、ORMのモデル、EmailStr の検証）
+FRAMEWORK_IMPORTS = "mangum, fastapi, sqlalchemy.orm, pydantic, email_validator"
+
+
+def run_importtime(target: str) -> tuple[float, list[tuple[int, str]]]:
+    """
+    新しいプロセスで -X importtime を実行
+
+    Args:
+        target: インポートするモジュール名（カンマ区切りで複数指定した場合は合計）
+
+    Returns:
+        tuple: (総インポート時間[ms], [(自己時間[us], モジュール名), ...])
+    """
+    targets = {name.strip() for name in target.split(",")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "0"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total_us = 0
+    self_times: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        self_times.append((int(self_us), name.strip()))
+        # 最上位（インデントなし）のインポートのみ合計する
+        if name.strip() in targets and len(name) - len(name.lstrip()) == 1:
+            total_us += int(cumulative_us)
+
+    return total_us / 1000, self_times
+
+
+def loaded_deferred_modules(target: str) -> list[str]:
+    """
+    インポート後に読み込まれている遅延対象モジュールを取得
+
+    Args:
+        target: インポートするモジュール名
+
+    Returns:
+        list[str]: 読み込まれていた遅延対象モジュール
+    """
+    code = f"import json, sys, {target}; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set(json.loads(result.stdout))
+    return [name for name in DEFERRED_MODULES if name in modules]
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="コールドスタートのインポート時間ベンチマーク")
+    parser.add_argument("--target", default="lambda_handler", help="インポートするモジュール")
+    parser.add_argument("--runs", type=int, default=10, help="計測回数")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="インポート時間の予算(ms)。既定は基準値 + 15%%",
+    )
+    parser.add_argument("--top", type=int, default=15, help="表示する自己時間上位モジュール数")
+    args = parser.parse_args()
+
+    print_header(f"インポート時間ベンチマーク: {args.target}")
+
+    # 1回目はバイトコード生成を含むため計測から除外
+    run_importtime(args.target)
+
+    totals = []
+    last_self_times: list[tuple[int, str]] = []
+    for _ in range(args.runs):
+        total_ms, last_self_times = run_importtime(args.target)
+        totals.append(total_ms)
+
+    framework = statistics.median(run_importtime(FRAMEWORK_IMPORTS)[0] for _ in range(args.runs))
+
+    median = statistics.median(totals)
+    print(f"runs={args.runs} median={median:.1f}ms min={min(totals):.1f}ms max={max(totals):.1f}ms")
+    print(f"  フレームワーク（{FRAMEWORK_IMPORTS}）: {framework:.1f}ms")
+    print(f"  アプリのモジュール（差分）: {median - framework:.1f}ms")
+    print(f"budget={args.budget_ms:.1f}ms (baseline={BASELINE_MS:.1f}ms)")
+    print()
+    print("自己時間の上位モジュール:")
+    for self_us, name in sorted(last_self_times, reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:8.2f}ms  {name}")
+    print()
+
+    failed = False
+    deferred = loaded_deferred_modules(args.target)
+    if deferred:
+        names = ", ".join(deferred)
+        print(f"✗ 遅延インポート対象のモジュールが初期化時に読み込まれています: {names}")
+        failed = True
+
+    if median > args.budget_ms:
+        print(f"✗ インポート時間が予算を超えています: {median:.1f}ms > {args.budget_ms:.1f}ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✓ インポート時間は予算内です")
+
+
+if __name__ == "__main__":
+    main()
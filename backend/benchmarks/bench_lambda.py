@@ -0,0 +1,368 @@
+"""
+Lambdaハンドラーの呼び出しベンチマーク
+
+API Gateway のイベント（REST API: ペイロード v1 / HTTP API: ペイロード v2）を合成し、
+lambda_handler.lambda_handler をプロセス内で呼び出して計測する。コールドスタートを再現するため、
+計測ごとに新しいPythonプロセスを起動する（--runs 回）。
+
+- init:    lambda_handler のインポート時間（Lambda の Init Duration に相当。ランタイム自体の
+           起動時間は含まない）
+- first:   初回呼び出しのレイテンシ（エンジン作成・DB接続・JWKS取得等の遅延初期化を含む）
+- steady:  2回目以降の呼び出しのレイテンシ（--invocations 回、イベントを順に繰り返す）
+- max RSS: プロセスのメモリ使用量の最大値（Lambda の Max Memory Used に相当）
+
+計測プロセスには AWS_LAMBDA_FUNCTION_NAME を設定するため、プールモード・構造化ログ・写真の
+後処理は Lambda上と同じ設定（auto）で動作する。認証が必要なイベントにはローカルJWKSスタンドインで
+発行したIDトークンを付与する（DBアクセスを含むためPostgreSQLが必要）。
+
+記録済みのイベントを使う場合は、API Gateway のイベント（またはそのリスト）のJSONファイルを
+--events で指定する。Authorization ヘッダーは発行したIDトークンに置き換える。
+
+実行方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_lambda --runs 5 --invocations 200
+    python -m benchmarks.bench_lambda --events recorded-events.json --json result.json
+"""
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from benchmarks.common import print_header, print_row, summarize_ms
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 合成データのユーザーの Cognito User ID の接頭辞（終了時に削除する）
+PREFIX = "bench-lambda-"
+
+FUNCTION_NAME = "okiteru-api-bench"
+
+# 合成するイベント（メソッド, パス, クエリ文字列, 認証の要否）。
+# 初回呼び出しで認証・DBの遅延初期化を計測するため、DBアクセスを含むイベントを先頭にする
+SYNTHETIC_REQUESTS = (
+    ("GET", "/api/previous-day-reports/latest/me", "", True),
+    ("GET", "/health", "", False),
+    ("GET", "/api/users/me", "", True),
+    ("GET", "/api/previous-day-reports", "limit=10", True),
+)
+
+
+class LambdaContext:
+    """Lambda のコンテキストオブジェクトの代替"""
+
+    def __init__(self, memory_limit_in_mb: int):
+        self.function_name = FUNCTION_NAME
+        self.function_version = "$LATEST"
+        self.invoked_function_arn = (
+            f"arn:aws:lambda:ap-northeast-1:000000000000:function:{FUNCTION_NAME}"
+        )
+        self.memory_limit_in_mb = memory_limit_in_mb
+        self.aws_request_id = str(uuid.uuid4())
+        self.log_group_name = f"/aws/lambda/{FUNCTION_NAME}"
+        self.log_stream_name = "bench"
+
+    def get_remaining_time_in_millis(self) -> int:
+        return 30000
+
+
+def api_gateway_event(
+    payload_format: str, method: str, path: str, query: str, headers: dict[str, str]
+) -> dict[str, Any]:
+    """
+    API Gateway のプロキシ統合イベントを作成
+
+    Args:
+        payload_format: v1（REST API）/ v2（HTTP API）
+        method: HTTPメソッド
+        path: パス
+        query: クエリ文字列（"limit=10" 等、?は含めない）
+        headers: リクエストヘッダー
+
+    Returns:
+        dict[str, Any]: イベント
+    """
+    headers = {"host": "api.example.com", "user-agent": "bench", "accept": "*/*", **headers}
+    params = dict(pair.split("=", 1) for pair in query.split("&")) if query else None
+    request_id = str(uuid.uuid4())
+    if payload_format == "v2":
+        return {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": path,
+            "rawQueryString": query,
+            "headers": headers,
+            "queryStringParameters": params,
+            "requestContext": {
+                "accountId": "000000000000",
+                "apiId": "bench",
+                "domainName": headers["host"],
+                "http": {
+                    "method": method,
+                    "path": path,
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "203.0.113.10",
+                    "userAgent": headers["user-agent"],
+                },
+                "requestId": request_id,
+                "routeKey": "$default",
+                "stage": "$default",
+                "timeEpoch": int(time.time() * 1000),
+            },
+            "isBase64Encoded": False,
+        }
+    return {
+        "resource": "/{proxy+}",
+        "path": path,
+        "httpMethod": method,
+        "headers": headers,
+        "multiValueHeaders": {name: [value] for name, value in headers.items()},
+        "queryStringParameters": params,
+        "multiValueQueryStringParameters": (
+            {name: [value] for name, value in params.items()} if params else None
+        ),
+        "pathParameters": {"proxy": path.lstrip("/")},
+        "stageVariables": None,
+        "requestContext": {
+            "accountId": "000000000000",
+            "apiId": "bench",
+            "httpMethod": method,
+            "identity": {"sourceIp": "203.0.113.10", "userAgent": headers["user-agent"]},
+            "path": f"/prod{path}",
+            "protocol": "HTTP/1.1",
+            "requestId": request_id,
+            "resourcePath": "/{proxy+}",
+            "stage": "prod",
+        },
+        "body": None,
+        "isBase64Encoded": False,
+    }
+
+
+def synthetic_events(payload_format: str, token: str) -> list[dict[str, Any]]:
+    """合成イベントの一覧"""
+    return [
+        api_gateway_event(
+            payload_format,
+            method,
+            path,
+            query,
+            {"authorization": f"Bearer {token}"} if authenticated else {},
+        )
+        for method, path, query, authenticated in SYNTHETIC_REQUESTS
+    ]
+
+
+def load_events(path: str, token: str) -> list[dict[str, Any]]:
+    """
+    記録済みのイベントを読み込み、Authorization ヘッダーを置き換える
+
+    Args:
+        path: イベント（またはそのリスト）のJSONファイル
+        token: 付与するIDトークン
+
+    Returns:
+        list[dict[str, Any]]: イベント
+    """
+    with open(path, encoding="utf-8") as f:
+        loaded = json.load(f)
+    events = loaded if isinstance(loaded, list) else [loaded]
+    for event in events:
+        for key in ("headers", "multiValueHeaders"):
+            headers = event.get(key) or {}
+            for name in list(headers):
+                if name.lower() == "authorization":
+                    value = f"Bearer {token}"
+                    headers[name] = [value] if key == "multiValueHeaders" else value
+    return events
+
+
+def payload_format_of(event: dict[str, Any]) -> str:
+    """イベントのペイロード形式（v1 / v2）"""
+    return "v2" if event.get("version") == "2.0" else "v1"
+
+
+def run_worker(result_path: str) -> None:
+    """
+    計測プロセスの処理（標準入力のイベントでハンドラーを呼び出し、結果をファイルに書き込む）
+
+    Args:
+        result_path: 結果（JSON）の出力先
+    """
+    spec = json.load(sys.stdin)
+    events, invocations = spec["events"], spec["invocations"]
+    memory = int(os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "512"))
+
+    start = time.perf_counter()
+    lambda_handler = importlib.import_module("lambda_handler").lambda_handler
+    init = time.perf_counter() - start
+
+    latencies, errors, error_count = [], [], 0
+    # 構造化ログ（Lambda上では標準出力に出力）は計測結果に混ざらないよう破棄する
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(invocations + 1):
+            event = events[i % len(events)]
+            start = time.perf_counter()
+            response = lambda_handler(event, LambdaContext(memory))
+            latencies.append(time.perf_counter() - start)
+            if response["statusCode"] >= 400:
+                error_count += 1
+                if len(errors) < 5:
+                    errors.append(f"{response['statusCode']} {str(response.get('body'))[:200]}")
+
+    # Linux の ru_maxrss はKB単位
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    with open(result_path, "w") as f:
+        json.dump(
+            {
+                "init": init,
+                "first": latencies[0],
+                "steady": latencies[1:],
+                "max_rss_mb": max_rss,
+                "errors": errors,
+                "error_count": error_count,
+            },
+            f,
+        )
+
+
+def run_cold_start(
+    events: list[dict[str, Any]], invocations: int, env: dict[str, str]
+) -> dict[str, Any]:
+    """
+    新しいプロセスでコールドスタートからの呼び出しを計測
+
+    Args:
+        events: 呼び出すイベント
+        invocations: 初回以降の呼び出し回数
+        env: 計測プロセスの環境変数
+
+    Returns:
+        dict[str, Any]: init / first / steady（秒）、max_rss_mb、errors（例）、error_count
+    """
+    with tempfile.NamedTemporaryFile(suffix=".json") as result:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_lambda", "--worker", result.name],
+            input=json.dumps({"events": events, "invocations": invocations}),
+            cwd=BACKEND_DIR,
+            env=env,
+            text=True,
+            check=True,
+        )
+        with open(result.name) as f:
+            return json.load(f)
+
+
+def cleanup() -> None:
+    """合成データを削除"""
+    from sqlalchemy import create_engine, text
+
+    from app.config import settings
+
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(
+            text("DELETE FROM users WHERE cognito_user_id LIKE :prefix"), {"prefix": f"{PREFIX}%"}
+        )
+    engine.dispose()
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="Lambdaハンドラーの呼び出しベンチマーク")
+    parser.add_argument("--runs", type=int, default=5, help="コールドスタートの回数")
+    parser.add_argument("--invocations", type=int, default=200, help="初回以降の呼び出し回数")
+    parser.add_argument(
+        "--format",
+        choices=("v1", "v2", "both"),
+        default="both",
+        help="合成イベントの形式",
+    )
+    parser.add_argument("--events", help="記録済みのイベント（JSON）。指定時は合成しない")
+    parser.add_argument("--memory", type=int, default=512, help="関数のメモリサイズ（MB）")
+    parser.add_argument("--json", help="結果（要約）をJSONで保存するパス（変更前後の比較用）")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker)
+        return
+
+    # 計測プロセスが jose・cryptography を事前に読み込まないよう、ここでインポートする
+    from benchmarks.jwks_stub import JWKSStub
+
+    stub = JWKSStub(user_pool_id="local-pool", client_id="local-client")
+    env = dict(
+        os.environ,
+        AWS_LAMBDA_FUNCTION_NAME=FUNCTION_NAME,
+        AWS_LAMBDA_FUNCTION_MEMORY_SIZE=str(args.memory),
+        COGNITO_USER_POOL_ID=stub.user_pool_id,
+        COGNITO_CLIENT_ID=stub.client_id,
+        COGNITO_REGION=stub.region,
+        COGNITO_JWKS_URL=stub.serve(),
+        PYTHONDONTWRITEBYTECODE="0",
+    )
+    token = stub.issue_token(sub=f"{PREFIX}staff", email=f"{PREFIX}staff@example.com")
+
+    if args.events:
+        events = load_events(args.events, token)
+        suites = {payload_format_of(events[0]): events}
+    else:
+        formats = ("v1", "v2") if args.format == "both" else (args.format,)
+        suites = {name: synthetic_events(name, token) for name in formats}
+
+    print_header("Lambdaハンドラー 呼び出しベンチマーク（Mangum・プロセス内）")
+    print(
+        f"runs={args.runs} invocations={args.invocations} memory={args.memory}MB "
+        f"events={args.events or 'synthetic'} python={sys.version.split()[0]}"
+    )
+    print()
+
+    summary: dict[str, Any] = {}
+    try:
+        for payload_format, events in suites.items():
+            results = [run_cold_start(events, args.invocations, env) for _ in range(args.runs)]
+            init = [result["init"] for result in results]
+            first = [result["first"] for result in results]
+            steady = [value for result in results for value in result["steady"]]
+            max_rss = max(result["max_rss_mb"] for result in results)
+            errors = [error for result in results for error in result["errors"]]
+            error_count = sum(result["error_count"] for result in results)
+
+            print(f"API Gateway payload {payload_format}（{len(events)}種類のイベント）")
+            print_row("  init", summarize_ms(init))
+            print_row("  first invocation", summarize_ms(first))
+            print_row("  steady", summarize_ms(steady))
+            print(f"  max RSS {max_rss:.1f}MB / {args.memory}MB")
+            if error_count:
+                print(f"  エラー {error_count}件")
+            for error in errors[:5]:
+                print(f"  エラー例: {error}")
+            print()
+            summary[payload_format] = {
+                "init_ms": statistics.median(init) * 1000,
+                "first_ms": statistics.median(first) * 1000,
+                "steady": summarize_ms(steady),
+                "max_rss_mb": max_rss,
+                "errors": error_count,
+            }
+    finally:
+        stub.shutdown()
+        cleanup()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"結果を保存しました: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
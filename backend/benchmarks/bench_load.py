@@ -0,0 +1,654 @@
+"""
+エンドポイントの負荷試験（PERF-002 / PERF-004）
+
+ローカルのPostgreSQLに合成データ（スタッフ・マネージャーと前日報告の履歴）を投入し、
+uvicorn で起動したアプリケーションに仮想ユーザーから並行にリクエストを送って、ルートごとの
+レイテンシ（p50/p95/p99）とスループットを表示する。認証はローカルJWKSスタンドインで発行した
+IDトークンを使用する（Cognito不要）。
+
+シナリオ（--scenario、既定は全て。起動直後のサーバーに wakeup から順に実行する）:
+
+- wakeup:    6時の一斉起床。全スタッフが --ramp 秒の間に集中してアクセスし、ユーザー情報と
+             最新の前日報告の確認、前日報告の登録（upsert）、一覧の確認を行う
+- dashboard: 上記の一斉アクセス中に、マネージャーが --interval 秒ごとにダッシュボードと
+             スタッフ一覧を更新する
+- steady:    --users 人の仮想ユーザーが --duration 秒間、平均 --think 秒の間隔で読み出し中心の
+             リクエストを繰り返す（同時接続数の確認。--think 0 で待ちなしの最大スループット）
+- attendance: 朝の勤怠報告。全スタッフが --ramp 秒の間に起床・出発・到着を順に報告する。
+             各報告は二度押しとして同じ内容を2回同時に送信し、最後に当日の勤怠記録を確認する
+
+判定（満たさない場合は終了コード1）:
+
+- PERF-002: 全シナリオ・全ルートの p95（--slo-percentile）が 500ms（--slo-ms）未満であること
+- PERF-004: steady で100人（--users）が同時に接続し、エラー（4xx・5xx・タイムアウト・
+            接続エラー）がないこと。--users が100未満の場合は判定しない。
+            同期・非同期のセッション（DATABASE_ASYNC=false / true）の両方で満たすこと
+- attendance: スタッフごとに勤怠記録が1件だけ作成されて complete になり、各段階の二度押しの
+            うち記録されたのが1回だけ（201が1件・200が1件）であること
+
+サーバーは DATABASE_URL・DATABASE_ASYNC 等の環境変数を引き継いで起動する。
+負荷を掛ける側も同じマシンで動くため、CPUコア数が少ない環境では値が悪化する。
+
+実行方法（backendディレクトリで実行、PostgreSQLが必要）:
+    python -m benchmarks.bench_load --users 100 --duration 20
+    DATABASE_ASYNC=true python -m benchmarks.bench_load --users 100 --duration 20
+    python -m benchmarks.bench_load --scenario wakeup --ramp 5
+    python -m benchmarks.bench_load --scenario attendance --staff 300 --ramp 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+from datetime import time as dt_time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import percentile, print_header, summarize_ms
+from benchmarks.jwks_stub import JWKSStub
+
+stub = JWKSStub(user_pool_id="local-pool", client_id="local-client")
+
+from sqlalchemy import create_engine, delete, func, insert, select  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.models.attendance import AttendanceRecord  # noqa: E402
+from app.models.previous_day_report import PreviousDayReport  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 合成データのユーザーの Cognito User ID の接頭辞（終了時に削除する）
+PREFIX = "bench-load-"
+
+SCENARIOS = ("wakeup", "dashboard", "steady", "attendance")
+
+# 勤怠報告の段階のパス → 送信データ（報告の順）
+ATTENDANCE_STAGES = {
+    "wakeup": {"wake_up_location": "自宅"},
+    "departure": {"departure_location": "自宅", "destination": "現場"},
+    "arrival": {"arrival_location": "現場", "arrival_gps_location": "35.6580,139.7016"},
+}
+
+# PERF-004 の同時接続ユーザー数
+PERF_004_USERS = 100
+
+# リクエストのタイムアウト（秒）。DATABASE_POOL_TIMEOUT（既定30秒）より短くし、
+# 接続の取得待ちで停止したリクエストをタイムアウトのエラーとして数える
+REQUEST_TIMEOUT = 10
+
+
+class VirtualUser:
+    """仮想ユーザー（IDトークンを保持）"""
+
+    def __init__(self, index: int, role: str):
+        self.sub = f"{PREFIX}{role}{index:04d}"
+        self.email = f"{self.sub}@example.com"
+        groups = ["manager"] if role == "manager" else ["staff"]
+        token = stub.issue_token(sub=self.sub, email=self.email, groups=groups)
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+
+class Recorder:
+    """ルートごとのレイテンシ・エラー数・同時実行数を記録"""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.error_samples: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        # attendance: (Cognito User ID, 段階) → 記録された（201の）報告数
+        self.recorded: dict[tuple[str, str], int] = defaultdict(int)
+
+    async def request(
+        self, client: httpx.AsyncClient, route: str, method: str, path: str, **kwargs
+    ) -> httpx.Response | None:
+        """
+        リクエストを送信してレイテンシを記録
+
+        Args:
+            client: HTTPクライアント
+            route: 集計に使うルート名（"GET /api/previous-day-reports/{report_id}" 等）
+            method: HTTPメソッド
+            path: パス
+
+        Returns:
+            httpx.Response | None: レスポンス（接続エラー・タイムアウトの場合はNone）
+        """
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            self._error(route, f"{route}: {type(e).__name__}")
+            return None
+        finally:
+            self.in_flight -= 1
+        self.latencies[route].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self._error(route, f"{route}: {response.status_code} {response.text[:200]}")
+        return response
+
+    def _error(self, route: str, sample: str) -> None:
+        self.errors[route] += 1
+        if len(self.error_samples) < 5:
+            self.error_samples.append(sample)
+
+    def finish(self) -> None:
+        """シナリオの経過時間を確定"""
+        self.elapsed = time.perf_counter() - self.start
+
+
+def report_body(report_date: date) -> dict:
+    """前日報告の登録データ（API）"""
+    return {
+        "report_date": report_date.isoformat(),
+        "next_wake_up_time": "06:00:00",
+        "next_departure_time": "07:30:00",
+        "next_arrival_time": "09:00:00",
+        "appearance_photo_url": "https://example.com/appearance.jpg",
+        "route_photo_url": "https://example.com/route.jpg",
+    }
+
+
+def report_row(user_id: uuid.UUID, report_date: date) -> dict:
+    """前日報告の行（合成データ、5〜7時台の起床）"""
+    wake_up = random.randint(5 * 60, 7 * 60 + 59)
+    hour, minute = divmod(wake_up, 60)
+    return {
+        "user_id": user_id,
+        "report_date": report_date,
+        "next_wake_up_time": dt_time(hour, minute),
+        "next_departure_time": dt_time(hour + 1, minute),
+        "next_arrival_time": dt_time(hour + 2, minute),
+        "appearance_photo_url": "https://example.com/appearance.jpg",
+        "route_photo_url": "https://example.com/route.jpg",
+    }
+
+
+def seed(staff: list[VirtualUser], managers: list[VirtualUser], days: int, today: date):
+    """
+    合成データを投入（前回の残りは削除してから投入する）
+
+    Args:
+        staff: スタッフの仮想ユーザー
+        managers: マネージャーの仮想ユーザー
+        days: スタッフごとの前日報告の履歴日数（今日の分は含めない）
+        today: 今日（シナリオで前日報告を登録する報告日）
+    """
+    users, reports = [], []
+    for role, members in (("staff", staff), ("manager", managers)):
+        for member in members:
+            user_id = uuid.uuid4()
+            users.append(
+                {
+                    "id": user_id,
+                    "cognito_user_id": member.sub,
+                    "email": member.email,
+                    "role": role,
+                    "name": member.sub,
+                    "active": True,
+                }
+            )
+            if role == "staff":
+                reports.extend(
+                    report_row(user_id, today - timedelta(days=offset))
+                    for offset in range(1, days + 1)
+                )
+
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(delete(User).where(User.cognito_user_id.like(f"{PREFIX}%")))
+        conn.execute(insert(User), users)
+        if reports:
+            conn.execute(insert(PreviousDayReport), reports)
+    engine.dispose()
+
+
+def cleanup() -> None:
+    """合成データを削除（前日報告はCASCADEで削除される）"""
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(delete(User).where(User.cognito_user_id.like(f"{PREFIX}%")))
+    engine.dispose()
+
+
+def free_port() -> int:
+    """空いているローカルのポート番号"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    """
+    uvicorn でアプリケーションを起動し、/health が応答するまで待つ
+
+    Args:
+        port: 待ち受けポート
+        workers: ワーカープロセス数
+
+    Returns:
+        subprocess.Popen: サーバープロセス
+    """
+    env = dict(
+        os.environ,
+        COGNITO_USER_POOL_ID=stub.user_pool_id,
+        COGNITO_CLIENT_ID=stub.client_id,
+        COGNITO_REGION=stub.region,
+        COGNITO_JWKS_URL=stub.serve(),
+        S3_VERIFY_UPLOADS="false",
+        PHOTO_PROCESSING_MODE="off",
+        REQUEST_LOG_MODE="off",
+    )
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+        "--log-level", "warning", "--no-access-log",
+    ]  # fmt: skip
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"サーバーが終了しました（終了コード {server.returncode}）")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).raise_for_status()
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("サーバーが起動しませんでした")
+
+
+async def wake_up(
+    client: httpx.AsyncClient, recorder: Recorder, user: VirtualUser, today: date, delay: float
+) -> None:
+    """起床時のスタッフの操作（delay 秒後に開始）"""
+    await asyncio.sleep(delay)
+    headers = user.headers
+    await recorder.request(client, "GET /api/users/me", "GET", "/api/users/me", headers=headers)
+    await recorder.request(
+        client,
+        "GET /api/previous-day-reports/latest/me",
+        "GET",
+        "/api/previous-day-reports/latest/me",
+        headers=headers,
+    )
+    await recorder.request(
+        client,
+        "POST /api/previous-day-reports?on_conflict=upsert",
+        "POST",
+        "/api/previous-day-reports?on_conflict=upsert",
+        json=report_body(today),
+        headers=headers,
+    )
+    await recorder.request(
+        client,
+        "GET /api/previous-day-reports",
+        "GET",
+        "/api/previous-day-reports?limit=10",
+        headers=headers,
+    )
+
+
+async def report_attendance(
+    client: httpx.AsyncClient, recorder: Recorder, user: VirtualUser, delay: float
+) -> None:
+    """勤怠報告（delay 秒後に開始）。各段階を二度押しとして2回同時に送信する"""
+    await asyncio.sleep(delay)
+    headers = user.headers
+    for stage, body in ATTENDANCE_STAGES.items():
+        route = f"POST /api/attendance/{stage}"
+        responses = await asyncio.gather(
+            *(
+                recorder.request(
+                    client, route, "POST", f"/api/attendance/{stage}", json=body, headers=headers
+                )
+                for _ in range(2)
+            )
+        )
+        recorder.recorded[user.sub, stage] += sum(
+            response is not None and response.status_code == 201 for response in responses
+        )
+    await recorder.request(
+        client, "GET /api/attendance/today", "GET", "/api/attendance/today", headers=headers
+    )
+
+
+def verify_attendance(staff: list[VirtualUser], recorder: Recorder) -> int:
+    """
+    勤怠報告の結果をデータベースと照合
+
+    Returns:
+        int: 勤怠記録が1件でない・complete でない・二度押しが1回だけ記録されていないスタッフ数
+    """
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(
+                User.cognito_user_id,
+                func.count(AttendanceRecord.id).label("records"),
+                func.bool_and(AttendanceRecord.status == "complete").label("complete"),
+            )
+            .join(AttendanceRecord, AttendanceRecord.staff_id == User.id)
+            .where(User.cognito_user_id.like(f"{PREFIX}%"))
+            .group_by(User.cognito_user_id)
+        ).all()
+    engine.dispose()
+
+    records = {row.cognito_user_id: row for row in rows}
+    failures = 0
+    for user in staff:
+        row = records.get(user.sub)
+        recorded = [recorder.recorded[user.sub, stage] for stage in ATTENDANCE_STAGES]
+        if row is None or row.records != 1 or not row.complete or recorded != [1, 1, 1]:
+            failures += 1
+            if failures <= 5:
+                print(
+                    f"  不整合: {user.sub} 記録数={row.records if row else 0} "
+                    f"complete={row.complete if row else None} 段階ごとの201={recorded}"
+                )
+    return failures
+
+
+async def refresh_dashboard(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    user: VirtualUser,
+    work_date: date,
+    until: asyncio.Future,
+    interval: float,
+) -> None:
+    """マネージャーのダッシュボード更新（until が完了するまで interval 秒ごと）"""
+    await asyncio.sleep(random.uniform(0, interval))
+    while True:
+        await recorder.request(
+            client,
+            "GET /api/dashboard/{work_date}",
+            "GET",
+            f"/api/dashboard/{work_date.isoformat()}",
+            headers=user.headers,
+        )
+        await recorder.request(
+            client,
+            "GET /api/users",
+            "GET",
+            "/api/users?role=staff&active_only=true&limit=100",
+            headers=user.headers,
+        )
+        if until.done():
+            return
+        await asyncio.wait([until], timeout=interval)
+
+
+async def browse(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    user: VirtualUser,
+    deadline: float,
+    think: float,
+) -> None:
+    """読み出し中心の操作を deadline まで繰り返す（操作の間隔は平均 think 秒）"""
+    headers = user.headers
+    report_id = None
+    await asyncio.sleep(random.uniform(0, think))
+    while time.perf_counter() < deadline:
+        choice = random.random()
+        if choice < 0.3 or report_id is None:
+            response = await recorder.request(
+                client,
+                "GET /api/previous-day-reports/latest/me",
+                "GET",
+                "/api/previous-day-reports/latest/me",
+                headers=headers,
+            )
+            if response is not None and response.status_code == 200 and response.content:
+                report_id = (response.json() or {}).get("id")
+        elif choice < 0.5:
+            await recorder.request(
+                client,
+                "GET /api/previous-day-reports/{report_id}",
+                "GET",
+                f"/api/previous-day-reports/{report_id}",
+                headers=headers,
+            )
+        elif choice < 0.8:
+            await recorder.request(
+                client,
+                "GET /api/previous-day-reports",
+                "GET",
+                "/api/previous-day-reports?limit=10",
+                headers=headers,
+            )
+        else:
+            await recorder.request(
+                client, "GET /api/users/me", "GET", "/api/users/me", headers=headers
+            )
+        remaining = deadline - time.perf_counter()
+        await asyncio.sleep(max(0.0, min(random.uniform(0.5, 1.5) * think, remaining)))
+
+
+async def run_scenario(
+    name: str,
+    base_url: str,
+    staff: list[VirtualUser],
+    managers: list[VirtualUser],
+    args: argparse.Namespace,
+) -> Recorder:
+    """
+    シナリオを実行
+
+    Args:
+        name: シナリオ名（wakeup / dashboard / steady / attendance）
+        base_url: サーバーのURL
+        staff: スタッフの仮想ユーザー
+        managers: マネージャーの仮想ユーザー
+        args: コマンドライン引数
+
+    Returns:
+        Recorder: 計測結果
+    """
+    connections = len(staff) + len(managers)
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    client = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=REQUEST_TIMEOUT)
+    async with client:
+        recorder = Recorder()
+        if name in ("wakeup", "dashboard"):
+            spike = asyncio.gather(
+                *(
+                    wake_up(client, recorder, user, args.today, random.uniform(0, args.ramp))
+                    for user in staff
+                )
+            )
+            if name == "dashboard":
+                work_date = args.today + timedelta(days=1)
+                await asyncio.gather(
+                    spike,
+                    *(
+                        refresh_dashboard(client, recorder, user, work_date, spike, args.interval)
+                        for user in managers
+                    ),
+                )
+            else:
+                await spike
+        elif name == "attendance":
+            await asyncio.gather(
+                *(
+                    report_attendance(client, recorder, user, random.uniform(0, args.ramp))
+                    for user in staff[: args.staff]
+                )
+            )
+        else:
+            deadline = time.perf_counter() + args.duration
+            await asyncio.gather(
+                *(
+                    browse(client, recorder, user, deadline, args.think)
+                    for user in staff[: args.users]
+                )
+            )
+        recorder.finish()
+    return recorder
+
+
+def print_result(name: str, recorder: Recorder, slo_percentile: float, slo_ms: float) -> int:
+    """
+    シナリオの結果をルートごとに表示
+
+    Returns:
+        int: PERF-002（レイテンシ）またはエラーの判定に失敗したルート数
+    """
+    total = sum(len(values) for values in recorder.latencies.values())
+    errors = sum(recorder.errors.values())
+    print(
+        f"[{name}] {total}件 {recorder.elapsed:.1f}秒 {total / recorder.elapsed:.1f}req/s "
+        f"エラー {errors}件 最大同時リクエスト数 {recorder.max_in_flight}"
+    )
+    print(
+        f"  {'route':<52} {'count':>6} {'err':>4} {'req/s':>7} "
+        f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    )
+    failures = 0
+    for route in sorted(recorder.latencies.keys() | recorder.errors.keys()):
+        latencies = recorder.latencies.get(route, [])
+        stats = summarize_ms(latencies)
+        slo_value = percentile([value * 1000 for value in latencies], slo_percentile)
+        failed = slo_value >= slo_ms or recorder.errors.get(route, 0) > 0
+        failures += failed
+        print(
+            f"  {route:<52} {len(latencies):>6} {recorder.errors.get(route, 0):>4} "
+            f"{len(latencies) / recorder.elapsed:>7.1f} {stats['p50']:>6.1f}ms "
+            f"{stats['p95']:>6.1f}ms {stats['p99']:>6.1f}ms {stats['max']:>6.1f}ms"
+            f"{'  ✗' if failed else ''}"
+        )
+    for sample in recorder.error_samples:
+        print(f"  エラー例: {sample}")
+    print()
+    return failures
+
+
+async def main_async(args: argparse.Namespace, base_url: str) -> bool:
+    staff = [VirtualUser(i, "staff") for i in range(max(args.staff, args.users))]
+    managers = [VirtualUser(i, "manager") for i in range(args.managers)]
+    seed(staff, managers, args.days, args.today)
+
+    passed = True
+    for name in args.scenario:
+        recorder = await run_scenario(name, base_url, staff, managers, args)
+        if print_result(name, recorder, args.slo_percentile, args.slo_ms):
+            passed = False
+            print(
+                f"✗ PERF-002: [{name}] p{args.slo_percentile:g} が {args.slo_ms:g}ms 以上、"
+                "またはエラーのあるルートがあります"
+            )
+            print()
+        if name == "steady" and args.users >= PERF_004_USERS:
+            errors = sum(recorder.errors.values())
+            if errors:
+                passed = False
+                print(f"✗ PERF-004: 同時接続 {args.users}ユーザーでエラー {errors}件")
+            else:
+                print(f"✓ PERF-004: 同時接続 {args.users}ユーザーでエラーなし")
+            print()
+        if name == "attendance":
+            inconsistent = verify_attendance(staff[: args.staff], recorder)
+            if inconsistent:
+                passed = False
+                print(f"✗ attendance: 勤怠記録・二度押しの記録が不整合なスタッフ {inconsistent}人")
+            else:
+                print(
+                    f"✓ attendance: {args.staff}人の勤怠記録が1件ずつ complete になり、",
+                    "二度押しは各段階1回だけ記録されました",
+                    sep="",
+                )
+            print()
+    return passed
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="エンドポイントの負荷試験")
+    parser.add_argument(
+        "--scenario",
+        choices=SCENARIOS,
+        action="append",
+        help="実行するシナリオ（複数指定可）",
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=PERF_004_USERS,
+        help="steady の同時接続ユーザー数",
+    )
+    parser.add_argument("--duration", type=float, default=20, help="steady の実行秒数")
+    parser.add_argument(
+        "--think",
+        type=float,
+        default=2,
+        help="steady の操作の間隔（秒、平均。0で待ちなし）",
+    )
+    parser.add_argument(
+        "--staff",
+        type=int,
+        default=100,
+        help="スタッフ数（wakeup・attendance の参加者）",
+    )
+    parser.add_argument("--managers", type=int, default=3, help="マネージャー数")
+    parser.add_argument("--days", type=int, default=30, help="スタッフごとの前日報告の履歴日数")
+    parser.add_argument(
+        "--ramp",
+        type=float,
+        default=10,
+        help="wakeup・attendance のアクセスが集中する秒数",
+    )
+    parser.add_argument("--interval", type=float, default=2, help="ダッシュボードの更新間隔（秒）")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn のワーカー数")
+    parser.add_argument("--slo-ms", type=float, default=500, help="PERF-002 のしきい値（ms）")
+    parser.add_argument(
+        "--slo-percentile",
+        type=float,
+        default=95,
+        help="PERF-002 の判定に使うパーセンタイル",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    args = parser.parse_args()
+    args.scenario = args.scenario or list(SCENARIOS)
+    args.today = date.today()
+    random.seed(args.seed)
+
+    print_header("エンドポイントの負荷試験（PERF-002 / PERF-004）")
+    print(
+        f"scenarios={','.join(args.scenario)} users={args.users} staff={args.staff} "
+        f"managers={args.managers} days={args.days} workers={args.workers} "
+        f"database_async={settings.DATABASE_ASYNC} cpus={os.cpu_count()}"
+    )
+    print()
+
+    port = free_port()
+    server = start_server(port, args.workers)
+    try:
+        passed = asyncio.run(main_async(args, f"http://127.0.0.1:{port}"))
+    finally:
+        server.terminate()
+        server.wait()
+        stub.shutdown()
+        cleanup()
+
+    if not passed:
+        print("✗ 性能要件を満たしていません")
+        sys.exit(1)
+    print(f"✓ 性能要件を満たしています（p{args.slo_percentile:g} < {args.slo_ms:g}ms）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+写真の後処理（派生画像の作成）のベンチマーク
+
+ローカルS3スタンドインに合成した大きな写真（EXIF付きJPEG）を置き、以下を計測・確認する
+（DBアクセスは含まない）。
+
+- 1枚あたりの派生画像作成時間（S3の取得・保存を含む process_photo）
+- 直列に処理する場合と、ワーカースレッドで並列に処理する場合のスループット
+  （Pillow はデコード・縮小・エンコード中にGILを解放するため、CPUコア数まで向上する）
+- 元の写真と派生画像（サムネイル・プレビュー）のサイズ
+- 派生画像にEXIF（撮影位置等）が残っていないこと、向き（Orientation）が画素に反映されていること
+
+実行方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_photo_processing --photos 16 --workers 4
+"""
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import print_header, print_row, summarize_ms
+from benchmarks.s3_stub import S3Stub
+
+stub = S3Stub(bucket="bench-photos")
+os.environ["S3_BUCKET_NAME"] = stub.bucket
+os.environ["S3_ENDPOINT_URL"] = stub.serve()
+os.environ.update(stub.credentials())
+
+from PIL import Image  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services.photo_processing_service import (  # noqa: E402
+    derived_photo_key,
+    process_photo,
+)
+from app.utils.s3 import put_object  # noqa: E402
+
+# EXIFタグ: Orientation / GPSInfo
+ORIENTATION = 0x0112
+GPS_INFO = 0x8825
+
+
+def make_photo(width: int, height: int) -> bytes:
+    """
+    スマートフォンで縦向きに撮影した写真を模したJPEGを作成
+
+    画素は横長で保存し、EXIFの Orientation=6（90度回転）と撮影位置を付ける
+    """
+    gradient = Image.radial_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 48)
+    image = Image.merge("RGB", (gradient, noise, Image.blend(gradient, noise, 0.5)))
+    exif = Image.Exif()
+    exif[ORIENTATION] = 6
+    exif.get_ifd(GPS_INFO).update({1: "N", 2: (35.0, 40.0, 0.0), 3: "E", 4: (139.0, 45.0, 0.0)})
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=92, exif=exif.tobytes())
+    return output.getvalue()
+
+
+def run(keys: list[str], workers: int) -> tuple[float, list[float]]:
+    """写真を処理し、全体の所要時間と1枚ごとの所要時間を返す"""
+
+    def timed(key: str) -> float:
+        start = time.perf_counter()
+        process_photo(key)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    if workers == 1:
+        latencies = [timed(key) for key in keys]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="photo") as executor:
+            latencies = list(executor.map(timed, keys))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="写真の後処理のベンチマーク")
+    parser.add_argument("--photos", type=int, default=16, help="処理する写真の枚数")
+    parser.add_argument("--workers", type=int, default=4, help="並列処理のワーカー数")
+    parser.add_argument("--width", type=int, default=4032, help="写真の幅（px）")
+    parser.add_argument("--height", type=int, default=3024, help="写真の高さ（px）")
+    args = parser.parse_args()
+
+    print_header("写真の後処理ベンチマーク（ローカルS3スタンドイン）")
+    photo = make_photo(args.width, args.height)
+    keys = [f"photos/bench/appearance/{i:04d}.jpg" for i in range(args.photos)]
+    for key in keys:
+        put_object(key, photo, "image/jpeg")
+    print(
+        f"photos={args.photos} size={args.width}x{args.height} ({len(photo) / 1024:.0f}KB) "
+        f"thumbnail={settings.PHOTO_THUMBNAIL_SIZE}px preview={settings.PHOTO_PREVIEW_SIZE}px "
+        f"quality={settings.PHOTO_WEBP_QUALITY}"
+    )
+    print()
+
+    # 初回（Pillow のインポート・S3クライアント作成）を計測対象から除く
+    process_photo(keys[0])
+
+    serial_elapsed, serial = run(keys, workers=1)
+    print_row("serial", summarize_ms(serial), f" ({args.photos / serial_elapsed:.1f}枚/秒)")
+    pool_elapsed, pooled = run(keys, workers=args.workers)
+    print_row(
+        f"pool (workers={args.workers})",
+        summarize_ms(pooled),
+        f" ({args.photos / pool_elapsed:.1f}枚/秒)",
+    )
+    print(f"スループット比: {serial_elapsed / pool_elapsed:.2f}x")
+    print()
+
+    print(f"{'original':<12} {len(photo) / 1024:8.1f}KB")
+    for name in ("thumbnail", "preview"):
+        body, content_type = stub.objects[derived_photo_key(keys[0], name)]
+        with Image.open(io.BytesIO(body)) as image:
+            exif = image.getexif()
+            print(
+                f"{name:<12} {len(body) / 1024:8.1f}KB {content_type} {image.width}x{image.height} "
+                f"({len(photo) / len(body):.0f}分の1) "
+                f"EXIF={'あり' if exif else 'なし'} "
+                f"縦向き={'ok' if image.height > image.width else 'ng'}"
+            )
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
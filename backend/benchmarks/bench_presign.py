@@ -0,0 +1,165 @@
+"""
+写真の署名付きアップロードURL発行のベンチマーク
+
+ローカルS3スタンドインを起動し、以下を計測・確認する（DBアクセスは含まない）。
+
+- 署名付きPOSTの作成: リクエストごとにboto3クライアントを作成する場合と、
+  プロセス内で再利用する場合（get_s3_client）の比較
+- POST /api/uploads/presign のレイテンシ（写真2枚、ASGI経由・認証はスタブ）
+- 発行したURLへのアップロード（20MB超の拒否を含む）と、前日報告の写真の存在確認
+
+実行方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_presign --iterations 200
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+import httpx
+
+from benchmarks.common import print_header, print_row, summarize_ms
+from benchmarks.s3_stub import S3Stub
+
+stub = S3Stub(bucket="bench-photos")
+os.environ["S3_BUCKET_NAME"] = stub.bucket
+os.environ["S3_ENDPOINT_URL"] = stub.serve()
+os.environ["S3_VERIFY_UPLOADS"] = "true"
+os.environ.update(stub.credentials())
+
+from fastapi import HTTPException  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.dependencies import CurrentUser, get_current_user  # noqa: E402
+from app.main import app  # noqa: E402
+from app.schemas.previous_day_report import PreviousDayReportCreate  # noqa: E402
+from app.services.upload_service import AsyncUploadService  # noqa: E402
+from app.utils.s3 import get_s3_client  # noqa: E402
+
+FILES = [
+    {"purpose": "appearance", "content_type": "image/jpeg"},
+    {"purpose": "route", "content_type": "image/png"},
+]
+
+
+def new_client():
+    """リクエストごとに作成する場合のS3クライアント"""
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        region_name=settings.S3_REGION,
+        endpoint_url=settings.S3_ENDPOINT_URL,
+        config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+    )
+
+
+def presign(client) -> dict:
+    """署名付きPOSTを1件作成"""
+    return client.generate_presigned_post(
+        Bucket=settings.S3_BUCKET_NAME,
+        Key=f"photos/bench/{uuid.uuid4().hex}.jpg",
+        Fields={"Content-Type": "image/jpeg"},
+        Conditions=[{"Content-Type": "image/jpeg"}, ["content-length-range", 1, 1024]],
+        ExpiresIn=900,
+    )
+
+
+def measure_client_reuse(iterations: int) -> None:
+    """クライアントを都度作成する場合と再利用する場合の署名付きPOST作成時間"""
+    start = time.perf_counter()
+    presign(get_s3_client())
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"初回（boto3のインポート + クライアント作成）: {elapsed_ms:.1f}ms")
+
+    for label, factory in (("new client per call", new_client), ("reused client", get_s3_client)):
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            presign(factory())
+            latencies.append(time.perf_counter() - start)
+        print_row(label, summarize_ms(latencies))
+
+
+async def upload(client: httpx.AsyncClient, target: dict, body: bytes) -> httpx.Response:
+    """署名付きPOSTで写真をアップロード（fields を file より前に送る）"""
+    return await client.post(target["url"], data=target["fields"], files={"file": ("photo", body)})
+
+
+async def main_async(iterations: int) -> None:
+    user_id = uuid.uuid4()
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        id=user_id, cognito_user_id="bench", email="bench@example.com", role="staff"
+    )
+    transport = httpx.ASGITransport(app=app)
+    api = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with api, httpx.AsyncClient() as s3:
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = await api.post("/api/uploads/presign", json={"files": FILES})
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+        print_row("POST /api/uploads/presign", summarize_ms(latencies), " (写真2枚)")
+        print()
+
+        uploads = response.json()["uploads"]
+        appearance, route = uploads
+        checks = {
+            "appearance upload": (await upload(s3, appearance, b"\xff\xd8" + os.urandom(1024))),
+            "route upload": (await upload(s3, route, b"\x89PNG" + os.urandom(1024))),
+        }
+        response = await api.post("/api/uploads/presign", json={"files": [FILES[0]]})
+        too_large = response.json()["uploads"][0]
+        oversized = b"\0" * (settings.PHOTO_MAX_BYTES + 1)
+        checks["20MB超の拒否"] = await upload(s3, too_large, oversized)
+        for label, result in checks.items():
+            print(f"{label:<24} status={result.status_code}")
+
+        service = AsyncUploadService()
+
+        def report(appearance_url: str, route_url: str) -> PreviousDayReportCreate:
+            return PreviousDayReportCreate(
+                report_date="2025-12-17",
+                next_wake_up_time="06:00",
+                next_departure_time="07:30",
+                next_arrival_time="09:00",
+                appearance_photo_url=appearance_url,
+                route_photo_url=route_url,
+            )
+
+        cases = {
+            "アップロード済み": (user_id, report(appearance["photo_url"], route["photo_url"])),
+            "未アップロード": (user_id, report(too_large["photo_url"], route["photo_url"])),
+            "用途の取り違え": (user_id, report(route["photo_url"], appearance["photo_url"])),
+            "他のユーザー": (uuid.uuid4(), report(appearance["photo_url"], route["photo_url"])),
+            "外部URL": (user_id, report("https://example.com/a.jpg", route["photo_url"])),
+        }
+        for label, (owner, data) in cases.items():
+            try:
+                await service.verify_report_photos(owner, data)
+                result = "ok"
+            except HTTPException as e:
+                result = f"{e.status_code} {e.detail}"
+            print(f"存在確認: {label:<12} {result}")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="写真の署名付きアップロードURL発行のベンチマーク")
+    parser.add_argument("--iterations", type=int, default=200, help="方式ごとの反復回数")
+    args = parser.parse_args()
+
+    print_header("写真 署名付きアップロードURL ベンチマーク（ローカルS3スタンドイン）")
+    print(f"iterations={args.iterations} endpoint={settings.S3_ENDPOINT_URL}")
+    print()
+    measure_client_reuse(args.iterations)
+    print()
+    asyncio.run(main_async(args.iterations))
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
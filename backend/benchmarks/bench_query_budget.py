@@ -0,0 +1,216 @@
+"""
+エンドポイントのクエリ数の確認
+
+ローカルJWKSスタンドインで発行したIDトークンで認証し（認証のユーザー検索を含む）、
+主要なエンドポイントを DATABASE_QUERY_BUDGET_MODE=strict で呼び出して、リクエストごとの
+クエリ数・DB時間と、宣言した上限（query_budget）を表示する。上限を超えたエンドポイントが
+ある場合は終了コード1で終了する（CIでのクエリ数の回帰検出用）。
+
+各エンドポイントは、ユーザー情報・読み出しキャッシュが空の状態（cold）と、
+キャッシュ済みの状態（warm）で1回ずつ呼び出す。
+
+実行方法（backendディレクトリで実行、PostgreSQLが必要）:
+    python -m benchmarks.bench_query_budget
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+from typing import Any
+
+import httpx
+
+from benchmarks.common import print_header
+from benchmarks.jwks_stub import JWKSStub
+
+stub = JWKSStub(user_pool_id="local-pool", client_id="local-client")
+os.environ["COGNITO_USER_POOL_ID"] = stub.user_pool_id
+os.environ["COGNITO_CLIENT_ID"] = stub.client_id
+os.environ["COGNITO_REGION"] = stub.region
+os.environ["COGNITO_JWKS_URL"] = stub.serve()
+os.environ["DATABASE_QUERY_BUDGET_MODE"] = "strict"
+os.environ["S3_VERIFY_UPLOADS"] = "false"
+os.environ["PHOTO_PROCESSING_MODE"] = "off"
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.previous_day_report_service import report_cache  # noqa: E402
+from app.services.user_service import identity_cache  # noqa: E402
+from app.utils.timing import QueryBudgetExceeded  # noqa: E402
+
+STAFF = {"sub": "bench-budget-staff", "email": "bench-budget-staff@example.com"}
+MANAGER = {"sub": "bench-budget-manager", "email": "bench-budget-manager@example.com"}
+
+# マネージャーが作成するユーザー（1件目は事前に作成し、2件目は作成の確認に使用）
+NEW_USERS = [
+    {
+        "name": "確認用スタッフ",
+        "email": f"bench-budget-user{i}@example.com",
+        "cognito_user_id": f"bench-budget-user{i}",
+    }
+    for i in range(2)
+]
+
+REPORT = {
+    "report_date": "2025-12-17",
+    "next_wake_up_time": "06:00:00",
+    "next_departure_time": "07:30:00",
+    "next_arrival_time": "09:00:00",
+    "appearance_photo_url": "https://example.com/a.jpg",
+    "route_photo_url": "https://example.com/r.jpg",
+}
+
+
+def cleanup() -> None:
+    """確認用ユーザーを削除（前日報告はCASCADEで削除される）"""
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE cognito_user_id LIKE 'bench-budget-%'"))
+    engine.dispose()
+
+
+def budget_of(method: str, path: str) -> int | None:
+    """エンドポイントに宣言されたクエリ数の上限"""
+    for route in app.routes:
+        if method in getattr(route, "methods", ()) and route.path_regex.match(path):
+            for dependency in route.dependant.dependencies:
+                closure = getattr(dependency.call, "__closure__", None) or ()
+                if dependency.call.__name__ == "declare_query_budget" and closure:
+                    return closure[0].cell_contents
+            return None
+    return None
+
+
+def parse_server_timing(value: str) -> dict[str, str]:
+    """Server-Timing ヘッダーを 名前 → dur/desc の辞書に変換"""
+    entries = {}
+    for entry in value.split(","):
+        name, *params = entry.strip().split(";")
+        for param in params:
+            key, _, raw = param.partition("=")
+            entries[f"{name}.{key}"] = raw.strip('"')
+    return entries
+
+
+async def call(client: httpx.AsyncClient, method: str, path: str, **kwargs: Any) -> dict:
+    """エンドポイントを呼び出し、ステータス・クエリ数・DB時間を返す"""
+    try:
+        response = await client.request(method, path, **kwargs)
+    except QueryBudgetExceeded as e:
+        return {"status": "budget", "queries": None, "db": None, "error": str(e), "json": None}
+    timing = parse_server_timing(response.headers.get("server-timing", ""))
+    is_json = response.content and "json" in response.headers.get("content-type", "")
+    return {
+        "status": response.status_code,
+        "queries": int(timing.get("queries.desc", 0)),
+        "db": float(timing.get("db.dur", 0.0)),
+        "error": None,
+        "json": response.json() if is_json else None,
+    }
+
+
+async def main_async() -> int:
+    cleanup()
+    staff = {"Authorization": f"Bearer {stub.issue_token(**STAFF)}"}
+    manager = {"Authorization": f"Bearer {stub.issue_token(**MANAGER, groups=['manager'])}"}
+    transport = httpx.ASGITransport(app=app)
+    failures = 0
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # マネージャー・スタッフのユーザーと、前日報告・ユーザーを1件ずつ作成しておく
+        # （初回ログインのユーザー作成を含む）
+        await call(client, "GET", "/api/users/me", headers=manager)
+        created = await call(
+            client, "POST", "/api/previous-day-reports", json=REPORT, headers=staff
+        )
+        report_id = created["json"]["id"]
+        next_report = dict(REPORT, report_date="2025-12-18")
+        created_user = await call(client, "POST", "/api/users", json=NEW_USERS[0], headers=manager)
+        user_id = created_user["json"]["id"]
+        attendance = await call(client, "POST", "/api/attendance/wakeup", json={}, headers=staff)
+        record_id = attendance["json"]["id"]
+        # ETagが一致しない場合（バージョンの確認と取得の2回）
+        stale = {**staff, "If-None-Match": 'W/"stale"'}
+
+        cases = [
+            ("GET", "/api/users/me", staff, {}),
+            ("GET", "/api/users/me", stale, {}),
+            ("GET", "/api/previous-day-reports/latest/me", staff, {}),
+            ("GET", "/api/previous-day-reports/latest/me", stale, {}),
+            ("GET", "/api/previous-day-reports?limit=10", staff, {}),
+            ("GET", f"/api/previous-day-reports/{report_id}", staff, {}),
+            ("POST", "/api/previous-day-reports", staff, {"json": next_report}),
+            ("POST", "/api/previous-day-reports?on_conflict=upsert", staff, {"json": REPORT}),
+            ("PUT", f"/api/previous-day-reports/{report_id}", staff, {"json": {"notes": "x"}}),
+            ("GET", "/api/dashboard/2025-12-18", manager, {}),
+            ("GET", "/api/users?limit=10", manager, {}),
+            ("GET", f"/api/users/{user_id}", manager, {}),
+            ("POST", "/api/users", manager, {"json": NEW_USERS[1]}),
+            ("PUT", f"/api/users/{user_id}", manager, {"json": {"name": "更新後"}}),
+            ("DELETE", f"/api/users/{user_id}", manager, {}),
+            (
+                "GET",
+                "/api/exports/previous-day-reports.csv?date_from=2025-12-01&date_to=2025-12-31",
+                manager,
+                {},
+            ),
+            ("GET", "/api/cache/stats", manager, {}),
+            # 起床は報告済み（二度押し: 記録せず当日の記録を読み出す）、出発は記録する
+            ("POST", "/api/attendance/wakeup", staff, {"json": {}}),
+            ("POST", "/api/attendance/departure", staff, {"json": {"destination": "現場"}}),
+            ("GET", "/api/attendance/today", staff, {}),
+            ("GET", "/api/attendance?limit=10", staff, {}),
+            ("GET", f"/api/attendance/{record_id}", manager, {}),
+            ("DELETE", f"/api/previous-day-reports/{report_id}", staff, {}),
+        ]
+
+        print(f"{'endpoint':<64} {'cache':<5} {'status':>6} {'queries':>7} {'budget':>6} db(ms)")
+        for method, path, headers, kwargs in cases:
+            budget = budget_of(method, path.split("?")[0])
+            for state in ("cold", "warm"):
+                if state == "cold":
+                    identity_cache.clear()
+                    report_cache.clear()
+                elif method in ("POST", "DELETE"):
+                    continue
+                result = await call(client, method, path, headers=headers, **kwargs)
+                over = result["status"] == "budget" or (
+                    budget is not None and result["queries"] > budget
+                )
+                failures += over
+                label = re.sub(r"[0-9a-f-]{36}", "{id}", f"{method} {path}")[:64]
+                queries = "-" if result["queries"] is None else result["queries"]
+                db = "-" if result["db"] is None else f"{result['db']:.1f}"
+                limit = "-" if budget is None else budget
+                mark = "  ✗ 上限超過" if over else ""
+                print(
+                    f"{label:<64} {state:<5} {result['status']:>6} {queries:>7} "
+                    f"{limit:>6} {db}{mark}"
+                )
+                if result["error"]:
+                    print(f"  {result['error']}")
+    cleanup()
+    return failures
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="エンドポイントのクエリ数の確認")
+    parser.parse_args()
+
+    print_header("エンドポイントのクエリ数（DATABASE_QUERY_BUDGET_MODE=strict）")
+    print(f"database_async={settings.DATABASE_ASYNC}")
+    print()
+    failures = asyncio.run(main_async())
+    stub.shutdown()
+    print()
+    if failures:
+        print(f"✗ クエリ数の上限を超えたエンドポイントがあります: {failures}件")
+        sys.exit(1)
+    print("✓ 全てのエンドポイントがクエリ数の上限内です")
+
+
+if __name__ == "__main__":
+    main()
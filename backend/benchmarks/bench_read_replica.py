@@ -0,0 +1,235 @@
+"""
+読み取り専用レプリカの振り分けの確認
+
+ローカルのPostgreSQLに、DATABASE_URL のデータベースを複製したデータベースをレプリカとして作成し
+（複製の時点で止まった、遅延したレプリカとして扱う）、ローカルJWKSスタンドインで発行したIDトークンで
+主要なエンドポイントを呼び出して、次を確認する。失敗した項目がある場合は終了コード1で終了する。
+
+- GETのエンドポイントの読み出しはレプリカで行う（複製後にプライマリだけを更新した値が返らない）
+- 書き込んだユーザーの直後のGETはプライマリで行う（Read-your-writes）
+- 書き込んでいない他のユーザーのGETは、その間もレプリカで行う
+- DATABASE_REPLICA_PIN_SECONDS の経過後は、書き込んだユーザーのGETもレプリカに戻る
+- 初回ログイン（GET中のユーザー作成）の直後の読み出しはプライマリで行う
+- レプリカのセッションでは書き込めない（読み取り専用のトランザクション）
+
+実行方法（backendディレクトリで実行、PostgreSQLとデータベースの作成権限が必要）:
+    python -m benchmarks.bench_read_replica
+    DATABASE_ASYNC=true python -m benchmarks.bench_read_replica
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import print_header
+from benchmarks.jwks_stub import JWKSStub
+
+# 書き込み後にプライマリで読み出す期間（秒）。経過後にレプリカに戻ることを確認する
+PIN_SECONDS = 1.0
+
+REPLICA_DATABASE = "okiteru_replica_check"
+
+stub = JWKSStub(user_pool_id="local-pool", client_id="local-client")
+os.environ["COGNITO_USER_POOL_ID"] = stub.user_pool_id
+os.environ["COGNITO_CLIENT_ID"] = stub.client_id
+os.environ["COGNITO_REGION"] = stub.region
+os.environ["COGNITO_JWKS_URL"] = stub.serve()
+os.environ["S3_VERIFY_UPLOADS"] = "false"
+os.environ["PHOTO_PROCESSING_MODE"] = "off"
+os.environ["DATABASE_REPLICA_PIN_SECONDS"] = str(PIN_SECONDS)
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.exc import DBAPIError  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app.config import settings  # noqa: E402
+
+PRIMARY_URL = make_url(settings.DATABASE_URL)
+REPLICA_URL = PRIMARY_URL.set(database=REPLICA_DATABASE)
+os.environ["DATABASE_REPLICA_URL"] = REPLICA_URL.render_as_string(hide_password=False)
+settings.DATABASE_REPLICA_URL = os.environ["DATABASE_REPLICA_URL"]
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.previous_day_report_service import report_cache  # noqa: E402
+from app.services.user_service import identity_cache  # noqa: E402
+
+STAFF = {"sub": "bench-replica-staff", "email": "bench-replica-staff@example.com"}
+MANAGER = {"sub": "bench-replica-manager", "email": "bench-replica-manager@example.com"}
+NEW_STAFF = {"sub": "bench-replica-new", "email": "bench-replica-new@example.com"}
+
+REPORT = {
+    "report_date": "2025-12-17",
+    "next_wake_up_time": "06:00:00",
+    "next_departure_time": "07:30:00",
+    "next_arrival_time": "09:00:00",
+    "appearance_photo_url": "https://example.com/a.jpg",
+    "route_photo_url": "https://example.com/r.jpg",
+}
+
+
+def execute(url, *statements: str, autocommit: bool = False) -> None:
+    """接続を保持しないエンジンでSQLを実行"""
+    engine = create_engine(url, poolclass=NullPool)
+    options = {"isolation_level": "AUTOCOMMIT"} if autocommit else {}
+    with engine.connect().execution_options(**options) as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+        conn.commit()
+    engine.dispose()
+
+
+def drop_replica() -> None:
+    """レプリカのデータベースを削除"""
+    execute(
+        PRIMARY_URL.set(database="postgres"),
+        f"DROP DATABASE IF EXISTS {REPLICA_DATABASE} WITH (FORCE)",
+        autocommit=True,
+    )
+
+
+def create_replica() -> None:
+    """
+    プライマリを複製したデータベースを作成
+
+    複製の後、確認用ユーザーの名前をプライマリでのみ変更し、どちらで読み出したかを名前で判別する
+    """
+    drop_replica()
+    execute(
+        PRIMARY_URL.set(database="postgres"),
+        f"CREATE DATABASE {REPLICA_DATABASE} TEMPLATE {PRIMARY_URL.database}",
+        autocommit=True,
+    )
+    execute(
+        PRIMARY_URL,
+        "UPDATE users SET name = 'primary' WHERE cognito_user_id LIKE 'bench-replica-%'",
+    )
+
+
+def cleanup() -> None:
+    """確認用ユーザーを削除（前日報告はCASCADEで削除される）"""
+    execute(PRIMARY_URL, "DELETE FROM users WHERE cognito_user_id LIKE 'bench-replica-%'")
+
+
+async def dispose_engines() -> None:
+    """アプリケーションのエンジンの接続を切断（データベースの複製・削除の前に行う）"""
+    for engine in (database._engine, database._replica_engine):
+        if engine is not None:
+            engine.dispose()
+    for engine in (database._async_engine, database._async_replica_engine):
+        if engine is not None:
+            await engine.dispose()
+
+
+class Checks:
+    """確認結果の記録"""
+
+    def __init__(self):
+        self.failures = 0
+
+    def check(self, label: str, ok: bool, detail: str = "") -> None:
+        self.failures += not ok
+        print(f"{'✓' if ok else '✗'} {label}{f'  ({detail})' if detail else ''}")
+
+
+async def main_async() -> int:
+    checks = Checks()
+    staff = {"Authorization": f"Bearer {stub.issue_token(**STAFF)}"}
+    manager = {"Authorization": f"Bearer {stub.issue_token(**MANAGER, groups=['manager'])}"}
+    new_staff = {"Authorization": f"Bearer {stub.issue_token(**NEW_STAFF)}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # 確認用ユーザーをプライマリに作成してから複製する（初回ログインの作成はプライマリ）
+        cleanup()
+        responses = [await client.get("/api/users/me", headers=h) for h in (staff, manager)]
+        assert all(r.status_code == 200 for r in responses), [r.text for r in responses]
+        staff_id = responses[0].json()["id"]
+        await dispose_engines()
+        database.primary_pins.clear()
+        create_replica()
+        identity_cache.clear()
+        report_cache.clear()
+
+        me = (await client.get("/api/users/me", headers=staff)).json()
+        checks.check("GETの読み出しはレプリカで行う", me["name"] != "primary", f"name={me['name']}")
+
+        created = await client.post("/api/previous-day-reports", json=REPORT, headers=staff)
+        checks.check("書き込みはプライマリで行う", created.status_code == 201, created.text[:80])
+
+        latest = (await client.get("/api/previous-day-reports/latest/me", headers=staff)).json()
+        checks.check(
+            "書き込んだユーザーの直後のGETはプライマリで行う",
+            latest is not None and latest["id"] == created.json()["id"],
+        )
+        me = (await client.get("/api/users/me", headers=staff)).json()
+        checks.check(
+            "書き込んだユーザーの他のGETもプライマリで行う",
+            me["name"] == "primary",
+            f"name={me['name']}",
+        )
+        other = (await client.get(f"/api/users/{staff_id}", headers=manager)).json()
+        checks.check(
+            "他のユーザーのGETはレプリカで行う",
+            other["name"] != "primary",
+            f"name={other['name']}",
+        )
+
+        await asyncio.sleep(PIN_SECONDS + 0.2)
+        report_cache.clear()
+        latest = (await client.get("/api/previous-day-reports/latest/me", headers=staff)).json()
+        checks.check(
+            f"{PIN_SECONDS:g}秒後はレプリカに戻る（レプリカには登録した報告がない）",
+            latest is None,
+        )
+
+        response = await client.get("/api/users/me", headers=new_staff)
+        checks.check(
+            "初回ログインの直後の読み出しはプライマリで行う",
+            response.status_code == 200,
+            f"status={response.status_code}",
+        )
+
+        try:
+            if settings.DATABASE_ASYNC:
+                async with database.AsyncReplicaSessionLocal() as db:
+                    await db.execute(text("UPDATE users SET name = name WHERE false"))
+            else:
+                with database.ReplicaSessionLocal() as db:
+                    db.execute(text("UPDATE users SET name = name WHERE false"))
+            read_only = False
+        except DBAPIError:
+            read_only = True
+        checks.check("レプリカのセッションでは書き込めない", read_only)
+
+    await dispose_engines()
+    return checks.failures
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="読み取り専用レプリカの振り分けの確認")
+    parser.parse_args()
+
+    print_header("読み取り専用レプリカの振り分け")
+    print(f"database_async={settings.DATABASE_ASYNC} replica={REPLICA_DATABASE}")
+    print()
+    start = time.perf_counter()
+    try:
+        failures = asyncio.run(main_async())
+    finally:
+        drop_replica()
+        cleanup()
+        stub.shutdown()
+    print()
+    if failures:
+        print(f"✗ 振り分けの確認に失敗した項目があります: {failures}件")
+        sys.exit(1)
+    print(f"✓ 全ての項目を確認しました（{time.perf_counter() - start:.1f}秒）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+前日報告の読み出しキャッシュのベンチマーク
+
+スタッフのホーム画面が繰り返し呼び出す GET /api/previous-day-reports/latest/me と
+一覧の1ページ目を、読み出しキャッシュの有無でASGI経由で比較する（認証はスタブ）。
+
+実行方法（backendディレクトリで実行、PostgreSQLが必要）:
+    python -m benchmarks.bench_report_cache --iterations 1000 --reports 365
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.dependencies import CurrentUser, get_current_user
+from app.main import app
+from app.services.previous_day_report_service import report_cache
+from benchmarks.common import print_header, print_row, summarize_ms
+
+BENCH_USER = "bench-report-cache"
+
+PATHS = {
+    "latest": "/api/previous-day-reports/latest/me",
+    "list": "/api/previous-day-reports?limit=10",
+}
+
+
+def seed(reports: int) -> uuid.UUID:
+    """ベンチマーク用ユーザーと前日報告を投入し、ユーザーIDを返す"""
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE cognito_user_id = :c"), {"c": BENCH_USER})
+        user_id = conn.execute(
+            text(
+                "INSERT INTO users (cognito_user_id, email, role, name) "
+                "VALUES (:c, :email, 'staff', 'ベンチ') RETURNING id"
+            ),
+            {"c": BENCH_USER, "email": f"{BENCH_USER}@example.com"},
+        ).scalar_one()
+        conn.execute(
+            text(
+                "INSERT INTO previous_day_reports ("
+                "  user_id, report_date, next_wake_up_time, next_departure_time,"
+                "  next_arrival_time, appearance_photo_url, route_photo_url) "
+                "SELECT :user_id, DATE '2025-01-01' + d, TIME '06:00', TIME '07:30', "
+                "  TIME '09:00', 'https://example.com/a.jpg', 'https://example.com/r.jpg' "
+                "FROM generate_series(0, :reports - 1) AS d"
+            ),
+            {"user_id": user_id, "reports": reports},
+        )
+    engine.dispose()
+    return user_id
+
+
+def cleanup() -> None:
+    """ベンチマーク用ユーザーを削除（前日報告はCASCADEで削除される）"""
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE cognito_user_id = :c"), {"c": BENCH_USER})
+    engine.dispose()
+
+
+async def measure(client: httpx.AsyncClient, path: str, iterations: int) -> list[float]:
+    """同じパスにリクエストを繰り返し、レイテンシを計測"""
+    (await client.get(path)).raise_for_status()  # ウォームアップ
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def main_async(args: argparse.Namespace, user_id: uuid.UUID) -> None:
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        id=user_id, cognito_user_id=BENCH_USER, email="bench@example.com", role="staff"
+    )
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        maxsize = report_cache.maxsize
+        for name, path in PATHS.items():
+            print(f"--- {name}: {path}")
+            for label, size in (("without cache", 0), ("with cache", maxsize or 10000)):
+                report_cache.maxsize = size
+                report_cache.clear()
+                latencies = await measure(client, path, args.iterations)
+                stats = report_cache.stats()
+                print_row(
+                    label,
+                    summarize_ms(latencies),
+                    f" hit_rate={stats['hit_rate']:.3f}",
+                )
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="前日報告の読み出しキャッシュのベンチマーク")
+    parser.add_argument("--iterations", type=int, default=1000, help="方式ごとのリクエスト数")
+    parser.add_argument("--reports", type=int, default=365, help="投入する前日報告の件数")
+    args = parser.parse_args()
+
+    print_header("前日報告 読み出しキャッシュ ベンチマーク")
+    print(f"iterations={args.iterations} reports={args.reports} async={settings.DATABASE_ASYNC}")
+    print()
+    user_id = seed(args.reports)
+    try:
+        asyncio.run(main_async(args, user_id))
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
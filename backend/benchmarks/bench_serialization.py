@@ -0,0 +1,180 @@
+"""
+一覧エンドポイントのJSONシリアライズのベンチマーク
+
+前日報告一覧（list[PreviousDayReportResponse]）とユーザー一覧（UserListResponse）を
+10 / 100 / 1000 件のORMオブジェクトで返すエンドポイントを用意し、ASGI経由で
+リクエストあたりのレイテンシを比較する（DBアクセスは含まない）。
+
+- response_model: response_model で検証し標準の JSONResponse でエンコード（従来の経路）
+- orjson:         response_model で検証し orjson でエンコード（デフォルトのレスポンスクラス）
+- serializer:     json_response（検証なし、スキーマから組み立てたシリアライザー + orjson）
+
+実行方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_serialization --iterations 200
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as dtime
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse as StdJSONResponse
+
+from app.models.previous_day_report import PreviousDayReport
+from app.models.user import User
+from app.schemas.previous_day_report import PreviousDayReportResponse
+from app.schemas.user import UserListResponse
+from app.utils.serialization import JSONResponse, json_response
+from benchmarks.common import print_header, print_row, summarize_ms
+
+SIZES = (10, 100, 1000)
+VARIANTS = ("response_model", "orjson", "serializer")
+
+
+def make_reports(count: int) -> list[PreviousDayReport]:
+    """前日報告のORMオブジェクトを作成"""
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+    return [
+        PreviousDayReport(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            report_date=date(2025, 1, 1) + timedelta(days=i),
+            next_wake_up_time=dtime(6, 0),
+            next_departure_time=dtime(7, 30),
+            next_arrival_time=dtime(9, 0),
+            appearance_photo_url=f"https://example.com/appearance/{i}.jpg",
+            route_photo_url=f"https://example.com/route/{i}.jpg",
+            notes="特になし",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def make_users(count: int) -> list[User]:
+    """ユーザーのORMオブジェクトを作成"""
+    now = datetime.now(timezone.utc)
+    return [
+        User(
+            id=uuid.uuid4(),
+            cognito_user_id=f"bench-{i}",
+            email=f"staff{i}@example.com",
+            role="staff",
+            name=f"スタッフ{i}",
+            phone="090-0000-0000",
+            active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def build_app() -> FastAPI:
+    """計測用のアプリケーションを作成（件数ごと・方式ごとのエンドポイント）"""
+    app = FastAPI()
+    for size in SIZES:
+        reports = make_reports(size)
+        users = make_users(size)
+
+        def add_routes(variant: str, response_class, reports=reports, users=users):
+            if variant == "serializer":
+
+                @app.get(f"/{variant}/{size}/reports")
+                async def serialize_reports():
+                    return json_response(list[PreviousDayReportResponse], reports)
+
+                @app.get(f"/{variant}/{size}/users")
+                async def serialize_users():
+                    return json_response(
+                        UserListResponse,
+                        {"total": len(users), "users": users, "next_cursor": None},
+                    )
+
+                return
+
+            @app.get(
+                f"/{variant}/{size}/reports",
+                response_model=list[PreviousDayReportResponse],
+                response_class=response_class,
+            )
+            async def list_reports():
+                return reports
+
+            @app.get(
+                f"/{variant}/{size}/users",
+                response_model=UserListResponse,
+                response_class=response_class,
+            )
+            async def list_users():
+                return UserListResponse(total=len(users), users=users, next_cursor=None)
+
+        add_routes("response_model", StdJSONResponse)
+        add_routes("orjson", JSONResponse)
+        add_routes("serializer", None)
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, iterations: int) -> tuple[list[float], int]:
+    """
+    同じパスにリクエストを繰り返し、レイテンシを計測
+
+    Returns:
+        tuple[list[float], int]: (レイテンシ一覧, レスポンスサイズ)
+    """
+    response = await client.get(path)  # ウォームアップ
+    response.raise_for_status()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - start)
+    return latencies, len(response.content)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for resource_name in ("reports", "users"):
+            for size in SIZES:
+                print(f"--- {resource_name} x {size}")
+                bodies = set()
+                for variant in VARIANTS:
+                    path = f"/{variant}/{size}/{resource_name}"
+                    latencies, body_size = await measure(client, path, args.iterations)
+                    bodies.add((await client.get(path)).json().__repr__())
+                    size_kb = body_size / 1024
+                    print_row(variant, summarize_ms(latencies), f" size={size_kb:7.1f}KB")
+                if len(bodies) != 1:
+                    raise RuntimeError(
+                        f"{resource_name} x {size}: 方式によってレスポンスが異なります",
+                    )
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(
+        description="一覧エンドポイントのJSONシリアライズのベンチマーク",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=200,
+        help="方式・件数ごとのリクエスト数",
+    )
+    args = parser.parse_args()
+
+    print_header("一覧エンドポイント JSONシリアライズ ベンチマーク")
+    print(f"iterations={args.iterations}")
+    print()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
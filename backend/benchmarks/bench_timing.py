@@ -0,0 +1,107 @@
+"""
+タイミング計測ミドルウェアのオーバーヘッドのベンチマーク
+
+DBアクセスを含まない軽量なエンドポイント（JSONを返すのみ）と、ストリーミングの
+エンドポイントを用意し、ASGI経由でリクエストあたりのレイテンシを比較する。
+
+- none:   ミドルウェアなし
+- timing: TimingMiddleware（Server-Timing ヘッダー + ヒストグラムへの記録）
+- timing+log: 上記 + リクエストごとの構造化ログ（Lambda上の動作。出力先は /dev/null）
+
+最後に /metrics の出力（Prometheus形式）の行数と作成時間を表示する。
+
+実行方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_timing --iterations 2000
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.utils.metrics import REQUEST_DURATION, render_metrics
+from app.utils.serialization import JSONResponse
+from app.utils.timing import TimingMiddleware, phase
+from benchmarks.common import print_header, print_row, summarize_ms
+
+VARIANTS = ("none", "timing", "timing+log")
+
+
+def make_app(variant: str) -> FastAPI:
+    """計測対象のアプリケーションを作成"""
+    settings.REQUEST_LOG_MODE = "on" if variant == "timing+log" else "off"
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        with phase("db"):
+            pass
+        return {"id": item_id, "name": "item"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(10):
+                yield b"x" * 1024
+
+        return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+    if variant != "none":
+        app.add_middleware(TimingMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, path: str, iterations: int) -> list[float]:
+    """リクエストあたりのレイテンシを計測"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(100, iterations)):
+            await client.get(path)
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+    return latencies
+
+
+async def main_async(iterations: int) -> None:
+    for path in ("/items/1", "/stream"):
+        print(f"GET {path}")
+        for variant in VARIANTS:
+            app = make_app(variant)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                latencies = await measure(app, path, iterations)
+            print_row(f"  {variant}", summarize_ms(latencies))
+        print()
+
+    start = time.perf_counter()
+    body = render_metrics()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"/metrics: {len(body.splitlines())}行 {len(body)}バイト 作成 {elapsed:.2f}ms")
+    count_prefix = f"{REQUEST_DURATION.name}_count"
+    series = sum(1 for line in body.splitlines() if line.startswith(count_prefix))
+    print(f"{REQUEST_DURATION.name} の系列数: {series}")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="タイミング計測ミドルウェアのベンチマーク")
+    parser.add_argument("--iterations", type=int, default=2000, help="方式ごとの反復回数")
+    args = parser.parse_args()
+
+    print_header("タイミング計測ミドルウェア ベンチマーク（ASGI・DBなし）")
+    print(f"iterations={args.iterations} python={sys.version.split()[0]}")
+    print()
+    asyncio.run(main_async(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
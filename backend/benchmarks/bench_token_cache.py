@@ -0,0 +1,93 @@
+"""
+検証済みトークンキャッシュのマイクロベンチマーク
+
+get_current_user をDBなし（ユーザーサービスはスタブ）で繰り返し呼び出し、
+トークンキャッシュの有無でレイテンシを比較する。
+JWKSはローカルスタンドインから配信する。
+
+実行方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_token_cache --iterations 2000
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from types import SimpleNamespace
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from benchmarks.common import print_header, print_row, summarize_ms
+from benchmarks.jwks_stub import JWKSStub
+
+stub = JWKSStub(user_pool_id="bench-pool", client_id="bench-client")
+os.environ["COGNITO_USER_POOL_ID"] = stub.user_pool_id
+os.environ["COGNITO_CLIENT_ID"] = stub.client_id
+os.environ["COGNITO_REGION"] = stub.region
+os.environ["COGNITO_JWKS_URL"] = stub.serve()
+
+from app.dependencies import get_current_user  # noqa: E402
+from app.utils.cognito import cognito_verifier  # noqa: E402
+
+
+class StubUserService:
+    """DBアクセスを行わないユーザーサービス"""
+
+    def __init__(self):
+        self.user = SimpleNamespace(
+            id=uuid.uuid4(),
+            cognito_user_id="bench-user",
+            email="bench@example.com",
+            role="staff",
+            active=True,
+        )
+
+    async def get_or_create_by_cognito_id(self, **kwargs):
+        return self.user
+
+
+async def measure(iterations: int, token: str) -> list[float]:
+    """get_current_user を繰り返し実行し、1回ごとの所要時間を返す"""
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    service = StubUserService()
+
+    # ウォームアップ（JWKS取得・初回検証）
+    await get_current_user(credentials, service)
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await get_current_user(credentials, service)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def main_async(iterations: int) -> None:
+    token = stub.issue_token(sub="bench-user", email="bench@example.com")
+
+    maxsize = cognito_verifier.token_cache.maxsize
+    for label, size in (("without cache", 0), ("with cache", maxsize or 1024)):
+        cognito_verifier.token_cache.maxsize = size
+        cognito_verifier.token_cache.clear()
+        latencies = await measure(iterations, token)
+        stats = cognito_verifier.token_cache.stats()
+        print_row(label, summarize_ms(latencies), f" hits={stats['hits']} misses={stats['misses']}")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="検証済みトークンキャッシュのベンチマーク")
+    parser.add_argument("--iterations", type=int, default=2000, help="反復回数")
+    args = parser.parse_args()
+
+    print_header("get_current_user マイクロベンチマーク")
+    print(f"iterations={args.iterations}")
+    print()
+    try:
+        asyncio.run(main_async(args.iterations))
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
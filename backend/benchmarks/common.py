@@ -0,0 +1,58 @@
+"""
+ベンチマーク共通ユーティリティ
+"""
+import statistics
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    パーセンタイル値を計算（最近傍法）
+
+    Args:
+        values: 計測値リスト
+        pct: パーセンタイル（0〜100）
+
+    Returns:
+        float: パーセンタイル値（空の場合は0.0）
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_ms(values: list[float]) -> dict[str, float]:
+    """
+    秒単位の計測値をミリ秒の統計値に要約
+
+    Args:
+        values: 計測値リスト（秒）
+
+    Returns:
+        dict[str, float]: mean/p50/p95/p99/max（ミリ秒）
+    """
+    ms = [v * 1000 for v in values]
+    return {
+        "mean": statistics.fmean(ms) if ms else 0.0,
+        "p50": percentile(ms, 50),
+        "p95": percentile(ms, 95),
+        "p99": percentile(ms, 99),
+        "max": max(ms) if ms else 0.0,
+    }
+
+
+def print_header(title: str) -> None:
+    """ベンチマークの見出しを表示"""
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+
+
+def print_row(label: str, stats: dict[str, float], extra: str = "") -> None:
+    """統計値を1行で表示"""
+    print(
+        f"{label:<24} mean={stats['mean']:8.2f}ms p50={stats['p50']:8.2f}ms "
+        f"p95={stats['p95']:8.2f}ms p99={stats['p99']:8.2f}ms max={stats['max']:8.2f}ms"
+        f"{extra}"
+    )
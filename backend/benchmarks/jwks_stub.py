@@ -0,0 +1,129 @@
+"""
+ローカルJWKSスタンドイン
+
+ベンチマーク用にRSA鍵ペアを生成し、JWKSをローカルHTTPサーバーで配信する。
+発行したIDトークンはアプリの CognitoJWTVerifier でそのまま検証できる。
+
+使用例:
+    stub = JWKSStub(user_pool_id="local-pool", client_id="local-client")
+    os.environ["COGNITO_JWKS_URL"] = stub.serve()
+    token = stub.issue_token(sub="staff-001", email="staff001@example.com")
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+
+class JWKSStub:
+    """JWKSスタンドイン"""
+
+    def __init__(
+        self,
+        user_pool_id: str,
+        client_id: str,
+        region: str = "ap-northeast-1",
+        kid: str = "local-key",
+    ):
+        """
+        Args:
+            user_pool_id: トークンのissuerに使うユーザープールID
+            client_id: トークンのaudience
+            region: トークンのissuerに使うリージョン
+            kid: 鍵ID
+        """
+        self.user_pool_id = user_pool_id
+        self.client_id = client_id
+        self.region = region
+        self.kid = kid
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+        public_jwk.update(kid=kid, alg="RS256", use="sig")
+        self.jwks = {"keys": [public_jwk]}
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def issuer(self) -> str:
+        """トークンの発行者（Cognitoと同じ形式）"""
+        return f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}"
+
+    def issue_token(
+        self,
+        sub: str,
+        email: str,
+        name: str | None = None,
+        groups: list[str] | None = None,
+        expires_in: int = 3600,
+    ) -> str:
+        """
+        IDトークンを発行
+
+        Args:
+            sub: Cognito User ID
+            email: メールアドレス
+            name: 氏名
+            groups: Cognitoグループ
+            expires_in: 有効期間（秒）
+
+        Returns:
+            str: 署名済みIDトークン
+        """
+        claims = {
+            "sub": sub,
+            "email": email,
+            "name": name or email,
+            "cognito:groups": groups or ["staff"],
+            "aud": self.client_id,
+            "iss": self.issuer,
+            "token_use": "id",
+            "exp": int(time.time()) + expires_in,
+        }
+        return jwt.encode(claims, self._private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        JWKSをバックグラウンドスレッドのHTTPサーバーで配信
+
+        Args:
+            host: バインドするホスト
+            port: バインドするポート（0の場合は空きポート）
+
+        Returns:
+            str: JWKSのURL（COGNITO_JWKS_URL に設定する）
+        """
+        body = json.dumps(self.jwks).encode()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self._server.server_port}/.well-known/jwks.json"
+
+    def shutdown(self) -> None:
+        """HTTPサーバーを停止"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
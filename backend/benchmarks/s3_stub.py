@@ -0,0 +1,235 @@
+"""
+ローカルS3スタンドイン
+
+ベンチマーク・動作確認用に、署名付きPOSTによるアップロードとHEAD/GET/PUT/DELETEに対応した
+S3互換のHTTPサーバーをローカルで起動する（パス形式のみ、オブジェクトはメモリに保存）。
+署名は検証しないが、署名付きPOSTのポリシー（有効期限・Content-Type・content-length-range）は検証する。
+
+使用例:
+    stub = S3Stub(bucket="okiteru-photos")
+    os.environ["S3_ENDPOINT_URL"] = stub.serve()
+    os.environ.update(stub.credentials())
+"""
+import base64
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+
+class PolicyError(Exception):
+    """署名付きPOSTのポリシー違反"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def check_policy(policy_b64: str, fields: dict[str, str], size: int) -> None:
+    """
+    署名付きPOSTのポリシーを検証
+
+    Args:
+        policy_b64: Base64エンコードされたポリシー
+        fields: フォームのフィールド
+        size: アップロードされたファイルのサイズ
+
+    Raises:
+        PolicyError: ポリシーに違反する場合
+    """
+    policy = json.loads(base64.b64decode(policy_b64))
+    expiration = datetime.fromisoformat(policy["expiration"].replace("Z", "+00:00"))
+    if expiration < datetime.now(timezone.utc):
+        raise PolicyError(403, "AccessDenied", "Invalid according to Policy: Policy expired.")
+
+    lowered = {name.lower(): value for name, value in fields.items()}
+    for condition in policy["conditions"]:
+        if isinstance(condition, dict):
+            for name, expected in condition.items():
+                if name.lower() == "bucket":
+                    continue
+                if lowered.get(name.lower()) != expected:
+                    raise PolicyError(
+                        403, "AccessDenied", f"Policy Condition failed: [eq, ${name}, {expected}]"
+                    )
+        elif condition[0] == "content-length-range":
+            low, high = int(condition[1]), int(condition[2])
+            if size > high:
+                raise PolicyError(400, "EntityTooLarge", "Your proposed upload exceeds the maximum")
+            if size < low:
+                raise PolicyError(
+                    400, "EntityTooSmall", "Your proposed upload is smaller than the minimum"
+                )
+        elif condition[0] in ("eq", "starts-with"):
+            name = condition[1].lstrip("$").lower()
+            value = lowered.get(name, "")
+            ok = value == condition[2] if condition[0] == "eq" else value.startswith(condition[2])
+            if not ok:
+                raise PolicyError(403, "AccessDenied", f"Policy Condition failed: {condition}")
+
+
+class S3Stub:
+    """S3スタンドイン"""
+
+    def __init__(self, bucket: str):
+        """
+        Args:
+            bucket: バケット名（他のバケットへのリクエストは NoSuchBucket）
+        """
+        self.bucket = bucket
+        # オブジェクトキー → (本文, Content-Type)
+        self.objects: dict[str, tuple[bytes, str]] = {}
+        self.requests: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    @staticmethod
+    def credentials() -> dict[str, str]:
+        """boto3 用のダミー認証情報（環境変数）"""
+        return {"AWS_ACCESS_KEY_ID": "local", "AWS_SECRET_ACCESS_KEY": "local"}
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        S3スタンドインをバックグラウンドスレッドのHTTPサーバーで起動
+
+        Args:
+            host: バインドするホスト
+            port: バインドするポート（0の場合は空きポート）
+
+        Returns:
+            str: エンドポイントURL（S3_ENDPOINT_URL に設定する）
+        """
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _target(self) -> tuple[str, str]:
+                path = unquote(urlsplit(self.path).path).lstrip("/")
+                bucket, _, key = path.partition("/")
+                return bucket, key
+
+            def _count(self) -> None:
+                with stub._lock:
+                    stub.requests[self.command] = stub.requests.get(self.command, 0) + 1
+
+            def _read_body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def _send(self, status: int, body: bytes = b"", headers: dict | None = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _error(self, status: int, code: str, message: str = ""):
+                body = (
+                    f'<?xml version="1.0" encoding="UTF-8"?>'
+                    f"<Error><Code>{code}</Code><Message>{message}</Message></Error>"
+                ).encode()
+                self._send(status, body, {"Content-Type": "application/xml"})
+
+            def _object(self, key: str):
+                with stub._lock:
+                    return stub.objects.get(key)
+
+            def _store(self, key: str, body: bytes, content_type: str) -> str:
+                with stub._lock:
+                    stub.objects[key] = (body, content_type)
+                return f'"{hashlib.md5(body).hexdigest()}"'
+
+            def do_HEAD(self):
+                self._count()
+                bucket, key = self._target()
+                obj = self._object(key) if bucket == stub.bucket else None
+                if obj is None:
+                    self._send(404)
+                    return
+                body, content_type = obj
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", f'"{hashlib.md5(body).hexdigest()}"')
+                self.end_headers()
+
+            def do_GET(self):
+                self._count()
+                bucket, key = self._target()
+                if bucket != stub.bucket:
+                    self._error(404, "NoSuchBucket")
+                    return
+                obj = self._object(key)
+                if obj is None:
+                    self._error(404, "NoSuchKey", "The specified key does not exist.")
+                    return
+                self._send(200, obj[0], {"Content-Type": obj[1]})
+
+            def do_PUT(self):
+                self._count()
+                bucket, key = self._target()
+                body = self._read_body()
+                if bucket != stub.bucket:
+                    self._error(404, "NoSuchBucket")
+                    return
+                content_type = self.headers.get("Content-Type", "binary/octet-stream")
+                self._send(200, headers={"ETag": self._store(key, body, content_type)})
+
+            def do_DELETE(self):
+                self._count()
+                bucket, key = self._target()
+                with stub._lock:
+                    stub.objects.pop(key, None)
+                self._send(204)
+
+            def do_POST(self):
+                self._count()
+                bucket, _ = self._target()
+                body = self._read_body()
+                if bucket != stub.bucket:
+                    self._error(404, "NoSuchBucket")
+                    return
+
+                header = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+                message = BytesParser(policy=HTTP).parsebytes(header + body)
+                fields: dict[str, str] = {}
+                file: bytes | None = None
+                for part in message.iter_parts():
+                    name = part.get_param("name", header="content-disposition")
+                    payload = part.get_payload(decode=True) or b""
+                    if name == "file":
+                        file = payload
+                    else:
+                        fields[name] = payload.decode()
+                if file is None or "key" not in fields:
+                    self._error(400, "InvalidArgument", "file and key are required")
+                    return
+                try:
+                    check_policy(fields.get("policy", ""), fields, len(file))
+                except PolicyError as e:
+                    self._error(e.status, e.code, str(e))
+                    return
+
+                content_type = fields.get("Content-Type", "binary/octet-stream")
+                etag = self._store(fields["key"], file, content_type)
+                self._send(204, headers={"ETag": etag})
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self._server.server_port}"
+
+    def shutdown(self) -> None:
+        """HTTPサーバーを停止"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
@@ -0,0 +1,180 @@
+"""
+保持期間を過ぎた前日報告のアーカイブスクリプト
+
+報告日が基準日（既定は保持期間の開始日）より前の前日報告を月ごとに、
+ID順のバッチ（キーセット方式）で読み出して gzip 圧縮した JSON Lines に書き込み、
+保存先（ローカルのディレクトリまたはS3互換のオブジェクトストレージ）に保存する。
+保存したファイルを読み直して件数がデータベースの件数と一致することを確認した後、
+アーカイブした行を一定件数ずつのバッチで削除する（バッチごとにコミットし、長時間のロックを避ける）。
+
+- 読み出しは月ごとに1つの REPEATABLE READ トランザクションで行い、件数とファイルの内容を一致させる
+- メモリに保持するのは1か月分の (id, updated_at) のみで、行はバッチごとにファイルに書き出す
+- アーカイブ後に更新された行は削除せず、次回の実行で新しいファイルにアーカイブする
+  （ファイル名に実行日時を含めるため、以前のアーカイブを上書きしない）
+
+確認したアーカイブは月ごとのマニフェスト（previous_day_reports/YYYY-MM/manifest.json）に件数と
+最終更新日時を記録する。保持期間を過ぎたパーティションの削除（scripts/manage_partitions.py）は
+マニフェストで行がアーカイブ済みであることを確認し、アーカイブしていない月の行は削除しない。
+
+使用例（backendディレクトリで実行）:
+    python scripts/archive_reports.py --dry-run
+    python scripts/archive_reports.py --destination s3://okiteru-archive/reports
+"""
+import argparse
+import gzip
+import sys
+import tempfile
+import time
+from contextlib import closing
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings
+from app.database import SessionLocal, get_engine
+from app.repositories.previous_day_report_repository import PreviousDayReportRepository
+from app.repositories.report_partition_repository import add_months, month_start, retention_cutoff
+from app.utils.archive import (
+    ArchiveSink,
+    archive_key,
+    count_records,
+    encode_record,
+    get_archive_sink,
+    write_manifest,
+)
+
+
+class ArchiveVerificationError(Exception):
+    """アーカイブの件数がデータベースの件数と一致しない"""
+
+
+def archive_month(
+    sink: ArchiveSink, lower: date, upper: date, key: str, batch_size: int
+) -> list[tuple]:
+    """
+    報告日が [lower, upper) の前日報告をアーカイブし、件数を確認する
+
+    Returns:
+        list[tuple]: アーカイブした行の (id, updated_at)
+
+    Raises:
+        ArchiveVerificationError: 書き込んだ件数・保存したファイルの件数が一致しない場合
+    """
+    keys = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "archive.jsonl.gz"
+        with SessionLocal() as db:
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            repository = PreviousDayReportRepository(db)
+            expected = repository.count_between(lower, upper)
+            if expected == 0:
+                return keys
+            with gzip.open(path, "wb") as output:
+                after = None
+                while rows := repository.get_archive_batch(lower, upper, after, batch_size):
+                    for row in rows:
+                        output.write(encode_record(row._asdict()))
+                        keys.append((row.id, row.updated_at))
+                    after = rows[-1].id
+        if len(keys) != expected:
+            raise ArchiveVerificationError(f"書き込んだ件数 {len(keys)} != 件数 {expected}")
+
+        sink.put(path, key)
+    with closing(sink.open(key)) as stream:
+        stored = count_records(stream)
+    if stored != expected:
+        raise ArchiveVerificationError(f"{sink.url(key)} の件数 {stored} != 件数 {expected}")
+    return keys
+
+
+def delete_archived(lower: date, upper: date, keys: list[tuple], batch_size: int) -> int:
+    """アーカイブした行をバッチごとにコミットしながら削除し、削除した件数を返す"""
+    deleted = 0
+    for start in range(0, len(keys), batch_size):
+        with SessionLocal() as db:
+            deleted += PreviousDayReportRepository(db).delete_archived(
+                lower, upper, keys[start : start + batch_size]
+            )
+            db.commit()
+    return deleted
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="保持期間を過ぎた前日報告をアーカイブして削除")
+    parser.add_argument(
+        "--before",
+        type=date.fromisoformat,
+        default=None,
+        help="この日より前の報告日を対象とする（YYYY-MM-DD、既定は保持期間の開始日）",
+    )
+    parser.add_argument(
+        "--destination",
+        default=settings.ARCHIVE_DESTINATION,
+        help="保存先（s3://バケット/接頭辞 またはディレクトリ）",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="1回に読み出す行数")
+    parser.add_argument("--delete-batch-size", type=int, default=500, help="1回に削除する行数")
+    parser.add_argument("--keep", action="store_true", help="アーカイブのみ行い、行を削除しない")
+    parser.add_argument("--dry-run", action="store_true", help="対象の月と件数のみ表示")
+    args = parser.parse_args()
+
+    before = args.before or retention_cutoff(
+        date.today(), settings.PREVIOUS_DAY_REPORT_RETENTION_MONTHS
+    )
+    sink = get_archive_sink(args.destination)
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    print("=" * 60)
+    print("前日報告のアーカイブ開始")
+    print("=" * 60)
+    print(f"対象: 報告日が {before} より前  保存先: {args.destination}")
+    print()
+
+    get_engine()
+    with SessionLocal() as db:
+        oldest = PreviousDayReportRepository(db).get_oldest_report_date()
+
+    archived = deleted = 0
+    start = time.perf_counter()
+    month = month_start(oldest) if oldest is not None else before
+    while month < before:
+        lower, upper = month, min(add_months(month, 1), before)
+        month = upper
+        if args.dry_run:
+            with SessionLocal() as db:
+                count = PreviousDayReportRepository(db).count_between(lower, upper)
+            print(f"  {lower:%Y-%m}: {count}件")
+            continue
+
+        key = archive_key(lower, run_id)
+        try:
+            keys = archive_month(sink, lower, upper, key, args.batch_size)
+        except ArchiveVerificationError as e:
+            print(f"✗ {lower:%Y-%m}: アーカイブの確認に失敗したため削除しません: {e}")
+            sys.exit(1)
+        if not keys:
+            continue
+        max_updated_at = max(updated_at for _, updated_at in keys)
+        write_manifest(sink, lower, key, lower, upper, len(keys), max_updated_at, run_id)
+        archived += len(keys)
+        message = f"  {lower:%Y-%m}: {len(keys)}件 → {sink.url(key)}"
+        if not args.keep:
+            month_deleted = delete_archived(lower, upper, keys, args.delete_batch_size)
+            deleted += month_deleted
+            message += f"（削除 {month_deleted}件"
+            if month_deleted < len(keys):
+                message += f"、アーカイブ後に更新・削除された {len(keys) - month_deleted}件は残す"
+            message += "）"
+        print(message)
+
+    elapsed = time.perf_counter() - start
+    print("\n" + "=" * 60)
+    print(f"前日報告のアーカイブ完了: {archived}件（削除 {deleted}件、{elapsed:.1f}秒）")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+前日報告のパーティション管理スクリプト（定期実行）
+
+1. 今月から PREVIOUS_DAY_REPORT_PARTITIONS_AHEAD か月先までの月のパーティションを作成する
+2. 保持期間（PREVIOUS_DAY_REPORT_RETENTION_MONTHS）を過ぎた月のパーティションを切り離して削除する
+   （--keep-detached の場合は切り離すのみで、テーブルは残す）
+
+行が残っているパーティション（DEFAULTパーティションの保持期間を過ぎた行も同様）は、
+scripts/archive_reports.py のマニフェストでアーカイブ済みであることを確認できた場合のみ削除する。
+確認できない月は削除せずに表示し、終了コード1で終了する（--force で確認せずに削除）。
+
+パーティションの切り離し・削除は行数によらず一定時間で完了する。作成済み・削除済みの
+パーティションは対象外となるため、繰り返し実行できる（毎日の実行を想定）
+
+使用例（backendディレクトリで実行）:
+    python scripts/manage_partitions.py --dry-run
+    python scripts/manage_partitions.py
+"""
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings
+from app.database import SessionLocal, get_engine
+from app.repositories.report_partition_repository import (
+    ReportPartitionRepository,
+    add_months,
+    month_start,
+    partition_name,
+    retention_cutoff,
+)
+from app.utils.archive import get_archive_sink, read_manifest, unarchived_reason
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="前日報告のパーティションの作成・削除")
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=settings.PREVIOUS_DAY_REPORT_RETENTION_MONTHS,
+        help="保持期間（月）",
+    )
+    parser.add_argument(
+        "--ahead",
+        type=int,
+        default=settings.PREVIOUS_DAY_REPORT_PARTITIONS_AHEAD,
+        help="今月から何か月先までパーティションを作成するか",
+    )
+    parser.add_argument(
+        "--today",
+        type=date.fromisoformat,
+        default=None,
+        help="基準日（YYYY-MM-DD）",
+    )
+    parser.add_argument(
+        "--destination",
+        default=settings.ARCHIVE_DESTINATION,
+        help="アーカイブの保存先（マニフェストでアーカイブ済みであることを確認する）",
+    )
+    parser.add_argument(
+        "--keep-detached",
+        action="store_true",
+        help="切り離したテーブルを削除しない",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="アーカイブ済みであることを確認せずに削除する",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="変更せずに対象のみ表示")
+    args = parser.parse_args()
+
+    today = args.today or date.today()
+    cutoff = retention_cutoff(today, args.retention_months)
+    sink = get_archive_sink(args.destination)
+    skipped = []
+
+    def unarchived(month: date, upper: date, count: int, max_updated_at) -> str | None:
+        """削除できない理由（アーカイブ済み、または --force の場合は None）"""
+        if args.force:
+            return None
+        return unarchived_reason(read_manifest(sink, month), month, upper, count, max_updated_at)
+
+    print("=" * 60)
+    print("前日報告のパーティション管理")
+    print("=" * 60)
+    print(f"基準日: {today}  保持期間: {args.retention_months}か月（{cutoff} より前を削除）")
+    print()
+
+    get_engine()
+    with SessionLocal() as db:
+        partitions = ReportPartitionRepository(db).get_partitions()
+    existing = {lower for _, lower, _ in partitions if lower is not None}
+
+    # 1. 先の月のパーティションの作成（パーティションごとにコミット）
+    this_month = month_start(today)
+    for offset in range(args.ahead + 1):
+        month = add_months(this_month, offset)
+        if month in existing:
+            continue
+        if args.dry_run:
+            print(f"  作成予定: {partition_name(month)}")
+            continue
+        with SessionLocal() as db:
+            moved = ReportPartitionRepository(db).create_partition(month)
+            db.commit()
+        print(f"  作成: {partition_name(month)}（DEFAULTパーティションから移動 {moved}件）")
+
+    # 2. 保持期間を過ぎたパーティションの切り離し・削除
+    #    （切り離すのみの場合は行が残るため、アーカイブ済みであることを確認しない）
+    expired = [
+        (name, lower, upper)
+        for name, lower, upper in partitions
+        if upper is not None and upper <= cutoff
+    ]
+    for name, lower, upper in expired:
+        reason = None
+        if not args.keep_detached:
+            with SessionLocal() as db:
+                count, max_updated_at = ReportPartitionRepository(db).get_table_stats(name)
+            reason = unarchived(lower, upper, count, max_updated_at)
+        if reason is not None:
+            skipped.append(f"{name}（{count}件）: {reason}")
+            continue
+        if args.dry_run:
+            print(f"  削除予定: {name}")
+            continue
+        with SessionLocal() as db:
+            repository = ReportPartitionRepository(db)
+            repository.detach_partition(name)
+            if not args.keep_detached:
+                repository.drop_table(name)
+            db.commit()
+        print(f"  {'切り離し' if args.keep_detached else '削除'}: {name}")
+
+    # 3. DEFAULTパーティションの保持期間を過ぎた行の削除（月ごとに確認）
+    with SessionLocal() as db:
+        default_months = ReportPartitionRepository(db).get_default_months_before(cutoff)
+    for month, count, max_updated_at in default_months:
+        upper = add_months(month, 1)
+        reason = unarchived(month, upper, count, max_updated_at)
+        if reason is not None:
+            skipped.append(f"DEFAULTパーティションの {month:%Y-%m}（{count}件）: {reason}")
+            continue
+        if args.dry_run:
+            print(f"  削除予定: DEFAULTパーティションの {month:%Y-%m}（{count}件）")
+            continue
+        with SessionLocal() as db:
+            deleted = ReportPartitionRepository(db).delete_default_between(month, upper)
+            db.commit()
+        print(f"  DEFAULTパーティションから削除: {month:%Y-%m} {deleted}件")
+
+    if skipped:
+        print("\n✗ アーカイブ済みであることを確認できないため削除しません")
+        print("  （scripts/archive_reports.py でアーカイブしてから再実行、または --force）:")
+        for message in skipped:
+            print(f"  - {message}")
+        sys.exit(1)
+
+    print("\n" + "=" * 60)
+    print("前日報告のパーティション管理完了")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
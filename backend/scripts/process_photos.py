@@ -0,0 +1,94 @@
+"""
+写真の後処理（派生画像の作成）スクリプト
+
+派生画像が未作成の写真を持つ前日報告を ID 順のバッチで取得し、サムネイル・プレビューを作成する。
+APIのワーカープールを使わない環境（Lambda: PHOTO_PROCESSING_MODE=auto では off）での定期実行や、
+既存データの一括作成に使用する。処理済みの報告は対象外となるため、繰り返し実行できる
+
+使用例（backendディレクトリで実行）:
+    python scripts/process_photos.py --batch-size 100 --workers 4
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings
+from app.database import SessionLocal, get_engine
+from app.repositories.previous_day_report_repository import PreviousDayReportRepository
+from app.services.photo_processing_service import PhotoProcessingService
+from app.utils.s3 import photo_base_url
+
+
+def process_report(report_id) -> bool:
+    """前日報告1件の写真を処理（失敗した場合はFalse）"""
+    with SessionLocal() as db:
+        try:
+            PhotoProcessingService(db).process_report(report_id)
+            return True
+        except Exception as e:
+            print(f"✗ {report_id}: {e}")
+            db.rollback()
+            return False
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="写真の派生画像（サムネイル・プレビュー）を作成")
+    parser.add_argument("--batch-size", type=int, default=100, help="1バッチの前日報告数")
+    parser.add_argument(
+        "--workers", type=int, default=settings.PHOTO_PROCESSING_WORKERS, help="並列数"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=0,
+        help="処理する前日報告数の上限（0は無制限）",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("写真の後処理開始")
+    print("=" * 60)
+    print(f"写真URL: {photo_base_url()}/")
+    print()
+
+    get_engine()
+    url_prefix = photo_base_url() + "/"
+    processed = failed = 0
+    after = None
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="photo") as executor:
+        while not args.limit or processed + failed < args.limit:
+            batch_size = args.batch_size
+            if args.limit:
+                batch_size = min(batch_size, args.limit - processed - failed)
+            with SessionLocal() as db:
+                report_ids = PreviousDayReportRepository(db).get_pending_photo_ids(
+                    url_prefix, after=after, limit=batch_size
+                )
+            if not report_ids:
+                break
+            # 失敗した報告は次のバッチで再取得しないよう、最後のIDから続ける
+            after = report_ids[-1]
+            for ok in executor.map(process_report, report_ids):
+                if ok:
+                    processed += 1
+                else:
+                    failed += 1
+            print(f"  {processed + failed}件処理（失敗 {failed}件）")
+
+    elapsed = time.perf_counter() - start
+    print("\n" + "=" * 60)
+    print(f"写真の後処理完了: {processed}件（失敗 {failed}件、{elapsed:.1f}秒）")
+    print("=" * 60)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
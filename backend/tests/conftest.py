@@ -0,0 +1,108 @@
+"""
+テスト共通のフィクスチャ
+
+ローカルJWKSスタンドインで発行したIDトークンで認証し、アプリを httpx.ASGITransport で呼び出す。
+データベースを使うテストは DATABASE_URL のPostgreSQL（alembic upgrade head 済み）が必要で、
+接続できない場合（ドライバがない場合を含む）はスキップする。DATABASE_URL のドライバは psycopg3
+（postgresql+psycopg）に揃える。テストで作成するユーザーの cognito_user_id は "test-" で始める
+
+実行方法（backendディレクトリで実行）:
+    pytest
+"""
+import os
+
+from benchmarks.jwks_stub import JWKSStub
+
+stub = JWKSStub(user_pool_id="test-pool", client_id="test-client")
+os.environ["COGNITO_USER_POOL_ID"] = stub.user_pool_id
+os.environ["COGNITO_CLIENT_ID"] = stub.client_id
+os.environ["COGNITO_REGION"] = stub.region
+os.environ["COGNITO_JWKS_URL"] = stub.serve()
+os.environ["S3_VERIFY_UPLOADS"] = "false"
+os.environ["PHOTO_PROCESSING_MODE"] = "off"
+os.environ.setdefault("DEBUG", "false")
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.exc import NoSuchModuleError, OperationalError  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app import database  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.previous_day_report_service import report_cache  # noqa: E402
+from app.services.user_service import identity_cache  # noqa: E402
+
+# requirements は psycopg3 のみのため、ドライバを指定していないURL（postgresql://、psycopg2）を
+# 非同期エンジンと同じ postgresql+psycopg に揃える（同期エンジン・スクリプトの実行にも使用する）
+settings.DATABASE_URL = database.to_async_database_url(settings.DATABASE_URL)
+
+
+def delete_test_users(url: str) -> None:
+    """テストで作成したユーザーを削除（前日報告・勤怠記録はCASCADEで削除される）"""
+    engine = create_engine(url, poolclass=NullPool)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE cognito_user_id LIKE 'test-%'"))
+    engine.dispose()
+
+
+def auth_header(sub: str, groups: list[str] | None = None) -> dict[str, str]:
+    """
+    テスト用ユーザーのAuthorizationヘッダー
+
+    Args:
+        sub: Cognito User ID（"test-" を付けて発行する）
+        groups: Cognitoグループ
+
+    Returns:
+        dict[str, str]: Authorizationヘッダー
+    """
+    token = stub.issue_token(sub=f"test-{sub}", email=f"test-{sub}@example.com", groups=groups)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="session")
+def database_url() -> str:
+    """PostgreSQLのURL（接続できない・ドライバがない場合はテストをスキップ）"""
+    try:
+        delete_test_users(settings.DATABASE_URL)
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQLに接続できません: {e.orig}")
+    except (ImportError, NoSuchModuleError) as e:
+        pytest.skip(f"PostgreSQLのドライバを読み込めません: {e}")
+    yield settings.DATABASE_URL
+    delete_test_users(settings.DATABASE_URL)
+
+
+async def reset_engines() -> None:
+    """作成済みのエンジンを破棄し、次の使用時に現在の設定で作り直す"""
+    for name in ("_engine", "_replica_engine"):
+        engine = getattr(database, name)
+        if engine is not None:
+            engine.dispose()
+            setattr(database, name, None)
+    for name in ("_async_engine", "_async_replica_engine"):
+        engine = getattr(database, name)
+        if engine is not None:
+            await engine.dispose()
+            setattr(database, name, None)
+
+
+@pytest.fixture(autouse=True)
+async def clear_state():
+    """テストごとにプロセス内のキャッシュを空にし、終了後にエンジンを破棄する"""
+    identity_cache.clear()
+    report_cache.clear()
+    database.primary_pins.clear()
+    yield
+    # 非同期エンジンの接続はテストのイベントループに結び付くため、テストごとに破棄する
+    await reset_engines()
+
+
+@pytest.fixture
+async def client(database_url: str):
+    """アプリを呼び出すHTTPクライアント"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
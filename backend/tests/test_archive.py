@@ -0,0 +1,194 @@
+"""
+前日報告のアーカイブのテスト
+
+アーカイブのマニフェストの記録と、scripts/archive_reports.py の実行でアーカイブした月の
+マニフェストに確認済みの件数が記録されること、scripts/manage_partitions.py がアーカイブを
+確認できない行を削除しないことを確認する
+"""
+import os
+import subprocess
+import sys
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.utils.archive import (
+    LocalArchiveSink,
+    manifest_key,
+    read_manifest,
+    unarchived_reason,
+    write_manifest,
+)
+from tests.conftest import auth_header
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 保持期間をはるかに過ぎた（他のテストのデータと重ならない）報告日
+OLD_MONTH = date(2001, 1, 1)
+
+
+def run_script(name: str, *args: str) -> subprocess.CompletedProcess:
+    """scripts/ のスクリプトを、テストと同じデータベースで実行"""
+    return subprocess.run(
+        [sys.executable, f"scripts/{name}", *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": settings.DATABASE_URL},
+        capture_output=True,
+        text=True,
+    )
+
+
+@pytest.fixture
+async def old_report(client) -> uuid.UUID:
+    """OLD_MONTH の前日報告（月のパーティションがないため DEFAULT パーティションに入る）"""
+    headers = auth_header(f"archive-{uuid.uuid4().hex[:8]}")
+    user_id = (await client.get("/api/users/me", headers=headers)).json()["id"]
+    report_id = uuid.uuid4()
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO previous_day_reports (
+                    id, user_id, report_date, next_wake_up_time, next_departure_time,
+                    next_arrival_time, appearance_photo_url, route_photo_url
+                )
+                VALUES (:id, :user_id, :report_date, '06:00', '07:30', '09:00', 'a', 'r')
+                """
+            ),
+            {"id": report_id, "user_id": user_id, "report_date": OLD_MONTH.replace(day=15)},
+        )
+    engine.dispose()
+    return report_id
+
+
+def report_exists(report_id: uuid.UUID) -> bool:
+    """前日報告が残っているか"""
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    with engine.connect() as conn:
+        statement = text("SELECT count(*) FROM previous_day_reports WHERE id = :id")
+        count = conn.execute(statement, {"id": report_id}).scalar()
+    engine.dispose()
+    return count > 0
+
+
+def manage_partitions(destination: Path, *args: str) -> subprocess.CompletedProcess:
+    """保持期間の開始日を OLD_MONTH の翌月としてパーティション管理を実行（作成は行わない）"""
+    return run_script(
+        "manage_partitions.py",
+        "--today",
+        "2001-02-15",
+        "--retention-months",
+        "0",
+        # 先の月のパーティションを作成しない
+        "--ahead",
+        "-1",
+        "--destination",
+        str(destination),
+        *args,
+    )
+
+
+def test_write_manifest_appends_runs(tmp_path):
+    """マニフェストは月ごとに1ファイルで、実行ごとの記録を追記する"""
+    sink = LocalArchiveSink(str(tmp_path))
+    month = date(2025, 1, 1)
+    assert read_manifest(sink, month) is None
+
+    for run_id, count in (("run1", 10), ("run2", 3)):
+        write_manifest(
+            sink,
+            month,
+            f"previous_day_reports/2025-01/{run_id}.jsonl.gz",
+            month,
+            date(2025, 2, 1),
+            count,
+            datetime(2025, 3, 1, tzinfo=timezone.utc),
+            run_id,
+        )
+
+    manifest = read_manifest(sink, month)
+    assert (tmp_path / manifest_key(month)).exists()
+    assert manifest["month"] == "2025-01"
+    assert [entry["count"] for entry in manifest["archives"]] == [10, 3]
+    assert manifest["archives"][-1]["upper"] == "2025-02-01"
+
+
+def test_archive_reports_writes_manifest(old_report, tmp_path):
+    """確認したアーカイブの件数と最終更新日時を月のマニフェストに記録する"""
+    result = run_script(
+        "archive_reports.py",
+        "--before",
+        "2001-02-01",
+        "--destination",
+        str(tmp_path),
+        "--keep",
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    manifest = read_manifest(LocalArchiveSink(str(tmp_path)), OLD_MONTH)
+    (entry,) = manifest["archives"]
+    assert entry["count"] == 1
+    assert entry["lower"] == "2001-01-01"
+    assert entry["upper"] == "2001-02-01"
+    assert (tmp_path / entry["key"]).exists()
+
+
+def test_unarchived_reason():
+    """最後のアーカイブが月全体を含み、その後の更新・登録がない場合のみアーカイブ済み"""
+    lower, upper = date(2025, 1, 1), date(2025, 2, 1)
+    archived_at = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    manifest = {
+        "archives": [
+            {
+                "lower": "2025-01-01",
+                "upper": "2025-02-01",
+                "count": 10,
+                "max_updated_at": archived_at.isoformat(),
+            }
+        ]
+    }
+
+    assert unarchived_reason(None, lower, upper, 0, None) is None
+    assert unarchived_reason(manifest, lower, upper, 10, archived_at) is None
+    assert "マニフェスト" in unarchived_reason(None, lower, upper, 1, archived_at)
+    assert "件数" in unarchived_reason(manifest, lower, upper, 11, archived_at)
+    newer = datetime(2025, 3, 2, tzinfo=timezone.utc)
+    assert "更新" in unarchived_reason(manifest, lower, upper, 10, newer)
+    partial = {"archives": [dict(manifest["archives"][0], upper="2025-01-15")]}
+    assert "期間" in unarchived_reason(partial, lower, upper, 10, archived_at)
+
+
+def test_manage_partitions_requires_archive(old_report, tmp_path):
+    """アーカイブしていない行は削除せず失敗し、アーカイブ後は削除する"""
+    result = manage_partitions(tmp_path)
+    assert result.returncode == 1
+    assert "アーカイブのマニフェストがありません" in result.stdout
+    assert report_exists(old_report)
+
+    archived = run_script(
+        "archive_reports.py",
+        "--before",
+        "2001-02-01",
+        "--destination",
+        str(tmp_path),
+        "--keep",
+    )
+    assert archived.returncode == 0, archived.stdout + archived.stderr
+
+    result = manage_partitions(tmp_path)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert not report_exists(old_report)
+
+
+def test_manage_partitions_force_skips_archive_check(old_report, tmp_path):
+    """--force の場合はアーカイブを確認せずに削除する"""
+    result = manage_partitions(tmp_path, "--force")
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert not report_exists(old_report)
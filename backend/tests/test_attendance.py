@@ -0,0 +1,28 @@
+"""
+勤怠記録のテスト
+
+段階の報告によるステータスの遷移（最初の報告で partial、3段階が揃うと complete）と、
+段階の順序を問わず受け付けることを確認する
+"""
+import uuid
+
+from tests.conftest import auth_header
+
+
+async def test_stages_complete_in_any_order(client):
+    """到着・起床・出発の順に報告しても、3段階が揃った時点で complete になる"""
+    headers = auth_header(f"attendance-{uuid.uuid4().hex[:8]}")
+    # 未報告の日は勤怠記録がない（pending は保存しない）
+    assert (await client.get("/api/attendance/today", headers=headers)).json() is None
+
+    statuses = []
+    for path, body in (
+        ("arrival", {"arrival_location": "現場"}),
+        ("wakeup", {}),
+        ("departure", {"destination": "現場"}),
+    ):
+        response = await client.post(f"/api/attendance/{path}", json=body, headers=headers)
+        assert response.status_code == 201, response.text
+        statuses.append(response.json()["status"])
+
+    assert statuses == ["partial", "partial", "complete"]
@@ -0,0 +1,78 @@
+"""
+同時接続のテスト（PERF-004）
+
+プールの接続数よりはるかに多いユーザーが同時にアクセスしても、リクエストが
+プールのタイムアウトまで停止しないことを確認する
+"""
+import asyncio
+
+import pytest
+
+from app import database
+from app.config import settings
+from tests.conftest import auth_header, reset_engines
+
+USERS = 100
+POOL_TIMEOUT = 30
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+async def small_pool(request, monkeypatch):
+    """接続数2のプール（同期・非同期のセッション）"""
+    monkeypatch.setattr(settings, "DATABASE_ASYNC", request.param)
+    monkeypatch.setattr(settings, "DATABASE_POOL_MODE", "queue")
+    monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DATABASE_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(settings, "DATABASE_POOL_TIMEOUT", POOL_TIMEOUT)
+    await reset_engines()
+    yield
+
+
+async def user_session(client, index: int) -> list[int]:
+    """初回ログイン・前日報告の登録・最新の前日報告の取得を行い、ステータスを返す"""
+    headers = auth_header(f"concurrency-{index}")
+    report = {
+        "report_date": "2025-12-17",
+        "next_wake_up_time": "06:00:00",
+        "next_departure_time": "07:30:00",
+        "next_arrival_time": "09:00:00",
+        "appearance_photo_url": "https://example.com/a.jpg",
+        "route_photo_url": "https://example.com/r.jpg",
+    }
+    statuses = []
+    for method, path, body in [
+        ("GET", "/api/users/me", None),
+        ("POST", "/api/previous-day-reports?on_conflict=upsert", report),
+        ("GET", "/api/previous-day-reports/latest/me", None),
+    ]:
+        response = await client.request(method, path, json=body, headers=headers)
+        statuses.append(response.status_code)
+    return statuses
+
+
+async def test_many_users_do_not_stall_on_small_pool(client, small_pool):
+    """100ユーザーが同時に複数回スレッドプールを経由するクエリを実行しても停止しない"""
+    sessions = asyncio.gather(*(user_session(client, i) for i in range(USERS)))
+    try:
+        results = await asyncio.wait_for(sessions, POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        pytest.fail(f"{USERS}ユーザーのリクエストが {POOL_TIMEOUT}秒以内に完了しませんでした")
+
+    assert all(status in (200, 201) for statuses in results for status in statuses), results
+
+
+async def test_session_slots_follow_pool_capacity(monkeypatch):
+    """同期セッションの同時数の上限はプールの最大接続数（null モードは上限なし）"""
+    monkeypatch.setattr(settings, "DATABASE_POOL_MODE", "queue")
+    monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DATABASE_MAX_OVERFLOW", 2)
+    database._session_slots.clear()
+    assert database.pool_capacity() == 5
+    assert database._session_slot("primary")._value == 5
+
+    monkeypatch.setattr(settings, "DATABASE_POOL_MODE", "single")
+    assert database.pool_capacity() == 1
+
+    monkeypatch.setattr(settings, "DATABASE_POOL_MODE", "null")
+    assert database.pool_capacity() is None
+    assert database._session_slot("replica") is None
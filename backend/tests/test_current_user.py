@@ -0,0 +1,51 @@
+"""
+認証済みユーザーの取得（get_current_user）のテスト
+"""
+import uuid
+
+from app.services.user_service import identity_cache
+from tests.conftest import auth_header
+
+
+async def test_inactive_user_is_forbidden(client):
+    """無効化されたユーザーは403、有効化すると再び利用できる"""
+    suffix = uuid.uuid4().hex[:8]
+    staff = auth_header(f"inactive-staff-{suffix}")
+    manager = auth_header(f"inactive-manager-{suffix}", groups=["manager"])
+    me = await client.get("/api/users/me", headers=staff)
+    user_id = me.json()["id"]
+
+    updated = await client.put(f"/api/users/{user_id}", json={"active": False}, headers=manager)
+    assert updated.status_code == 200
+
+    response = await client.get("/api/users/me", headers=staff)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "このユーザーは無効化されています"
+    # 無効化の状態もキャッシュし、次のリクエストではユーザー検索を省略する
+    cached, _ = identity_cache.get(f"test-inactive-staff-{suffix}")
+    assert cached.active is False
+
+    await client.put(f"/api/users/{user_id}", json={"active": True}, headers=manager)
+    assert (await client.get("/api/users/me", headers=staff)).status_code == 200
+
+
+async def test_stale_identity_is_not_cached_after_invalidation(client):
+    """ユーザー検索中に無効化された場合、検索した（有効な）ユーザー情報を保存しない"""
+    suffix = uuid.uuid4().hex[:8]
+    sub = f"test-stale-staff-{suffix}"
+    staff = auth_header(f"stale-staff-{suffix}")
+    manager = auth_header(f"stale-manager-{suffix}", groups=["manager"])
+    me = await client.get("/api/users/me", headers=staff)
+    stale, _ = identity_cache.get(sub)
+    identity_cache.delete(sub)
+
+    # 別のリクエストがキャッシュのミスでユーザーを検索している間に、マネージャーが無効化する
+    _, token = identity_cache.get(sub)
+    updated = await client.put(
+        f"/api/users/{me.json()['id']}", json={"active": False}, headers=manager
+    )
+    assert updated.status_code == 200
+    identity_cache.set(sub, stale, token)
+
+    assert identity_cache.get(sub)[0] is None
+    assert (await client.get("/api/users/me", headers=staff)).status_code == 403
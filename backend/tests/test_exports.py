@@ -0,0 +1,112 @@
+"""
+前日報告のCSVエクスポートのテスト
+
+数式として解釈される値の無効化（CSVインジェクション対策）と、Lambda向けの応答方式（buffered）で
+上限を超えるCSVを400にすることを確認する
+"""
+import csv
+import io
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services.export_service import (
+    PREVIOUS_DAY_REPORT_CSV_COLUMNS,
+    _csv_rows,
+    resolve_export_mode,
+)
+from tests.conftest import auth_header
+
+REPORT = {
+    "report_date": "2025-12-17",
+    "next_wake_up_time": "06:00:00",
+    "next_departure_time": "07:30:00",
+    "next_arrival_time": "09:00:00",
+    "appearance_photo_url": "https://example.com/a.jpg",
+    "route_photo_url": "https://example.com/r.jpg",
+}
+
+
+def read_csv(body: bytes) -> list[dict[str, str]]:
+    """CSV（BOM付き）を見出し → 値の辞書のリストとして読み出す"""
+    return list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+
+
+@pytest.mark.parametrize("value", ["=1+1", "+1", "-1", "@SUM(A1)", "\t=1", "\r=1"])
+def test_csv_rows_neutralizes_formulas(value: str):
+    """数式として解釈される先頭の文字で始まる文字列は ' を前置する"""
+    row = SimpleNamespace(**{attr: None for _, attr in PREVIOUS_DAY_REPORT_CSV_COLUMNS})
+    row.name, row.email, row.notes = value, value, value
+
+    (cells,) = csv.reader(io.StringIO(_csv_rows([row]).decode("utf-8")))
+
+    columns = [attr for _, attr in PREVIOUS_DAY_REPORT_CSV_COLUMNS]
+    for attr in ("name", "email", "notes"):
+        assert cells[columns.index(attr)] == "'" + value
+
+
+def test_csv_rows_keeps_plain_values():
+    """それ以外の値はそのまま出力する"""
+    row = SimpleNamespace(**{attr: None for _, attr in PREVIOUS_DAY_REPORT_CSV_COLUMNS})
+    row.name, row.notes = "山田 太郎", "1+1=2"
+
+    (cells,) = csv.reader(io.StringIO(_csv_rows([row]).decode("utf-8")))
+
+    assert "山田 太郎" in cells
+    assert "1+1=2" in cells
+
+
+def test_resolve_export_mode(monkeypatch):
+    """auto はLambda上で buffered、それ以外で stream"""
+    monkeypatch.setattr(settings, "EXPORT_RESPONSE_MODE", "auto")
+    monkeypatch.delenv("AWS_LAMBDA_FUNCTION_NAME", raising=False)
+    assert resolve_export_mode() == "stream"
+
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "okiteru-api")
+    assert resolve_export_mode() == "buffered"
+
+    monkeypatch.setattr(settings, "EXPORT_RESPONSE_MODE", "invalid")
+    with pytest.raises(ValueError):
+        resolve_export_mode()
+
+
+@pytest.fixture
+async def exported(client) -> dict:
+    """数式で始まる備考の前日報告を登録したスタッフと、エクスポートするマネージャー"""
+    suffix = uuid.uuid4().hex[:8]
+    staff = auth_header(f"exports-staff-{suffix}")
+    manager = auth_header(f"exports-manager-{suffix}", groups=["manager"])
+    me = await client.get("/api/users/me", headers=staff)
+    report = dict(REPORT, notes='=HYPERLINK("https://example.com","x")')
+    created = await client.post("/api/previous-day-reports", json=report, headers=staff)
+    assert created.status_code == 201, created.text
+    return {
+        "manager": manager,
+        "path": f"/api/exports/previous-day-reports.csv?user_id={me.json()['id']}",
+    }
+
+
+@pytest.mark.parametrize("mode", ["stream", "buffered"])
+async def test_export_escapes_notes(client, exported, monkeypatch, mode: str):
+    """どちらの応答方式でも備考の数式を無効化して出力する"""
+    monkeypatch.setattr(settings, "EXPORT_RESPONSE_MODE", mode)
+
+    response = await client.get(exported["path"], headers=exported["manager"])
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    (row,) = read_csv(response.content)
+    assert row["備考"] == '\'=HYPERLINK("https://example.com","x")'
+
+
+async def test_buffered_export_rejects_oversized_csv(client, exported, monkeypatch):
+    """buffered では EXPORT_MAX_BYTES を超えるCSVを400にする"""
+    monkeypatch.setattr(settings, "EXPORT_RESPONSE_MODE", "buffered")
+    monkeypatch.setattr(settings, "EXPORT_MAX_BYTES", 100)
+
+    response = await client.get(exported["path"], headers=exported["manager"])
+
+    assert response.status_code == 400
+    assert "上限" in response.json()["detail"]
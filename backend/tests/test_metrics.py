@@ -0,0 +1,27 @@
+"""
+/metrics の公開条件のテスト
+"""
+import pytest
+
+from app.config import settings
+from app.routers.metrics import metrics_enabled
+
+
+def test_metrics_disabled_by_default():
+    """デフォルトでは /metrics を公開しない"""
+    assert type(settings).model_fields["METRICS_ENABLED"].default is False
+
+
+def test_metrics_require_token_outside_development(monkeypatch):
+    """development 以外の環境では METRICS_TOKEN なしで有効にできない"""
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+    assert metrics_enabled()
+
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    with pytest.raises(ValueError, match="METRICS_TOKEN"):
+        metrics_enabled()
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "secret")
+    assert metrics_enabled()
@@ -0,0 +1,225 @@
+"""
+エンドポイントのクエリ数の上限（query_budget）のテスト
+
+DATABASE_QUERY_BUDGET_MODE=strict で主要なエンドポイントを呼び出し、宣言した上限内で応答すること
+（上限を超えるクエリの実行前に QueryBudgetExceeded が送出されないこと）を、ユーザー情報・読み出し
+キャッシュが空の状態（cold）とキャッシュ済みの状態（warm）で確認する
+"""
+import uuid
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import get_session
+from app.dependencies import query_budget
+from app.main import app
+from app.services.previous_day_report_service import report_cache
+from app.services.user_service import identity_cache
+from app.utils.timing import QueryBudgetExceeded, TimingMiddleware, query_allowance
+from tests.conftest import auth_header
+
+REPORT = {
+    "report_date": "2025-12-17",
+    "next_wake_up_time": "06:00:00",
+    "next_departure_time": "07:30:00",
+    "next_arrival_time": "09:00:00",
+    "appearance_photo_url": "https://example.com/a.jpg",
+    "route_photo_url": "https://example.com/r.jpg",
+}
+
+EXPORT_PATH = "/api/exports/previous-day-reports.csv?date_from=2025-12-01&date_to=2025-12-31"
+
+# (メソッド, パス, 呼び出すユーザー, リクエストボディ)。パスの {report_id} 等は scenario の値
+CASES = [
+    ("GET", "/api/users/me", "staff", None),
+    ("GET", "/api/previous-day-reports/latest/me", "staff", None),
+    ("GET", "/api/previous-day-reports?limit=10", "staff", None),
+    ("GET", "/api/previous-day-reports/{report_id}", "staff", None),
+    ("POST", "/api/previous-day-reports", "staff", dict(REPORT, report_date="2025-12-18")),
+    ("POST", "/api/previous-day-reports?on_conflict=upsert", "staff", REPORT),
+    ("PUT", "/api/previous-day-reports/{report_id}", "staff", {"notes": "x"}),
+    ("DELETE", "/api/previous-day-reports/{report_id}", "staff", None),
+    ("GET", "/api/dashboard/2025-12-18", "manager", None),
+    ("GET", "/api/users?limit=10", "manager", None),
+    ("GET", "/api/users/{user_id}", "manager", None),
+    ("POST", "/api/users", "manager", "new_user"),
+    ("PUT", "/api/users/{user_id}", "manager", {"name": "更新後"}),
+    ("DELETE", "/api/users/{user_id}", "manager", None),
+    ("GET", EXPORT_PATH, "manager", None),
+    ("GET", "/api/cache/stats", "manager", None),
+    # 起床は報告済み（二度押し: 記録せず当日の記録を読み出す）、出発は記録する
+    ("POST", "/api/attendance/wakeup", "staff", {}),
+    ("POST", "/api/attendance/departure", "staff", {"destination": "現場"}),
+    ("GET", "/api/attendance/today", "staff", None),
+    ("GET", "/api/attendance?limit=10", "staff", None),
+    ("GET", "/api/attendance/{record_id}", "manager", None),
+]
+
+# 書き込み後の状態が変わるため、キャッシュ済み（warm）の確認はGET・PUTのみ
+PARAMS = [
+    pytest.param(*case, cache, id=f"{case[0]} {case[1].split('?')[0]} {cache}")
+    for case in CASES
+    for cache in ("cold", "warm")
+    if cache == "cold" or case[0] in ("GET", "PUT")
+]
+
+
+def budget_of(method: str, path: str) -> int | None:
+    """エンドポイントに宣言されたクエリ数の上限"""
+    for route in app.routes:
+        if method in getattr(route, "methods", ()) and route.path_regex.match(path):
+            for dependency in route.dependant.dependencies:
+                closure = getattr(dependency.call, "__closure__", None) or ()
+                if dependency.call.__name__ == "declare_query_budget" and closure:
+                    return closure[0].cell_contents
+            return None
+    return None
+
+
+def queries_of(response: httpx.Response) -> int:
+    """Server-Timing ヘッダーのクエリ数（クエリを実行しなかった場合は含まれないため0）"""
+    for entry in response.headers["server-timing"].split(","):
+        name, *params = entry.strip().split(";")
+        if name == "queries":
+            return int(dict(param.split("=", 1) for param in params)["desc"].strip('"'))
+    return 0
+
+
+@pytest.fixture
+def strict(monkeypatch):
+    """上限を超えるクエリの実行前に QueryBudgetExceeded を送出する"""
+    monkeypatch.setattr(settings, "DATABASE_QUERY_BUDGET_MODE", "strict")
+
+
+@pytest.fixture
+async def scenario(client: httpx.AsyncClient, strict) -> dict:
+    """
+    スタッフ・マネージャーと、前日報告・ユーザー・勤怠記録を1件ずつ作成
+
+    Returns:
+        dict: ユーザーごとのヘッダー（staff / manager）と、パスに埋め込むID
+    """
+    suffix = uuid.uuid4().hex[:8]
+    staff = auth_header(f"budget-staff-{suffix}")
+    manager = auth_header(f"budget-manager-{suffix}", groups=["manager"])
+
+    def new_user(index: int) -> dict:
+        sub = f"test-budget-user{index}-{suffix}"
+        return {"name": "確認用スタッフ", "email": f"{sub}@example.com", "cognito_user_id": sub}
+
+    # 初回ログインのユーザー作成を含む
+    await client.get("/api/users/me", headers=manager)
+    report = await client.post("/api/previous-day-reports", json=REPORT, headers=staff)
+    user = await client.post("/api/users", json=new_user(0), headers=manager)
+    record = await client.post("/api/attendance/wakeup", json={}, headers=staff)
+    return {
+        "staff": staff,
+        "manager": manager,
+        "new_user": new_user(1),
+        "ids": {
+            "report_id": report.json()["id"],
+            "user_id": user.json()["id"],
+            "record_id": record.json()["id"],
+        },
+    }
+
+
+@pytest.mark.parametrize("method, path, who, body, cache", PARAMS)
+async def test_route_stays_within_query_budget(
+    client: httpx.AsyncClient, scenario: dict, method: str, path: str, who: str, body, cache: str
+):
+    """エンドポイントが上限を宣言し、strict モードで上限内のクエリ数で応答する"""
+    path = path.format(**scenario["ids"])
+    budget = budget_of(method, path.split("?")[0])
+    assert budget is not None, f"{method} {path} に query_budget が宣言されていません"
+    if isinstance(body, str):
+        body = scenario[body]
+    if cache == "warm":
+        await client.request(method, path, json=body, headers=scenario[who])
+    else:
+        identity_cache.clear()
+        report_cache.clear()
+
+    response = await client.request(method, path, json=body, headers=scenario[who])
+
+    assert response.status_code < 400, response.text
+    assert queries_of(response) <= budget
+
+
+def budget_app(budget: int, allowed: int = 0) -> FastAPI:
+    """
+    クエリ数の上限を宣言し、SELECT 1 を実行するエンドポイントのアプリ
+
+    Args:
+        budget: 宣言する上限
+        allowed: 上限の前に query_allowance(0) のブロック内で実行するクエリ数
+    """
+    budget_app = FastAPI()
+    budget_app.add_middleware(TimingMiddleware)
+
+    @budget_app.get("/queries/{count}", dependencies=[Depends(query_budget(budget))])
+    async def run_queries(count: int, db=Depends(get_session)):
+        async def execute(n: int) -> None:
+            for _ in range(n):
+                if settings.DATABASE_ASYNC:
+                    await db.execute(text("SELECT 1"))
+                else:
+                    await run_in_threadpool(db.execute, text("SELECT 1"))
+
+        with query_allowance(0):
+            await execute(allowed)
+        await execute(count)
+        return {"count": count}
+
+    return budget_app
+
+
+@pytest.fixture
+async def budget_client(database_url: str):
+    """budget_app を呼び出すHTTPクライアントのファクトリ"""
+    clients = []
+
+    def create(budget: int, allowed: int = 0) -> httpx.AsyncClient:
+        transport = httpx.ASGITransport(app=budget_app(budget, allowed))
+        client = httpx.AsyncClient(transport=transport, base_url="http://test")
+        clients.append(client)
+        return client
+
+    yield create
+    for client in clients:
+        await client.aclose()
+
+
+async def test_strict_mode_raises_before_exceeding_query(budget_client, strict):
+    """strict モードでは上限を超えるクエリの実行前に QueryBudgetExceeded を送出する"""
+    client = budget_client(2)
+
+    assert (await client.get("/queries/2")).status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="クエリ数の上限（2）を超えました"):
+        await client.get("/queries/3")
+
+
+async def test_warn_mode_logs_without_raising(budget_client, monkeypatch, caplog):
+    """warn モードでは上限を超えても応答し、ログに警告する"""
+    monkeypatch.setattr(settings, "DATABASE_QUERY_BUDGET_MODE", "warn")
+    client = budget_client(1)
+
+    response = await client.get("/queries/3")
+
+    assert response.status_code == 200
+    assert queries_of(response) == 3
+    assert any("上限" in record.getMessage() for record in caplog.records)
+
+
+async def test_query_allowance_extends_budget(budget_client, strict):
+    """query_allowance のブロック内のクエリ（初回ログインのユーザー作成等）は上限に加算される"""
+    client = budget_client(1, allowed=2)
+
+    response = await client.get("/queries/1")
+
+    assert response.status_code == 200
+    assert queries_of(response) == 3
@@ -0,0 +1,399 @@
+"""
+リポジトリのクエリの実行計画のテスト
+
+合成データ（スタッフ・マネージャー・前日報告と勤怠記録の履歴）を投入して VACUUM ANALYZE した後、
+リポジトリの各メソッドが発行するクエリ（モジュールのクエリ作成関数から作成）を EXPLAIN し、
+以下を確認する（インデックス・クエリの回帰検出用）。
+
+- 計画に逐次スキャン（Seq Scan）が含まれないこと。小さいテーブルでは逐次スキャンの方が安いため、
+  enable_seqscan=off で計画し、使えるインデックスがない場合にのみ逐次スキャンが残るようにする
+- 期待するスキャン（Index Only Scan 等のノードの種類、またはインデックス名）が計画に含まれること
+  （カバリングインデックス・部分インデックスが使われなくなった場合の検出）
+- 報告日で絞り込むクエリが、前日報告のパーティションを上限（PRUNED_QUERIES）より多く検索しないこと
+  （パーティションの除外が効かなくなった場合の検出）
+
+パーティションのインデックス・テーブルは親（previous_day_reports のインデックス名）に置き換えて
+判定する。
+PostgreSQL（マイグレーション適用済み）が必要で、接続できない場合はスキップする
+"""
+import random
+import uuid
+from datetime import date, time, timedelta
+from typing import Any, Iterator
+
+import pytest
+from sqlalchemy import create_engine, delete, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Executable
+
+from app.models.attendance import AttendanceRecord
+from app.models.daily_staff_summary import DailyStaffSummary
+from app.models.previous_day_report import PreviousDayReport
+from app.models.user import User
+from app.repositories import attendance_repository as attendance
+from app.repositories import daily_staff_summary_repository as summaries
+from app.repositories import previous_day_report_repository as reports
+from app.repositories import user_repository as users
+from app.schemas.previous_day_report import PreviousDayReportCreate
+
+# 合成データのユーザーの Cognito User ID の接頭辞（終了時に削除する）
+PREFIX = "test-plans-"
+
+# 合成データのスタッフ数と、スタッフごとの前日報告・勤怠記録の日数
+STAFF = 200
+DAYS = 60
+
+# 写真用バケットのURL（派生画像が未作成の写真の検索に使用）
+PHOTO_URL_PREFIX = "https://test-photos.s3.ap-northeast-1.amazonaws.com/"
+
+# 派生画像が未作成の前日報告の割合
+PENDING_PHOTO_RATIO = 0.01
+
+# 報告日で絞り込むクエリと、検索してよい前日報告のパーティション数（月単位のため、
+# 7日間のエクスポートは最大2パーティション）
+PRUNED_QUERIES = {
+    "reports.get_by_user_and_date": 1,
+    "reports.stream_for_export (dates)": 2,
+    "summaries.get_dashboard": 1,
+}
+
+
+def seed(conn: Connection, staff: int, days: int, today: date) -> dict[str, Any]:
+    """
+    合成データを投入
+
+    スタッフのほか、マネージャーと非アクティブなスタッフも作成する。
+    前日報告の写真は、一部を除き派生画像を作成済みとする。勤怠記録は前日報告と同じ日数分を作成する
+
+    Returns:
+        dict[str, Any]: クエリの引数に使う値（user_id, report_id, report_date 等）
+    """
+    conn.execute(delete(User).where(User.cognito_user_id.like(f"{PREFIX}%")))
+    members = [("staff", True)] * staff + [("manager", True)] * max(1, staff // 20)
+    members += [("staff", False)] * max(1, staff // 10)
+    user_rows = [
+        {
+            "id": uuid.uuid4(),
+            "cognito_user_id": f"{PREFIX}{i:05d}",
+            "email": f"{PREFIX}{i:05d}@example.com",
+            "role": role,
+            "name": f"{PREFIX}{i:05d}",
+            "active": active,
+        }
+        for i, (role, active) in enumerate(members)
+    ]
+    conn.execute(insert(User), user_rows)
+
+    report_rows, attendance_rows = [], []
+    for user in user_rows:
+        if user["role"] != "staff":
+            continue
+        for offset in range(1, days + 1):
+            key = f"{PHOTO_URL_PREFIX}photos/{user['id']}/{offset}"
+            processed = random.random() >= PENDING_PHOTO_RATIO
+            report_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user["id"],
+                    "report_date": today - timedelta(days=offset),
+                    "next_wake_up_time": time(6, 0),
+                    "next_departure_time": time(7, 30),
+                    "next_arrival_time": time(9, 0),
+                    "appearance_photo_url": f"{key}/appearance.jpg",
+                    "route_photo_url": f"{key}/route.jpg",
+                    "appearance_thumbnail_url": f"{key}/appearance.thumb.webp"
+                    if processed
+                    else None,
+                    "route_thumbnail_url": f"{key}/route.thumb.webp" if processed else None,
+                }
+            )
+            attendance_rows.append(
+                {
+                    "staff_id": user["id"],
+                    "date": today - timedelta(days=offset),
+                    "status": "complete",
+                }
+            )
+    conn.execute(insert(PreviousDayReport), report_rows)
+    conn.execute(insert(AttendanceRecord), attendance_rows)
+    conn.execute(
+        summaries.upsert_previous_day_reports_from(
+            select(PreviousDayReport)
+            .where(PreviousDayReport.user_id.in_([user["id"] for user in user_rows]))
+            .subquery()
+        )
+    )
+
+    sample = report_rows[len(report_rows) // 2]
+    return {
+        "user_id": sample["user_id"],
+        "report_id": sample["id"],
+        "report_date": sample["report_date"],
+        "appearance_photo_url": sample["appearance_photo_url"],
+    }
+
+
+def cases(values: dict[str, Any], today: date) -> Iterator[tuple[str, Executable, Any]]:
+    """
+    確認するクエリ（名前, クエリ, 期待するスキャン）
+
+    期待するスキャンはノードの種類（"Index Only Scan" 等）またはインデックス名で指定する。
+    同等に使えるインデックスが複数ある場合はタプルで指定し、いずれかが使われればよい。
+
+    ORM の主キー操作（Session.get・flush による UPDATE/DELETE）は主キーで行を特定するため含めない
+    """
+    user_id, report_id = values["user_id"], values["report_id"]
+    report_date = values["report_date"]
+    data = PreviousDayReportCreate(
+        report_date=today,
+        next_wake_up_time=time(6, 0),
+        next_departure_time=time(7, 30),
+        next_arrival_time=time(9, 0),
+        appearance_photo_url="https://example.com/a.jpg",
+        route_photo_url="https://example.com/r.jpg",
+    )
+
+    # previous_day_report_repository
+    yield "reports.get_by_id", reports._select_by_id(report_id), None
+    yield (
+        "reports.get_by_user_and_date",
+        reports._select_by_user_and_date(user_id, report_date),
+        None,
+    )
+    yield "reports.get_by_user", reports._select_page_by_user(user_id, 10, 0, None), None
+    yield (
+        "reports.get_by_user (cursor)",
+        reports._select_page_by_user(user_id, 10, 0, (report_date, report_id)),
+        None,
+    )
+    yield "reports.get_latest_by_user", reports._select_by_user(user_id).limit(1), None
+    yield "reports.get_version_by_id", reports._select_version_by_id(report_id), None
+    yield (
+        "reports.get_latest_version_by_user",
+        reports._select_latest_version_by_user(user_id),
+        "Index Only Scan",
+    )
+    yield (
+        "reports.get_collection_version_by_user",
+        reports._select_collection_version_by_user(user_id),
+        "Index Only Scan",
+    )
+    yield "reports.get_photos", reports._select_photos_by_id(report_id), None
+    yield (
+        "reports.get_pending_photo_ids",
+        reports._select_pending_photo_ids(PHOTO_URL_PREFIX, None, 100),
+        "idx_prev_reports_pending_photos",
+    )
+    yield (
+        "reports.set_derived_photo_urls",
+        reports._update_derived_photo_urls(
+            report_id,
+            "appearance_photo_url",
+            values["appearance_photo_url"],
+            {"appearance_thumbnail_url": "x"},
+        ),
+        None,
+    )
+    yield (
+        "reports.stream_for_export (dates)",
+        reports._select_for_export(today - timedelta(days=7), today, None),
+        "idx_prev_reports_date_user",
+    )
+    yield (
+        "reports.stream_for_export (user)",
+        reports._select_for_export(None, None, user_id),
+        None,
+    )
+    yield "reports.insert (reject)", reports._insert_report(user_id, data, "reject"), None
+    yield "reports.insert (upsert)", reports._insert_report(user_id, data, "upsert"), None
+
+    # attendance_repository
+    yield "attendance.get_by_id", attendance._select_by_id(report_id), None
+    # スタッフ・日付の等価条件のため、どちらの列順のインデックスも1行を直接引ける
+    yield (
+        "attendance.get_today_by_staff",
+        attendance._select_today_by_staff(user_id),
+        ("uq_attendance_staff_date", "idx_attendance_date_staff"),
+    )
+    yield (
+        "attendance.get_by_staff",
+        attendance._select_page_by_staff(user_id, 10, None),
+        "uq_attendance_staff_date",
+    )
+    yield (
+        "attendance.get_by_staff (cursor)",
+        attendance._select_page_by_staff(user_id, 10, (report_date, report_id)),
+        "uq_attendance_staff_date",
+    )
+    yield (
+        "attendance.record_stage",
+        attendance._record_stage(user_id, "departure", {"destination": "x"}),
+        None,
+    )
+
+    # daily_staff_summary_repository
+    yield (
+        "summaries.get_dashboard",
+        summaries._select_dashboard(today),
+        "idx_users_active_role_created_at_id",
+    )
+    yield (
+        "summaries.clear_previous_day_report",
+        summaries._clear_previous_day_report(report_id, user_id, report_date),
+        None,
+    )
+
+    # user_repository（クエリ作成関数のないメソッドはメソッド内のクエリと同じもの）
+    yield "users.get_by_id", select(User).where(User.id == user_id), None
+    yield "users.get_version", select(User.id, User.updated_at).where(User.id == user_id), None
+    yield (
+        "users.get_by_cognito_id",
+        select(User).where(User.cognito_user_id == f"{PREFIX}00000"),
+        None,
+    )
+    yield "users.get_by_email", select(User).where(User.email == f"{PREFIX}00000@example.com"), None
+    for role, active_only in ((None, False), ("staff", False), (None, True), ("staff", True)):
+        label = f"role={role} active_only={active_only}"
+        yield f"users.get_all ({label})", users._select_all(0, 100, role, active_only), None
+        yield (
+            f"users.get_all_with_total ({label})",
+            users._select_all_with_total(0, 100, role, active_only),
+            None,
+        )
+        yield f"users.count ({label})", users._select_count(role, active_only), None
+
+
+def walk(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """実行計画のノードを深さ優先で列挙"""
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from walk(child)
+
+
+def explain(conn: Connection, query: Executable) -> dict[str, Any]:
+    """
+    クエリの実行計画を取得（enable_seqscan=off）
+
+    Returns:
+        dict[str, Any]: EXPLAIN (FORMAT JSON) の結果
+    """
+    compiled = query.compile(dialect=conn.dialect)
+    transaction = conn.begin_nested()
+    try:
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params)
+        return plan.scalar()[0]
+    finally:
+        transaction.rollback()
+
+
+def load_parents(conn: Connection) -> dict[str, str]:
+    """
+    パーティション・パーティションのインデックスの名前から親の名前への対応を取得
+
+    Returns:
+        dict[str, str]: 子の名前 → 親の名前（"previous_day_reports_p2026_10_pkey" →
+            "previous_day_reports_pkey" 等）
+    """
+    rows = conn.execute(
+        text(
+            """
+            SELECT child.relname, parent.relname
+            FROM pg_inherits
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent
+            """
+        )
+    )
+    return dict(rows.all())
+
+
+def scans(plan: dict[str, Any], parents: dict[str, str]) -> Iterator[tuple[str, str, str]]:
+    """
+    実行計画のスキャンを列挙
+
+    Returns:
+        Iterator[tuple[str, str, str]]: (ノードの種類, 親に置き換えたインデックス名・テーブル名,
+            検索するテーブル・パーティション名)
+    """
+    for node in walk(plan["Plan"]):
+        if "Scan" not in node["Node Type"] or node["Node Type"] == "CTE Scan":
+            continue
+        target = node.get("Index Name") or node.get("Relation Name", "")
+        yield node["Node Type"], parents.get(target, target), node.get("Relation Name", "")
+
+
+def partitions_scanned(plan: dict[str, Any], parents: dict[str, str]) -> int:
+    """実行計画で検索する前日報告のパーティション数"""
+    table = PreviousDayReport.__tablename__
+    return len({rel for _, _, rel in scans(plan, parents) if parents.get(rel) == table})
+
+
+def describe(plan: dict[str, Any], parents: dict[str, str]) -> str:
+    """実行計画のスキャンの要約（"Index Only Scan uq_prev_reports_user_date ×13" 等）"""
+    counts: dict[str, int] = {}
+    for node_type, target, _ in scans(plan, parents):
+        key = f"{node_type} {target}".strip()
+        counts[key] = counts.get(key, 0) + 1
+    return ", ".join(f"{key} ×{n}" if n > 1 else key for key, n in counts.items()) or "-"
+
+
+TODAY = date.today()
+
+# クエリ名 → 期待するスキャン（クエリの作成に合成データは不要なため仮の値で列挙する）
+EXPECTED_SCANS = {
+    name: expected
+    for name, _, expected in cases(
+        {
+            "user_id": uuid.uuid4(),
+            "report_id": uuid.uuid4(),
+            "report_date": TODAY,
+            "appearance_photo_url": "",
+        },
+        TODAY,
+    )
+}
+
+
+@pytest.fixture(scope="module")
+def plans(database_url: str) -> Iterator[tuple[dict, dict[str, str]]]:
+    """
+    合成データを投入し、各クエリの実行計画を取得
+
+    Yields:
+        (クエリ名 → 実行計画, パーティション等の名前 → 親の名前)
+    """
+    random.seed(0)
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() as conn:
+            values = seed(conn, STAFF, DAYS, TODAY)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in (User, PreviousDayReport, DailyStaffSummary, AttendanceRecord):
+                conn.execute(text(f"VACUUM ANALYZE {table.__tablename__}"))
+        with engine.connect() as conn:
+            parents = load_parents(conn)
+            explained = {name: explain(conn, query) for name, query, _ in cases(values, TODAY)}
+        yield explained, parents
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(User).where(User.cognito_user_id.like(f"{PREFIX}%")))
+        engine.dispose()
+
+
+@pytest.mark.parametrize("name", EXPECTED_SCANS)
+def test_query_uses_expected_index(plans, name: str):
+    """クエリが逐次スキャンせず、期待するスキャン・パーティションの除外を使う"""
+    explained, parents = plans
+    expected = EXPECTED_SCANS[name]
+    plan = explained[name]
+    nodes = [node["Node Type"] for node in walk(plan["Plan"])]
+    indexes = [target for _, target, _ in scans(plan, parents)]
+    summary = describe(plan, parents)
+
+    assert "Seq Scan" not in nodes, summary
+    if expected:
+        accepted = (expected,) if isinstance(expected, str) else expected
+        assert set(accepted) & set(nodes + indexes), summary
+    if name in PRUNED_QUERIES:
+        assert partitions_scanned(plan, parents) <= PRUNED_QUERIES[name], summary
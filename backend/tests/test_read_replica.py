@@ -0,0 +1,176 @@
+"""
+読み取り専用レプリカの振り分けのテスト
+
+ローカルのPostgreSQLに、DATABASE_URL のデータベースを複製したデータベースをレプリカとして作成する
+（複製の時点で止まった、遅延したレプリカとして扱う）。確認用ユーザーの名前をレプリカでのみ
+"replica" に変更し、どちらのデータベースで読み出したかを名前で判別する。
+データベースの作成権限がない場合はスキップする
+"""
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, insert, select, text, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, ProgrammingError
+from sqlalchemy.pool import NullPool
+
+from app import database
+from app.config import settings
+from app.dependencies import CurrentUser, get_read_session
+from app.models.user import User
+from app.services.previous_day_report_service import report_cache
+from app.services.user_service import identity_cache
+from app.utils.cache import TTLCache
+from tests.conftest import auth_header, reset_engines
+
+REPLICA_DATABASE = "okiteru_test_replica"
+
+# 書き込み後にプライマリで読み出す期間（秒）。経過後にレプリカに戻ることを確認する
+PIN_SECONDS = 0.5
+
+REPORT = {
+    "report_date": "2025-12-17",
+    "next_wake_up_time": "06:00:00",
+    "next_departure_time": "07:30:00",
+    "next_arrival_time": "09:00:00",
+    "appearance_photo_url": "https://example.com/a.jpg",
+    "route_photo_url": "https://example.com/r.jpg",
+}
+
+
+def execute(url, statement: str) -> None:
+    """接続を保持しないエンジンで、トランザクション外のSQL（CREATE DATABASE 等）を実行"""
+    engine = create_engine(url, poolclass=NullPool)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(statement))
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def replica_url(database_url: str) -> str:
+    """プライマリのスキーマを複製したレプリカのデータベースのURL"""
+    primary = make_url(database_url)
+    server = primary.set(database="postgres")
+    try:
+        execute(server, f"DROP DATABASE IF EXISTS {REPLICA_DATABASE} WITH (FORCE)")
+        execute(server, f"CREATE DATABASE {REPLICA_DATABASE} TEMPLATE {primary.database}")
+    except (DBAPIError, ProgrammingError) as e:
+        pytest.skip(f"レプリカのデータベースを作成できません: {e.orig}")
+    yield primary.set(database=REPLICA_DATABASE).render_as_string(hide_password=False)
+    execute(server, f"DROP DATABASE IF EXISTS {REPLICA_DATABASE} WITH (FORCE)")
+
+
+@pytest.fixture
+async def replica(replica_url: str, monkeypatch):
+    """レプリカを設定し、書き込み後 PIN_SECONDS の間プライマリで読み出す"""
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", replica_url)
+    monkeypatch.setattr(database, "primary_pins", TTLCache(maxsize=1000, ttl=PIN_SECONDS))
+    await reset_engines()
+    yield replica_url
+
+
+def mirror_users(replica_url: str, *user_ids: str) -> None:
+    """プライマリのユーザーを、名前を "replica" に変えてレプリカに複製する"""
+    primary = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    with primary.connect() as conn:
+        rows = conn.execute(select(User.__table__).where(User.id.in_(user_ids))).mappings()
+        rows = [dict(row, name="replica") for row in rows]
+    primary.dispose()
+    engine = create_engine(replica_url, poolclass=NullPool)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), rows)
+    engine.dispose()
+
+
+async def login(client, sub: str, groups: list[str] | None = None) -> tuple[dict, str]:
+    """初回ログインでユーザーをプライマリに作成し、(ヘッダー, ユーザーID) を返す"""
+    headers = auth_header(f"{sub}-{uuid.uuid4().hex[:8]}", groups=groups)
+    response = await client.get("/api/users/me", headers=headers)
+    assert response.status_code == 200, response.text
+    return headers, response.json()["id"]
+
+
+def forget_writes() -> None:
+    """書き込み後のプライマリへの固定と、ユーザー情報のキャッシュを解除"""
+    database.primary_pins.clear()
+    identity_cache.clear()
+
+
+async def test_reads_go_to_replica_and_writers_are_pinned_to_primary(client, replica):
+    """GETはレプリカ、書き込んだユーザーの直後のGETはプライマリ、他のユーザーはレプリカ"""
+    staff, staff_id = await login(client, "replica-staff")
+    manager, manager_id = await login(client, "replica-manager", groups=["manager"])
+    mirror_users(replica, staff_id, manager_id)
+    forget_writes()
+
+    me = await client.get("/api/users/me", headers=staff)
+    assert me.json()["name"] == "replica"
+
+    created = await client.post("/api/previous-day-reports", json=REPORT, headers=staff)
+    assert created.status_code == 201
+    assert database.is_primary_pinned(uuid.UUID(staff_id))
+
+    latest = await client.get("/api/previous-day-reports/latest/me", headers=staff)
+    assert latest.json()["id"] == created.json()["id"]
+    me = await client.get("/api/users/me", headers=staff)
+    assert me.json()["name"] != "replica"
+    other = await client.get(f"/api/users/{staff_id}", headers=manager)
+    assert other.json()["name"] == "replica"
+
+    await asyncio.sleep(PIN_SECONDS + 0.1)
+    assert not database.is_primary_pinned(uuid.UUID(staff_id))
+    # 読み出しキャッシュを経由せず、レプリカ（登録した報告がない）から読み出す
+    report_cache.clear()
+    latest = await client.get("/api/previous-day-reports/latest/me", headers=staff)
+    assert latest.json() is None
+
+
+async def test_first_login_reads_from_primary(client, replica):
+    """初回ログイン（GET中のユーザー作成）の直後の読み出しはプライマリで行う"""
+    headers = auth_header(f"replica-new-{uuid.uuid4().hex[:8]}")
+
+    response = await client.get("/api/users/me", headers=headers)
+
+    # 作成したユーザーはレプリカにないため、レプリカで読み出した場合は404になる
+    assert response.status_code == 200
+
+
+async def test_replica_session_is_read_only(replica):
+    """レプリカのセッションでは書き込めない"""
+    statement = update(User).where(text("false")).values(name="x")
+    with pytest.raises(DBAPIError):
+        if settings.DATABASE_ASYNC:
+            database.get_async_replica_engine()
+            async with database.AsyncReplicaSessionLocal() as db:
+                await db.execute(statement)
+        else:
+            database.get_replica_engine()
+            with database.ReplicaSessionLocal() as db:
+                db.execute(statement)
+
+
+async def test_reads_fall_back_to_primary_without_replica(client, monkeypatch):
+    """DATABASE_REPLICA_URL が未設定の場合はGETもプライマリで読み出し、書き込みで固定しない"""
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", "")
+    staff, staff_id = await login(client, "replica-fallback")
+
+    created = await client.post("/api/previous-day-reports", json=REPORT, headers=staff)
+    latest = await client.get("/api/previous-day-reports/latest/me", headers=staff)
+
+    assert latest.json()["id"] == created.json()["id"]
+    assert not database.is_primary_pinned(uuid.UUID(staff_id))
+    assert database.get_replica_engine() is None
+    sessions = [session async for session in database.get_replica_session()]
+    assert sessions == [None]
+
+
+def test_get_read_session_routing():
+    """レプリカがない・書き込み直後の場合はプライマリ、それ以外はレプリカのセッション"""
+    user = CurrentUser(id=uuid.uuid4(), cognito_user_id="test-routing", email="r@example.com")
+    primary, replica = object(), object()
+
+    assert get_read_session(user, primary, None) is primary
+    assert get_read_session(user, primary, replica) is replica
+    database.primary_pins.set(user.id, True)
+    assert get_read_session(user, primary, replica) is primary
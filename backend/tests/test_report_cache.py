@@ -0,0 +1,69 @@
+"""
+前日報告の読み出しキャッシュのテスト
+
+他プロセス（別のLambdaコンテナ等）での更新をデータベースを直接更新して再現し、
+キャッシュ済みの最新の報告が返されないことを確認する
+"""
+import uuid
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from tests.conftest import auth_header
+
+REPORT = {
+    "report_date": "2025-12-17",
+    "next_wake_up_time": "06:00:00",
+    "next_departure_time": "07:30:00",
+    "next_arrival_time": "09:00:00",
+    "appearance_photo_url": "https://example.com/a.jpg",
+    "route_photo_url": "https://example.com/r.jpg",
+}
+
+LATEST_PATH = "/api/previous-day-reports/latest/me"
+
+
+def update_elsewhere(report_id: str, notes: str) -> None:
+    """このプロセスのキャッシュを無効化せずに前日報告を更新（他プロセスでの更新）"""
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE previous_day_reports SET notes = :notes, updated_at = now() "
+                "WHERE id = :id"
+            ),
+            {"id": report_id, "notes": notes},
+        )
+    engine.dispose()
+
+
+async def test_latest_reflects_updates_from_other_processes(client):
+    """他プロセスで更新された場合、キャッシュ済みの古い報告ではなく更新後の報告を返す"""
+    headers = auth_header(f"report-cache-{uuid.uuid4().hex[:8]}")
+    created = await client.post("/api/previous-day-reports", json=REPORT, headers=headers)
+    first = await client.get(LATEST_PATH, headers=headers)
+    assert first.json()["id"] == created.json()["id"]
+
+    update_elsewhere(created.json()["id"], "他のプロセスで更新")
+    latest = await client.get(LATEST_PATH, headers=headers)
+
+    assert latest.json()["notes"] == "他のプロセスで更新"
+    assert latest.headers["etag"] != first.headers["etag"]
+    # 更新後のETagの条件付きGETは304、本文と同じバージョンのETagを返す
+    again = await client.get(
+        LATEST_PATH, headers={**headers, "If-None-Match": latest.headers["etag"]}
+    )
+    assert again.status_code == 304
+
+
+async def test_latest_is_served_from_cache_when_unchanged(client):
+    """バージョンが変わらない場合はキャッシュから返す（最新の報告の読み出しは1回）"""
+    headers = auth_header(f"report-cache-hit-{uuid.uuid4().hex[:8]}")
+    await client.post("/api/previous-day-reports", json=REPORT, headers=headers)
+    await client.get(LATEST_PATH, headers=headers)
+
+    cached = await client.get(LATEST_PATH, headers=headers)
+
+    # ユーザー情報はキャッシュ済みのため、クエリはバージョンの確認の1回のみ
+    assert 'queries;desc="1"' in cached.headers["server-timing"]
@@ -0,0 +1,212 @@
+"""
+写真アップロードのテスト
+
+ローカルS3スタンドイン（benchmarks.s3_stub）に対して、署名付きアップロードURLの発行、
+前日報告の写真URLの所有者・用途の確認、未アップロードの写真の拒否を確認する
+"""
+import uuid
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.dependencies import CurrentUser, get_current_user
+from app.main import app
+from app.schemas.previous_day_report import PreviousDayReportCreate
+from app.services.upload_service import AsyncUploadService, _report_photo_keys
+from app.utils import s3
+from benchmarks.s3_stub import S3Stub
+from tests.conftest import auth_header
+
+FILES = [
+    {"purpose": "appearance", "content_type": "image/jpeg"},
+    {"purpose": "route", "content_type": "image/png"},
+]
+
+
+@pytest.fixture(scope="module")
+def s3_stub():
+    """S3スタンドインのサーバー（スタンドイン, エンドポイントURL）"""
+    stub = S3Stub(bucket="test-photos")
+    yield stub, stub.serve()
+    stub.shutdown()
+
+
+@pytest.fixture
+def bucket(s3_stub, monkeypatch):
+    """S3スタンドインを写真用バケットとし、写真のアップロード確認を有効にする"""
+    stub, endpoint = s3_stub
+    monkeypatch.setattr(settings, "S3_BUCKET_NAME", stub.bucket)
+    monkeypatch.setattr(settings, "S3_ENDPOINT_URL", endpoint)
+    monkeypatch.setattr(settings, "S3_PUBLIC_BASE_URL", "")
+    monkeypatch.setattr(settings, "S3_VERIFY_UPLOADS", True)
+    for name, value in S3Stub.credentials().items():
+        monkeypatch.setenv(name, value)
+    # S3クライアントは初回使用時の設定で作成されるため、テストの前後で作り直す
+    monkeypatch.setattr(s3, "_client", None)
+    stub.objects.clear()
+    yield stub
+
+
+@pytest.fixture
+def user_id():
+    """認証済みのユーザー（データベースを使わずに認証を置き換える）"""
+    user_id = uuid.uuid4()
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        id=user_id, cognito_user_id="test-uploads", email="test-uploads@example.com"
+    )
+    yield user_id
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+async def api():
+    """アプリを呼び出すHTTPクライアント（データベース不要のエンドポイント用）"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def presign(api: httpx.AsyncClient, files: list[dict]) -> list[dict]:
+    """署名付きアップロードURLを発行"""
+    response = await api.post("/api/uploads/presign", json={"files": files})
+    assert response.status_code == 200, response.text
+    return response.json()["uploads"]
+
+
+async def upload(target: dict, body: bytes) -> httpx.Response:
+    """署名付きPOSTで写真をアップロード（fields を file より前に送る）"""
+    async with httpx.AsyncClient() as client:
+        return await client.post(target["url"], data=target["fields"], files={"file": ("p", body)})
+
+
+def report(appearance_url: str, route_url: str) -> PreviousDayReportCreate:
+    """写真URLを指定した前日報告の作成データ"""
+    return PreviousDayReportCreate(
+        report_date="2025-12-17",
+        next_wake_up_time="06:00",
+        next_departure_time="07:30",
+        next_arrival_time="09:00",
+        appearance_photo_url=appearance_url,
+        route_photo_url=route_url,
+    )
+
+
+async def test_presign_issues_keys_under_user_and_purpose(bucket, user_id, api):
+    """ユーザー・用途ごとの接頭辞のキーと、写真用バケットの写真URLを発行する"""
+    appearance, route = await presign(api, FILES)
+
+    assert appearance["purpose"] == "appearance"
+    assert appearance["key"].startswith(f"photos/{user_id}/appearance/")
+    assert appearance["key"].endswith(".jpg")
+    assert route["key"].startswith(f"photos/{user_id}/route/")
+    assert route["key"].endswith(".png")
+    assert appearance["photo_url"] == f"{settings.S3_ENDPOINT_URL}/test-photos/{appearance['key']}"
+    assert appearance["fields"]["Content-Type"] == "image/jpeg"
+    assert appearance["method"] == "POST"
+
+
+async def test_presigned_post_uploads_and_enforces_policy(bucket, user_id, api):
+    """署名付きPOSTでアップロードでき、Content-Type の不一致・サイズ超過はS3側で拒否される"""
+    (target,) = await presign(api, FILES[:1])
+
+    response = await upload(target, b"\xff\xd8" + b"\0" * 1024)
+    assert response.status_code in (200, 201, 204)
+    assert target["key"] in bucket.objects
+
+    mismatched = dict(target, fields={**target["fields"], "Content-Type": "image/png"})
+    assert (await upload(mismatched, b"\x89PNG")).status_code == 403
+
+    (too_large,) = await presign(api, FILES[:1])
+    response = await upload(too_large, b"\0" * (settings.PHOTO_MAX_BYTES + 1))
+    assert response.status_code == 400
+    assert too_large["key"] not in bucket.objects
+
+
+async def test_presign_rejects_unsupported_content_type(bucket, user_id, api):
+    """JPEG・PNG以外の画像形式は発行しない"""
+    files = [{"purpose": "appearance", "content_type": "image/gif"}]
+    response = await api.post("/api/uploads/presign", json={"files": files})
+    assert response.status_code == 422
+
+
+def test_report_photo_keys_accepts_own_keys(bucket):
+    """自分の用途ごとの接頭辞のキーはフィールド名 → キーとして返す"""
+    user_id = uuid.uuid4()
+    appearance = f"photos/{user_id}/appearance/a.jpg"
+    route = f"photos/{user_id}/route/r.png"
+
+    keys = _report_photo_keys(user_id, report(s3.photo_url(appearance), s3.photo_url(route)))
+
+    assert keys == {"appearance_photo_url": appearance, "route_photo_url": route}
+
+
+@pytest.mark.parametrize(
+    "appearance_key, route_key",
+    [
+        # 他のユーザーのキー
+        ("photos/{other}/appearance/a.jpg", "photos/{user}/route/r.png"),
+        # 用途の取り違え
+        ("photos/{user}/route/r.png", "photos/{user}/route/r.png"),
+        # 接頭辞の外のキー
+        ("uploads/{user}/appearance/a.jpg", "photos/{user}/route/r.png"),
+    ],
+    ids=["other-user", "wrong-purpose", "outside-prefix"],
+)
+def test_report_photo_keys_rejects_foreign_keys(bucket, appearance_key: str, route_key: str):
+    """他のユーザー・用途の接頭辞のキーは400"""
+    user_id, other = uuid.uuid4(), uuid.uuid4()
+    appearance = s3.photo_url(appearance_key.format(user=user_id, other=other))
+    route = s3.photo_url(route_key.format(user=user_id, other=other))
+
+    with pytest.raises(HTTPException) as e:
+        _report_photo_keys(user_id, report(appearance, route))
+
+    assert e.value.status_code == 400
+    assert "appearance_photo_url" in e.value.detail
+
+
+def test_report_photo_keys_rejects_external_url(bucket):
+    """写真用バケット以外のURLは400"""
+    user_id = uuid.uuid4()
+    route = s3.photo_url(f"photos/{user_id}/route/r.png")
+
+    with pytest.raises(HTTPException) as e:
+        _report_photo_keys(user_id, report("https://example.com/a.jpg", route))
+
+    assert e.value.status_code == 400
+
+
+async def test_verify_report_photos_requires_uploaded_objects(bucket, user_id, api):
+    """アップロード済みの写真は通過し、未アップロードの写真は400"""
+    appearance, route = await presign(api, FILES)
+    await upload(appearance, b"\xff\xd8" + b"\0" * 16)
+    service = AsyncUploadService()
+
+    with pytest.raises(HTTPException) as e:
+        await service.verify_report_photos(
+            user_id, report(appearance["photo_url"], route["photo_url"])
+        )
+    assert e.value.status_code == 400
+    assert "route_photo_url" in e.value.detail
+
+    await upload(route, b"\x89PNG" + b"\0" * 16)
+    await service.verify_report_photos(user_id, report(appearance["photo_url"], route["photo_url"]))
+
+
+async def test_create_report_with_missing_photo_returns_400(bucket, client):
+    """前日報告の登録で写真が未アップロードの場合は400（報告は作成しない）"""
+    headers = auth_header("uploads-missing")
+    me = await client.get("/api/users/me", headers=headers)
+    user_id = me.json()["id"]
+    appearance = s3.photo_url(f"photos/{user_id}/appearance/missing.jpg")
+    route = s3.photo_url(f"photos/{user_id}/route/missing.png")
+    body = report(appearance, route).model_dump(mode="json")
+
+    response = await client.post("/api/previous-day-reports", json=body, headers=headers)
+
+    assert response.status_code == 400
+    assert "写真がアップロードされていません" in response.json()["detail"]
+    latest = await client.get("/api/previous-day-reports/latest/me", headers=headers)
+    assert latest.json() is None